@@ -0,0 +1,267 @@
+"""Accolade rules, evaluated in batches off the request path.
+
+Guesses, purchases and campaign ends only write an accolade_triggers row (see
+enqueue_accolade_trigger). evaluate_pending_accolades claims pending triggers with
+FOR UPDATE SKIP LOCKED, loads everything the rules need for the whole batch in a few
+queries, awards, and deletes the triggers in the same transaction. award_accolade is
+idempotent per (user, campaign, key, date), so a replayed trigger never double counts;
+that is also what makes backfill_triggers safe to run over history.
+"""
+import json
+import os
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from app.accolades.service import (
+    BIG_SPENDER_THRESHOLD,
+    HOARDER_THRESHOLD,
+    award_accolade,
+    classify_time_accolades,
+    is_lucky_strike,
+)
+from app.crud import get_db
+from app.dates import iso_date
+
+
+ACCOLADE_EVAL_SECONDS = int(os.getenv("ACCOLADE_EVAL_SECONDS", "5"))
+ACCOLADE_BATCH_SIZE = int(os.getenv("ACCOLADE_BATCH_SIZE", "500"))
+
+
+def _shift(date_str: str, days: int) -> str:
+    return (datetime.strptime(date_str, "%Y-%m-%d").date() + timedelta(days=days)).strftime("%Y-%m-%d")
+
+
+def _load_game_context(conn, games: list) -> dict:
+    """Batch lookups for the solved-game rules: first solvers, the two prior days, item use."""
+    solved = [t for t in games if t["payload"].get("solved")]
+    context = {"first_solvers": {}, "prior_solved": {}, "first_item_use": {}}
+    if not solved:
+        return context
+
+    days = sorted({(t["campaign_id"], t["date"]) for t in solved})
+    rows = conn.execute("""
+        SELECT DISTINCT ON (campaign_id, date) campaign_id, date, user_id
+        FROM campaign_user_daily_results
+        WHERE (campaign_id, date) IN (SELECT * FROM unnest(%s::int[], %s::date[]))
+          AND solved = 1
+        ORDER BY campaign_id, date, completed_at ASC NULLS LAST, user_id ASC
+    """, ([c for c, _ in days], [d for _, d in days])).fetchall()
+    context["first_solvers"] = {(row[0], iso_date(row[1])): row[2] for row in rows}
+
+    prior = sorted({
+        (t["user_id"], t["campaign_id"], _shift(t["date"], -back))
+        for t in solved
+        for back in (1, 2)
+    })
+    rows = conn.execute("""
+        SELECT user_id, campaign_id, date, solved
+        FROM campaign_user_daily_results
+        WHERE (user_id, campaign_id, date) IN (SELECT * FROM unnest(%s::int[], %s::int[], %s::date[]))
+    """, ([p[0] for p in prior], [p[1] for p in prior], [p[2] for p in prior])).fetchall()
+    context["prior_solved"] = {(row[0], row[1], iso_date(row[2])): int(row[3]) for row in rows}
+
+    players = sorted({(t["user_id"], t["campaign_id"]) for t in solved})
+    first_day = min(d for _, d in days)
+    last_day = max(d for _, d in days)
+    # created_at is a naive UTC timestamp. The created_at bounds keep the scan on the
+    # matching monthly partitions.
+    rows = conn.execute("""
+        SELECT user_id, campaign_id,
+               TO_CHAR((created_at AT TIME ZONE 'UTC') AT TIME ZONE 'America/Chicago', 'YYYY-MM-DD'),
+               MIN(created_at AT TIME ZONE 'UTC')
+        FROM campaign_item_events
+        WHERE (user_id, campaign_id) IN (SELECT * FROM unnest(%s::int[], %s::int[]))
+          AND event_type = 'use'
+          AND created_at >= %s::date - 1 AND created_at < %s::date + 2
+        GROUP BY 1, 2, 3
+    """, ([p[0] for p in players], [p[1] for p in players], first_day, last_day)).fetchall()
+    context["first_item_use"] = {(row[0], row[1], row[2]): row[3] for row in rows}
+    return context
+
+
+def _game_accolades(trigger: dict, context: dict) -> list:
+    payload = trigger["payload"]
+    user_id, campaign_id, day = trigger["user_id"], trigger["campaign_id"], trigger["date"]
+    keys = []
+    guesses_used = payload.get("guesses_used")
+    if payload.get("solved"):
+        if guesses_used == 1:
+            keys.append("ace")
+        elif guesses_used in (2, 3):
+            keys.append("clutch")
+        elif guesses_used == 6:
+            keys.append("barely_made_it")
+
+        if guesses_used == 3 and is_lucky_strike(payload.get("results") or []):
+            keys.append("lucky_strike")
+
+        completed_at = datetime.fromisoformat(payload["completed_at"]) if payload.get("completed_at") else None
+        if completed_at and completed_at.tzinfo is None:
+            # Triggers queued before completed_at carried an offset.
+            completed_at = completed_at.replace(tzinfo=ZoneInfo("America/Chicago"))
+        if completed_at:
+            target_date = datetime.strptime(day, "%Y-%m-%d").date()
+            early, night, late_save = classify_time_accolades(completed_at, target_date)
+            if early:
+                keys.append("early_bird")
+            if night:
+                keys.append("night_owl")
+            if late_save:
+                keys.append("late_save")
+
+        if context["first_solvers"].get((campaign_id, day)) == user_id:
+            keys.append("first_solver")
+
+        yesterday = context["prior_solved"].get((user_id, campaign_id, _shift(day, -1)))
+        two_days = context["prior_solved"].get((user_id, campaign_id, _shift(day, -2)))
+        if yesterday == 0:
+            keys.append("comeback")
+            if two_days == 0:
+                keys.append("iron_will")
+
+        # Only an item used before the solve can have saved it.
+        first_item_use = context["first_item_use"].get((user_id, campaign_id, day))
+        if first_item_use and completed_at and first_item_use < completed_at and guesses_used <= 3:
+            keys.append("saves_the_day")
+
+    coins_before, coins_after = payload.get("coins_before"), payload.get("coins_after")
+    if (
+        HOARDER_THRESHOLD is not None
+        and coins_before is not None
+        and coins_after is not None
+        and coins_before < HOARDER_THRESHOLD <= coins_after
+    ):
+        keys.append("hoarder")
+
+    if payload.get("days_played") in (7, 30, 100):
+        keys.append(f"veteran_{payload['days_played']}")
+
+    if payload.get("streak") == 7:
+        keys.append("perfect_week")
+    if payload.get("streak") == 10:
+        keys.append("marathon")
+    return [(user_id, key) for key in keys]
+
+
+def _purchase_accolades(trigger: dict, context: dict) -> list:
+    spend_total = trigger["payload"].get("spend_total") or 0
+    if BIG_SPENDER_THRESHOLD and spend_total >= BIG_SPENDER_THRESHOLD:
+        return [(trigger["user_id"], "big_spender")]
+    return []
+
+
+def _campaign_end_accolades(trigger: dict, context: dict) -> list:
+    return [(user_id, "top_3") for user_id in trigger["payload"].get("top_user_ids") or []]
+
+
+RULES = {
+    "game_completed": _game_accolades,
+    "purchase": _purchase_accolades,
+    "campaign_ended": _campaign_end_accolades,
+}
+
+
+def evaluate_triggers(conn, triggers: list) -> int:
+    """Run every rule over one batch of triggers; returns the number of new accolades."""
+    context = _load_game_context(conn, [t for t in triggers if t["kind"] == "game_completed"])
+    awarded = 0
+    for trigger in triggers:
+        rule = RULES.get(trigger["kind"])
+        if rule is None:
+            continue
+        for user_id, key in rule(trigger, context):
+            if award_accolade(conn, trigger["campaign_id"], user_id, key, trigger["date"]):
+                awarded += 1
+    return awarded
+
+
+def _claim(conn, limit: int) -> list:
+    rows = conn.execute("""
+        SELECT id, kind, campaign_id, user_id, date, payload
+        FROM accolade_triggers
+        ORDER BY id
+        LIMIT %s
+        FOR UPDATE SKIP LOCKED
+    """, (limit,)).fetchall()
+    return [
+        {
+            "id": row[0],
+            "kind": row[1],
+            "campaign_id": row[2],
+            "user_id": row[3],
+            "date": row[4],
+            "payload": json.loads(row[5]) if row[5] else {},
+        }
+        for row in rows
+    ]
+
+
+def evaluate_pending_accolades(batch_size: int = ACCOLADE_BATCH_SIZE) -> dict:
+    """Drain the trigger queue, one transaction per batch."""
+    totals = {"triggers": 0, "awarded": 0}
+    while True:
+        with get_db() as conn:
+            triggers = _claim(conn, batch_size)
+            if not triggers:
+                return totals
+            totals["awarded"] += evaluate_triggers(conn, triggers)
+            conn.execute("DELETE FROM accolade_triggers WHERE id = ANY(%s)", ([t["id"] for t in triggers],))
+        totals["triggers"] += len(triggers)
+        if len(triggers) < batch_size:
+            return totals
+
+
+def backfill_triggers(conn, start: str, end: str) -> dict:
+    """Queue triggers rebuilt from stored history between two YYYY-MM-DD dates.
+
+    Games come from campaign_user_daily_results (with the board from campaign_guess_states)
+    and purchases from campaign_shop_daily_spend. Coin balances and streaks at the time are
+    not stored, so hoarder, perfect_week and marathon are not replayed, and neither is
+    top_3, whose final standings are cleared when a campaign resets. completed_at is stored
+    as naive UTC, so it is emitted with its offset for the time-of-day rules.
+    """
+    games = conn.execute("""
+        INSERT INTO accolade_triggers (kind, campaign_id, user_id, date, payload)
+        SELECT 'game_completed', r.campaign_id, r.user_id, r.date, json_build_object(
+            'solved', r.solved = 1,
+            'guesses_used', r.guesses_used,
+            'results', gs.results::json,
+            'completed_at', r.completed_at AT TIME ZONE 'UTC',
+            'days_played', r.days_played
+        )::text
+        FROM (
+            SELECT user_id, campaign_id, date, solved, guesses_used, completed_at,
+                   COUNT(*) OVER (PARTITION BY user_id, campaign_id ORDER BY date) AS days_played
+            FROM campaign_user_daily_results
+            WHERE date <= %s
+        ) r
+        JOIN campaigns c ON c.id = r.campaign_id
+        LEFT JOIN campaign_guess_states gs
+          ON gs.user_id = r.user_id AND gs.campaign_id = r.campaign_id AND gs.date = r.date
+        WHERE r.date >= %s AND COALESCE(c.is_admin_campaign, FALSE) = FALSE
+    """, (end, start)).rowcount
+    purchases = conn.execute("""
+        INSERT INTO accolade_triggers (kind, campaign_id, user_id, date, payload)
+        SELECT 'purchase', s.campaign_id, s.user_id, s.shop_date, json_build_object('spend_total', s.coins_spent)::text
+        FROM campaign_shop_daily_spend s
+        JOIN campaigns c ON c.id = s.campaign_id
+        WHERE s.shop_date BETWEEN %s AND %s AND COALESCE(c.is_admin_campaign, FALSE) = FALSE
+    """, (start, end)).rowcount
+    return {"game_completed": games, "purchase": purchases}
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Evaluate queued accolade triggers.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("run", help="drain the trigger queue once")
+    backfill_parser = subparsers.add_parser("backfill", help="replay stored history, then drain")
+    backfill_parser.add_argument("--start", required=True, help="YYYY-MM-DD")
+    backfill_parser.add_argument("--end", required=True, help="YYYY-MM-DD")
+    args = parser.parse_args()
+
+    if args.command == "backfill":
+        with get_db() as conn:
+            print(f"queued {backfill_triggers(conn, args.start, args.end)}")
+    print(f"evaluated {evaluate_pending_accolades()}")
@@ -1,8 +1,11 @@
 from __future__ import annotations
 
+import json
 from datetime import datetime, timedelta, date
 from zoneinfo import ZoneInfo
 
+from app.counters import record_accolade
+
 ACCOLADE_LABELS = {
     "ace": "Ace (1 guess)",
     "clutch": "Clutch (2-3 guesses)",
@@ -86,17 +89,21 @@ def award_accolade(conn, campaign_id: int, user_id: int, accolade_key: str, date
         """,
         (campaign_id, accolade_key),
     )
+    record_accolade(conn, accolade_key)
+    return True
+
+
+def enqueue_accolade_trigger(
+    conn, kind: str, campaign_id: int, user_id: int | None, date_str: str, payload: dict
+) -> None:
+    """Record an accolade-relevant fact for app.accolades.evaluator to judge off the request path."""
     conn.execute(
         """
-        INSERT INTO global_accolade_stats (accolade_key, count, last_awarded_at)
-        VALUES (%s, 1, CURRENT_TIMESTAMP)
-        ON CONFLICT (accolade_key)
-        DO UPDATE SET count = global_accolade_stats.count + 1,
-                      last_awarded_at = CURRENT_TIMESTAMP
+        INSERT INTO accolade_triggers (kind, campaign_id, user_id, date, payload)
+        VALUES (%s, %s, %s, %s, %s)
         """,
-        (accolade_key,),
+        (kind, campaign_id, user_id, date_str, json.dumps(payload)),
     )
-    return True
 
 
 def list_user_accolades(conn, user_id: int, campaign_id: int):
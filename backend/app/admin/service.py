@@ -4,7 +4,7 @@ from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
 from fastapi import HTTPException
 
-from app.crud import get_db, is_admin_user, VALID_WORDS
+from app.crud import get_db, invalidate_leaderboard, is_admin_user, load_valid_words, require_campaign_member
 from app.items import ITEM_CATALOG, get_item
 from app.utils.campaigns import resolve_campaign_day
 
@@ -167,7 +167,7 @@ def admin_add_effect(user_id: int, campaign_id: int, effect_key: str, effect_pay
                 raise HTTPException(status_code=400, detail="Choose a valid 5-letter word.")
             if effect_key == "hex_of_compulsion" and len(set(payload_value)) < 4:
                 raise HTTPException(status_code=400, detail="Word must include at least 4 unique letters.")
-            if payload_value not in VALID_WORDS:
+            if payload_value not in load_valid_words():
                 raise HTTPException(status_code=400, detail="Word must be a valid guess.")
         else:
             raise HTTPException(status_code=400, detail="Unsupported payload type.")
@@ -195,13 +195,7 @@ def admin_add_effect(user_id: int, campaign_id: int, effect_key: str, effect_pay
 
     with get_db() as conn:
         require_admin(conn, user_id)
-        member_row = conn.execute("""
-            SELECT 1
-            FROM campaign_members
-            WHERE campaign_id = %s AND user_id = %s
-        """, (campaign_id, user_id)).fetchone()
-        if not member_row:
-            raise HTTPException(status_code=403, detail="You are not a member of this campaign")
+        require_campaign_member(conn, user_id, campaign_id)
 
         _, _, _, _, target_date = resolve_campaign_day(conn, campaign_id, None)
         target_date_str = target_date.strftime("%Y-%m-%d")
@@ -457,6 +451,7 @@ def admin_add_troops(user_id: int, campaign_id: int, amount: int):
             SET score = %s
             WHERE user_id = %s AND campaign_id = %s
         """, (next_score, user_id, campaign_id))
+        invalidate_leaderboard(conn, campaign_id)
     return {"score": next_score}
 
 def admin_reset_double_down(user_id: int, campaign_id: int):
@@ -477,7 +472,7 @@ def admin_set_word(user_id: int, campaign_id: int, word: str):
     normalized_word = str(word or "").strip().lower()
     if len(normalized_word) != 5 or not normalized_word.isalpha():
         raise HTTPException(status_code=400, detail="Word must be exactly 5 letters.")
-    if normalized_word not in VALID_WORDS:
+    if normalized_word not in load_valid_words():
         raise HTTPException(status_code=400, detail="Word must be a valid guess word.")
 
     with get_db() as conn:
@@ -0,0 +1,3 @@
+from app.analytics.service import export_daily_facts, get_item_usage_trends, get_monthly_trends, get_word_difficulty
+
+__all__ = ["export_daily_facts", "get_item_usage_trends", "get_monthly_trends", "get_word_difficulty"]
@@ -0,0 +1,13 @@
+import argparse
+from datetime import date, datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from app.analytics.service import backfill_facts
+
+
+parser = argparse.ArgumentParser(description="Backfill the columnar analytics store from Postgres.")
+parser.add_argument("--start", required=True, help="YYYY-MM-DD")
+parser.add_argument("--end", help="YYYY-MM-DD, defaults to yesterday")
+args = parser.parse_args()
+end = date.fromisoformat(args.end) if args.end else datetime.now(ZoneInfo("America/Chicago")).date() - timedelta(days=1)
+print(backfill_facts(date.fromisoformat(args.start), end))
@@ -0,0 +1,420 @@
+import csv
+import os
+import tempfile
+import threading
+from datetime import date, datetime, timedelta
+from typing import Optional
+from zoneinfo import ZoneInfo
+
+from app.crud import get_db
+
+
+BACKEND_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+ANALYTICS_DIR = os.getenv("ANALYTICS_DIR", os.path.join(BACKEND_ROOT, "analytics"))
+ANALYTICS_MAX_MONTHS = 36
+ANALYTICS_MAX_LIMIT = 500
+# The nightly export lands shortly after midnight, so the newest file is normally one or
+# two days old. Past this lag the endpoints answer from Postgres instead.
+ANALYTICS_MAX_LAG_DAYS = int(os.getenv("ANALYTICS_MAX_LAG_DAYS", "2"))
+
+# Daily fact snapshots, one Parquet file per fact per day under ANALYTICS_DIR/<fact>/.
+# Each query pulls exactly one day from Postgres; rerunning a day replaces that day's rows,
+# whether they sit in its daily file or have already been compacted into the month.
+FACTS = {
+    "daily_results": {
+        "columns": [
+            ("user_id", "INTEGER"),
+            ("campaign_id", "INTEGER"),
+            ("date", "DATE"),
+            ("word", "VARCHAR"),
+            ("guesses_used", "INTEGER"),
+            ("solved", "INTEGER"),
+            ("used_double_down", "INTEGER"),
+            ("double_down_success", "INTEGER"),
+            ("troops_earned", "INTEGER"),
+            ("coins_earned", "INTEGER"),
+        ],
+        "query": """
+            SELECT cudr.user_id, cudr.campaign_id, cudr.date, cudr.word, cudr.guesses_used, cudr.solved,
+                   cudr.used_double_down, cudr.double_down_success, cudr.troops_earned, cudr.coins_earned
+            FROM campaign_user_daily_results cudr
+            JOIN campaigns c ON c.id = cudr.campaign_id
+            WHERE cudr.date = %s AND COALESCE(c.is_admin_campaign, FALSE) = FALSE
+        """,
+    },
+    "campaign_daily": {
+        "columns": [
+            ("campaign_id", "INTEGER"),
+            ("date", "DATE"),
+            ("total_troops", "INTEGER"),
+            ("member_count", "INTEGER"),
+            ("completed_count", "INTEGER"),
+            ("fast_solve_count", "INTEGER"),
+            ("clutch_wins", "INTEGER"),
+            ("double_down_used", "INTEGER"),
+            ("double_down_success", "INTEGER"),
+        ],
+        "query": """
+            SELECT cds.campaign_id, cds.date, cds.total_troops, cds.member_count, cds.completed_count,
+                   cds.fast_solve_count, cds.clutch_wins, cds.double_down_used, cds.double_down_success
+            FROM campaign_daily_stats cds
+            WHERE cds.date = %s
+        """,
+    },
+    "item_events": {
+        "columns": [
+            ("campaign_id", "INTEGER"),
+            ("user_id", "INTEGER"),
+            ("date", "DATE"),
+            ("item_key", "VARCHAR"),
+            ("event_type", "VARCHAR"),
+            ("target_user_id", "INTEGER"),
+        ],
+        "query": """
+            SELECT cie.campaign_id, cie.user_id, %s, cie.item_key, cie.event_type, cie.target_user_id
+            FROM campaign_item_events cie
+            JOIN campaigns c ON c.id = cie.campaign_id
+            WHERE cie.created_at >= %s::date AND cie.created_at < %s::date + 1
+              AND COALESCE(c.is_admin_campaign, FALSE) = FALSE
+        """,
+        "params": lambda day: (day, day, day),
+    },
+}
+
+# One in-memory DuckDB database, opened on first use; every query runs on its own cursor
+# because a DuckDB connection must not be shared between threads.
+_duck = None
+_duck_lock = threading.Lock()
+
+
+def _duck_cursor():
+    global _duck
+    with _duck_lock:
+        if _duck is None:
+            import duckdb
+
+            _duck = duckdb.connect()
+        return _duck.cursor()
+
+
+def _fact_dir(fact: str) -> str:
+    return os.path.join(ANALYTICS_DIR, fact)
+
+
+def _last_day(name: str) -> Optional[date]:
+    # Daily files are YYYY-MM-DD.parquet and compacted months YYYY-MM.parquet.
+    stem = name[:-len(".parquet")]
+    try:
+        if len(stem) == 10:
+            return date.fromisoformat(stem)
+        if len(stem) == 7:
+            first = date.fromisoformat(f"{stem}-01")
+            return (first + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+    except ValueError:
+        pass
+    return None
+
+
+def _first_day_path(fact: str) -> str:
+    return os.path.join(_fact_dir(fact), "first_day")
+
+
+def _first_day(fact: str) -> Optional[date]:
+    """The earliest day exported for `fact`; the store covers everything from there on."""
+    try:
+        with open(_first_day_path(fact)) as fh:
+            return date.fromisoformat(fh.read().strip())
+    except (OSError, ValueError):
+        return None
+
+
+def _record_first_day(fact: str, day: date) -> None:
+    first = _first_day(fact)
+    if first is not None and first <= day:
+        return
+    path = _first_day_path(fact)
+    with open(f"{path}.partial", "w") as fh:
+        fh.write(day.isoformat())
+    os.replace(f"{path}.partial", path)
+
+
+def _fact_glob(fact: str, since: date) -> Optional[str]:
+    """The fact's Parquet files, or None unless they cover `since` up to the last night or two."""
+    directory = _fact_dir(fact)
+    if not os.path.isdir(directory):
+        return None
+    first = _first_day(fact)
+    if first is None or first > since:
+        return None
+    days = [_last_day(name) for name in os.listdir(directory) if name.endswith(".parquet")]
+    days = [day for day in days if day is not None]
+    if not days:
+        return None
+    today = datetime.now(ZoneInfo("America/Chicago")).date()
+    if (today - max(days)).days > ANALYTICS_MAX_LAG_DAYS:
+        return None
+    return os.path.join(directory, "*.parquet")
+
+
+def _write_parquet(fact: str, day: str, rows: list) -> str:
+    columns = FACTS[fact]["columns"]
+    directory = _fact_dir(fact)
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{day}.parquet")
+    partial_path = f"{path}.partial"
+    # Rows go through a scratch CSV so DuckDB bulk-loads them with the declared types.
+    with tempfile.NamedTemporaryFile("w", newline="", suffix=".csv", delete=False) as fh:
+        csv.writer(fh).writerows(rows)
+        csv_path = fh.name
+    try:
+        column_types = ", ".join(f"'{name}': '{kind}'" for name, kind in columns)
+        cursor = _duck_cursor()
+        try:
+            cursor.execute(f"""
+                COPY (
+                    SELECT * FROM read_csv(?, header = false, auto_detect = false, delim = ',', quote = '"', columns = {{{column_types}}})
+                ) TO '{partial_path}' (FORMAT parquet, COMPRESSION zstd)
+            """, [csv_path])
+        finally:
+            cursor.close()
+    finally:
+        os.remove(csv_path)
+    os.replace(partial_path, path)
+    return path
+
+
+def compact_month(fact: str, month: str) -> Optional[str]:
+    """Merge a month's daily files into one YYYY-MM.parquet.
+
+    Opening files dominates scan time over hundreds of small dailies, so closed months
+    are kept as a single file sorted by date. Days with a daily file replace their rows
+    in an existing month file, so a re-exported day is never counted twice.
+    """
+    directory = _fact_dir(fact)
+    daily_names = sorted(
+        name
+        for name in os.listdir(directory)
+        if name.startswith(f"{month}-") and name.endswith(".parquet")
+    ) if os.path.isdir(directory) else []
+    if not daily_names:
+        return None
+    daily_paths = [os.path.join(directory, name) for name in daily_names]
+    path = os.path.join(directory, f"{month}.parquet")
+    partial_path = f"{path}.partial"
+    cursor = _duck_cursor()
+    try:
+        if os.path.exists(path):
+            cursor.execute(f"""
+                COPY (
+                    SELECT * FROM (
+                        SELECT * FROM read_parquet(?)
+                        WHERE NOT list_contains(?, strftime(date, '%Y-%m-%d'))
+                        UNION ALL
+                        SELECT * FROM read_parquet(?)
+                    )
+                    ORDER BY date
+                ) TO '{partial_path}' (FORMAT parquet, COMPRESSION zstd)
+            """, [path, [name[:10] for name in daily_names], daily_paths])
+        else:
+            cursor.execute(f"""
+                COPY (SELECT * FROM read_parquet(?) ORDER BY date) TO '{partial_path}' (FORMAT parquet, COMPRESSION zstd)
+            """, [daily_paths])
+    finally:
+        cursor.close()
+    os.replace(partial_path, path)
+    for daily_path in daily_paths:
+        os.remove(daily_path)
+    return path
+
+
+def export_daily_facts(day: date) -> dict:
+    """Snapshot one day's facts from Postgres into the columnar store."""
+    day_str = day.strftime("%Y-%m-%d")
+    month = day.strftime("%Y-%m")
+    month_end = (day + timedelta(days=1)).day == 1
+    counts = {}
+    with get_db(readonly=True) as conn:
+        for fact, spec in FACTS.items():
+            params = spec["params"](day_str) if "params" in spec else (day_str,)
+            rows = conn.execute(spec["query"], params).fetchall()
+            _write_parquet(fact, day_str, rows)
+            counts[fact] = len(rows)
+    for fact in FACTS:
+        # A day of an already compacted month goes straight back into the month file.
+        if month_end or os.path.exists(os.path.join(_fact_dir(fact), f"{month}.parquet")):
+            compact_month(fact, month)
+        _record_first_day(fact, day)
+    return counts
+
+
+def backfill_facts(start: date, end: date) -> dict:
+    totals = {fact: 0 for fact in FACTS}
+    day = start
+    while day <= end:
+        for fact, count in export_daily_facts(day).items():
+            totals[fact] += count
+        day += timedelta(days=1)
+    return totals
+
+
+def _query(sql: str, params: list) -> list[dict]:
+    cursor = _duck_cursor()
+    try:
+        cursor.execute(sql, params)
+        columns = [column[0] for column in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+    finally:
+        cursor.close()
+
+
+def _since(months: Optional[int]) -> date:
+    months = max(1, min(int(months or 12), ANALYTICS_MAX_MONTHS))
+    today = datetime.now(ZoneInfo("America/Chicago")).date().replace(day=1)
+    index = today.year * 12 + today.month - 1 - (months - 1)
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _pg_query(sql: str, params: list) -> list[dict]:
+    # Fallback for when the columnar store is missing or stale (for example the API cannot
+    # see the scheduler's ANALYTICS_DIR); same result shape, read from the replica.
+    with get_db(readonly=True) as conn:
+        cursor = conn.execute(sql, params)
+        columns = [column.name for column in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+
+def get_monthly_trends(campaign_id: Optional[int], months: Optional[int]):
+    since = _since(months)
+    source = _fact_glob("daily_results", since)
+    if source is None:
+        clauses = ["COALESCE(c.is_admin_campaign, FALSE) = FALSE", "cudr.date >= %s"]
+        params: list = [since]
+        if campaign_id is not None:
+            clauses.append("cudr.campaign_id = %s")
+            params.append(campaign_id)
+        return _pg_query(f"""
+            SELECT
+                to_char(date_trunc('month', cudr.date), 'YYYY-MM') AS month,
+                COUNT(*) AS games,
+                COUNT(DISTINCT cudr.user_id) AS players,
+                COUNT(DISTINCT cudr.campaign_id) AS campaigns,
+                ROUND(AVG(cudr.solved), 4)::float AS solve_rate,
+                ROUND(AVG(cudr.guesses_used) FILTER (WHERE cudr.solved = 1), 3)::float AS avg_guesses_when_solved,
+                SUM(cudr.troops_earned) AS troops_earned,
+                SUM(cudr.coins_earned) AS coins_earned,
+                SUM(cudr.used_double_down) AS double_downs
+            FROM campaign_user_daily_results cudr
+            JOIN campaigns c ON c.id = cudr.campaign_id
+            WHERE {' AND '.join(clauses)}
+            GROUP BY 1
+            ORDER BY 1 ASC
+        """, params)
+    clauses = ["date >= ?"]
+    params = [source, since]
+    if campaign_id is not None:
+        clauses.append("campaign_id = ?")
+        params.append(campaign_id)
+    return _query(f"""
+        SELECT
+            strftime(date_trunc('month', date), '%Y-%m') AS month,
+            COUNT(*) AS games,
+            COUNT(DISTINCT user_id) AS players,
+            COUNT(DISTINCT campaign_id) AS campaigns,
+            ROUND(AVG(solved), 4) AS solve_rate,
+            ROUND(AVG(guesses_used) FILTER (WHERE solved = 1), 3) AS avg_guesses_when_solved,
+            SUM(troops_earned) AS troops_earned,
+            SUM(coins_earned) AS coins_earned,
+            SUM(used_double_down) AS double_downs
+        FROM read_parquet(?)
+        WHERE {' AND '.join(clauses)}
+        GROUP BY 1
+        ORDER BY 1 ASC
+    """, params)
+
+
+def get_word_difficulty(limit: Optional[int], min_attempts: int = 5, months: Optional[int] = None):
+    # Difficulty blends how often a word beats players with how many guesses it costs
+    # when it does not: 0 = always solved in one, 1 = never solved.
+    limit = max(1, min(int(limit or 50), ANALYTICS_MAX_LIMIT))
+    since = _since(months)
+    source = _fact_glob("daily_results", since)
+    if source is None:
+        return _pg_query("""
+            SELECT
+                cudr.word,
+                COUNT(*) AS attempts,
+                ROUND(AVG(cudr.solved), 4)::float AS solve_rate,
+                ROUND(AVG(cudr.guesses_used) FILTER (WHERE cudr.solved = 1), 3)::float AS avg_guesses_when_solved,
+                ROUND(
+                    0.6 * (1 - AVG(cudr.solved))
+                    + 0.4 * COALESCE((AVG(cudr.guesses_used) FILTER (WHERE cudr.solved = 1) - 1) / 5.0, 1),
+                    4
+                )::float AS difficulty
+            FROM campaign_user_daily_results cudr
+            JOIN campaigns c ON c.id = cudr.campaign_id
+            WHERE COALESCE(c.is_admin_campaign, FALSE) = FALSE
+              AND cudr.word IS NOT NULL AND cudr.date >= %s
+            GROUP BY cudr.word
+            HAVING COUNT(*) >= %s
+            ORDER BY difficulty DESC, attempts DESC, cudr.word ASC
+            LIMIT %s
+        """, [since, min_attempts, limit])
+    return _query("""
+        SELECT
+            word,
+            COUNT(*) AS attempts,
+            ROUND(AVG(solved), 4) AS solve_rate,
+            ROUND(AVG(guesses_used) FILTER (WHERE solved = 1), 3) AS avg_guesses_when_solved,
+            ROUND(
+                0.6 * (1 - AVG(solved))
+                + 0.4 * COALESCE((AVG(guesses_used) FILTER (WHERE solved = 1) - 1) / 5.0, 1),
+                4
+            ) AS difficulty
+        FROM read_parquet(?)
+        WHERE word IS NOT NULL AND date >= ?
+        GROUP BY word
+        HAVING COUNT(*) >= ?
+        ORDER BY difficulty DESC, attempts DESC, word ASC
+        LIMIT ?
+    """, [source, since, min_attempts, limit])
+
+
+def get_item_usage_trends(campaign_id: Optional[int], months: Optional[int]):
+    since = _since(months)
+    source = _fact_glob("item_events", since)
+    if source is None:
+        clauses = ["COALESCE(c.is_admin_campaign, FALSE) = FALSE", "cie.created_at >= %s"]
+        params: list = [since]
+        if campaign_id is not None:
+            clauses.append("cie.campaign_id = %s")
+            params.append(campaign_id)
+        return _pg_query(f"""
+            SELECT
+                to_char(date_trunc('month', cie.created_at), 'YYYY-MM') AS month,
+                cie.item_key,
+                COUNT(*) AS events,
+                COUNT(DISTINCT cie.user_id) AS users,
+                COUNT(DISTINCT cie.target_user_id) AS targets
+            FROM campaign_item_events cie
+            JOIN campaigns c ON c.id = cie.campaign_id
+            WHERE {' AND '.join(clauses)}
+            GROUP BY 1, 2
+            ORDER BY 1 ASC, events DESC, cie.item_key ASC
+        """, params)
+    clauses = ["date >= ?"]
+    params = [source, since]
+    if campaign_id is not None:
+        clauses.append("campaign_id = ?")
+        params.append(campaign_id)
+    return _query(f"""
+        SELECT
+            strftime(date_trunc('month', date), '%Y-%m') AS month,
+            item_key,
+            COUNT(*) AS events,
+            COUNT(DISTINCT user_id) AS users,
+            COUNT(DISTINCT target_user_id) AS targets
+        FROM read_parquet(?)
+        WHERE {' AND '.join(clauses)}
+        GROUP BY 1, 2
+        ORDER BY 1 ASC, events DESC, item_key ASC
+    """, params)
@@ -2,9 +2,16 @@ from fastapi import Depends, HTTPException, Security, status
 from fastapi.security import APIKeyHeader, OAuth2PasswordBearer
 from jose import JWTError, jwt
 from datetime import datetime, timedelta
+from collections import OrderedDict
+from hashlib import sha256
 import os
+import threading
+import time
 from dotenv import load_dotenv
 
+from app.crud import get_db
+from app.principal import Principal, fetch_principal
+
 # Load environment variables from .env file
 load_dotenv()
 
@@ -12,10 +19,15 @@ SECRET_KEY = os.getenv("SECRET_KEY")
 ALGORITHM = os.getenv("ALGORITHM")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES"))
 PRIVATE_API_KEY = os.getenv("PRIVATE_API_KEY")
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", "4096"))
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="login")
 api_key_header = APIKeyHeader(name="X-API-Key", auto_error=False)
 
+# Verified tokens keyed by sha256(token) -> (user_id, exp). Entries are served until the token's own exp.
+_token_cache: "OrderedDict[str, tuple[int, float]]" = OrderedDict()
+_token_cache_lock = threading.Lock()
+
 def create_access_token(data: dict, expires_delta: timedelta = None):
     to_encode = data.copy()
     expire = datetime.utcnow() + (expires_delta or timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES))
@@ -28,15 +40,50 @@ def get_current_user(token: str = Depends(oauth2_scheme)):
         detail="Could not validate token",
         headers={"WWW-Authenticate": "Bearer"},
     )
+    token_key = sha256(token.encode("utf-8")).hexdigest()
+    user_id = _get_cached_token(token_key)
+    if user_id is not None:
+        return {"user_id": user_id}
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         user_id: int = payload.get("user_id")
         if user_id is None:
             raise credentials_exception
+        _cache_token(token_key, user_id, payload.get("exp"))
         return {"user_id": user_id}
     except JWTError:
         raise credentials_exception
 
+def get_principal(current_user: dict = Depends(get_current_user)) -> Principal:
+    """The caller's cached Principal (admin flag and campaign memberships) for routes that need it."""
+    return fetch_principal(current_user["user_id"], get_db)
+
+def _get_cached_token(token_key: str):
+    with _token_cache_lock:
+        entry = _token_cache.get(token_key)
+        if entry is None:
+            return None
+        user_id, exp = entry
+        if exp <= time.time():
+            del _token_cache[token_key]
+            return None
+        _token_cache.move_to_end(token_key)
+        return user_id
+
+def _cache_token(token_key: str, user_id: int, exp) -> None:
+    # Tokens without an expiry are never cached; they would otherwise live forever.
+    if not isinstance(exp, (int, float)) or TOKEN_CACHE_SIZE <= 0:
+        return
+    with _token_cache_lock:
+        _token_cache[token_key] = (user_id, float(exp))
+        _token_cache.move_to_end(token_key)
+        while len(_token_cache) > TOKEN_CACHE_SIZE:
+            _token_cache.popitem(last=False)
+
+def clear_token_cache() -> None:
+    with _token_cache_lock:
+        _token_cache.clear()
+
 def require_api_key(api_key: str = Security(api_key_header)):
     if not PRIVATE_API_KEY:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="PRIVATE_API_KEY not configured")
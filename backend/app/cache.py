@@ -0,0 +1,270 @@
+"""Two-tier read-through caches kept consistent across workers.
+
+Each Cache is a per-process LRU with a TTL (L1) in front of an optional shared backend (L2,
+CACHE_BACKEND=memory or redis). Write paths call `cache.invalidate(conn, key)` inside their
+transaction: it drops this process's copy and queues a pg_notify on CACHE_CHANNEL, which
+Postgres delivers only once that transaction commits. The listener thread in every worker
+then drops the key from its L1 and from L2, so no worker keeps serving what another one
+just changed. A worker whose listener loses its connection clears its L1 on reconnect,
+since it may have missed notifications in between; the TTL bounds anything else.
+"""
+import json
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+import psycopg
+from prometheus_client import Counter
+
+
+CACHE_CHANNEL = "cache_invalidation"
+# "" (L1 only), "memory" (process-local L2, for tests) or "redis".
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "").lower()
+CACHE_REDIS_URL = os.getenv("CACHE_REDIS_URL", "redis://localhost:6379/0")
+CACHE_LISTEN_RETRY_SECONDS = float(os.getenv("CACHE_LISTEN_RETRY_SECONDS", "5"))
+
+CACHE_REQUESTS = Counter(
+    "cache_requests_total",
+    "Cache lookups by namespace, tier and outcome",
+    ["namespace", "tier", "result"],
+)
+CACHE_EVICTIONS = Counter(
+    "cache_evictions_total",
+    "Entries dropped from the in-process cache",
+    ["namespace", "reason"],
+)
+
+
+class MemoryBackend:
+    """Process-local stand-in for a shared L2."""
+
+    def __init__(self):
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return None
+            return value
+
+    def set(self, key: str, value: bytes, ttl_seconds: float) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl_seconds, value)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def delete_prefix(self, prefix: str) -> None:
+        with self._lock:
+            for key in [key for key in self._data if key.startswith(prefix)]:
+                del self._data[key]
+
+
+class RedisBackend:
+    """Shared L2 on Redis, or anything speaking its protocol (the redis package is optional)."""
+
+    def __init__(self, url: str):
+        import redis
+
+        self._client = redis.Redis.from_url(url)
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self._client.get(key)
+
+    def set(self, key: str, value: bytes, ttl_seconds: float) -> None:
+        self._client.set(key, value, px=max(int(ttl_seconds * 1000), 1))
+
+    def delete(self, key: str) -> None:
+        self._client.delete(key)
+
+    def delete_prefix(self, prefix: str) -> None:
+        keys = list(self._client.scan_iter(match=f"{prefix}*"))
+        if keys:
+            self._client.delete(*keys)
+
+
+_backend = None
+_backend_lock = threading.Lock()
+_caches: dict = {}
+
+
+def get_backend():
+    """The configured L2, created on first use; None when CACHE_BACKEND is unset."""
+    global _backend
+    if not CACHE_BACKEND:
+        return None
+    with _backend_lock:
+        if _backend is None:
+            if CACHE_BACKEND == "memory":
+                _backend = MemoryBackend()
+            elif CACHE_BACKEND == "redis":
+                _backend = RedisBackend(CACHE_REDIS_URL)
+            else:
+                raise RuntimeError(f"Unknown CACHE_BACKEND {CACHE_BACKEND!r}")
+        return _backend
+
+
+class Cache:
+    """One cache namespace. Keys are ints, strings or tuples of them; None is never cached."""
+
+    def __init__(self, namespace: str, ttl_seconds: float, maxsize: int = 1024):
+        self.namespace = namespace
+        self.ttl_seconds = ttl_seconds
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[str, tuple[float, object]]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Bumped on every invalidation so a load that raced a write is not stored.
+        self._generation = 0
+        _caches[namespace] = self
+
+    def _shared_key(self, key: str) -> str:
+        return f"{self.namespace}:{key}"
+
+    def get(self, key, loader):
+        """Return the cached value for key, calling loader() and caching its result on a miss."""
+        key = repr(key)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._entries.move_to_end(key)
+                    CACHE_REQUESTS.labels(self.namespace, "l1", "hit").inc()
+                    return entry[1]
+                del self._entries[key]
+                CACHE_EVICTIONS.labels(self.namespace, "expired").inc()
+            generation = self._generation
+        CACHE_REQUESTS.labels(self.namespace, "l1", "miss").inc()
+
+        backend = get_backend()
+        if backend is not None:
+            raw = backend.get(self._shared_key(key))
+            if raw is not None:
+                CACHE_REQUESTS.labels(self.namespace, "l2", "hit").inc()
+                value = pickle.loads(raw)
+                self._store(key, value, generation)
+                return value
+            CACHE_REQUESTS.labels(self.namespace, "l2", "miss").inc()
+
+        value = loader()
+        if value is not None and self._store(key, value, generation) and backend is not None:
+            backend.set(self._shared_key(key), pickle.dumps(value), self.ttl_seconds)
+        return value
+
+    def generation(self) -> int:
+        """Read before loading a value outside get(); pass it to prime()."""
+        with self._lock:
+            return self._generation
+
+    def prime(self, key, value, generation: int) -> bool:
+        """Store a value loaded outside get(), unless an invalidation landed after `generation`."""
+        key = repr(key)
+        if value is None or not self._store(key, value, generation):
+            return False
+        backend = get_backend()
+        if backend is not None:
+            backend.set(self._shared_key(key), pickle.dumps(value), self.ttl_seconds)
+        return True
+
+    def _store(self, key: str, value, generation: int) -> bool:
+        with self._lock:
+            if generation != self._generation:
+                return False
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                CACHE_EVICTIONS.labels(self.namespace, "size").inc()
+        return True
+
+    def discard(self, key: Optional[str] = None) -> None:
+        """Drop a key (already repr()'d) or, with None, everything from this process's L1."""
+        with self._lock:
+            self._generation += 1
+            if key is None:
+                dropped = len(self._entries)
+                self._entries.clear()
+            else:
+                dropped = 1 if self._entries.pop(key, None) is not None else 0
+        if dropped:
+            CACHE_EVICTIONS.labels(self.namespace, "invalidated").inc(dropped)
+
+    def invalidate(self, conn, key=None) -> None:
+        """Drop key (the whole namespace when None) in every worker once conn's transaction commits."""
+        key = None if key is None else repr(key)
+        self.discard(key)
+        conn.execute(
+            "SELECT pg_notify(%s, %s)",
+            (CACHE_CHANNEL, json.dumps({"namespace": self.namespace, "key": key})),
+        )
+
+    def clear(self) -> None:
+        self.discard(None)
+
+
+def _apply_notification(payload: str) -> None:
+    try:
+        message = json.loads(payload)
+    except json.JSONDecodeError:
+        return
+    cache = _caches.get(message.get("namespace"))
+    if cache is None:
+        return
+    key = message.get("key")
+    cache.discard(key)
+    backend = get_backend()
+    if backend is not None:
+        if key is None:
+            backend.delete_prefix(f"{cache.namespace}:")
+        else:
+            backend.delete(cache._shared_key(key))
+
+
+def clear_all() -> None:
+    for cache in list(_caches.values()):
+        cache.clear()
+
+
+class InvalidationListener:
+    """LISTENs on CACHE_CHANNEL (on the primary; notifications are not replicated)."""
+
+    def __init__(self, dsn: Optional[str] = None):
+        self.dsn = dsn or os.getenv("DATABASE_URL")
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _listen_once(self) -> None:
+        with psycopg.connect(self.dsn, autocommit=True) as conn:
+            conn.execute(f"LISTEN {CACHE_CHANNEL}")
+            # Anything written while we were not listening was never seen here.
+            clear_all()
+            while not self._stop.is_set():
+                for notify in conn.notifies(timeout=1.0):
+                    _apply_notification(notify.payload)
+
+    def run_forever(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self._listen_once()
+            except psycopg.Error as exc:
+                print(f"⚠️ Cache invalidation listener disconnected, retrying: {exc}")
+                clear_all()
+                self._stop.wait(CACHE_LISTEN_RETRY_SECONDS)
+
+    def start(self) -> "InvalidationListener":
+        self._thread = threading.Thread(target=self.run_forever, name="cache-invalidation", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
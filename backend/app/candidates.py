@@ -0,0 +1,139 @@
+"""Surviving-answer bitsets over the playable word list.
+
+Bit i of a candidate set is set while PLAYABLE_WORD_ORDER[i] is still consistent with every
+guess and result seen so far. A guess narrows the set with a handful of ANDs against
+bitsets precomputed per (position, letter) and per (letter, minimum count), so a board
+never rescans the word list. Sets are stored on campaign_guess_states.candidates as bytes
+prefixed with a checksum of the word list; a set saved against a different list is
+rebuilt from the board instead of being misread.
+"""
+import os
+import zlib
+from functools import lru_cache
+from typing import Optional
+
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+
+
+def _load_words() -> tuple:
+    with open(os.path.join(DATA_DIR, "playablewordlist.txt"), "r") as f:
+        return tuple(sorted({line.strip().lower() for line in f if len(line.strip()) == 5}))
+
+
+PLAYABLE_WORD_ORDER = _load_words()
+ALL_CANDIDATES = (1 << len(PLAYABLE_WORD_ORDER)) - 1
+_WORDLIST_CHECKSUM = zlib.crc32("\n".join(PLAYABLE_WORD_ORDER).encode("ascii")).to_bytes(4, "big")
+_SET_BYTES = (len(PLAYABLE_WORD_ORDER) + 7) // 8
+
+
+@lru_cache(maxsize=1)
+def _index() -> tuple:
+    # position[i][letter]: words with that letter at position i.
+    # at_least[letter][k]: words containing that letter at least k times.
+    position = [{} for _ in range(5)]
+    at_least = {}
+    for index, word in enumerate(PLAYABLE_WORD_ORDER):
+        bit = 1 << index
+        for i, letter in enumerate(word):
+            position[i][letter] = position[i].get(letter, 0) | bit
+        for letter in set(word):
+            counts = at_least.setdefault(letter, {})
+            for k in range(1, word.count(letter) + 1):
+                counts[k] = counts.get(k, 0) | bit
+    return position, at_least
+
+
+def preload() -> None:
+    """Build the bitset index now (e.g. ahead of midnight) instead of on the first guess."""
+    _index()
+
+
+def narrow(candidates: int, guess: str, result: list) -> int:
+    """Drop every word that would not have produced `result` for `guess`."""
+    position_bits, at_least_bits = _index()
+    guess = guess.lower()
+    marked = {}
+    capped = set()
+    for i, (letter, status) in enumerate(zip(guess, result)):
+        at_position = position_bits[i].get(letter, 0)
+        if status == "correct":
+            candidates &= at_position
+        else:
+            candidates &= ~at_position
+        if status in ("correct", "present"):
+            marked[letter] = marked.get(letter, 0) + 1
+        else:
+            capped.add(letter)
+    # Greens and yellows give a minimum count for their letter; a grey copy of the same
+    # letter makes that minimum exact.
+    for letter in set(guess):
+        counts = at_least_bits.get(letter, {})
+        minimum = marked.get(letter, 0)
+        if minimum:
+            candidates &= counts.get(minimum, 0)
+        if letter in capped:
+            candidates &= ~counts.get(minimum + 1, 0)
+    return candidates
+
+
+def from_board(guesses: list, results: list) -> int:
+    candidates = ALL_CANDIDATES
+    for guess, result in zip(guesses or [], results or []):
+        if not result or not guess:
+            continue
+        word = "".join(guess) if isinstance(guess, list) else str(guess)
+        if len(word) == 5 and len(result) == 5:
+            candidates = narrow(candidates, word, result)
+    return candidates
+
+
+def encode(candidates: int) -> bytes:
+    return _WORDLIST_CHECKSUM + candidates.to_bytes(_SET_BYTES, "little")
+
+
+def decode(value) -> Optional[int]:
+    if value is None:
+        return None
+    value = bytes(value)
+    if len(value) != 4 + _SET_BYTES or value[:4] != _WORDLIST_CHECKSUM:
+        return None
+    return int.from_bytes(value[4:], "little")
+
+
+def load(value, guesses: list, results: list) -> int:
+    """The stored set, or one rebuilt from the board for rows saved before or across list changes."""
+    candidates = decode(value)
+    return from_board(guesses, results) if candidates is None else candidates
+
+
+def count(candidates: int) -> int:
+    return candidates.bit_count()
+
+
+def words(candidates: int, limit: Optional[int] = None) -> list:
+    found = []
+    while candidates and (limit is None or len(found) < limit):
+        low = candidates & -candidates
+        found.append(PLAYABLE_WORD_ORDER[low.bit_length() - 1])
+        candidates ^= low
+    return found
+
+
+def letter_counts(candidates: int) -> dict:
+    """Candidates containing each letter, for letters that appear in any of them."""
+    counts = {}
+    for letter, at_least in _index()[1].items():
+        hits = (candidates & at_least[1]).bit_count()
+        if hits:
+            counts[letter] = hits
+    return counts
+
+
+def position_letter_counts(candidates: int, position: int) -> dict:
+    counts = {}
+    for letter, at_position in _index()[0][position].items():
+        hits = (candidates & at_position).bit_count()
+        if hits:
+            counts[letter] = hits
+    return counts
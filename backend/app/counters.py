@@ -0,0 +1,100 @@
+"""Contention-free increments for the global_*_stats rows.
+
+Every game, accolade and item use used to upsert one shared row per word / accolade /
+item, so concurrent transactions queued on that row lock until the first one committed.
+Now each event appends a row to a delta table in the caller's transaction (plain inserts
+never wait on each other) and flush_global_counters folds the pending deltas into the
+stats rows in one statement per table.
+
+Durability: a delta commits or rolls back with the game/purchase it belongs to, so no
+increment is lost on a crash or double counted on a retry. The global_*_stats tables
+trail the truth by at most COUNTER_FLUSH_SECONDS (the scheduler interval) plus whatever
+was pending when the process stopped; the next flush from any worker picks that up.
+"""
+import os
+
+
+COUNTER_FLUSH_SECONDS = int(os.getenv("COUNTER_FLUSH_SECONDS", "10"))
+
+
+def record_word_result(conn, word: str, solved: bool, day: str) -> None:
+    conn.execute("""
+        INSERT INTO global_word_stat_deltas (word, solved, day)
+        VALUES (%s, %s, %s)
+    """, (word, 1 if solved else 0, day))
+
+
+def record_item_use(conn, item_key: str, targeted: bool) -> None:
+    conn.execute("""
+        INSERT INTO global_item_stat_deltas (item_key, targeted)
+        VALUES (%s, %s)
+    """, (item_key, 1 if targeted else 0))
+
+
+def record_accolade(conn, accolade_key: str) -> None:
+    conn.execute("""
+        INSERT INTO global_accolade_stat_deltas (accolade_key)
+        VALUES (%s)
+    """, (accolade_key,))
+
+
+# DELETE ... RETURNING claims the pending rows, so two workers flushing at once each fold
+# a disjoint set and the stats rows are locked once per flush instead of once per event.
+_FLUSHES = {
+    "word_stats": """
+        WITH moved AS (
+            DELETE FROM global_word_stat_deltas
+            RETURNING word, solved, day
+        ), folded AS (
+            INSERT INTO global_word_stats (word, attempts, solves, fails, first_seen, last_seen)
+            SELECT word, COUNT(*), SUM(solved), COUNT(*) - SUM(solved), MIN(day), MAX(day)
+            FROM moved
+            GROUP BY word
+            ON CONFLICT (word) DO UPDATE
+            SET attempts = global_word_stats.attempts + EXCLUDED.attempts,
+                solves = global_word_stats.solves + EXCLUDED.solves,
+                fails = global_word_stats.fails + EXCLUDED.fails,
+                last_seen = GREATEST(global_word_stats.last_seen, EXCLUDED.last_seen)
+            RETURNING 1
+        )
+        SELECT COUNT(*) FROM folded
+    """,
+    "item_stats": """
+        WITH moved AS (
+            DELETE FROM global_item_stat_deltas
+            RETURNING item_key, targeted, used_at
+        ), folded AS (
+            INSERT INTO global_item_stats (item_key, uses, targets, last_used_at)
+            SELECT item_key, COUNT(*), SUM(targeted), MAX(used_at)
+            FROM moved
+            GROUP BY item_key
+            ON CONFLICT (item_key) DO UPDATE
+            SET uses = global_item_stats.uses + EXCLUDED.uses,
+                targets = global_item_stats.targets + EXCLUDED.targets,
+                last_used_at = GREATEST(global_item_stats.last_used_at, EXCLUDED.last_used_at)
+            RETURNING 1
+        )
+        SELECT COUNT(*) FROM folded
+    """,
+    "accolade_stats": """
+        WITH moved AS (
+            DELETE FROM global_accolade_stat_deltas
+            RETURNING accolade_key, awarded_at
+        ), folded AS (
+            INSERT INTO global_accolade_stats (accolade_key, count, last_awarded_at)
+            SELECT accolade_key, COUNT(*), MAX(awarded_at)
+            FROM moved
+            GROUP BY accolade_key
+            ON CONFLICT (accolade_key) DO UPDATE
+            SET count = global_accolade_stats.count + EXCLUDED.count,
+                last_awarded_at = GREATEST(global_accolade_stats.last_awarded_at, EXCLUDED.last_awarded_at)
+            RETURNING 1
+        )
+        SELECT COUNT(*) FROM folded
+    """,
+}
+
+
+def flush_global_counters(conn) -> dict:
+    """Fold pending deltas into the global stats tables; returns stats rows touched per table."""
+    return {name: conn.execute(query).fetchone()[0] for name, query in _FLUSHES.items()}
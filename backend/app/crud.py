@@ -1,52 +1,89 @@
+import asyncio
 import psycopg
 from psycopg.rows import tuple_row
 from datetime import datetime
+import secrets
 import string
 import random
 import math
 from zoneinfo import ZoneInfo  
 from hashlib import sha256
 from collections import Counter
+from functools import lru_cache
 import os
 from fastapi import HTTPException
+from starlette.concurrency import run_in_threadpool
 import json
 from jose import JWTError, jwt
 from datetime import timedelta
 import os
 from dotenv import load_dotenv
-import bcrypt
 
 # Load environment variables from .env file
 load_dotenv()
 
 from app.items import ITEM_CATALOG, SHOP_ITEM_CATALOG, LEGACY_ITEM_KEY_ALIASES, get_item
+from app.items.context import ItemContext
 from app.accolades.service import (
     award_accolade,
-    is_lucky_strike,
-    classify_time_accolades,
+    enqueue_accolade_trigger,
     SHOP_REGULAR_THRESHOLD,
     ITEM_MASTER_THRESHOLD,
-    BIG_SPENDER_THRESHOLD,
-    HOARDER_THRESHOLD,
     list_user_accolades,
 )
-from app.utils.campaigns import resolve_campaign_day
+from app.utils.campaigns import CAMPAIGN_SCHEDULE_CACHE, resolve_campaign_day
+from app.dates import as_date
+from app.cache import Cache
+from app.singleflight import SingleFlight
+from app.principal import get_principal, invalidate_principal, is_campaign_member
+from app.passwords import hash_password_async, verify_password_async, needs_rehash
 from app.media.storage import create_presigned_download
 from app.rewards import get_weekly_reward_pending, choose_weekly_reward_recipients
+from app.replica import connect_replica
+from app.counters import record_item_use, record_word_result
+from app import candidates as candidate_sets
 
 DB_URL = os.getenv("DATABASE_URL")
 
-def get_db():
+# Raw standings rows per (campaign, CT day); presigned image URLs are minted per response.
+LEADERBOARD_CACHE = Cache(
+    "leaderboard",
+    ttl_seconds=float(os.getenv("LEADERBOARD_CACHE_TTL_SECONDS", "30")),
+)
+
+def get_db(readonly: bool = False):
+    """Open a connection; readonly=True marks a call site that may be served by the replica.
+
+    Read-only connections use DATABASE_REPLICA_URL when it is configured, reachable and
+    within REPLICA_MAX_LAG_SECONDS, and fall back to the primary otherwise. Either way the
+    session is read-only, so a write on an annotated call site fails on every deployment.
+    """
     if not DB_URL:
         raise RuntimeError("DATABASE_URL is not set")
-    return psycopg.connect(DB_URL, row_factory=tuple_row)
+    if readonly:
+        conn = connect_replica()
+        if conn is not None:
+            return conn
+    conn = psycopg.connect(DB_URL, row_factory=tuple_row)
+    if readonly:
+        conn.read_only = True
+    return conn
+
+# Everyone in a campaign opens the app right after midnight; identical reads share one query.
+LEADERBOARD_READS = SingleFlight("leaderboard")
+PROGRESS_READS = SingleFlight("campaign_progress")
+
+def invalidate_leaderboard(conn, campaign_id: int) -> None:
+    """Drop today's cached standings for a campaign in every worker once conn commits."""
+    today = datetime.now(ZoneInfo("America/Chicago")).strftime("%Y-%m-%d")
+    LEADERBOARD_CACHE.invalidate(conn, (campaign_id, today))
 
 def is_admin_user(conn, user_id: int) -> bool:
-    row = conn.execute(
-        "SELECT COALESCE(is_admin, FALSE) FROM users WHERE id = %s",
-        (user_id,)
-    ).fetchone()
-    return bool(row[0]) if row else False
+    return get_principal(conn, user_id).is_admin
+
+def require_campaign_member(conn, user_id: int, campaign_id: int) -> None:
+    if not is_campaign_member(conn, user_id, campaign_id):
+        raise HTTPException(status_code=403, detail="You are not a member of this campaign")
 
 def is_admin_campaign(conn, campaign_id: int) -> bool:
     row = conn.execute(
@@ -79,8 +116,12 @@ def _ensure_admin_inventory_floor(conn, user_id: int, campaign_id: int, minimum_
 
 
 
-def register_user(first_name, last_name, email, phone, password):
-    hashed_pw = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt())
+async def register_user(first_name, last_name, email, phone, password):
+    hashed_pw = await hash_password_async(password)
+    return await run_in_threadpool(_insert_user, first_name, last_name, email, phone, hashed_pw)
+
+
+def _insert_user(first_name, last_name, email, phone, hashed_pw):
     with get_db() as conn:
         try:
             conn.execute("""
@@ -98,37 +139,79 @@ def register_user(first_name, last_name, email, phone, password):
 
 
 
-def login_user(email, password):
+async def login_user(email, password):
+    # bcrypt runs on the password pool and the lookups on the request pool, so
+    # no request thread sits idle while a login waits for a hashing worker.
+    user = await run_in_threadpool(_load_login_user, email)
+
+    if user:
+        stored_pw = user[2]
+        if isinstance(stored_pw, memoryview):
+            stored_pw = stored_pw.tobytes()
+        elif isinstance(stored_pw, str):
+            if stored_pw.startswith("\\x"):
+                stored_pw = bytes.fromhex(stored_pw[2:])
+            else:
+                stored_pw = stored_pw.encode('utf-8')
+
+        if await verify_password_async(password, stored_pw):
+            if needs_rehash(stored_pw):
+                await _rehash_password(user[0], password)
+            return {"user_id": user[0], "first_name": user[1], "is_admin": bool(user[3])}
+
+    raise HTTPException(status_code=401, detail="Invalid credentials")
+
+
+def _load_login_user(email):
     with get_db() as conn:
-        user = conn.execute(
+        return conn.execute(
             "SELECT id, first_name, password, COALESCE(is_admin, FALSE) FROM users WHERE email = %s",
             (email.lower(),)
         ).fetchone()
 
-        if user:
-            stored_pw = user[2]
-            if isinstance(stored_pw, memoryview):
-                stored_pw = stored_pw.tobytes()
-            elif isinstance(stored_pw, str):
-                if stored_pw.startswith("\\x"):
-                    stored_pw = bytes.fromhex(stored_pw[2:])
-                else:
-                    stored_pw = stored_pw.encode('utf-8')
 
-            if bcrypt.checkpw(password.encode('utf-8'), stored_pw):
-                return {"user_id": user[0], "first_name": user[1], "is_admin": bool(user[3])}
+async def _rehash_password(user_id: int, password: str) -> None:
+    # Upgrading the cost factor is best-effort; a busy hash queue must not fail the login.
+    try:
+        new_hash = await hash_password_async(password)
+    except HTTPException:
+        return
+    await run_in_threadpool(_store_password_hash, user_id, new_hash)
+
 
-        raise HTTPException(status_code=401, detail="Invalid credentials")
+def _store_password_hash(user_id: int, new_hash: bytes) -> None:
+    with get_db() as conn:
+        conn.execute("UPDATE users SET password = %s WHERE id = %s", (new_hash, user_id))
 
 
 
-def create_campaign(name, user_id, cycle_length, is_admin_campaign: bool = False):
+async def create_campaign(name, user_id, cycle_length, is_admin_campaign: bool = False):
     cleaned_name = (name or "").strip()
     if not cleaned_name:
         raise HTTPException(status_code=400, detail="Campaign name cannot be empty")
     if len(cleaned_name) > 32:
         raise HTTPException(status_code=400, detail="Campaign name must be 32 characters or fewer")
 
+    test_password_hashes = []
+    if is_admin_campaign:
+        if not await run_in_threadpool(_is_admin, user_id):
+            raise HTTPException(status_code=403, detail="Admin privileges required")
+        # The test members never sign in; their random passwords are hashed before the
+        # transaction opens so bcrypt never runs on a request thread or inside it.
+        test_password_hashes = await asyncio.gather(
+            *(hash_password_async(secrets.token_urlsafe(16)) for _ in range(3))
+        )
+    return await run_in_threadpool(
+        _insert_campaign, cleaned_name, user_id, cycle_length, is_admin_campaign, test_password_hashes
+    )
+
+
+def _is_admin(user_id: int) -> bool:
+    with get_db() as conn:
+        return is_admin_user(conn, user_id)
+
+
+def _insert_campaign(cleaned_name, user_id, cycle_length, is_admin_campaign, test_password_hashes):
     code = ''.join(random.choices(string.ascii_uppercase + string.digits, k=6))
     today = datetime.now(ZoneInfo("America/Chicago")).strftime("%Y-%m-%d")
 
@@ -163,11 +246,10 @@ def create_campaign(name, user_id, cycle_length, is_admin_campaign: bool = False
             all_colors = ['#ffd700', '#c0c0c0', '#cd7f32', '#4caf50', '#2196f3',
                           '#9c27b0', '#ff5722', '#00bcd4', '#795548', '#607d8b']
             used_colors = {default_color}
-            for i in range(3):
+            for i, hashed_pw in enumerate(test_password_hashes):
                 random_suffix = ''.join(random.choices(string.ascii_lowercase + string.digits, k=4))
                 email = f"test_{camp_id}_{i}_{random_suffix}@example.com"
                 phone = f"9{camp_id:04d}{i}{random.randint(1000, 9999)}"
-                hashed_pw = bcrypt.hashpw(f"test_{camp_id}_{i}".encode("utf-8"), bcrypt.gensalt())
                 fake_row = conn.execute("""
                     INSERT INTO users (first_name, last_name, email, phone, password)
                     VALUES (%s, %s, %s, %s, %s)
@@ -182,6 +264,7 @@ def create_campaign(name, user_id, cycle_length, is_admin_campaign: bool = False
                 """, (fake_user_id, camp_id, f"Test User {i + 1}", available_color))
 
         initialize_campaign_words(camp_id, cycle_length, conn)
+        invalidate_principal(conn, user_id)
 
     return {"campaign_id": camp_id, "invite_code": code}
 
@@ -199,12 +282,7 @@ def join_campaign(invite_code, user_id):
         if is_admin_flag and not is_admin_user(conn, user_id):
             raise HTTPException(status_code=403, detail="Admin campaign access denied")
 
-        already_in = conn.execute(
-            "SELECT 1 FROM campaign_members WHERE user_id = %s AND campaign_id = %s",
-            (user_id, campaign_id)
-        ).fetchone()
-
-        if already_in:
+        if is_campaign_member(conn, user_id, campaign_id):
             return {"message": "Already joined"}
 
         # Get user's first name
@@ -231,8 +309,10 @@ def join_campaign(invite_code, user_id):
 
         if not is_admin_flag:
             conn.execute("UPDATE users SET campaigns = campaigns + 1 WHERE id = %s", (user_id,))
+        invalidate_leaderboard(conn, campaign_id)
+        invalidate_principal(conn, user_id)
 
-        return {"message": "Joined campaign", "campaign_id": campaign_id}
+    return {"message": "Joined campaign", "campaign_id": campaign_id}
 
 
 def join_campaign_by_id(campaign_id, user_id):
@@ -247,10 +327,10 @@ def join_campaign_by_id(campaign_id, user_id):
         if not row:
             raise HTTPException(status_code=404, detail="Campaign not found")
 
-        start_date_str, cycle_length, is_admin_flag = row
+        start_date, cycle_length, is_admin_flag = row
         if is_admin_flag and not is_admin_user(conn, user_id):
             raise HTTPException(status_code=403, detail="Admin campaign access denied")
-        start_date = datetime.strptime(start_date_str, "%Y-%m-%d").date()
+        start_date = as_date(start_date)
         expire_date = start_date + timedelta(days=cycle_length)
         today = datetime.now(ZoneInfo("America/Chicago")).date()
 
@@ -258,11 +338,7 @@ def join_campaign_by_id(campaign_id, user_id):
             raise HTTPException(status_code=410, detail="Invite expired")
 
         # ✅ Already in check
-        already_in = conn.execute(
-            "SELECT 1 FROM campaign_members WHERE user_id = %s AND campaign_id = %s",
-            (user_id, campaign_id)
-        ).fetchone()
-        if already_in:
+        if is_campaign_member(conn, user_id, campaign_id):
             return {"message": "Already joined"}
 
         # 🔧 Get user first name
@@ -290,7 +366,10 @@ def join_campaign_by_id(campaign_id, user_id):
 
         if not is_admin_flag:
             conn.execute("UPDATE users SET campaigns = campaigns + 1 WHERE id = %s", (user_id,))
-        return {"message": "Joined campaign", "campaign_id": campaign_id}
+        invalidate_leaderboard(conn, campaign_id)
+        invalidate_principal(conn, user_id)
+
+    return {"message": "Joined campaign", "campaign_id": campaign_id}
 
 def get_user_campaigns(user_id: int):
     today = datetime.now(ZoneInfo("America/Chicago")).date()
@@ -321,10 +400,10 @@ def get_user_campaigns(user_id: int):
 
     campaign_list = []
     for row in rows:
-        campaign_id, name, start_date_str, cycle_length, is_admin_campaign, is_finished, dd_activated, daily_completed = row
+        campaign_id, name, start_date, cycle_length, is_admin_campaign, is_finished, dd_activated, daily_completed = row
 
         # Safely calculate current day
-        start_date = datetime.strptime(start_date_str, "%Y-%m-%d").date()
+        start_date = as_date(start_date)
         day = min((today - start_date).days + 1, cycle_length)
 
         campaign_list.append({
@@ -411,6 +490,7 @@ def update_army_name(user_id: int, campaign_id: int, army_name: str):
             """,
             (army_name, campaign_id, user_id)
         )
+        invalidate_leaderboard(conn, campaign_id)
     return {"army_name": army_name}
 
 
@@ -421,14 +501,21 @@ def acknowledge_update(user_id: int):
         """, (user_id,))
     return {"status": "acknowledged"}
 
-def load_valid_words():
+@lru_cache(maxsize=1)
+def load_valid_words() -> frozenset:
+    # Read on the first guess rather than at import, so workers start serving sooner.
     base_dir = os.path.dirname(__file__)
     wordlist_path = os.path.join(base_dir, "data", "wordlist.txt")
     with open(wordlist_path, "r") as f:
-        return set(word.strip().lower() for word in f.readlines())
+        return frozenset(word.strip().lower() for word in f.readlines())
 
-VALID_WORDS = load_valid_words()
 EXCLUSIVE_ALL_KEYS = {item["key"] for item in ITEM_CATALOG if item.get("exclusive_all")}
+# Item keys whose queued use on a target blocks each item; None means any queued effect does.
+ITEM_BLOCKED_BY = {
+    item["key"]: None if item.get("exclusive_all")
+    else frozenset({item["key"], *item.get("exclusive_with", []), *EXCLUSIVE_ALL_KEYS})
+    for item in ITEM_CATALOG
+}
 CURSE_ITEM_KEYS = {item["key"] for item in ITEM_CATALOG if item.get("category") == "curse"}
 VOWELS = {"a", "e", "i", "o", "u"}
 CONSONANTS = [letter for letter in string.ascii_lowercase if letter not in VOWELS]
@@ -439,8 +526,6 @@ def load_playable_words():
     with open(wordlist_path, "r") as f:
         return [line.strip().lower() for line in f if line.strip()]
 
-PLAYABLE_WORDS = set(load_playable_words())
-
 
 def _is_curse_lock_dispersed_for_day(conn, user_id: int, campaign_id: int, target_day: int) -> bool:
     row = conn.execute("""
@@ -526,9 +611,13 @@ def _apply_infernal_penalty(conn, user_id: int, campaign_id: int, target_day: in
         SET score = GREATEST(score - %s, 0)
         WHERE user_id = %s AND campaign_id = %s
     """, (applied, user_id, campaign_id))
+    invalidate_leaderboard(conn, campaign_id)
     return applied
 
 def initialize_campaign_words(campaign_id: int, num_days: int, conn):
+    # Imported here so numpy and the pattern matrix only load in processes that create campaigns.
+    from app.wordmatrix import word_difficulty
+
     words = load_playable_words()
     if len(words) < num_days:
         raise HTTPException(status_code=400, detail="Not enough words in wordlist")
@@ -537,8 +626,8 @@ def initialize_campaign_words(campaign_id: int, num_days: int, conn):
 
     for day, word in enumerate(selected_words, start=1):
         conn.execute(
-            "INSERT INTO campaign_words (campaign_id, day, word) VALUES (%s, %s, %s)",
-            (campaign_id, day, word)
+            "INSERT INTO campaign_words (campaign_id, day, word, difficulty) VALUES (%s, %s, %s, %s)",
+            (campaign_id, day, word, word_difficulty(word))
         )
 
 def _update_streak_table(conn, table: str, user_id: int, campaign_id: int, date_str: str):
@@ -684,6 +773,16 @@ def get_daily_word(campaign_id: int, day_override: int | None = None):
 
     return word_row[0]
 
+def _lock_players(conn, campaign_id: int, *user_ids) -> None:
+    """Serialize guesses and item uses per (user, campaign) until conn commits or rolls back.
+
+    A double-submitted guess waits for the first to finish instead of interleaving with it;
+    other players never wait. Players are locked in id order so two item uses aimed at each
+    other cannot deadlock.
+    """
+    for user_id in sorted({int(u) for u in user_ids if u is not None}):
+        conn.execute("SELECT pg_advisory_xact_lock(%s, %s)", (user_id, campaign_id))
+
 def validate_guess(word: str, user_id: int, campaign_id: int, day_override: int | None = None):
     points_by_row = {
         0: 150,
@@ -703,6 +802,9 @@ def validate_guess(word: str, user_id: int, campaign_id: int, day_override: int
     }
 
     with get_db() as conn:
+        # Held until the guess commits, so the duplicate check, the state read and the writes
+        # below see no other request from this player in between.
+        _lock_players(conn, campaign_id, user_id)
         _, cycle_length, current_day, target_day, target_date = resolve_campaign_day(
             conn, campaign_id, day_override
         )
@@ -742,7 +844,7 @@ def validate_guess(word: str, user_id: int, campaign_id: int, day_override: int
         secret = secret_row[0]
 
         guess = word.lower()
-        is_valid_word = guess in VALID_WORDS
+        is_valid_word = guess in load_valid_words()
         result = ['absent'] * 5
         secret_counts = Counter(secret)
 
@@ -761,8 +863,6 @@ def validate_guess(word: str, user_id: int, campaign_id: int, day_override: int
         correct = all(r == 'correct' for r in result)
         target_date_str = target_date.strftime("%Y-%m-%d")
 
-        conn.execute("BEGIN")
-
         # NEW: if this exact word was already guessed today, bail out without mutating state
         dup = conn.execute("""
             SELECT 1
@@ -787,7 +887,7 @@ def validate_guess(word: str, user_id: int, campaign_id: int, day_override: int
 
         # Fetch progress
         row = conn.execute("""
-            SELECT guesses, results, letter_status, current_row, game_over
+            SELECT guesses, results, letter_status, current_row, game_over, candidates
             FROM campaign_guess_states
             WHERE user_id = %s AND campaign_id = %s AND date = %s
         """, (user_id, campaign_id, target_date_str)).fetchone()
@@ -798,12 +898,14 @@ def validate_guess(word: str, user_id: int, campaign_id: int, day_override: int
             letter_status = json.loads(row[2])
             current_row = row[3]
             game_over = bool(row[4])
+            candidates = candidate_sets.load(row[5], guesses, results_data)
         else:
             guesses = [[""] * 5 for _ in range(6)]
             results_data = [None] * 6
             letter_status = {}
             current_row = 0
             game_over = False
+            candidates = candidate_sets.ALL_CANDIDATES
 
         if game_over or current_row >= 6:
             raise HTTPException(status_code=403, detail="You've already played today")
@@ -978,6 +1080,7 @@ def validate_guess(word: str, user_id: int, campaign_id: int, day_override: int
             """, (user_id,))
 
         results_data[current_row] = result
+        candidates = candidate_sets.narrow(candidates, guess, result)
 
         for i in range(5):
             letter = guess[i]
@@ -1059,21 +1162,23 @@ def validate_guess(word: str, user_id: int, campaign_id: int, day_override: int
         conn.execute("""
             INSERT INTO campaign_guess_states (
                 user_id, campaign_id, date,
-                guesses, results, letter_status, current_row, game_over
-            ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+                guesses, results, letter_status, current_row, game_over, candidates
+            ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
             ON CONFLICT (user_id, campaign_id, date) DO UPDATE
             SET guesses = EXCLUDED.guesses,
                 results = EXCLUDED.results,
                 letter_status = EXCLUDED.letter_status,
                 current_row = EXCLUDED.current_row,
-                game_over = EXCLUDED.game_over
+                game_over = EXCLUDED.game_over,
+                candidates = EXCLUDED.candidates
         """, (
             user_id, campaign_id, target_date_str,
             json.dumps(guesses),
             json.dumps(results_data),
             json.dumps(letter_status),
             current_row + 1,
-            int(new_game_over)
+            int(new_game_over),
+            candidate_sets.encode(candidates)
         ))
 
         conn.execute("""
@@ -1090,6 +1195,7 @@ def validate_guess(word: str, user_id: int, campaign_id: int, day_override: int
         ))
 
         if new_game_over:
+            invalidate_leaderboard(conn, campaign_id)
             new_streak = None
             if target_day == current_day:
                 new_streak = update_campaign_streak(
@@ -1150,27 +1256,7 @@ def validate_guess(word: str, user_id: int, campaign_id: int, day_override: int
             ))
 
             if not is_admin_flag:
-                conn.execute("""
-                    INSERT INTO global_word_stats (
-                        word,
-                        attempts,
-                        solves,
-                        fails,
-                        first_seen,
-                        last_seen
-                    ) VALUES (%s, 1, %s, %s, %s, %s)
-                    ON CONFLICT (word) DO UPDATE
-                    SET attempts = global_word_stats.attempts + 1,
-                        solves = global_word_stats.solves + EXCLUDED.solves,
-                        fails = global_word_stats.fails + EXCLUDED.fails,
-                        last_seen = EXCLUDED.last_seen
-                """, (
-                    secret,
-                    1 if correct else 0,
-                    0 if correct else 1,
-                    target_date_str,
-                    target_date_str
-                ))
+                record_word_result(conn, secret, correct, target_date_str)
 
             total_days_played_new = None
             if not is_admin_flag:
@@ -1243,78 +1329,17 @@ def validate_guess(word: str, user_id: int, campaign_id: int, day_override: int
                         coins_to_add
                     ))
 
-                if correct:
-                    if guesses_used == 1:
-                        award_accolade(conn, campaign_id, user_id, "ace", target_date_str)
-                    elif guesses_used in (2, 3):
-                        award_accolade(conn, campaign_id, user_id, "clutch", target_date_str)
-                    elif guesses_used == 6:
-                        award_accolade(conn, campaign_id, user_id, "barely_made_it", target_date_str)
-
-                    if guesses_used == 3 and is_lucky_strike(results_data):
-                        award_accolade(conn, campaign_id, user_id, "lucky_strike", target_date_str)
-
-                    early, night, late_save = classify_time_accolades(completed_at, target_date)
-                    if early:
-                        award_accolade(conn, campaign_id, user_id, "early_bird", target_date_str)
-                    if night:
-                        award_accolade(conn, campaign_id, user_id, "night_owl", target_date_str)
-                    if late_save:
-                        award_accolade(conn, campaign_id, user_id, "late_save", target_date_str)
-
-                    first_solver_row = conn.execute("""
-                        SELECT user_id
-                        FROM campaign_user_daily_results
-                        WHERE campaign_id = %s AND date = %s AND solved = 1
-                        ORDER BY completed_at ASC NULLS LAST, user_id ASC
-                        LIMIT 1
-                    """, (campaign_id, target_date_str)).fetchone()
-                    if first_solver_row and first_solver_row[0] == user_id:
-                        award_accolade(conn, campaign_id, user_id, "first_solver", target_date_str)
-
-                    yesterday = (target_date - timedelta(days=1)).strftime("%Y-%m-%d")
-                    prev_row = conn.execute("""
-                        SELECT solved
-                        FROM campaign_user_daily_results
-                        WHERE user_id = %s AND campaign_id = %s AND date = %s
-                    """, (user_id, campaign_id, yesterday)).fetchone()
-                    if prev_row and int(prev_row[0]) == 0:
-                        award_accolade(conn, campaign_id, user_id, "comeback", target_date_str)
-
-                    two_days = (target_date - timedelta(days=2)).strftime("%Y-%m-%d")
-                    prev_two_row = conn.execute("""
-                        SELECT solved
-                        FROM campaign_user_daily_results
-                        WHERE user_id = %s AND campaign_id = %s AND date = %s
-                    """, (user_id, campaign_id, two_days)).fetchone()
-                    if prev_row and prev_two_row and int(prev_row[0]) == 0 and int(prev_two_row[0]) == 0:
-                        award_accolade(conn, campaign_id, user_id, "iron_will", target_date_str)
-
-                    item_used_row = conn.execute("""
-                        SELECT 1
-                        FROM campaign_item_events
-                        WHERE user_id = %s AND campaign_id = %s AND event_type = 'use'
-                          AND DATE(created_at AT TIME ZONE 'America/Chicago') = %s
-                        LIMIT 1
-                    """, (user_id, campaign_id, target_date_str)).fetchone()
-                    if item_used_row and guesses_used <= 3:
-                        award_accolade(conn, campaign_id, user_id, "saves_the_day", target_date_str)
-
-                if (
-                    HOARDER_THRESHOLD is not None
-                    and new_coin_balance is not None
-                    and (new_coin_balance - coins_to_add) < HOARDER_THRESHOLD <= new_coin_balance
-                ):
-                    award_accolade(conn, campaign_id, user_id, "hoarder", target_date_str)
-
-                if total_days_played_new in (7, 30, 100):
-                    key = f"veteran_{total_days_played_new}"
-                    award_accolade(conn, campaign_id, user_id, key, target_date_str)
-
-                if new_streak == 7:
-                    award_accolade(conn, campaign_id, user_id, "perfect_week", target_date_str)
-                if new_streak == 10:
-                    award_accolade(conn, campaign_id, user_id, "marathon", target_date_str)
+                # Accolade rules run later in app.accolades.evaluator; the guess only records the facts.
+                enqueue_accolade_trigger(conn, "game_completed", campaign_id, user_id, target_date_str, {
+                    "solved": bool(correct),
+                    "guesses_used": guesses_used,
+                    "results": results_data,
+                    "completed_at": completed_at.isoformat(),
+                    "coins_before": None if new_coin_balance is None else new_coin_balance - coins_to_add,
+                    "coins_after": new_coin_balance,
+                    "days_played": total_days_played_new,
+                    "streak": new_streak,
+                })
 
         return {
             "result": result,
@@ -1324,6 +1349,7 @@ def validate_guess(word: str, user_id: int, campaign_id: int, day_override: int
             "infernal_penalty_applied": infernal_penalty_applied,
             "infernal_rule_broken": infernal_rule_broken,
             "infernal_violation_type": infernal_violation_type,
+            "candidates_remaining": candidate_sets.count(candidates),
         }
 
 def activate_double_down(user_id: int, campaign_id: int):
@@ -1363,8 +1389,8 @@ def get_campaign_day(campaign_id: int):
     if not row:
         raise HTTPException(status_code=404, detail="Campaign not found")
 
-    start_date_str, cycle_length = row
-    start_date = datetime.strptime(start_date_str, "%Y-%m-%d").date()
+    start_date, cycle_length = row
+    start_date = as_date(start_date)
     today = datetime.now(ZoneInfo("America/Chicago")).date()
     delta = (today - start_date).days
 
@@ -1373,6 +1399,10 @@ def get_campaign_day(campaign_id: int):
 
 
 def get_campaign_progress(campaign_id: int):
+    today = datetime.now(ZoneInfo("America/Chicago")).strftime("%Y-%m-%d")
+    return PROGRESS_READS.do((campaign_id, today), lambda: _campaign_progress(campaign_id))
+
+def _campaign_progress(campaign_id: int):
     with get_db() as conn:
         row = conn.execute(
             """
@@ -1395,8 +1425,8 @@ def get_campaign_progress(campaign_id: int):
     if not row:
         raise HTTPException(status_code=404, detail="Campaign not found")
 
-    name, start_date_str, invite_code, cycle_length, king, ruler_id, ruler_title, is_admin_campaign, ruler_bg_url, ruler_bg_key = row
-    start_date = datetime.strptime(start_date_str, "%Y-%m-%d").date()
+    name, start_date, invite_code, cycle_length, king, ruler_id, ruler_title, is_admin_campaign, ruler_bg_url, ruler_bg_key = row
+    start_date = as_date(start_date)
     today = datetime.now(ZoneInfo("America/Chicago")).date()
     delta = (today - start_date).days
     ruler_background_image_url = None
@@ -1442,57 +1472,144 @@ def get_user_accolades(user_id: int, campaign_id: int):
     with get_db() as conn:
         return {"accolades": list_user_accolades(conn, user_id, campaign_id)}
 
-def get_leaderboard(campaign_id: int):
-    today = datetime.now(ZoneInfo("America/Chicago")).strftime("%Y-%m-%d")
-
+_LEADERBOARD_SELECT = """
+    SELECT 
+        cm.user_id,
+        cm.display_name,
+        cm.color,
+        cm.score,
+        COALESCE(dp.completed, 0) as played_today,
+        u.profile_image_url,
+        u.profile_image_key,
+        u.profile_image_thumb_url,
+        u.profile_image_thumb_key,
+        cm.army_image_url,
+        cm.army_image_key,
+        cm.army_image_thumb_url,
+        cm.army_image_thumb_key,
+        cm.army_name,
+        cm.campaign_id
+    FROM campaign_members cm
+    JOIN users u ON u.id = cm.user_id
+    LEFT JOIN campaign_daily_progress dp 
+      ON cm.user_id = dp.user_id 
+      AND cm.campaign_id = dp.campaign_id 
+      AND dp.date = %s
+"""
+
+def _load_leaderboard_rows(campaign_id: int, today: str) -> list:
     with get_db() as conn:
         rows = conn.execute(
-            """
-            SELECT 
-                cm.user_id,
-                cm.display_name,
-                cm.color,
-                cm.score,
-                COALESCE(dp.completed, 0) as played_today,
-                u.profile_image_url,
-                u.profile_image_key,
-                u.profile_image_thumb_url,
-                u.profile_image_thumb_key,
-                cm.army_image_url,
-                cm.army_image_key,
-                cm.army_image_thumb_url,
-                cm.army_image_thumb_key,
-                cm.army_name
-            FROM campaign_members cm
-            JOIN users u ON u.id = cm.user_id
-            LEFT JOIN campaign_daily_progress dp 
-              ON cm.user_id = dp.user_id 
-              AND cm.campaign_id = dp.campaign_id 
-              AND dp.date = %s
-            WHERE cm.campaign_id = %s
-            ORDER BY cm.score DESC
-            """,
+            _LEADERBOARD_SELECT + "WHERE cm.campaign_id = %s ORDER BY cm.score DESC, cm.user_id",
             (today, campaign_id)
         ).fetchall()
+    return [row[:-1] for row in rows]
 
-    return [
-        {
-            "user_id": row[0],
-            "display_name": row[1],
-            "username": row[1],
-            "color": row[2],
-            "score": row[3],
-            "played_today": bool(row[4]),
-            "profile_image_full_url": create_presigned_download(row[6]) if row[6] else row[5],
-            "profile_image_thumb_url": create_presigned_download(row[8]) if row[8] else row[7] or row[5],
-            "profile_image_url": create_presigned_download(row[8]) if row[8] else create_presigned_download(row[6]) if row[6] else row[5],
-            "army_image_full_url": create_presigned_download(row[10]) if row[10] else row[9],
-            "army_image_thumb_url": create_presigned_download(row[12]) if row[12] else row[11] or row[9],
-            "army_image_url": create_presigned_download(row[10]) if row[10] else row[9],
-            "army_name": row[13]
-        }
-        for row in rows
-    ]
+def prime_campaign_caches(conn, today: str) -> int:
+    """Load every campaign's schedule and today's standings into the caches; returns campaigns primed.
+
+    Two queries for all campaigns instead of two per campaign on each one's first request
+    of the day. Generations are read before the bulk reads, so if any invalidation lands
+    while they run, that cache is not primed and its first request loads it as usual.
+    """
+    schedule_generation = CAMPAIGN_SCHEDULE_CACHE.generation()
+    leaderboard_generation = LEADERBOARD_CACHE.generation()
+    campaigns = conn.execute("SELECT id, start_date, cycle_length FROM campaigns").fetchall()
+    standings = {}
+    for row in conn.execute(_LEADERBOARD_SELECT + "ORDER BY cm.campaign_id, cm.score DESC, cm.user_id", (today,)).fetchall():
+        standings.setdefault(row[-1], []).append(row[:-1])
+
+    for campaign_id, start_date, cycle_length in campaigns:
+        CAMPAIGN_SCHEDULE_CACHE.prime(campaign_id, (start_date, cycle_length), schedule_generation)
+        LEADERBOARD_CACHE.prime((campaign_id, today), standings.get(campaign_id, []), leaderboard_generation)
+    return len(campaigns)
+
+def _shape_leaderboard_row(row):
+    return {
+        "user_id": row[0],
+        "display_name": row[1],
+        "username": row[1],
+        "color": row[2],
+        "score": row[3],
+        "played_today": bool(row[4]),
+        "profile_image_full_url": create_presigned_download(row[6]) if row[6] else row[5],
+        "profile_image_thumb_url": create_presigned_download(row[8]) if row[8] else row[7] or row[5],
+        "profile_image_url": create_presigned_download(row[8]) if row[8] else create_presigned_download(row[6]) if row[6] else row[5],
+        "army_image_full_url": create_presigned_download(row[10]) if row[10] else row[9],
+        "army_image_thumb_url": create_presigned_download(row[12]) if row[12] else row[11] or row[9],
+        "army_image_url": create_presigned_download(row[10]) if row[10] else row[9],
+        "army_name": row[13]
+    }
+
+def get_leaderboard(campaign_id: int):
+    today = datetime.now(ZoneInfo("America/Chicago")).strftime("%Y-%m-%d")
+    rows = LEADERBOARD_CACHE.get((campaign_id, today), lambda: LEADERBOARD_READS.do(
+        (campaign_id, today), lambda: _load_leaderboard_rows(campaign_id, today)
+    ))
+
+    return [_shape_leaderboard_row(row) for row in rows]
+
+LEADERBOARD_WINDOW_MAX = 25
+
+def get_leaderboard_window(campaign_id: int, user_id: int, top: int = 3, radius: int = 2):
+    """The top `top` standings plus `radius` ranks either side of the caller, in rank order.
+
+    Ranks follow the full board's (score DESC, user_id) order. The rows are read by
+    walking idx_campaign_members_rank from a known position, so the response stays at
+    top + 2 * radius + 1 entries. The caller's rank is a COUNT over the same index,
+    which visits every member above them: cheap near the top, O(rank) further down.
+    """
+    top = max(0, min(int(top), LEADERBOARD_WINDOW_MAX))
+    radius = max(0, min(int(radius), LEADERBOARD_WINDOW_MAX))
+    today = datetime.now(ZoneInfo("America/Chicago")).strftime("%Y-%m-%d")
+    with get_db(readonly=True) as conn:
+        me = conn.execute("""
+            SELECT score
+            FROM campaign_members
+            WHERE campaign_id = %s AND user_id = %s
+        """, (campaign_id, user_id)).fetchone()
+        if not me:
+            raise HTTPException(status_code=403, detail="You are not a member of this campaign")
+        score = me[0]
+
+        ahead = conn.execute("""
+            SELECT COUNT(*)
+            FROM campaign_members
+            WHERE campaign_id = %s
+              AND (score > %s OR (score = %s AND user_id < %s))
+        """, (campaign_id, score, score, user_id)).fetchone()[0]
+        my_rank = ahead + 1
+
+        top_rows = conn.execute(
+            _LEADERBOARD_SELECT + "WHERE cm.campaign_id = %s ORDER BY cm.score DESC, cm.user_id LIMIT %s",
+            (today, campaign_id, top)
+        ).fetchall()
+        # Walk the index backwards from the caller for the ranks just above them.
+        above = conn.execute(
+            _LEADERBOARD_SELECT + """WHERE cm.campaign_id = %s
+              AND (cm.score > %s OR (cm.score = %s AND cm.user_id < %s))
+            ORDER BY cm.score, cm.user_id DESC
+            LIMIT %s""",
+            (today, campaign_id, score, score, user_id, radius)
+        ).fetchall()
+        from_me = conn.execute(
+            _LEADERBOARD_SELECT + """WHERE cm.campaign_id = %s
+              AND (cm.score < %s OR (cm.score = %s AND cm.user_id >= %s))
+            ORDER BY cm.score DESC, cm.user_id
+            LIMIT %s""",
+            (today, campaign_id, score, score, user_id, radius + 1)
+        ).fetchall()
+
+    ranked = {rank: row for rank, row in enumerate(top_rows, start=1)}
+    ranked.update({my_rank - offset: row for offset, row in enumerate(above, start=1)})
+    ranked.update({my_rank + offset: row for offset, row in enumerate(from_me)})
+    return {
+        "my_rank": my_rank,
+        "entries": [
+            {**_shape_leaderboard_row(row[:-1]), "rank": rank}
+            for rank, row in sorted(ranked.items())
+        ],
+    }
 
 def get_saved_progress(user_id: int, campaign_id: int, day_override: int | None = None):
     with get_db() as conn:
@@ -1526,7 +1643,7 @@ def get_saved_progress(user_id: int, campaign_id: int, day_override: int | None
 
         # Fetch saved progress
         row = conn.execute("""
-            SELECT guesses, results, letter_status, current_row, game_over
+            SELECT guesses, results, letter_status, current_row, game_over, candidates
             FROM campaign_guess_states
             WHERE user_id = %s AND campaign_id = %s AND date = %s
         """, (user_id, campaign_id, target_date_str)).fetchone()
@@ -1537,13 +1654,16 @@ def get_saved_progress(user_id: int, campaign_id: int, day_override: int | None
         daily_word = word_row[0] if word_row else None
 
     if row:
+        guesses = json.loads(row[0])
+        results = json.loads(row[1])
         return {
-            "guesses": json.loads(row[0]),
-            "results": json.loads(row[1]),
+            "guesses": guesses,
+            "results": results,
             "letter_status": json.loads(row[2]),
             "current_row": row[3],
             "game_over": bool(row[4]),
-            "word": daily_word
+            "word": daily_word,
+            "candidates_remaining": candidate_sets.count(candidate_sets.load(row[5], guesses, results)),
         }
 
     # 🧼 Default fallback for new day/campaign
@@ -1553,7 +1673,8 @@ def get_saved_progress(user_id: int, campaign_id: int, day_override: int | None
         "letter_status": {},
         "current_row": 0,
         "game_over": 0,
-        "word": daily_word
+        "word": daily_word,
+        "candidates_remaining": candidate_sets.count(candidate_sets.ALL_CANDIDATES),
     }
 
 def handle_campaign_end(campaign_id: int):
@@ -1578,10 +1699,10 @@ def handle_campaign_end(campaign_id: int):
         """, (campaign_id,)).fetchall()
 
         if standings:
-            user_id, score, display_name, first_name, last_name, camp_name, start_date_str, cycle_length, is_admin_flag = standings[0]
+            user_id, score, display_name, first_name, last_name, camp_name, start_date, cycle_length, is_admin_flag = standings[0]
 
             # Determine when this “season” ended
-            start_date = datetime.strptime(start_date_str, "%Y-%m-%d").date()
+            start_date = as_date(start_date)
             final_day = start_date + timedelta(days=cycle_length - 1)
             today = datetime.now(ZoneInfo("America/Chicago")).date()
 
@@ -1600,8 +1721,9 @@ def handle_campaign_end(campaign_id: int):
 
             if not is_admin_flag:
                 ended_on_str = ended_on.strftime("%Y-%m-%d")
-                for rank_row in standings[:3]:
-                    award_accolade(conn, campaign_id, rank_row[0], "top_3", ended_on_str)
+                enqueue_accolade_trigger(conn, "campaign_ended", campaign_id, None, ended_on_str, {
+                    "top_user_ids": [rank_row[0] for rank_row in standings[:3]],
+                })
 
                 # 1a. Record global high score entries for all members
                 for member_user_id, member_score, member_display_name, member_first, member_last, *_ in standings:
@@ -1612,25 +1734,16 @@ def handle_campaign_end(campaign_id: int):
                         player_name = account_name
                     else:
                         player_name = (member_display_name or account_name).strip()
-                    conn.execute("""
-                        INSERT INTO global_high_scores (
-                            user_id,
-                            campaign_id,
-                            player_name,
-                            campaign_name,
-                            troops,
-                            ended_on,
-                            campaign_length
-                        ) VALUES (%s, %s, %s, %s, %s, %s, %s)
-                    """, (
+                    _record_global_high_score(
+                        conn,
                         member_user_id,
                         campaign_id,
                         player_name,
                         camp_name,
                         member_score,
                         ended_on.strftime("%Y-%m-%d"),
-                        cycle_length
-                    ))
+                        cycle_length,
+                    )
 
                 # 1b. Update winner’s campaign_wins
                 conn.execute("""
@@ -1691,6 +1804,8 @@ def handle_campaign_end(campaign_id: int):
             WHERE campaign_id = %s
         """, (campaign_id,))
         conn.execute("DELETE FROM campaign_words WHERE campaign_id = %s", (campaign_id,))
+        CAMPAIGN_SCHEDULE_CACHE.invalidate(conn, campaign_id)
+        invalidate_leaderboard(conn, campaign_id)
         
         # Reinitialize for a new cycle of # days 
         cycle_length_row = conn.execute(
@@ -1814,7 +1929,11 @@ def delete_campaign(campaign_id: int, requester_id: int):
         conn.execute("DELETE FROM campaign_guess_states WHERE campaign_id = %s", (campaign_id,))
         conn.execute("DELETE FROM campaign_daily_progress WHERE campaign_id = %s", (campaign_id,))
         conn.execute("DELETE FROM campaign_words WHERE campaign_id = %s", (campaign_id,)) 
-        return {"status": "deleted"}
+        CAMPAIGN_SCHEDULE_CACHE.invalidate(conn, campaign_id)
+        # Every member of the campaign lost a membership; cheaper to drop the whole cache than to list them.
+        invalidate_principal(conn)
+
+    return {"status": "deleted"}
 
 
 def kick_player_from_campaign(campaign_id: int, target_user_id: int, requester_id: int):
@@ -1852,8 +1971,10 @@ def kick_player_from_campaign(campaign_id: int, target_user_id: int, requester_i
         conn.execute("DELETE FROM campaign_guesses WHERE campaign_id = %s AND user_id = %s", (campaign_id, target_user_id))
         conn.execute("DELETE FROM campaign_guess_states WHERE campaign_id = %s AND user_id = %s", (campaign_id, target_user_id))
         conn.execute("DELETE FROM campaign_daily_progress WHERE campaign_id = %s AND user_id = %s", (campaign_id, target_user_id))
+        invalidate_leaderboard(conn, campaign_id)
+        invalidate_principal(conn, target_user_id)
 
-        return {"status": "kicked"}
+    return {"status": "kicked"}
 
 
 def get_campaigns_by_owner(owner_id: int):
@@ -1937,13 +2058,7 @@ def get_self_member(campaign_id: int, user_id: int):
 
 def get_targetable_members(campaign_id: int, requester_id: int):
     with get_db() as conn:
-        member_row = conn.execute("""
-            SELECT 1
-            FROM campaign_members
-            WHERE campaign_id = %s AND user_id = %s
-        """, (campaign_id, requester_id)).fetchone()
-        if not member_row:
-            raise HTTPException(status_code=403, detail="You are not a member of this campaign")
+        require_campaign_member(conn, requester_id, campaign_id)
 
         rows = conn.execute("""
             SELECT user_id, display_name, color
@@ -1954,51 +2069,57 @@ def get_targetable_members(campaign_id: int, requester_id: int):
 
         return [{"user_id": r[0], "display_name": r[1], "color": r[2]} for r in rows]
 
-def get_targetable_members_with_item_status(campaign_id: int, requester_id: int, item_key: str):
-    with get_db() as conn:
-        member_row = conn.execute("""
-            SELECT 1
-            FROM campaign_members
-            WHERE campaign_id = %s AND user_id = %s
-        """, (campaign_id, requester_id)).fetchone()
-        if not member_row:
-            raise HTTPException(status_code=403, detail="You are not a member of this campaign")
+def _queued_effects(conn, campaign_id: int, target_ids: list | None = None):
+    """(effective_on, {target_user_id: item keys}) for effects queued to land tomorrow.
 
-        item = get_item(item_key)
-        if not item:
-            raise HTTPException(status_code=404, detail="Item not found")
+    One scan of the day's use events serves any number of items; target_ids narrows it
+    to one page of members.
+    """
+    _, _, _, _, target_date = resolve_campaign_day(conn, campaign_id, None)
+    effective_on = (target_date + timedelta(days=1)).strftime("%Y-%m-%d")
 
-        _, _, _, _, target_date = resolve_campaign_day(conn, campaign_id, None)
-        effective_on = (target_date + timedelta(days=1)).strftime("%Y-%m-%d")
+    if target_ids is None:
+        rows = conn.execute("""
+            SELECT target_user_id, item_key
+            FROM campaign_item_events
+            WHERE campaign_id = %s
+              AND event_type = %s
+              AND (details::json->>'effective_on') = %s
+              AND target_user_id IS NOT NULL
+        """, (campaign_id, "use", effective_on)).fetchall()
+    else:
+        rows = conn.execute("""
+            SELECT target_user_id, item_key
+            FROM campaign_item_events
+            WHERE campaign_id = %s
+              AND event_type = %s
+              AND (details::json->>'effective_on') = %s
+              AND target_user_id = ANY(%s)
+        """, (campaign_id, "use", effective_on, list(target_ids))).fetchall()
+
+    queued = {}
+    for target_user_id, item_key in rows:
+        queued.setdefault(target_user_id, set()).add(_canonical_item_key(item_key))
+    return effective_on, queued
+
+def _blocks(item_key: str, queued_keys: set) -> bool:
+    blocked_by = ITEM_BLOCKED_BY[item_key]
+    if blocked_by is None:
+        return bool(queued_keys)
+    return not blocked_by.isdisjoint(queued_keys)
+
+def _blocked_targets(conn, campaign_id: int, item_key: str, target_ids: list) -> set:
+    """Which of target_ids already have an effect landing tomorrow that excludes item_key."""
+    item = get_item(item_key)
+    if not item:
+        raise HTTPException(status_code=404, detail="Item not found")
 
-        exclusive_keys = set(item.get("exclusive_with", []))
-        exclusive_keys.add(item_key)
+    _, queued = _queued_effects(conn, campaign_id, target_ids)
+    return {target for target, keys in queued.items() if _blocks(item["key"], keys)}
 
-        blocked = set()
-        if item.get("exclusive_all"):
-            blocked_rows = conn.execute("""
-                SELECT target_user_id
-                FROM campaign_item_events
-                WHERE campaign_id = %s
-                  AND event_type = %s
-                  AND (details::json->>'effective_on') = %s
-                  AND target_user_id IS NOT NULL
-            """, (campaign_id, "use", effective_on)).fetchall()
-            blocked = {row[0] for row in blocked_rows}
-        else:
-            combined_keys = set(exclusive_keys)
-            combined_keys.update(EXCLUSIVE_ALL_KEYS)
-            if combined_keys:
-                blocked_rows = conn.execute("""
-                    SELECT target_user_id
-                    FROM campaign_item_events
-                    WHERE campaign_id = %s
-                      AND item_key = ANY(%s)
-                      AND event_type = %s
-                      AND (details::json->>'effective_on') = %s
-                      AND target_user_id IS NOT NULL
-                """, (campaign_id, list(combined_keys), "use", effective_on)).fetchall()
-                blocked = {row[0] for row in blocked_rows}
+def get_targetable_members_with_item_status(campaign_id: int, requester_id: int, item_key: str):
+    with get_db() as conn:
+        require_campaign_member(conn, requester_id, campaign_id)
 
         rows = conn.execute("""
             SELECT user_id, display_name, color
@@ -2006,6 +2127,7 @@ def get_targetable_members_with_item_status(campaign_id: int, requester_id: int,
             WHERE campaign_id = %s AND user_id != %s
             ORDER BY display_name
         """, (campaign_id, requester_id)).fetchall()
+        blocked = _blocked_targets(conn, campaign_id, item_key, [r[0] for r in rows])
 
         return [
             {
@@ -2017,6 +2139,117 @@ def get_targetable_members_with_item_status(campaign_id: int, requester_id: int,
             for r in rows
         ]
 
+MEMBER_PAGE_MAX_LIMIT = 100
+
+def _encode_member_cursor(user_id: int, display_name: str) -> str:
+    # Cursor is the (lower(COALESCE(display_name, '')), user_id) sort key of the last member on the page.
+    return f"{user_id}:{(display_name or '').lower()}"
+
+def _decode_member_cursor(cursor: str):
+    try:
+        user_id, name = cursor.split(":", 1)
+        return name, int(user_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def _member_page(conn, campaign_id: int, requester_id: int, limit: int,
+                 cursor: str | None, prefix: str | None):
+    """One page of the other members by name: (rows, next_cursor).
+
+    Rows are (user_id, display_name, color, full name). Ordering, prefix search and the
+    cursor all run on idx_campaign_members_sort_name, so a page costs the same in a
+    campaign of ten members or ten thousand. A missing display name sorts as ''.
+    """
+    limit = max(1, min(int(limit), MEMBER_PAGE_MAX_LIMIT))
+    pattern = (prefix or "").lower().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+    after_name, after_user_id = _decode_member_cursor(cursor) if cursor else ("", 0)
+    rows = conn.execute("""
+        SELECT cm.user_id, cm.display_name, cm.color, u.first_name || ' ' || u.last_name
+        FROM campaign_members cm
+        JOIN users u ON u.id = cm.user_id
+        WHERE cm.campaign_id = %s AND cm.user_id != %s
+          AND lower(COALESCE(cm.display_name, '')) COLLATE "C" LIKE %s
+          AND (lower(COALESCE(cm.display_name, '')) COLLATE "C", cm.user_id) > (%s, %s)
+        ORDER BY lower(COALESCE(cm.display_name, '')) COLLATE "C", cm.user_id
+        LIMIT %s
+    """, (campaign_id, requester_id, pattern, after_name, after_user_id, limit + 1)).fetchall()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    next_cursor = _encode_member_cursor(rows[-1][0], rows[-1][1]) if has_more and rows else None
+    return rows, next_cursor
+
+def get_campaign_members_page(campaign_id: int, requester_id: int, limit: int = 25,
+                              cursor: str | None = None, prefix: str | None = None):
+    # Ownership is checked on the primary; only the page itself is read from the replica.
+    with get_db() as conn:
+        owner = conn.execute(
+            "SELECT owner_id FROM campaigns WHERE id = %s",
+            (campaign_id,)
+        ).fetchone()
+        if not owner or owner[0] != requester_id:
+            raise HTTPException(status_code=403, detail="You are not the owner of this campaign")
+
+    with get_db(readonly=True) as conn:
+        rows, next_cursor = _member_page(conn, campaign_id, requester_id, limit, cursor, prefix)
+
+    return {
+        "members": [{"user_id": r[0], "display_name": r[1], "name": r[3]} for r in rows],
+        "next_cursor": next_cursor,
+    }
+
+def get_targetable_members_page(campaign_id: int, requester_id: int, limit: int = 25,
+                                cursor: str | None = None, prefix: str | None = None,
+                                item_key: str | None = None):
+    # Membership is checked on the primary: a lagging replica would still admit a kicked player.
+    with get_db() as conn:
+        require_campaign_member(conn, requester_id, campaign_id)
+
+    with get_db(readonly=True) as conn:
+        rows, next_cursor = _member_page(conn, campaign_id, requester_id, limit, cursor, prefix)
+        targets = [{"user_id": r[0], "display_name": r[1], "color": r[2]} for r in rows]
+        if item_key:
+            blocked = _blocked_targets(conn, campaign_id, item_key, [r[0] for r in rows])
+            for target in targets:
+                target["blocked"] = target["user_id"] in blocked
+
+    return {"targets": targets, "next_cursor": next_cursor}
+
+def get_item_target_matrix(campaign_id: int, requester_id: int, item_keys: list | None = None):
+    """Blocked targets for several items at once, from one scan of tomorrow's queued effects.
+
+    item_keys defaults to the targeted items in the requester's inventory. Only blocked
+    members are listed, so the response grows with the day's item uses, not the campaign.
+    """
+    with get_db() as conn:
+        require_campaign_member(conn, requester_id, campaign_id)
+
+    with get_db(readonly=True) as conn:
+        if item_keys is None:
+            inv_rows = conn.execute("""
+                SELECT item_key
+                FROM campaign_user_items
+                WHERE user_id = %s AND campaign_id = %s AND quantity > 0
+                ORDER BY item_key
+            """, (requester_id, campaign_id)).fetchall()
+            items = [get_item(row[0]) for row in inv_rows]
+            items = [item for item in items if item and item.get("requires_target")]
+        else:
+            items = [get_item(key) for key in item_keys]
+            if not all(items):
+                raise HTTPException(status_code=404, detail="Item not found")
+
+        effective_on, queued = _queued_effects(conn, campaign_id)
+
+    queued.pop(requester_id, None)
+    keys = list(dict.fromkeys(item["key"] for item in items))
+    return {
+        "effective_on": effective_on,
+        "items": {
+            key: sorted(target for target, queued_keys in queued.items() if _blocks(key, queued_keys))
+            for key in keys
+        },
+    }
+
 def get_active_target_effects(user_id: int, campaign_id: int):
     with get_db() as conn:
         _, _, _, target_day, target_date = resolve_campaign_day(conn, campaign_id, None)
@@ -2142,6 +2375,7 @@ def redeem_candle_of_mercy(user_id: int, campaign_id: int):
             INSERT INTO campaign_item_events (user_id, campaign_id, item_key, event_type, details)
             VALUES (%s, %s, %s, %s, %s)
         """, (user_id, campaign_id, "candle_of_mercy", "redeem", log_details))
+        invalidate_leaderboard(conn, campaign_id)
 
         if not admin_testing_override:
             conn.execute("""
@@ -2163,6 +2397,7 @@ def update_campaign_member(campaign_id: int, user_id: int, display_name: str, co
 
         if result.rowcount == 0:
             raise HTTPException(status_code=404, detail="Campaign membership not found")
+        invalidate_leaderboard(conn, campaign_id)
 
         # If the member is the current ruler, keep the campaign king name in sync.
         is_ruler = conn.execute(
@@ -2185,76 +2420,127 @@ def update_campaign_member(campaign_id: int, user_id: int, display_name: str, co
 
         return {"status": "updated", "display_name": display_name, "color": color}
     
-def get_global_leaderboard(limit: int = 10):
-    limit = max(1, min(int(limit), 100))
-    with get_db() as conn:
-        # Ensure table exists (in case migration missed it)
+
+GLOBAL_LEADERBOARD_MAX_LIMIT = 100
+_GLOBAL_HIGH_SCORE_COLUMNS = "player_name, campaign_name, troops, ended_on, campaign_length, id"
+
+
+def _record_global_high_score(conn, user_id, campaign_id, player_name, campaign_name, troops, ended_on, campaign_length):
+    conn.execute("""
+        INSERT INTO global_high_scores (
+            user_id,
+            campaign_id,
+            player_name,
+            campaign_name,
+            troops,
+            ended_on,
+            campaign_length
+        ) VALUES (%s, %s, %s, %s, %s, %s, %s)
+    """, (user_id, campaign_id, player_name, campaign_name, troops, ended_on, campaign_length))
+    # Keep the rank buckets in step: the all-lengths board (0) and this cycle length's board.
+    bucket_lengths = [0] + ([campaign_length] if campaign_length and campaign_length > 0 else [])
+    for bucket_length in bucket_lengths:
         conn.execute("""
-            CREATE TABLE IF NOT EXISTS global_high_scores (
-                id SERIAL PRIMARY KEY,
-                user_id INTEGER,
-                campaign_id INTEGER,
-                player_name TEXT NOT NULL,
-                campaign_name TEXT NOT NULL,
-                troops INTEGER NOT NULL,
-                ended_on TEXT NOT NULL,
-                campaign_length INTEGER,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-        conn.execute("ALTER TABLE global_high_scores ADD COLUMN IF NOT EXISTS campaign_length INTEGER")
-        # ✅ 1) Seed dummy data if the table is empty
-        count = conn.execute("SELECT COUNT(*) FROM global_high_scores").fetchone()[0]
-
-        if count == 0:
-            conn.executemany("""
-                INSERT INTO global_high_scores (
-                    user_id,
-                    campaign_id,
-                    player_name,
-                    campaign_name,
-                    troops,
-                    ended_on,
-                    campaign_length
-                ) VALUES (%s, %s, %s, %s, %s, %s, %s)
-            """, [
-                (None, None, "Sir Lexicon",    "Season of Shadows",      150, "2025-01-01", 7),
-                (None, None, "Count Vowel",    "Vowels of Valor",        130, "2025-02-10", 5),
-                (None, None, "Duke Consonant", "Consonant Crusade",      120, "2025-03-05", 3),
-                (None, None, "Baron Bigram",   "Siege of Syllables",     110, "2025-04-18", 7),
-                (None, None, "Lady Syllable",  "Whispers of Wordsmiths", 100, "2025-05-22", 5),
-                (None, None, "Lord Trigram",    "Trigram Trials",         95, "2025-06-15", 3),
-                (None, None, "Knight Rhyme",   "Rhymes of Ruin",          90, "2025-07-03", 7),
-                (None, None, "Dame Diction",   "Diction Dominion",        85, "2025-08-09", 5),
-                (None, None, "Countess Clue",  "Clue of Crowns",          80, "2025-09-12", 3),
-                (None, None, "Viscount Verb",  "Verbs of Valor",          75, "2025-10-01", 5),
-            ])
-            conn.commit()
-
-        # ✅ 2) Pull the top 10 scores of all time from the Hall of Fame
-        rows = conn.execute("""
-            SELECT 
-                player_name,
-                campaign_name,
-                troops,
-                ended_on,
-                campaign_length
+            INSERT INTO global_high_score_buckets (campaign_length, troops, entries)
+            VALUES (%s, %s, 1)
+            ON CONFLICT (campaign_length, troops)
+            DO UPDATE SET entries = global_high_score_buckets.entries + 1
+        """, (bucket_length, troops))
+
+
+def _shape_global_high_score(row):
+    return {
+        "player_name": row[0],
+        "campaign_name": row[1],
+        "best_troops": row[2],
+        "ended_on": row[3],
+        "campaign_length": row[4]
+    }
+
+
+def _encode_global_cursor(row) -> str:
+    # Cursor is the (troops, ended_on, id) sort key of the last row on the page.
+    return f"{row[2]}:{row[3]}:{row[5]}"
+
+
+def _decode_global_cursor(cursor: str):
+    try:
+        troops, ended_on, score_id = cursor.split(":")
+        datetime.strptime(ended_on, "%Y-%m-%d")
+        return int(troops), ended_on, int(score_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def get_global_leaderboard(limit: int = 10, campaign_length: int | None = None):
+    return get_global_leaderboard_page(limit, campaign_length)["entries"]
+
+
+def get_global_leaderboard_page(limit: int = 25, campaign_length: int | None = None, cursor: str | None = None):
+    limit = max(1, min(int(limit), GLOBAL_LEADERBOARD_MAX_LIMIT))
+    filters = []
+    params = []
+    if campaign_length:
+        filters.append("campaign_length = %s")
+        params.append(campaign_length)
+    if cursor:
+        filters.append("(troops, ended_on, id) < (%s, %s, %s)")
+        params.extend(_decode_global_cursor(cursor))
+    where_clause = f"WHERE {' AND '.join(filters)}" if filters else ""
+    with get_db(readonly=True) as conn:
+        # Fetch one extra row to know whether another page exists.
+        rows = conn.execute(f"""
+            SELECT {_GLOBAL_HIGH_SCORE_COLUMNS}
             FROM global_high_scores
-            ORDER BY troops DESC, ended_on DESC
+            {where_clause}
+            ORDER BY troops DESC, ended_on DESC, id DESC
             LIMIT %s
-        """, (limit,)).fetchall()
+        """, (*params, limit + 1)).fetchall()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    return {
+        "entries": [_shape_global_high_score(row) for row in rows],
+        "next_cursor": _encode_global_cursor(rows[-1]) if has_more and rows else None,
+    }
 
-    # ✅ 3) Shape for the frontend
-    return [
-        {
-            "player_name": row[0],
-            "campaign_name": row[1],
-            "best_troops": row[2],
-            "ended_on": row[3],
-            "campaign_length": row[4]
-        }
-        for row in rows
-    ]
+
+def _global_score_rank(conn, troops: int, campaign_length: int | None) -> int:
+    row = conn.execute("""
+        SELECT COALESCE(SUM(entries), 0)
+        FROM global_high_score_buckets
+        WHERE campaign_length = %s AND troops > %s
+    """, (campaign_length or 0, troops)).fetchone()
+    return int(row[0] or 0) + 1
+
+
+def get_global_score_rank(troops: int, campaign_length: int | None = None):
+    with get_db(readonly=True) as conn:
+        rank = _global_score_rank(conn, troops, campaign_length)
+    return {"troops": troops, "campaign_length": campaign_length, "rank": rank}
+
+
+def get_global_personal_best(user_id: int, campaign_length: int | None = None):
+    with get_db(readonly=True) as conn:
+        if campaign_length:
+            row = conn.execute(f"""
+                SELECT {_GLOBAL_HIGH_SCORE_COLUMNS}
+                FROM global_high_scores
+                WHERE user_id = %s AND campaign_length = %s
+                ORDER BY troops DESC, ended_on DESC, id DESC
+                LIMIT 1
+            """, (user_id, campaign_length)).fetchone()
+        else:
+            row = conn.execute(f"""
+                SELECT {_GLOBAL_HIGH_SCORE_COLUMNS}
+                FROM global_high_scores
+                WHERE user_id = %s
+                ORDER BY troops DESC, ended_on DESC, id DESC
+                LIMIT 1
+            """, (user_id,)).fetchone()
+        if not row:
+            return {"best": None, "rank": None}
+        rank = _global_score_rank(conn, row[2], campaign_length)
+    return {"best": _shape_global_high_score(row), "rank": rank}
 
 def get_shop_catalog():
     return [
@@ -2366,6 +2652,24 @@ def _get_or_create_shop_rotation(conn, user_id: int, campaign_id: int, date_str:
     """, (user_id, campaign_id, date_str, json.dumps(selection)))
     return selection
 
+def pregenerate_shop_rotations(conn, date_str: str) -> int:
+    """Create date_str's rotation for every campaign member who has none yet; returns rows attempted.
+
+    Run ahead of midnight so the first shop open of the day reads its rotation instead of
+    every player inserting one at once. Existing rows (a reshuffle already made) are kept.
+    """
+    members = conn.execute("SELECT user_id, campaign_id FROM campaign_members").fetchall()
+    with conn.cursor() as cur:
+        cur.executemany("""
+            INSERT INTO campaign_shop_rotation (user_id, campaign_id, date, items)
+            VALUES (%s, %s, %s, %s)
+            ON CONFLICT (user_id, campaign_id, date) DO NOTHING
+        """, [
+            (user_id, campaign_id, date_str, json.dumps(_select_shop_items_by_category(SHOP_ITEM_CATALOG, 2)))
+            for user_id, campaign_id in members
+        ])
+    return len(members)
+
 def get_shop_state(user_id: int, campaign_id: int):
     with get_db() as conn:
         is_admin_flag = is_admin_campaign(conn, campaign_id)
@@ -2444,29 +2748,17 @@ def get_shop_state(user_id: int, campaign_id: int):
             })
 
         purchased_rows = conn.execute("""
-            SELECT item_key, details
-            FROM campaign_shop_log
-            WHERE user_id = %s
-              AND campaign_id = %s
-              AND event_type = %s
-              AND (
-                ((COALESCE(details, '{}')::jsonb ? 'date') AND COALESCE(details, '{}')::jsonb->>'date' = %s)
-                OR ((NOT (COALESCE(details, '{}')::jsonb ? 'date')) AND DATE(created_at AT TIME ZONE 'America/Chicago') = %s)
-              )
-        """, (user_id, campaign_id, "purchase", today_str, today_str)).fetchall()
+            SELECT item_key, category
+            FROM campaign_shop_daily_purchases
+            WHERE user_id = %s AND campaign_id = %s AND shop_date = %s
+        """, (user_id, campaign_id, today_str)).fetchall()
         purchased_items = []
         purchased_by_category = {"illusion": set(), "blessing": set(), "curse": set()}
         for row in purchased_rows:
             item_key = row[0]
             if item_key:
                 purchased_items.append(item_key)
-            details = None
-            if row[1]:
-                try:
-                    details = json.loads(row[1])
-                except json.JSONDecodeError:
-                    details = None
-            category = details.get("category") if isinstance(details, dict) else None
+            category = row[1]
             if category in purchased_by_category and item_key:
                 purchased_by_category[category].add(item_key)
 
@@ -2539,37 +2831,37 @@ def purchase_item(user_id: int, campaign_id: int, item_key: str):
         available_items = rotation_by_category.get(category_key, []) if isinstance(rotation_by_category, dict) else []
         if item_key not in available_items:
             raise HTTPException(status_code=400, detail="Item is not currently available in this stall.")
-        purchased_row = conn.execute("""
-            SELECT 1
-            FROM campaign_shop_log
-            WHERE user_id = %s
-              AND campaign_id = %s
-              AND event_type = %s
-              AND item_key = %s
-              AND (
-                ((COALESCE(details, '{}')::jsonb ? 'date') AND COALESCE(details, '{}')::jsonb->>'date' = %s)
-                OR ((NOT (COALESCE(details, '{}')::jsonb ? 'date')) AND DATE(created_at AT TIME ZONE 'America/Chicago') = %s)
-              )
-            LIMIT 1
-        """, (user_id, campaign_id, "purchase", item_key, today_str, today_str)).fetchone()
-        if purchased_row:
+        claimed_row = conn.execute("""
+            INSERT INTO campaign_shop_daily_purchases (
+                user_id, campaign_id, shop_date, item_key, category, cost
+            )
+            VALUES (%s, %s, %s, %s, %s, %s)
+            ON CONFLICT (user_id, campaign_id, shop_date, item_key) DO NOTHING
+            RETURNING 1
+        """, (user_id, campaign_id, today_str, item["key"], category_key, item["cost"])).fetchone()
+        if not claimed_row:
             raise HTTPException(status_code=400, detail="You already bought this item today.")
 
         coins_row = conn.execute("""
-            SELECT coins
-            FROM campaign_coins
-            WHERE user_id = %s AND campaign_id = %s
-        """, (user_id, campaign_id)).fetchone()
-        coins = coins_row[0] if coins_row else 0
-
-        if coins < item["cost"]:
-            raise HTTPException(status_code=400, detail="Not enough coins")
-
-        conn.execute("""
             UPDATE campaign_coins
             SET coins = coins - %s
-            WHERE user_id = %s AND campaign_id = %s
-        """, (item["cost"], user_id, campaign_id))
+            WHERE user_id = %s AND campaign_id = %s AND coins >= %s
+            RETURNING coins
+        """, (item["cost"], user_id, campaign_id, item["cost"])).fetchone()
+        if not coins_row:
+            raise HTTPException(status_code=400, detail="Not enough coins")
+        remaining_coins = coins_row[0]
+
+        spend_row = conn.execute("""
+            INSERT INTO campaign_shop_daily_spend (user_id, campaign_id, shop_date, coins_spent, purchase_count)
+            VALUES (%s, %s, %s, %s, 1)
+            ON CONFLICT (user_id, campaign_id, shop_date)
+            DO UPDATE SET
+                coins_spent = campaign_shop_daily_spend.coins_spent + EXCLUDED.coins_spent,
+                purchase_count = campaign_shop_daily_spend.purchase_count + 1
+            RETURNING coins_spent
+        """, (user_id, campaign_id, today_str, item["cost"])).fetchone()
+        spend_total = spend_row[0] if spend_row else item["cost"]
 
         conn.execute("""
             INSERT INTO store_purchases (user_id, campaign_id, item_key, category, cost)
@@ -2597,18 +2889,14 @@ def purchase_item(user_id: int, campaign_id: int, item_key: str):
 
         new_quantity = qty_row[0] if qty_row else 1
 
-        if not is_admin_flag and BIG_SPENDER_THRESHOLD:
-            spend_total = conn.execute("""
-                SELECT COALESCE(SUM(cost), 0)
-                FROM store_purchases
-                WHERE user_id = %s AND campaign_id = %s
-                  AND DATE(purchased_at AT TIME ZONE 'America/Chicago') = %s
-            """, (user_id, campaign_id, today_str)).fetchone()[0]
-            if spend_total >= BIG_SPENDER_THRESHOLD:
-                award_accolade(conn, campaign_id, user_id, "big_spender", today_str)
+        if not is_admin_flag:
+            enqueue_accolade_trigger(conn, "purchase", campaign_id, user_id, today_str, {
+                "item_key": item["key"],
+                "spend_total": spend_total,
+            })
 
     return {
-        "coins": coins - item["cost"],
+        "coins": remaining_coins,
         "item": item,
         "quantity": new_quantity
     }
@@ -2620,17 +2908,10 @@ def reshuffle_shop(user_id: int, campaign_id: int, category: str, cost: int = 3)
         today_str = _get_shop_day(conn, campaign_id)
         purchased_row = conn.execute("""
             SELECT 1
-            FROM campaign_shop_log
-            WHERE user_id = %s
-              AND campaign_id = %s
-              AND event_type = %s
-              AND (
-                ((COALESCE(details, '{}')::jsonb ? 'date') AND COALESCE(details, '{}')::jsonb->>'date' = %s)
-                OR ((NOT (COALESCE(details, '{}')::jsonb ? 'date')) AND DATE(created_at AT TIME ZONE 'America/Chicago') = %s)
-              )
-              AND (COALESCE(details, '{}')::jsonb ? 'category' AND COALESCE(details, '{}')::jsonb->>'category' = %s)
+            FROM campaign_shop_daily_purchases
+            WHERE user_id = %s AND campaign_id = %s AND shop_date = %s AND category = %s
             LIMIT 1
-        """, (user_id, campaign_id, "purchase", today_str, today_str, category)).fetchone()
+        """, (user_id, campaign_id, today_str, category)).fetchone()
         if purchased_row:
             raise HTTPException(status_code=400, detail="Cannot reshuffle after purchasing in this stall today.")
 
@@ -2730,6 +3011,7 @@ def use_item(
     payload_type = item.get("payload_type")
 
     with get_db() as conn:
+        _lock_players(conn, campaign_id, user_id, target_user_id)
         _, cycle_length, current_day, target_day, target_date = resolve_campaign_day(conn, campaign_id, None)
         is_admin_flag = is_admin_campaign(conn, campaign_id)
         admin_testing_override = _ensure_admin_inventory_floor(conn, user_id, campaign_id, minimum_quantity=1)
@@ -2752,6 +3034,7 @@ def use_item(
 
         blessing_cost_applied = 0
         candle_consumed = False
+        guess_state = None
         is_blessing = item.get("category") == "blessing"
         requires_blessing_cost = is_blessing and item_key != "dispel_curse"
         if is_blessing and item_key != "dispel_curse":
@@ -2801,7 +3084,7 @@ def use_item(
                 )
             day_progress_row = conn.execute(
                 """
-                SELECT game_over, current_row
+                SELECT game_over, current_row, guesses, results, letter_status, candidates
                 FROM campaign_guess_states
                 WHERE user_id = %s AND campaign_id = %s AND date = %s
                 """,
@@ -2815,6 +3098,12 @@ def use_item(
                         status_code=400,
                         detail="Blessings can only be used before you have played the current day.",
                     )
+                guess_state = {
+                    "guesses": day_progress_row[2],
+                    "results": day_progress_row[3],
+                    "letter_status": day_progress_row[4],
+                    "candidates": day_progress_row[5],
+                }
         if is_blessing and item_key == "candle_of_mercy":
             raise HTTPException(
                 status_code=400,
@@ -2851,12 +3140,7 @@ def use_item(
             raise HTTPException(status_code=400, detail="Target required for this item")
 
         if affects_others and requires_target:
-            member_row = conn.execute("""
-                SELECT 1
-                FROM campaign_members
-                WHERE campaign_id = %s AND user_id = %s
-            """, (campaign_id, target_user_id)).fetchone()
-            if not member_row:
+            if not is_campaign_member(conn, target_user_id, campaign_id):
                 raise HTTPException(status_code=404, detail="Target not found in campaign")
 
         qty_row = conn.execute("""
@@ -2892,6 +3176,7 @@ def use_item(
                     SET score = GREATEST(score - %s, 0)
                     WHERE user_id = %s AND campaign_id = %s
                 """, (blessing_cost_applied, user_id, campaign_id))
+                invalidate_leaderboard(conn, campaign_id)
 
         if payload_type:
             payload_value = (effect_payload or {}).get("value")
@@ -2906,7 +3191,7 @@ def use_item(
                     raise HTTPException(status_code=400, detail="Choose a valid 5-letter word.")
                 if item_key == "hex_of_compulsion" and len(set(payload_value)) < 4:
                     raise HTTPException(status_code=400, detail="Word must include at least 4 unique letters.")
-                if payload_value not in VALID_WORDS:
+                if payload_value not in load_valid_words():
                     raise HTTPException(status_code=400, detail="Word must be a valid guess.")
             else:
                 raise HTTPException(status_code=400, detail="Unsupported payload type.")
@@ -2998,13 +3283,22 @@ def use_item(
                 if conflict_row:
                     raise HTTPException(status_code=400, detail="Target already has a conflicting effect for that day")
 
+        # Lifetime totals live outside campaign_item_events, whose old months are archived away.
+        conn.execute("""
+            INSERT INTO campaign_item_use_totals (user_id, campaign_id, item_key, uses, targeted, last_used_at)
+            VALUES (%s, %s, %s, 1, %s, now())
+            ON CONFLICT (user_id, campaign_id, item_key) DO UPDATE
+            SET uses = campaign_item_use_totals.uses + 1,
+                targeted = campaign_item_use_totals.targeted + EXCLUDED.targeted,
+                last_used_at = EXCLUDED.last_used_at
+        """, (user_id, campaign_id, item_key, 1 if target_user_id else 0))
         use_count_before = 0
         if not is_admin_flag and ITEM_MASTER_THRESHOLD:
             use_count_before = conn.execute("""
-                SELECT COUNT(*)
-                FROM campaign_item_events
-                WHERE user_id = %s AND campaign_id = %s AND event_type = 'use'
-            """, (user_id, campaign_id)).fetchone()[0]
+                SELECT COALESCE(SUM(uses), 0)
+                FROM campaign_item_use_totals
+                WHERE user_id = %s AND campaign_id = %s
+            """, (user_id, campaign_id)).fetchone()[0] - 1
 
         if not admin_testing_override:
             conn.execute("""
@@ -3015,7 +3309,23 @@ def use_item(
 
         handler = item.get("handler")
         if handler:
-            effect_payload = handler(conn, user_id, campaign_id)
+            secret = None
+            if requires_blessing_cost:
+                secret_row = conn.execute(
+                    "SELECT word FROM campaign_words WHERE campaign_id = %s AND day = %s",
+                    (campaign_id, target_day)
+                ).fetchone()
+                secret = secret_row[0] if secret_row else None
+            context = ItemContext(
+                conn=conn,
+                user_id=user_id,
+                campaign_id=campaign_id,
+                target_day=target_day,
+                target_date=target_date,
+                secret=secret,
+                guess_state=guess_state,
+            )
+            effect_payload = handler(context)
             if effect_payload:
                 details_payload.update(effect_payload)
                 if "hint" in effect_payload:
@@ -3028,14 +3338,7 @@ def use_item(
         """, (user_id, campaign_id, item_key, target_user_id, "use", details))
 
         if not is_admin_flag:
-            conn.execute("""
-                INSERT INTO global_item_stats (item_key, uses, targets, last_used_at)
-                VALUES (%s, 1, %s, CURRENT_TIMESTAMP)
-                ON CONFLICT (item_key)
-                DO UPDATE SET uses = global_item_stats.uses + 1,
-                              targets = global_item_stats.targets + %s,
-                              last_used_at = CURRENT_TIMESTAMP
-            """, (item_key, 1 if target_user_id else 0, 1 if target_user_id else 0))
+            record_item_use(conn, item_key, bool(target_user_id))
 
         if not is_admin_flag and ITEM_MASTER_THRESHOLD:
             if use_count_before < ITEM_MASTER_THRESHOLD <= use_count_before + 1:
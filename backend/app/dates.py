@@ -0,0 +1,134 @@
+"""Calendar days as native DATE columns.
+
+The columns in DATE_COLUMNS used to hold 'YYYY-MM-DD' TEXT; migrate_date_columns converts
+them once, from init_db. Strings still work as query parameters (psycopg sends them
+untyped and Postgres reads them as dates), so callers keep passing `today_str`. Reads now
+return datetime.date: use iso_date() where a value leaves as JSON, keys a dict shared with
+strings, or is compared against one of the columns that are still TEXT.
+
+campaign_guesses.date and user_accolade_events.date stay TEXT: they are the partition keys
+of app.partitions, and ISO strings already sort and range-scan like dates there.
+"""
+import logging
+import os
+from datetime import date, datetime
+from typing import Optional
+
+
+DATE_COLUMNS = {
+    "campaigns": ["start_date"],
+    "campaign_cycle_rewards": ["cycle_start_date"],
+    "campaign_cycle_reward_recipients": ["cycle_start_date"],
+    "campaign_guess_states": ["date"],
+    "campaign_daily_progress": ["date"],
+    "campaign_user_daily_results": ["date"],
+    "campaign_first_guesses": ["date"],
+    "campaign_daily_troops": ["date"],
+    "campaign_daily_stats": ["date"],
+    "campaign_daily_word_stats": ["date"],
+    "campaign_daily_recaps": ["date"],
+    "campaign_shop_rotation": ["date"],
+    "campaign_shop_daily_purchases": ["shop_date"],
+    "campaign_shop_daily_spend": ["shop_date"],
+    "global_daily_stats": ["date"],
+}
+
+_MIGRATION_LOCK_KEY = "date_column_migration"
+
+logger = logging.getLogger(__name__)
+
+
+def as_date(value) -> Optional[date]:
+    """A DATE column value, or a 'YYYY-MM-DD' string from a TEXT column, as a date."""
+    if value is None or type(value) is date:
+        return value
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(value[:10])
+
+
+def iso_date(value) -> Optional[str]:
+    """The API's 'YYYY-MM-DD' form of a DATE column value; strings pass through."""
+    if value is None or isinstance(value, str):
+        return value
+    return as_date(value).isoformat()
+
+
+def _text_columns(conn, table: str, columns: list) -> list:
+    rows = conn.execute("""
+        SELECT column_name
+        FROM information_schema.columns
+        WHERE table_schema = current_schema() AND table_name = %s AND data_type = 'text'
+    """, (table,)).fetchall()
+    text = {row[0] for row in rows}
+    return [column for column in columns if column in text]
+
+
+def _malformed_count(conn, table: str, column: str) -> int:
+    """Rows whose value is not a real YYYY-MM-DD date (the shape check alone passes 2024-02-31)."""
+    return conn.execute(f"""
+        SELECT COUNT(*)
+        FROM {table}
+        WHERE {column} IS NOT NULL
+          AND ({column} !~ '^[0-9]{{4}}-[0-9]{{2}}-[0-9]{{2}}$' OR pg_temp.try_date({column}) IS NULL)
+    """).fetchone()[0]
+
+
+def migrate_date_columns(conn) -> None:
+    """Convert the DATE_COLUMNS still stored as TEXT, once.
+
+    ALTER ... TYPE rewrites each table under an exclusive lock, so on a large install run
+    `python -m app.dates migrate` in a maintenance window before deploying. Every pending
+    column is validated first; any value that is not a valid date fails the migration (and
+    startup) before anything is altered, naming the offending columns.
+    """
+    conn.execute("SELECT pg_advisory_xact_lock(hashtext(%s))", (_MIGRATION_LOCK_KEY,))
+    pending = {table: _text_columns(conn, table, columns) for table, columns in DATE_COLUMNS.items()}
+    pending = {table: columns for table, columns in pending.items() if columns}
+    if not pending:
+        return
+
+    conn.execute("""
+        CREATE OR REPLACE FUNCTION pg_temp.try_date(value TEXT) RETURNS DATE
+        LANGUAGE plpgsql IMMUTABLE AS $$
+        BEGIN
+            RETURN value::date;
+        EXCEPTION WHEN others THEN
+            RETURN NULL;
+        END
+        $$
+    """)
+    malformed = [
+        f"{table}.{column} ({count} rows)"
+        for table, columns in pending.items()
+        for column in columns
+        if (count := _malformed_count(conn, table, column))
+    ]
+    if malformed:
+        raise RuntimeError(
+            "Cannot convert date columns to DATE; fix or clear the values that are not "
+            f"valid YYYY-MM-DD dates in: {', '.join(malformed)}"
+        )
+
+    for table, columns in pending.items():
+        conn.execute(
+            f"ALTER TABLE {table} "
+            + ", ".join(f"ALTER COLUMN {column} TYPE DATE USING {column}::date" for column in columns)
+        )
+        conn.execute(f"ANALYZE {table}")
+        logger.info("%s: %s converted to DATE", table, ", ".join(columns))
+
+
+if __name__ == "__main__":
+    import argparse
+
+    import psycopg
+
+    parser = argparse.ArgumentParser(description="Convert 'YYYY-MM-DD' TEXT columns to DATE.")
+    parser.add_argument("command", choices=["migrate"])
+    parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    with psycopg.connect(os.environ["DATABASE_URL"]) as conn:
+        migrate_date_columns(conn)
@@ -0,0 +1,136 @@
+"""Replay the stored response when a mutation is retried with the same Idempotency-Key.
+
+Mobile clients retry guesses, purchases, reshuffles and item uses on flaky networks. With an
+Idempotency-Key header the first successful response is stored per user for
+IDEMPOTENCY_TTL_HOURS, and a retry gets it back without touching the gameplay tables. Reusing a
+key for another endpoint or request body is a 422.
+
+The key is claimed up front with a committed in-flight row, so no connection is held while the
+handler runs. A duplicate that arrives before the first finishes polls that row and replays the
+result once it is stored; only after IDEMPOTENCY_WAIT_SECONDS without one does it get a 409.
+Errors are not stored: the claim is released and a retry runs the handler again. A claim left
+behind by a crash stops blocking the key after IDEMPOTENCY_IN_FLIGHT_SECONDS; the per-player
+lock and duplicate checks in crud still cover a retry that then runs twice.
+"""
+import hashlib
+import json
+import os
+import time
+
+from fastapi import HTTPException
+from fastapi.encoders import jsonable_encoder
+from prometheus_client import Counter
+
+from app.crud import get_db
+
+
+IDEMPOTENCY_TTL_HOURS = float(os.getenv("IDEMPOTENCY_TTL_HOURS", "24"))
+IDEMPOTENCY_IN_FLIGHT_SECONDS = float(os.getenv("IDEMPOTENCY_IN_FLIGHT_SECONDS", "60"))
+# How long a duplicate waits for the first request's result, checking every poll interval.
+IDEMPOTENCY_WAIT_SECONDS = float(os.getenv("IDEMPOTENCY_WAIT_SECONDS", "10"))
+IDEMPOTENCY_POLL_SECONDS = 0.1
+IN_FLIGHT_RETRY_AFTER_SECONDS = 1
+MAX_KEY_LENGTH = 255
+REPLAY_HEADER = "Idempotent-Replayed"
+
+IDEMPOTENT_REQUESTS = Counter(
+    "idempotent_requests_total",
+    "Requests carrying an Idempotency-Key by endpoint and outcome: stored the first response, replayed it, "
+    "rejected a reused key, or turned away a duplicate still in flight after waiting",
+    ["endpoint", "outcome"],
+)
+
+
+def _fingerprint(request) -> str:
+    body = json.dumps(jsonable_encoder(request), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(body.encode()).hexdigest()
+
+
+def _claim(user_id: int, key: str, endpoint: str, request_hash: str):
+    """Claim the key with an in-flight row, or return the live row that already holds it."""
+    with get_db() as conn:
+        claimed = conn.execute("""
+            INSERT INTO idempotency_keys (user_id, idempotency_key, endpoint, request_hash)
+            VALUES (%s, %s, %s, %s)
+            ON CONFLICT (user_id, idempotency_key) DO UPDATE
+            SET endpoint = EXCLUDED.endpoint,
+                request_hash = EXCLUDED.request_hash,
+                status_code = NULL,
+                response = NULL,
+                created_at = now()
+            WHERE idempotency_keys.created_at <= now() - make_interval(secs => %s)
+               -- Client errors stored by earlier releases are not replayed any more.
+               OR idempotency_keys.status_code >= 400
+               OR (idempotency_keys.status_code IS NULL
+                   AND idempotency_keys.created_at <= now() - make_interval(secs => %s))
+            RETURNING 1
+        """, (user_id, key, endpoint, request_hash,
+              IDEMPOTENCY_TTL_HOURS * 3600, IDEMPOTENCY_IN_FLIGHT_SECONDS)).fetchone()
+        if claimed:
+            return None
+        return conn.execute("""
+            SELECT endpoint, request_hash, status_code, response
+            FROM idempotency_keys
+            WHERE user_id = %s AND idempotency_key = %s
+        """, (user_id, key)).fetchone()
+
+
+def _release(user_id: int, key: str) -> None:
+    with get_db() as conn:
+        conn.execute("""
+            DELETE FROM idempotency_keys
+            WHERE user_id = %s AND idempotency_key = %s AND status_code IS NULL
+        """, (user_id, key))
+
+
+def run_idempotent(user_id: int, key: str | None, endpoint: str, request, handler, response=None):
+    """Return handler(), or what it returned for an earlier call with the same key."""
+    if key is None:
+        return handler()
+    if not key or len(key) > MAX_KEY_LENGTH:
+        raise HTTPException(status_code=400, detail=f"Idempotency-Key must be 1-{MAX_KEY_LENGTH} characters")
+    request_hash = _fingerprint(request)
+
+    deadline = time.monotonic() + IDEMPOTENCY_WAIT_SECONDS
+    while True:
+        # Claiming again on each poll also takes over a key the first request released on error.
+        row = _claim(user_id, key, endpoint, request_hash)
+        if row is None:
+            break
+        if (row[0], row[1]) != (endpoint, request_hash):
+            IDEMPOTENT_REQUESTS.labels(endpoint, "conflict").inc()
+            raise HTTPException(status_code=422, detail="Idempotency-Key was already used for a different request")
+        if row[2] is not None:
+            IDEMPOTENT_REQUESTS.labels(endpoint, "replayed").inc()
+            if response is not None:
+                response.headers[REPLAY_HEADER] = "true"
+            return row[3]["body"]
+        if time.monotonic() >= deadline:
+            IDEMPOTENT_REQUESTS.labels(endpoint, "in_flight").inc()
+            raise HTTPException(
+                status_code=409,
+                detail="A request with this Idempotency-Key is still being processed",
+                headers={"Retry-After": str(IN_FLIGHT_RETRY_AFTER_SECONDS)},
+            )
+        time.sleep(IDEMPOTENCY_POLL_SECONDS)
+
+    try:
+        result = jsonable_encoder(handler())
+    except BaseException:
+        _release(user_id, key)
+        raise
+    with get_db() as conn:
+        conn.execute("""
+            UPDATE idempotency_keys
+            SET status_code = 200, response = %s
+            WHERE user_id = %s AND idempotency_key = %s
+        """, (json.dumps({"body": result}), user_id, key))
+    IDEMPOTENT_REQUESTS.labels(endpoint, "stored").inc()
+    return result
+
+
+def purge_expired(conn) -> int:
+    return conn.execute(
+        "DELETE FROM idempotency_keys WHERE created_at < now() - make_interval(secs => %s)",
+        (IDEMPOTENCY_TTL_HOURS * 3600,),
+    ).rowcount
@@ -1,11 +1,10 @@
 import json
-from app.utils.campaigns import resolve_campaign_day
+from app.items.context import ItemContext
 
 
-def _dispel_curse(conn, user_id: int, campaign_id: int):
-    _, _, _, target_day, _ = resolve_campaign_day(conn, campaign_id, None)
-    payload = {"day": target_day, "dispelled": True}
-    conn.execute("""
+def _dispel_curse(ctx: ItemContext):
+    payload = {"day": ctx.target_day, "dispelled": True}
+    ctx.conn.execute("""
         INSERT INTO campaign_user_status_effects (
             user_id, campaign_id, effect_key, effect_value, applied_at, active
         )
@@ -14,7 +13,7 @@ def _dispel_curse(conn, user_id: int, campaign_id: int):
         DO UPDATE SET effect_value = EXCLUDED.effect_value,
                       applied_at = EXCLUDED.applied_at,
                       active = FALSE
-    """, (user_id, campaign_id, "cursed", json.dumps(payload)))
+    """, (ctx.user_id, ctx.campaign_id, "cursed", json.dumps(payload)))
     return {"cleansed": True}
 
 
@@ -2,43 +2,40 @@ import json
 import random
 from datetime import timedelta
 from fastapi import HTTPException
-from app.utils.campaigns import resolve_campaign_day
+from app.items.context import ItemContext
+from app import candidates as candidate_sets
 
-def _guiding_light(conn, user_id: int, campaign_id: int):
-    _, _, _, target_day, target_date = resolve_campaign_day(conn, campaign_id, None)
-    word_row = conn.execute(
-        "SELECT word FROM campaign_words WHERE campaign_id = %s AND day = %s",
-        (campaign_id, target_day)
-    ).fetchone()
-    if not word_row:
+def _guiding_light(ctx: ItemContext):
+    word = ctx.word
+    if not word:
         raise HTTPException(status_code=404, detail="No word assigned for that day")
 
-    word = word_row[0].upper()
-    target_date_str = target_date.strftime("%Y-%m-%d")
     used_letters = set()
-    progress_row = conn.execute("""
-        SELECT guesses
-        FROM campaign_guess_states
-        WHERE user_id = %s AND campaign_id = %s AND date = %s
-    """, (user_id, campaign_id, target_date_str)).fetchone()
-    if progress_row and progress_row[0]:
+    remaining = candidate_sets.ALL_CANDIDATES
+    state = ctx.guess_state or {}
+    if state.get("guesses"):
         try:
-            guesses = json.loads(progress_row[0])
+            guesses = json.loads(state["guesses"])
             for row in guesses:
                 for letter in row:
                     if letter:
                         used_letters.add(letter.upper())
+            remaining = candidate_sets.load(state.get("candidates"), guesses, json.loads(state.get("results") or "[]"))
         except json.JSONDecodeError:
             used_letters = set()
 
-    alphabet = [chr(c) for c in range(ord("A"), ord("Z") + 1)]
-    unused = [c for c in alphabet if c not in word and c not in used_letters]
-    random.shuffle(unused)
-    revealed = unused[:4] if len(unused) >= 4 else unused
+    unused = [c for c in word.absent_letters if c not in used_letters]
+    # Letters that still appear in some possible answer rule words out; show those first.
+    in_candidates = candidate_sets.letter_counts(remaining)
+    informative = [c for c in unused if c.lower() in in_candidates]
+    filler = [c for c in unused if c.lower() not in in_candidates]
+    random.shuffle(informative)
+    random.shuffle(filler)
+    revealed = (informative + filler)[:4]
 
-    payload = {"day": target_day, "unused_letters": revealed}
-    expires_at = target_date + timedelta(days=1)
-    conn.execute("""
+    payload = {"day": ctx.target_day, "unused_letters": revealed}
+    expires_at = ctx.target_date + timedelta(days=1)
+    ctx.conn.execute("""
         INSERT INTO campaign_user_status_effects (user_id, campaign_id, effect_key, effect_value, applied_at, expires_at, active)
         VALUES (%s, %s, %s, %s, CURRENT_TIMESTAMP, %s, TRUE)
         ON CONFLICT (user_id, campaign_id, effect_key)
@@ -46,7 +43,7 @@ def _guiding_light(conn, user_id: int, campaign_id: int):
                       applied_at = EXCLUDED.applied_at,
                       expires_at = EXCLUDED.expires_at,
                       active = TRUE
-    """, (user_id, campaign_id, "guiding_light", json.dumps(payload), expires_at))
+    """, (ctx.user_id, ctx.campaign_id, "guiding_light", json.dumps(payload), expires_at))
 
     return {"cartography": payload}
 
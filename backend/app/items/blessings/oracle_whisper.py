@@ -2,11 +2,11 @@ from datetime import datetime, timedelta
 import json
 import random
 from fastapi import HTTPException
-from app.utils.campaigns import resolve_campaign_day
+from app.items.context import ItemContext
+from app import candidates as candidate_sets
 
-def _oracle_whisper(conn, user_id: int, campaign_id: int):
-    _, _, _, target_day, target_date = resolve_campaign_day(conn, campaign_id, None)
-    target_date_str = target_date.strftime("%Y-%m-%d")
+def _oracle_whisper(ctx: ItemContext):
+    conn, user_id, campaign_id = ctx.conn, ctx.user_id, ctx.campaign_id
 
     dd_row = conn.execute("""
         SELECT double_down_activated
@@ -24,46 +24,48 @@ def _oracle_whisper(conn, user_id: int, campaign_id: int):
           AND item_key = %s
           AND event_type = %s
           AND DATE(created_at) = %s
-    """, (user_id, campaign_id, "oracle_whisper", "use", target_date_str)).fetchone()
+    """, (user_id, campaign_id, "oracle_whisper", "use", ctx.target_date_str)).fetchone()
     if used_row:
         raise HTTPException(status_code=400, detail="Oracle's Whisper can only be used once per day.")
-    word_row = conn.execute(
-        "SELECT word FROM campaign_words WHERE campaign_id = %s AND day = %s",
-        (campaign_id, target_day)
-    ).fetchone()
-    if not word_row:
+    if not ctx.word:
         raise HTTPException(status_code=404, detail="No word assigned for that day")
 
-    word = word_row[0]
-    target_date_str = target_date.strftime("%Y-%m-%d")
+    word = ctx.word.word
     confirmed_letters = set()
-    status_row = conn.execute("""
-        SELECT letter_status
-        FROM campaign_guess_states
-        WHERE user_id = %s AND campaign_id = %s AND date = %s
-    """, (user_id, campaign_id, target_date_str)).fetchone()
-    if status_row and status_row[0]:
+    remaining = None
+    state = ctx.guess_state or {}
+    if state.get("letter_status"):
         try:
-            status = json.loads(status_row[0])
+            status = json.loads(state["letter_status"])
             confirmed_letters = {k.upper() for k, v in status.items() if v == "correct"}
+            remaining = candidate_sets.load(
+                state.get("candidates"), json.loads(state.get("guesses") or "[]"), json.loads(state.get("results") or "[]")
+            )
         except json.JSONDecodeError:
             confirmed_letters = set()
 
     positions = list(range(len(word)))
     random.shuffle(positions)
     chosen = None
-    for pos in positions:
-        if word[pos].upper() not in confirmed_letters:
-            chosen = pos
-            break
+    if remaining:
+        # Reveal a position the remaining answers still disagree on, so the hint always narrows.
+        for pos in positions:
+            if len(candidate_sets.position_letter_counts(remaining, pos)) > 1:
+                chosen = pos
+                break
+    if chosen is None:
+        for pos in positions:
+            if word[pos].upper() not in confirmed_letters:
+                chosen = pos
+                break
     if chosen is None:
         chosen = random.randint(0, len(word) - 1)
 
     position = chosen
     letter = word[position].upper()
-    hint_payload = {"day": target_day, "position": position + 1, "letter": letter}
+    hint_payload = {"day": ctx.target_day, "position": position + 1, "letter": letter}
 
-    expires_at = datetime.combine(target_date + timedelta(days=1), datetime.min.time())
+    expires_at = datetime.combine(ctx.target_date + timedelta(days=1), datetime.min.time())
     conn.execute("""
         INSERT INTO campaign_user_status_effects (user_id, campaign_id, effect_key, effect_value, applied_at, expires_at, active)
         VALUES (%s, %s, %s, %s, CURRENT_TIMESTAMP, %s, TRUE)
@@ -1,22 +1,14 @@
 import json
 from datetime import timedelta
-from app.utils.campaigns import resolve_campaign_day
+from app.items.context import ItemContext
 
 
-def _vowel_vision(conn, user_id: int, campaign_id: int):
-    _, _, _, target_day, target_date = resolve_campaign_day(conn, campaign_id, None)
-    word_row = conn.execute(
-        "SELECT word FROM campaign_words WHERE campaign_id = %s AND day = %s",
-        (campaign_id, target_day)
-    ).fetchone()
-    vowel_count = 0
-    if word_row and word_row[0]:
-        word = str(word_row[0]).upper()
-        vowel_count = sum(1 for ch in word if ch in {"A", "E", "I", "O", "U"})
+def _vowel_vision(ctx: ItemContext):
+    vowel_count = ctx.word.vowel_count if ctx.word else 0
 
-    payload = {"day": target_day, "vowel_count": vowel_count}
-    expires_at = target_date + timedelta(days=1)
-    conn.execute("""
+    payload = {"day": ctx.target_day, "vowel_count": vowel_count}
+    expires_at = ctx.target_date + timedelta(days=1)
+    ctx.conn.execute("""
         INSERT INTO campaign_user_status_effects (user_id, campaign_id, effect_key, effect_value, applied_at, expires_at, active)
         VALUES (%s, %s, %s, %s, CURRENT_TIMESTAMP, %s, TRUE)
         ON CONFLICT (user_id, campaign_id, effect_key)
@@ -24,7 +16,7 @@ def _vowel_vision(conn, user_id: int, campaign_id: int):
                       applied_at = EXCLUDED.applied_at,
                       expires_at = EXCLUDED.expires_at,
                       active = TRUE
-    """, (user_id, campaign_id, "vowel_vision", json.dumps(payload), expires_at))
+    """, (ctx.user_id, ctx.campaign_id, "vowel_vision", json.dumps(payload), expires_at))
     return {"easy_tongue": payload}
 
 
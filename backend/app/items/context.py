@@ -0,0 +1,30 @@
+from dataclasses import dataclass
+from datetime import date
+from typing import Optional
+
+from app.wordfeatures import WordFeatures, features
+
+
+@dataclass(frozen=True)
+class ItemContext:
+    """What use_item has already loaded for the day, handed to every item handler.
+
+    `secret` is the day's word (None when unassigned or not loaded for the item) and
+    `guess_state` the user's campaign_guess_states columns for the day, both fetched once
+    by use_item so handlers do not query them again.
+    """
+    conn: object
+    user_id: int
+    campaign_id: int
+    target_day: int
+    target_date: date
+    secret: Optional[str] = None
+    guess_state: Optional[dict] = None
+
+    @property
+    def target_date_str(self) -> str:
+        return self.target_date.strftime("%Y-%m-%d")
+
+    @property
+    def word(self) -> Optional[WordFeatures]:
+        return features(self.secret) if self.secret else None
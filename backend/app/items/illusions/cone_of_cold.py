@@ -1,4 +1,4 @@
-def _cone_of_cold(conn, user_id: int, campaign_id: int):
+def _cone_of_cold(ctx):
     return {}
 
 cone_of_cold_item = {
@@ -1,4 +1,4 @@
-def _earthquake(conn, user_id: int, campaign_id: int):
+def _earthquake(ctx):
     return {}
 
 earthquake_item = {
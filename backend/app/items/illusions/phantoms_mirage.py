@@ -1,4 +1,4 @@
-def _phantoms_mirage(conn, user_id: int, campaign_id: int):
+def _phantoms_mirage(ctx):
     return {}
 
 phantoms_mirage_item = {
@@ -1,4 +1,4 @@
-def _sigil_of_the_wandering_glyph(conn, user_id: int, campaign_id: int):
+def _sigil_of_the_wandering_glyph(ctx):
     return {}
 
 
@@ -1,4 +1,4 @@
-def _spider_swarm(conn, user_id: int, campaign_id: int):
+def _spider_swarm(ctx):
     return {}
 
 spider_swarm_item = {
@@ -1,4 +1,4 @@
-def _time_stop(conn, user_id: int, campaign_id: int):
+def _time_stop(ctx):
     return {}
 
 
@@ -1,4 +1,4 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, Header, HTTPException, Response
 from fastapi.middleware.cors import CORSMiddleware
 from app import models, crud
 from app.models import CampaignOnly
@@ -9,10 +9,12 @@ from app.updates.routes import router as updates_router
 from app.auth import create_access_token
 from app.models import UserOnly, UpdateUserInfo, CampaignAndUserOnly, ShopPurchase, ShopReshuffle, UseItemRequest, ItemTargetRequest, ArmyNameUpdate, WeeklyRewardChoose
 from app.recap import service as recap_service
+from app.idempotency import run_idempotent
 from prometheus_fastapi_instrumentator import Instrumentator
 
-from app.scheduler import start_scheduler
+from app.scheduler import RUN_SCHEDULER_IN_API, RolloverWarmer, flush_counters, get_scheduler_health, start_scheduler
 from database import init_db
+from app.cache import InvalidationListener
 from app.media.routes import router as media_router
 from app.private.routes import router as private_router
 
@@ -33,32 +35,92 @@ app.add_middleware(
 )
 
 instrumentator = Instrumentator().instrument(app)
+cache_listener = InvalidationListener()
+rollover_warmer = RolloverWarmer()
 
 @app.on_event("startup")
 async def startup_event():
-    start_scheduler()
+    # Jobs run in the separate `python -m app.scheduler` process; API workers only stand
+    # for leader when RUN_SCHEDULER_IN_API is on.
+    if RUN_SCHEDULER_IN_API:
+        start_scheduler()
     init_db()
+    if not RUN_SCHEDULER_IN_API and get_scheduler_health()["status"] == "no_leader":
+        print("⚠️ RUN_SCHEDULER_IN_API is off and no scheduler leader is heartbeating; "
+              "nightly resets, stats and flushes will not run until `python -m app.scheduler` starts")
+    cache_listener.start()
+    rollover_warmer.start()
     instrumentator.expose(app, include_in_schema=True, should_gzip=False)
 
+@app.on_event("shutdown")
+def shutdown_event():
+    cache_listener.stop()
+    rollover_warmer.stop()
+    # Fold whatever is still pending so the global stats are current after a deploy.
+    try:
+        flush_counters()
+    except Exception as exc:
+        print(f"⚠️ Could not flush global counters on shutdown; the next flush will: {exc}")
+
+@app.get("/api/health/scheduler")
+def scheduler_health():
+    health = get_scheduler_health()
+    if health["status"] != "ok":
+        raise HTTPException(status_code=503, detail=health)
+    return health
+
 @app.post("/api/word/reveal")
 def reveal_word(data: models.CampaignOnly):
     return {"word": crud.get_daily_word(data.campaign_id, data.day)}
 
+# Mutations below accept an Idempotency-Key header; a retry with the same key replays the
+# first response instead of running the transaction again.
 @app.post("/api/guess")
-def guess_with_meta(data: models.GuessWithMeta, current_user: dict = Depends(get_current_user)):
-    return crud.validate_guess(data.word, current_user["user_id"], data.campaign_id, data.day)
+def guess_with_meta(
+    data: models.GuessWithMeta,
+    response: Response,
+    current_user: dict = Depends(get_current_user),
+    idempotency_key: str | None = Header(default=None),
+):
+    user_id = current_user["user_id"]
+    return run_idempotent(
+        user_id, idempotency_key, "guess", data,
+        lambda: crud.validate_guess(data.word, user_id, data.campaign_id, data.day),
+        response,
+    )
 
 @app.post("/api/leaderboard")
 def get_leaderboard(data: CampaignOnly):
     return crud.get_leaderboard(data.campaign_id)
 
+@app.post("/api/leaderboard/window")
+def get_leaderboard_window(data: models.LeaderboardWindowRequest, current_user: dict = Depends(get_current_user)):
+    return crud.get_leaderboard_window(data.campaign_id, current_user["user_id"], data.top, data.radius)
+
 @app.get("/api/leaderboard/global")
-def get_global_leaderboard(limit: int = 10, current_user: dict = Depends(get_current_user)):
-    return crud.get_global_leaderboard(limit)
+def get_global_leaderboard(limit: int = 10, campaign_length: int | None = None, current_user: dict = Depends(get_current_user)):
+    return crud.get_global_leaderboard(limit, campaign_length)
+
+@app.get("/api/leaderboard/global/page")
+def get_global_leaderboard_page(
+    limit: int = 25,
+    campaign_length: int | None = None,
+    cursor: str | None = None,
+    current_user: dict = Depends(get_current_user),
+):
+    return crud.get_global_leaderboard_page(limit, campaign_length, cursor)
+
+@app.get("/api/leaderboard/global/me")
+def get_global_personal_best(campaign_length: int | None = None, current_user: dict = Depends(get_current_user)):
+    return crud.get_global_personal_best(current_user["user_id"], campaign_length)
+
+@app.get("/api/leaderboard/global/rank")
+def get_global_score_rank(troops: int, campaign_length: int | None = None, current_user: dict = Depends(get_current_user)):
+    return crud.get_global_score_rank(troops, campaign_length)
 
 @app.post("/api/register")
-def register(user: models.UserRegister):
-    return crud.register_user(
+async def register(user: models.UserRegister):
+    return await crud.register_user(
         user.first_name,
         user.last_name,
         user.email,
@@ -67,14 +129,14 @@ def register(user: models.UserRegister):
     )
 
 @app.post("/api/login")
-def login(user: models.UserLogin):
-    user_data = crud.login_user(user.email, user.password)
+async def login(user: models.UserLogin):
+    user_data = await crud.login_user(user.email, user.password)
     token = create_access_token({"user_id": user_data["user_id"]})
     return {"access_token": token, "user": user_data}
 
 @app.post("/api/campaign/create")
-def create_campaign(camp: models.NewCampaign, current_user: dict = Depends(get_current_user)):
-    return crud.create_campaign(
+async def create_campaign(camp: models.NewCampaign, current_user: dict = Depends(get_current_user)):
+    return await crud.create_campaign(
         camp.name,
         current_user["user_id"],
         camp.cycle_length,
@@ -143,6 +205,12 @@ def get_owned_campaigns(current_user: dict = Depends(get_current_user)):
 def get_campaign_members(data: CampaignOnly, current_user: dict = Depends(get_current_user)):
     return crud.get_campaign_members(data.campaign_id, current_user["user_id"])
 
+@app.post("/api/campaign/members/page")
+def get_campaign_members_page(data: models.MemberPageRequest, current_user: dict = Depends(get_current_user)):
+    return crud.get_campaign_members_page(
+        data.campaign_id, current_user["user_id"], data.limit, data.cursor, data.prefix
+    )
+
 @app.post("/api/campaign/self_member")
 def get_self_member(data: models.CampaignOnly, current_user: dict = Depends(get_current_user)):
     return crud.get_self_member(data.campaign_id, current_user["user_id"])
@@ -151,6 +219,16 @@ def get_self_member(data: models.CampaignOnly, current_user: dict = Depends(get_
 def get_campaign_targets(data: models.CampaignOnly, current_user: dict = Depends(get_current_user)):
     return crud.get_targetable_members(data.campaign_id, current_user["user_id"])
 
+@app.post("/api/campaign/targets/items")
+def get_campaign_targets_for_items(data: models.ItemTargetBatchRequest, current_user: dict = Depends(get_current_user)):
+    return crud.get_item_target_matrix(data.campaign_id, current_user["user_id"], data.item_keys)
+
+@app.post("/api/campaign/targets/page")
+def get_campaign_targets_page(data: models.TargetPageRequest, current_user: dict = Depends(get_current_user)):
+    return crud.get_targetable_members_page(
+        data.campaign_id, current_user["user_id"], data.limit, data.cursor, data.prefix, data.item_key
+    )
+
 @app.post("/api/campaign/targets/item")
 def get_campaign_targets_for_item(data: ItemTargetRequest, current_user: dict = Depends(get_current_user)):
     return crud.get_targetable_members_with_item_status(
@@ -209,23 +287,53 @@ def get_campaign_shop_state(data: CampaignOnly, current_user: dict = Depends(get
     return crud.get_shop_state(current_user["user_id"], data.campaign_id)
 
 @app.post("/api/campaign/shop/purchase")
-def purchase_shop_item(data: ShopPurchase, current_user: dict = Depends(get_current_user)):
-    return crud.purchase_item(current_user["user_id"], data.campaign_id, data.item_key)
+def purchase_shop_item(
+    data: ShopPurchase,
+    response: Response,
+    current_user: dict = Depends(get_current_user),
+    idempotency_key: str | None = Header(default=None),
+):
+    user_id = current_user["user_id"]
+    return run_idempotent(
+        user_id, idempotency_key, "shop_purchase", data,
+        lambda: crud.purchase_item(user_id, data.campaign_id, data.item_key),
+        response,
+    )
 
 @app.post("/api/campaign/shop/reshuffle")
-def reshuffle_shop(data: ShopReshuffle, current_user: dict = Depends(get_current_user)):
-    return crud.reshuffle_shop(current_user["user_id"], data.campaign_id, data.category)
+def reshuffle_shop(
+    data: ShopReshuffle,
+    response: Response,
+    current_user: dict = Depends(get_current_user),
+    idempotency_key: str | None = Header(default=None),
+):
+    user_id = current_user["user_id"]
+    return run_idempotent(
+        user_id, idempotency_key, "shop_reshuffle", data,
+        lambda: crud.reshuffle_shop(user_id, data.campaign_id, data.category),
+        response,
+    )
 
 @app.post("/api/campaign/items/use")
-def use_campaign_item(data: UseItemRequest, current_user: dict = Depends(get_current_user)):
-    return crud.use_item(
-        current_user["user_id"],
-        data.campaign_id,
-        data.item_key,
-        data.target_user_id,
-        data.effect_payload,
-        accept_blessing_cost=bool(data.accept_blessing_cost),
-        consume_candle_of_mercy=bool(data.consume_candle_of_mercy),
+def use_campaign_item(
+    data: UseItemRequest,
+    response: Response,
+    current_user: dict = Depends(get_current_user),
+    idempotency_key: str | None = Header(default=None),
+):
+    user_id = current_user["user_id"]
+    return run_idempotent(
+        user_id, idempotency_key, "item_use", data,
+        lambda: crud.use_item(
+            user_id,
+            data.campaign_id,
+            data.item_key,
+            data.target_user_id,
+            data.effect_payload,
+            accept_blessing_cost=bool(data.accept_blessing_cost),
+            consume_candle_of_mercy=bool(data.consume_candle_of_mercy),
+        ),
+        response,
     )
 
 @app.post("/api/campaign/items/hint")
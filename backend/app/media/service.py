@@ -1,7 +1,6 @@
 from io import BytesIO
 
 from fastapi import HTTPException
-from PIL import Image, ImageOps
 
 from app.media.storage import (
     create_presigned_upload,
@@ -10,7 +9,8 @@ from app.media.storage import (
     get_object_bytes,
     put_object_bytes,
 )
-from app.crud import get_db
+from app.crud import LEADERBOARD_CACHE, get_db, invalidate_leaderboard
+from app.principal import get_principal, is_campaign_member
 
 
 def _thumb_key(original_key: str) -> str:
@@ -21,6 +21,8 @@ def _thumb_key(original_key: str) -> str:
 
 
 def _build_thumbnail(data: bytes, size: int = 256) -> bytes:
+    from PIL import Image, ImageOps
+
     with Image.open(BytesIO(data)) as img:
         img = ImageOps.exif_transpose(img)
         img = img.convert("RGB")
@@ -31,11 +33,7 @@ def _build_thumbnail(data: bytes, size: int = 256) -> bytes:
 
 
 def _require_campaign_member(conn, campaign_id: int, user_id: int) -> None:
-    member = conn.execute(
-        "SELECT 1 FROM campaign_members WHERE campaign_id = %s AND user_id = %s",
-        (campaign_id, user_id)
-    ).fetchone()
-    if not member:
+    if not is_campaign_member(conn, user_id, campaign_id):
         raise HTTPException(status_code=403, detail="Not a member of this campaign")
 
 def _require_campaign_ruler(conn, campaign_id: int, user_id: int) -> None:
@@ -52,11 +50,7 @@ def _require_campaign_ruler(conn, campaign_id: int, user_id: int) -> None:
     ruler_id, is_admin_campaign = row
     if is_admin_campaign:
         raise HTTPException(status_code=403, detail="Admin campaigns cannot set a ruler background")
-    is_admin = conn.execute(
-        "SELECT COALESCE(is_admin, FALSE) FROM users WHERE id = %s",
-        (user_id,)
-    ).fetchone()
-    is_admin = bool(is_admin[0]) if is_admin else False
+    is_admin = get_principal(conn, user_id).is_admin
     if not is_admin and (not ruler_id or ruler_id != user_id):
         raise HTTPException(status_code=403, detail="Only the current ruler can set the background")
 
@@ -98,6 +92,8 @@ def confirm_profile_image_upload(user_id: int, key: str, file_url: str):
             """,
             (file_url, key, thumb_url, thumb_key, user_id)
         )
+        # The profile image shows on every campaign the user is in.
+        LEADERBOARD_CACHE.invalidate(conn)
     signed_url = create_presigned_download(key)
     thumb_signed_url = create_presigned_download(thumb_key) if thumb_key else None
     return {"profile_image_url": signed_url, "profile_image_thumb_url": thumb_signed_url}
@@ -143,6 +139,7 @@ def confirm_army_image_upload(user_id: int, campaign_id: int, key: str, file_url
             """,
             (file_url, key, thumb_url, thumb_key, campaign_id, user_id)
         )
+        invalidate_leaderboard(conn, campaign_id)
     signed_url = create_presigned_download(key)
     thumb_signed_url = create_presigned_download(thumb_key) if thumb_key else None
     return {"army_image_url": signed_url, "army_image_thumb_url": thumb_signed_url}
@@ -2,8 +2,6 @@ import os
 import uuid
 from typing import Tuple
 
-import boto3
-from botocore.config import Config
 from fastapi import HTTPException
 
 ALLOWED_CONTENT_TYPES = {
@@ -30,6 +28,10 @@ def _get_s3_settings():
 
 
 def _get_s3_client(endpoint_url: str | None = None):
+    # boto3/botocore add ~100 ms to process start; only media requests need them.
+    import boto3
+    from botocore.config import Config
+
     settings = _get_s3_settings()
     internal_endpoint_url, _, access_key, secret_key, _, region, _ = settings
     resolved_endpoint = endpoint_url or internal_endpoint_url
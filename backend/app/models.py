@@ -82,6 +82,24 @@ class ItemTargetRequest(BaseModel):
     campaign_id: int
     item_key: str
 
+class ItemTargetBatchRequest(BaseModel):
+    campaign_id: int
+    item_keys: Optional[List[str]] = None
+
+class MemberPageRequest(BaseModel):
+    campaign_id: int
+    limit: int = 25
+    cursor: Optional[str] = None
+    prefix: Optional[str] = None
+
+class TargetPageRequest(MemberPageRequest):
+    item_key: Optional[str] = None
+
+class LeaderboardWindowRequest(BaseModel):
+    campaign_id: int
+    top: int = 3
+    radius: int = 2
+
 class ProfileImagePresign(BaseModel):
     filename: str
     content_type: str
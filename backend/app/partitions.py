@@ -0,0 +1,463 @@
+import csv
+import gzip
+import os
+import re
+from datetime import date, datetime
+
+
+BACKEND_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+PARTITION_ARCHIVE_DIR = os.getenv("PARTITION_ARCHIVE_DIR", os.path.join(BACKEND_ROOT, "archive"))
+# Months kept live in Postgres (the current month counts as one); anything older is
+# copied to PARTITION_ARCHIVE_DIR, detached and dropped by the nightly maintenance job.
+PARTITION_RETENTION_MONTHS = int(os.getenv("PARTITION_RETENTION_MONTHS", "6"))
+PARTITION_MONTHS_AHEAD = int(os.getenv("PARTITION_MONTHS_AHEAD", "2"))
+PARTITION_MIGRATION_BATCH_SIZE = int(os.getenv("PARTITION_MIGRATION_BATCH_SIZE", "10000"))
+
+# Append-only tables, range partitioned by month on `key`. Text keys hold 'YYYY-MM-DD'
+# strings, which sort the same way as dates, so the bounds are plain strings for both.
+# `dataset` is the name the private API uses for the archived months. Archived months leave
+# the database, so lifetime totals must not be counted from these tables; they are kept in
+# unpartitioned counter tables (campaign_item_use_totals, the global stat counters) instead.
+PARTITIONED_TABLES = {
+    "campaign_guesses": {"dataset": "guesses", "key": "date"},
+    "campaign_item_events": {"dataset": "item_events", "key": "created_at"},
+    "campaign_shop_log": {"dataset": "shop_log", "key": "created_at"},
+    "store_purchases": {"dataset": "store_purchases", "key": "purchased_at"},
+    "user_accolade_events": {"dataset": "accolade_events", "key": "date"},
+}
+
+_PARTITION_SUFFIX = re.compile(r"_p(\d{4})(\d{2})$")
+_INDEX_DEFINITION = re.compile(r"CREATE INDEX (\S+) ON \S+ ")
+_MIGRATION_LOCK_KEY = "partition_migration"
+
+
+def table_for_dataset(dataset: str):
+    for table, spec in PARTITIONED_TABLES.items():
+        if spec["dataset"] == dataset:
+            return table
+    return None
+
+
+def month_start(value: date) -> date:
+    return value.replace(day=1)
+
+
+def add_months(value: date, months: int) -> date:
+    index = value.year * 12 + value.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table: str, month: date) -> str:
+    return f"{table}_p{month.year:04d}{month.month:02d}"
+
+
+def _parse_month(value):
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return month_start(value.date())
+    if isinstance(value, date):
+        return month_start(value)
+    try:
+        return date(int(str(value)[:4]), int(str(value)[5:7]), 1)
+    except ValueError:
+        return None
+
+
+def _relkind(conn, table: str):
+    row = conn.execute(
+        "SELECT relkind FROM pg_class WHERE oid = to_regclass(%s)",
+        (table,),
+    ).fetchone()
+    return row[0] if row else None
+
+
+def _primary_key_columns(conn, table: str) -> list:
+    rows = conn.execute("""
+        SELECT a.attname
+        FROM pg_index i
+        JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = ANY(i.indkey)
+        WHERE i.indrelid = %s::regclass AND i.indisprimary
+        ORDER BY array_position(i.indkey::int2[], a.attnum)
+    """, (table,)).fetchall()
+    return [row[0] for row in rows]
+
+
+def _secondary_index_definitions(conn, table: str) -> list:
+    # Unique indexes would need the partition key appended to stay valid; none of the
+    # append-only tables carry one besides their primary key, so they are skipped.
+    rows = conn.execute("""
+        SELECT pg_get_indexdef(i.indexrelid)
+        FROM pg_index i
+        WHERE i.indrelid = %s::regclass AND NOT i.indisprimary AND NOT i.indisunique
+    """, (table,)).fetchall()
+    return [row[0] for row in rows]
+
+
+def _owned_sequences(conn, table: str) -> list:
+    rows = conn.execute("""
+        SELECT a.attname, pg_get_serial_sequence(%s, a.attname)
+        FROM pg_attribute a
+        WHERE a.attrelid = %s::regclass AND a.attnum > 0 AND NOT a.attisdropped
+    """, (table, table)).fetchall()
+    return [(column, sequence) for column, sequence in rows if sequence]
+
+
+def create_month_partition(conn, table: str, month: date, parent: str = None) -> str:
+    """Create the partition for `month`, moving any of its rows out of DEFAULT first.
+
+    Postgres refuses to add a month while the DEFAULT partition holds rows for it
+    (e.g. after the nightly job missed a month boundary), so those rows are moved
+    into a standalone table that is then attached as the month. `parent` is the
+    staging table while a migration is still copying rows.
+    """
+    parent = parent or table
+    name = partition_name(table, month)
+    if _relkind(conn, name):
+        return name
+    key = PARTITIONED_TABLES[table]["key"]
+    lower, upper = month.isoformat(), add_months(month, 1).isoformat()
+    default = f"{table}_default"
+    stranded = _relkind(conn, default) and conn.execute(
+        f"SELECT 1 FROM {default} WHERE {key} >= %s AND {key} < %s LIMIT 1",
+        (lower, upper),
+    ).fetchone()
+    if not stranded:
+        conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS {name}
+            PARTITION OF {parent}
+            FOR VALUES FROM ('{lower}') TO ('{upper}')
+        """)
+        return name
+    conn.execute(f"LOCK TABLE {parent} IN SHARE ROW EXCLUSIVE MODE")
+    conn.execute(f"CREATE TABLE {name} (LIKE {parent} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)")
+    conn.execute(f"""
+        WITH moved AS (
+            DELETE FROM {default} WHERE {key} >= %s AND {key} < %s RETURNING *
+        )
+        INSERT INTO {name} SELECT * FROM moved
+    """, (lower, upper))
+    conn.execute(f"ALTER TABLE {parent} ATTACH PARTITION {name} FOR VALUES FROM ('{lower}') TO ('{upper}')")
+    return name
+
+
+def ensure_future_partitions(conn, today: date, months_ahead: int = PARTITION_MONTHS_AHEAD) -> None:
+    current = month_start(today)
+    for table in PARTITIONED_TABLES:
+        if _relkind(conn, table) != "p":
+            continue
+        for offset in range(months_ahead + 1):
+            create_month_partition(conn, table, add_months(current, offset))
+
+
+def staging_table(table: str) -> str:
+    return f"{table}_partitioned"
+
+
+def capture_table(table: str) -> str:
+    return f"{table}_migration_capture"
+
+
+# Copies each row inserted into the table it fires on into the table named by its argument.
+_CAPTURE_FUNCTION = """
+    CREATE OR REPLACE FUNCTION partition_migration_capture() RETURNS trigger
+    LANGUAGE plpgsql AS $$
+    BEGIN
+        EXECUTE format('INSERT INTO %I SELECT ($1).*', TG_ARGV[0]) USING NEW;
+        RETURN NULL;
+    END
+    $$
+"""
+
+
+def _staged_indexes(conn, table: str) -> list:
+    """(name, staged name, definition on the staging table) for each secondary index.
+
+    Derived from the live table each time, so a resumed migration rebuilds the same list.
+    """
+    staged = []
+    for definition in _secondary_index_definitions(conn, table):
+        match = _INDEX_DEFINITION.match(definition)
+        name = match.group(1)
+        staged_name = f"{name}_staged"
+        staged.append((
+            name,
+            staged_name,
+            f"CREATE INDEX IF NOT EXISTS {staged_name} ON {staging_table(table)} {definition[match.end():]}",
+        ))
+    return staged
+
+
+def _prepare_staging(conn, table: str, today: date) -> None:
+    """Create the partitioned copy of `table` (PK, DEFAULT, months, indexes) if it is missing."""
+    staging = staging_table(table)
+    if _relkind(conn, staging):
+        return
+    key = PARTITIONED_TABLES[table]["key"]
+    primary_key = _primary_key_columns(conn, table)
+    if primary_key and key not in primary_key:
+        primary_key.append(key)
+    first_month, last_month = (
+        _parse_month(value)
+        for value in conn.execute(f"SELECT MIN({key}), MAX({key}) FROM {table}").fetchone()
+    )
+
+    conn.execute(f"""
+        CREATE TABLE {staging} (LIKE {table} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)
+        PARTITION BY RANGE ({key})
+    """)
+    if primary_key:
+        conn.execute(f"ALTER TABLE {staging} ADD PRIMARY KEY ({', '.join(primary_key)})")
+    # Rows with a missing or unparseable key land here instead of failing the copy.
+    conn.execute(f"CREATE TABLE {table}_default PARTITION OF {staging} DEFAULT")
+
+    current = month_start(today)
+    month = min(first_month or current, current)
+    stop = max(last_month or current, add_months(current, PARTITION_MONTHS_AHEAD))
+    while month <= stop:
+        create_month_partition(conn, table, month, parent=staging)
+        month = add_months(month, 1)
+    for _, _, definition in _staged_indexes(conn, table):
+        conn.execute(definition)
+
+
+def _start_capture(conn, table: str) -> None:
+    """Log every row inserted into `table` from now on, for the catch-up at swap time.
+
+    The tables are append-only, so inserts are the only changes to capture. Creating the
+    trigger waits for in-flight inserts, so each row is either committed before the copy
+    starts or logged here.
+    """
+    capture = capture_table(table)
+    if _relkind(conn, capture):
+        return
+    conn.execute(f"CREATE TABLE {capture} (LIKE {table})")
+    conn.execute(_CAPTURE_FUNCTION)
+    conn.execute(f"""
+        CREATE TRIGGER {capture} AFTER INSERT ON {table}
+        FOR EACH ROW EXECUTE FUNCTION partition_migration_capture('{capture}')
+    """)
+
+
+def _copy_batches(conn, table: str, batch_size: int) -> int:
+    """Copy rows into the staging table in primary-key order, committing each batch.
+
+    Picks up after the highest key already copied, so an interrupted run resumes
+    where it stopped (only this copy writes to the staging table before the swap).
+    Returns the number of rows copied by this call.
+    """
+    staging = staging_table(table)
+    primary_key = _primary_key_columns(conn, table)
+    columns = ", ".join(primary_key)
+    descending = ", ".join(f"{column} DESC" for column in primary_key)
+    last = conn.execute(f"SELECT {columns} FROM {staging} ORDER BY {descending} LIMIT 1").fetchone()
+    copied = 0
+    while True:
+        after = f"WHERE ({columns}) > ({', '.join(['%s'] * len(primary_key))})" if last else ""
+        row = conn.execute(f"""
+            WITH batch AS (
+                SELECT * FROM {table} {after} ORDER BY {columns} LIMIT %s
+            ), copied AS (
+                INSERT INTO {staging} SELECT * FROM batch ON CONFLICT DO NOTHING
+            )
+            SELECT {columns}, (SELECT COUNT(*) FROM batch)
+            FROM batch
+            ORDER BY {descending}
+            LIMIT 1
+        """, (*(last or ()), batch_size)).fetchone()
+        if not row:
+            return copied
+        last, batch_rows = row[:-1], row[-1]
+        copied += batch_rows
+        conn.commit()
+        if batch_rows < batch_size:
+            return copied
+
+
+def _swap_in(conn, table: str) -> None:
+    """Bring the staging table level with `table` under an exclusive lock and take its name.
+
+    The lock is held for the captured rows and the renames, never for a pass over the table.
+    """
+    staging = staging_table(table)
+    primary_key = _primary_key_columns(conn, table)
+    indexes = _staged_indexes(conn, table)
+    sequences = _owned_sequences(conn, table)
+
+    conn.execute(f"LOCK TABLE {table} IN ACCESS EXCLUSIVE MODE")
+    capture = capture_table(table)
+    if _relkind(conn, capture):
+        # Only the rows inserted since the copy started; those a batch already took are skipped.
+        conn.execute(f"INSERT INTO {staging} SELECT * FROM {capture} ON CONFLICT DO NOTHING")
+        conn.execute(f"DROP TABLE {capture}")
+    for column, sequence in sequences:
+        # Keep serial ids counting on: dropping the old table would otherwise drop its sequence.
+        conn.execute(f"ALTER SEQUENCE {sequence} OWNED BY {staging}.{column}")
+    conn.execute(f"DROP TABLE {table}")
+    conn.execute(f"ALTER TABLE {staging} RENAME TO {table}")
+    if primary_key:
+        conn.execute(f"ALTER TABLE {table} RENAME CONSTRAINT {staging}_pkey TO {table}_pkey")
+    for name, staged_name, _ in indexes:
+        conn.execute(f"ALTER INDEX {staged_name} RENAME TO {name}")
+    conn.execute(f"ANALYZE {table}")
+    print(f"  🗂️ Partitioned {table} by month on {PARTITIONED_TABLES[table]['key']}")
+
+
+def migrate_to_partitions(conn, today: date) -> None:
+    """Partition the append-only tables that are still empty; called from init_db.
+
+    Tables that already hold rows are left as they are (the app works with either
+    layout) until `python -m app.partitions migrate` copies them in batches.
+    """
+    conn.execute("SELECT pg_advisory_xact_lock(hashtext(%s))", (_MIGRATION_LOCK_KEY,))
+    for table in PARTITIONED_TABLES:
+        if _relkind(conn, table) != "r":
+            continue
+        if conn.execute(f"SELECT 1 FROM {table} LIMIT 1").fetchone():
+            print(f"  ⚠️ {table} is not partitioned yet; run `python -m app.partitions migrate`")
+            continue
+        # Check again under the lock: a row written since would be lost by the swap.
+        conn.execute(f"LOCK TABLE {table} IN ACCESS EXCLUSIVE MODE")
+        if conn.execute(f"SELECT 1 FROM {table} LIMIT 1").fetchone():
+            continue
+        _prepare_staging(conn, table, today)
+        _swap_in(conn, table)
+    ensure_future_partitions(conn, today)
+
+
+def migrate_in_batches(conn, today: date, batch_size: int = PARTITION_MIGRATION_BATCH_SIZE) -> None:
+    """Partition every remaining unpartitioned table without one long transaction.
+
+    Each table is staged and copied in committed batches while the app keeps writing
+    to the original and a trigger logs those new rows. The exclusive lock at the end
+    covers only the logged rows and the rename. Safe to interrupt and rerun. Tables
+    without a primary key are refused: the copy has no key to resume from or to
+    de-duplicate the logged rows against.
+    """
+    if not conn.execute("SELECT pg_try_advisory_lock(hashtext(%s))", (_MIGRATION_LOCK_KEY,)).fetchone()[0]:
+        raise RuntimeError("Another partition migration is running")
+    try:
+        for table in PARTITIONED_TABLES:
+            if _relkind(conn, table) != "r":
+                continue
+            if not _primary_key_columns(conn, table):
+                raise RuntimeError(f"{table} has no primary key; add one before partitioning it")
+            _prepare_staging(conn, table, today)
+            _start_capture(conn, table)
+            conn.commit()
+            copied = _copy_batches(conn, table, batch_size)
+            print(f"  Copied {copied} rows of {table} into {staging_table(table)}")
+            _swap_in(conn, table)
+            conn.commit()
+        ensure_future_partitions(conn, today)
+        conn.commit()
+    finally:
+        conn.rollback()
+        conn.execute("SELECT pg_advisory_unlock(hashtext(%s))", (_MIGRATION_LOCK_KEY,))
+        conn.commit()
+
+
+def expired_partitions(conn, today: date, retention_months: int = PARTITION_RETENTION_MONTHS) -> list:
+    cutoff = add_months(month_start(today), -(retention_months - 1))
+    expired = []
+    for table in PARTITIONED_TABLES:
+        if _relkind(conn, table) != "p":
+            continue
+        rows = conn.execute("""
+            SELECT c.relname
+            FROM pg_inherits i
+            JOIN pg_class c ON c.oid = i.inhrelid
+            WHERE i.inhparent = %s::regclass
+            ORDER BY c.relname
+        """, (table,)).fetchall()
+        for name, in rows:
+            match = _PARTITION_SUFFIX.search(name)
+            if not match:
+                continue
+            month = date(int(match.group(1)), int(match.group(2)), 1)
+            if month < cutoff:
+                expired.append((table, name, month))
+    return expired
+
+
+def archive_path(table: str, month: date, archive_dir: str = None) -> str:
+    return os.path.join(archive_dir or PARTITION_ARCHIVE_DIR, table, f"{month:%Y-%m}.csv.gz")
+
+
+def archive_partition(conn, table: str, partition: str, month: date, archive_dir: str = None) -> dict:
+    """Write one monthly partition to a gzipped CSV, then detach and drop it.
+
+    The file is fully written and renamed into place before the partition is dropped,
+    so a crash part way leaves the live partition untouched and the job simply redoes it.
+    """
+    path = archive_path(table, month, archive_dir)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    partial_path = f"{path}.partial"
+    with conn.cursor() as cur:
+        with gzip.open(partial_path, "wb") as fh:
+            with cur.copy(f"COPY {partition} TO STDOUT WITH (FORMAT csv, HEADER true)") as copy:
+                for chunk in copy:
+                    fh.write(chunk)
+        row_count = cur.rowcount
+    os.replace(partial_path, path)
+
+    conn.execute(f"ALTER TABLE {table} DETACH PARTITION {partition}")
+    conn.execute(f"DROP TABLE {partition}")
+    archived = {
+        "table_name": table,
+        "month": f"{month:%Y-%m}",
+        "path": path,
+        "row_count": row_count,
+        "bytes": os.path.getsize(path),
+    }
+    conn.execute("""
+        INSERT INTO archived_partitions (table_name, month, path, row_count, bytes)
+        VALUES (%s, %s, %s, %s, %s)
+        ON CONFLICT (table_name, month) DO UPDATE SET
+            path = EXCLUDED.path,
+            row_count = EXCLUDED.row_count,
+            bytes = EXCLUDED.bytes,
+            archived_at = CURRENT_TIMESTAMP
+    """, (table, archived["month"], path, row_count, archived["bytes"]))
+    return archived
+
+
+def read_archive(path: str):
+    """Return (columns, rows) for an archive file; rows is a lazy iterator of lists.
+
+    COPY writes SQL NULL as an empty field, which reads back as None.
+    """
+    fh = gzip.open(path, "rt", newline="")
+    reader = csv.reader(fh)
+    try:
+        columns = next(reader)
+    except StopIteration:
+        fh.close()
+        return [], iter(())
+
+    def _rows():
+        with fh:
+            for row in reader:
+                yield [value if value != "" else None for value in row]
+
+    return columns, _rows()
+
+
+if __name__ == "__main__":
+    import argparse
+    from zoneinfo import ZoneInfo
+
+    import psycopg
+
+    parser = argparse.ArgumentParser(description="Monthly partition maintenance for the append-only tables.")
+    parser.add_argument("command", choices=["migrate", "archive"])
+    args = parser.parse_args()
+    today = datetime.now(ZoneInfo("America/Chicago")).date()
+    with psycopg.connect(os.environ["DATABASE_URL"]) as conn:
+        if args.command == "migrate":
+            migrate_in_batches(conn, today)
+        else:
+            ensure_future_partitions(conn, today)
+            for table, partition, month in expired_partitions(conn, today):
+                print(archive_partition(conn, table, partition, month))
+                conn.commit()
@@ -0,0 +1,129 @@
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from fastapi import HTTPException
+from prometheus_client import Counter, Gauge, Histogram
+
+
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+# Requests allowed to wait for a hashing worker before new ones are turned away.
+PASSWORD_HASH_QUEUE_LIMIT = int(os.getenv("PASSWORD_HASH_QUEUE_LIMIT", "16"))
+PASSWORD_HASH_RETRY_AFTER_SECONDS = 2
+
+# bcrypt releases the GIL, so a small dedicated thread pool caps how many cores
+# password work can take. The admission semaphore caps how many jobs can wait on
+# it. Callers await the result on the event loop instead of parking a thread
+# from the shared request pool.
+_executor = ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash")
+_admission = threading.BoundedSemaphore(PASSWORD_HASH_WORKERS + PASSWORD_HASH_QUEUE_LIMIT)
+_depth_lock = threading.Lock()
+_queued = 0
+
+PASSWORD_HASH_QUEUE_DEPTH = Gauge(
+    "password_hash_queue_depth",
+    "Password hash/verify jobs waiting for a worker",
+)
+PASSWORD_HASH_IN_FLIGHT = Gauge(
+    "password_hash_in_flight",
+    "Password hash/verify jobs currently running",
+)
+PASSWORD_HASH_REJECTED = Counter(
+    "password_hash_rejected_total",
+    "Password hash/verify jobs rejected because the queue was full",
+    ["operation"],
+)
+PASSWORD_HASH_SECONDS = Histogram(
+    "password_hash_seconds",
+    "Time spent running bcrypt, excluding queue wait",
+    ["operation"],
+)
+
+
+def _adjust_queued(delta: int) -> None:
+    global _queued
+    with _depth_lock:
+        _queued += delta
+        PASSWORD_HASH_QUEUE_DEPTH.set(_queued)
+
+
+def queue_depth() -> int:
+    return _queued
+
+
+def _timed(operation: str, fn, *args):
+    _adjust_queued(-1)
+    PASSWORD_HASH_IN_FLIGHT.inc()
+    started = time.perf_counter()
+    try:
+        return fn(*args)
+    finally:
+        PASSWORD_HASH_SECONDS.labels(operation).observe(time.perf_counter() - started)
+        PASSWORD_HASH_IN_FLIGHT.dec()
+
+
+def _admit(operation: str) -> None:
+    if not _admission.acquire(blocking=False):
+        PASSWORD_HASH_REJECTED.labels(operation).inc()
+        raise HTTPException(
+            status_code=503,
+            detail="Sign-in is busy right now, please try again in a moment.",
+            headers={"Retry-After": str(PASSWORD_HASH_RETRY_AFTER_SECONDS)},
+        )
+    _adjust_queued(1)
+
+
+def _release(future) -> None:
+    if future.cancelled():
+        # Never reached _timed, so it still counts as queued.
+        _adjust_queued(-1)
+    _admission.release()
+
+
+async def _run_async(operation: str, fn, *args):
+    _admit(operation)
+    try:
+        future = _executor.submit(_timed, operation, fn, *args)
+    except BaseException:
+        _adjust_queued(-1)
+        _admission.release()
+        raise
+    # The slot is held until the worker is done, even if the caller goes away
+    # first, so the admission limit keeps matching real executor load.
+    future.add_done_callback(_release)
+    return await asyncio.wrap_future(future)
+
+
+def _hash(password: bytes, rounds: int) -> bytes:
+    import bcrypt
+
+    return bcrypt.hashpw(password, bcrypt.gensalt(rounds=rounds))
+
+
+def _check(password: bytes, stored_hash: bytes) -> bool:
+    import bcrypt
+
+    return bcrypt.checkpw(password, stored_hash)
+
+
+async def hash_password_async(password: str) -> bytes:
+    return await _run_async("hash", _hash, password.encode("utf-8"), BCRYPT_ROUNDS)
+
+
+async def verify_password_async(password: str, stored_hash: bytes) -> bool:
+    return await _run_async("verify", _check, password.encode("utf-8"), stored_hash)
+
+
+def hash_rounds(stored_hash: bytes) -> int | None:
+    # bcrypt hashes look like b"$2b$12$<salt+digest>".
+    parts = stored_hash.split(b"$")
+    if len(parts) < 4 or not parts[2].isdigit():
+        return None
+    return int(parts[2])
+
+
+def needs_rehash(stored_hash: bytes) -> bool:
+    return hash_rounds(stored_hash) != BCRYPT_ROUNDS
@@ -0,0 +1,98 @@
+import os
+from dataclasses import dataclass, field
+
+from app.cache import Cache
+
+
+# Memberships and the admin flag change through the app (joins, kicks, set_admin, or
+# `python -m app.principal grant-admin|revoke-admin <user_id>`), which invalidates the
+# principal in every worker via the cache NOTIFY channel. The TTL only bounds edits
+# made by hand in the users table; follow those with invalidate_principal().
+PRINCIPAL_TTL_SECONDS = float(os.getenv("PRINCIPAL_TTL_SECONDS", "60"))
+PRINCIPAL_CACHE_SIZE = int(os.getenv("PRINCIPAL_CACHE_SIZE", "4096"))
+
+
+@dataclass(frozen=True)
+class Principal:
+    user_id: int
+    is_admin: bool
+    memberships: frozenset = field(default_factory=frozenset)
+
+    def is_member(self, campaign_id: int) -> bool:
+        return campaign_id in self.memberships
+
+
+PRINCIPAL_CACHE = Cache("principal", PRINCIPAL_TTL_SECONDS, maxsize=PRINCIPAL_CACHE_SIZE)
+
+
+def _load_principal(conn, user_id: int) -> Principal:
+    row = conn.execute(
+        """
+        SELECT
+            COALESCE(u.is_admin, FALSE),
+            COALESCE(
+                (SELECT array_agg(cm.campaign_id) FROM campaign_members cm WHERE cm.user_id = u.id),
+                '{}'
+            )
+        FROM users u
+        WHERE u.id = %s
+        """,
+        (user_id,)
+    ).fetchone()
+    if not row:
+        return Principal(user_id=user_id, is_admin=False)
+    return Principal(user_id=user_id, is_admin=bool(row[0]), memberships=frozenset(row[1] or []))
+
+
+def get_principal(conn, user_id: int, refresh: bool = False) -> Principal:
+    """Return the cached principal for a user, loading it with a single query when missing or stale."""
+    if not refresh:
+        return PRINCIPAL_CACHE.get(user_id, lambda: _load_principal(conn, user_id))
+    generation = PRINCIPAL_CACHE.generation()
+    principal = _load_principal(conn, user_id)
+    PRINCIPAL_CACHE.prime(user_id, principal, generation)
+    return principal
+
+
+def fetch_principal(user_id: int, connect) -> Principal:
+    """get_principal for callers without a connection: connect() is only opened on a cache miss."""
+    def _load():
+        with connect() as conn:
+            return _load_principal(conn, user_id)
+
+    return PRINCIPAL_CACHE.get(user_id, _load)
+
+
+def is_campaign_member(conn, user_id: int, campaign_id: int) -> bool:
+    principal = get_principal(conn, user_id)
+    if principal.is_member(campaign_id):
+        return True
+    # A miss may just mean the user joined after we cached them; confirm against the database.
+    return get_principal(conn, user_id, refresh=True).is_member(campaign_id)
+
+
+def invalidate_principal(conn, user_id: int | None = None) -> None:
+    """Drop a principal in every worker once conn's transaction commits (all of them when user_id is None).
+
+    Call it inside the transaction that changes the admin flag or memberships.
+    """
+    PRINCIPAL_CACHE.invalidate(conn, user_id)
+
+
+def set_admin(conn, user_id: int, is_admin: bool) -> None:
+    """Grant or revoke a user's admin flag; every worker drops their principal once conn commits."""
+    conn.execute("UPDATE users SET is_admin = %s WHERE id = %s", (is_admin, user_id))
+    invalidate_principal(conn, user_id)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    import psycopg
+
+    parser = argparse.ArgumentParser(description="Grant or revoke a user's admin flag.")
+    parser.add_argument("command", choices=["grant-admin", "revoke-admin"])
+    parser.add_argument("user_id", type=int)
+    args = parser.parse_args()
+    with psycopg.connect(os.environ["DATABASE_URL"]) as conn:
+        set_admin(conn, args.user_id, args.command == "grant-admin")
@@ -1,6 +1,9 @@
 from fastapi import APIRouter, Depends, Query
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel
 
+from app.analytics import service as analytics
 from app.auth import require_api_key
 from app.private import service
 
@@ -28,17 +31,22 @@ def campaign_details(campaign_id: int):
 def list_users(
     limit: int | None = Query(default=100, ge=1, le=365),
     offset: int | None = Query(default=0, ge=0, le=10000),
+    cursor: str | None = None,
 ):
-    return {"users": service.list_users(limit, offset)}
+    users = service.list_users(limit, offset, cursor)
+    return {"users": users, "next_cursor": service.next_cursor("users", users, limit)}
 
 @router.get("/users/stats")
 def user_campaign_stats(
     user_id: int | None = None,
     campaign_id: int | None = None,
     limit: int | None = Query(default=100, ge=1, le=365),
+    cursor: str | None = None,
 ):
+    stats = service.get_user_campaign_stats(user_id, campaign_id, limit, cursor)
     return {
-        "user_campaign_stats": service.get_user_campaign_stats(user_id, campaign_id, limit)
+        "user_campaign_stats": stats,
+        "next_cursor": service.next_cursor("user_campaign_stats", stats, limit),
     }
 
 @router.get("/users/daily-results")
@@ -48,9 +56,12 @@ def user_daily_results(
     date_from: str | None = None,
     date_to: str | None = None,
     limit: int | None = Query(default=100, ge=1, le=365),
+    cursor: str | None = None,
 ):
+    results = service.get_user_daily_results(user_id, campaign_id, date_from, date_to, limit, cursor)
     return {
-        "daily_results": service.get_user_daily_results(user_id, campaign_id, date_from, date_to, limit)
+        "daily_results": results,
+        "next_cursor": service.next_cursor("daily_results", results, limit),
     }
 
 @router.get("/users/accolades")
@@ -70,9 +81,12 @@ def user_accolade_events(
     date_from: str | None = None,
     date_to: str | None = None,
     limit: int | None = Query(default=100, ge=1, le=365),
+    cursor: str | None = None,
 ):
+    events = service.get_user_accolade_events(user_id, campaign_id, date_from, date_to, limit, cursor)
     return {
-        "user_accolade_events": service.get_user_accolade_events(user_id, campaign_id, date_from, date_to, limit)
+        "user_accolade_events": events,
+        "next_cursor": service.next_cursor("user_accolade_events", events, limit),
     }
 
 
@@ -89,9 +103,12 @@ def global_daily_stats(
     date_from: str | None = None,
     date_to: str | None = None,
     limit: int | None = Query(default=30, ge=1, le=365),
+    cursor: str | None = None,
 ):
+    stats = service.get_global_daily_stats(date_from, date_to, limit, cursor)
     return {
-        "daily_stats": service.get_global_daily_stats(date_from, date_to, limit)
+        "daily_stats": stats,
+        "next_cursor": service.next_cursor("global_daily_stats", stats, limit),
     }
 
 
@@ -140,10 +157,13 @@ def campaign_daily_stats(
     date_from: str | None = None,
     date_to: str | None = None,
     limit: int | None = Query(default=30, ge=1, le=365),
+    cursor: str | None = None,
 ):
+    stats = service.get_campaign_daily_stats(campaign_id, date_from, date_to, limit, cursor)
     return {
         "campaign_id": campaign_id,
-        "daily_stats": service.get_campaign_daily_stats(campaign_id, date_from, date_to, limit),
+        "daily_stats": stats,
+        "next_cursor": service.next_cursor("campaign_daily_stats", stats, limit),
     }
 
 @router.get("/stats/campaign/daily-troops")
@@ -153,10 +173,13 @@ def campaign_daily_troops(
     date_from: str | None = None,
     date_to: str | None = None,
     limit: int | None = Query(default=100, ge=1, le=365),
+    cursor: str | None = None,
 ):
+    troops = service.get_campaign_daily_troops(campaign_id, user_id, date_from, date_to, limit, cursor)
     return {
         "campaign_id": campaign_id,
-        "daily_troops": service.get_campaign_daily_troops(campaign_id, user_id, date_from, date_to, limit),
+        "daily_troops": troops,
+        "next_cursor": service.next_cursor("daily_troops", troops, limit),
     }
 
 
@@ -202,10 +225,13 @@ def campaign_guess_states(
     date_from: str | None = None,
     date_to: str | None = None,
     limit: int | None = Query(default=50, ge=1, le=365),
+    cursor: str | None = None,
 ):
+    states = service.get_campaign_guess_states(campaign_id, user_id, date_from, date_to, limit, cursor)
     return {
         "campaign_id": campaign_id,
-        "guess_states": service.get_campaign_guess_states(campaign_id, user_id, date_from, date_to, limit),
+        "guess_states": states,
+        "next_cursor": service.next_cursor("guess_states", states, limit),
     }
 
 @router.get("/campaign/first-guesses")
@@ -215,10 +241,13 @@ def campaign_first_guesses(
     date_from: str | None = None,
     date_to: str | None = None,
     limit: int | None = Query(default=100, ge=1, le=365),
+    cursor: str | None = None,
 ):
+    guesses = service.get_campaign_first_guesses(campaign_id, user_id, date_from, date_to, limit, cursor)
     return {
         "campaign_id": campaign_id,
-        "first_guesses": service.get_campaign_first_guesses(campaign_id, user_id, date_from, date_to, limit),
+        "first_guesses": guesses,
+        "next_cursor": service.next_cursor("first_guesses", guesses, limit),
     }
 
 @router.get("/campaign/shop/rotation")
@@ -228,10 +257,13 @@ def campaign_shop_rotation(
     date_from: str | None = None,
     date_to: str | None = None,
     limit: int | None = Query(default=100, ge=1, le=365),
+    cursor: str | None = None,
 ):
+    rotation = service.get_campaign_shop_rotation(campaign_id, user_id, date_from, date_to, limit, cursor)
     return {
         "campaign_id": campaign_id,
-        "shop_rotation": service.get_campaign_shop_rotation(campaign_id, user_id, date_from, date_to, limit),
+        "shop_rotation": rotation,
+        "next_cursor": service.next_cursor("shop_rotation", rotation, limit),
     }
 
 @router.get("/campaign/shop/log")
@@ -242,10 +274,13 @@ def campaign_shop_log(
     date_from: str | None = None,
     date_to: str | None = None,
     limit: int | None = Query(default=200, ge=1, le=365),
+    cursor: str | None = None,
 ):
+    log = service.get_campaign_shop_log(campaign_id, user_id, event_type, date_from, date_to, limit, cursor)
     return {
         "campaign_id": campaign_id,
-        "shop_log": service.get_campaign_shop_log(campaign_id, user_id, event_type, date_from, date_to, limit),
+        "shop_log": log,
+        "next_cursor": service.next_cursor("shop_log", log, limit),
     }
 
 @router.get("/campaign/item-events")
@@ -258,19 +293,23 @@ def campaign_item_events(
     date_from: str | None = None,
     date_to: str | None = None,
     limit: int | None = Query(default=200, ge=1, le=365),
+    cursor: str | None = None,
 ):
+    events = service.get_campaign_item_events(
+        campaign_id,
+        user_id,
+        target_user_id,
+        event_type,
+        item_key,
+        date_from,
+        date_to,
+        limit,
+        cursor,
+    )
     return {
         "campaign_id": campaign_id,
-        "item_events": service.get_campaign_item_events(
-            campaign_id,
-            user_id,
-            target_user_id,
-            event_type,
-            item_key,
-            date_from,
-            date_to,
-            limit,
-        ),
+        "item_events": events,
+        "next_cursor": service.next_cursor("item_events", events, limit),
     }
 
 
@@ -280,13 +319,81 @@ def campaign_recaps(
     date_from: str | None = None,
     date_to: str | None = None,
     limit: int | None = Query(default=30, ge=1, le=365),
+    cursor: str | None = None,
 ):
+    recaps = service.get_campaign_recaps(campaign_id, date_from, date_to, limit, cursor)
     return {
         "campaign_id": campaign_id,
-        "recaps": service.get_campaign_recaps(campaign_id, date_from, date_to, limit),
+        "recaps": recaps,
+        "next_cursor": service.next_cursor("recaps", recaps, limit),
     }
 
 
+@router.get("/export/{dataset}")
+def export_dataset(
+    dataset: str,
+    format: str = Query(default="ndjson", pattern="^(ndjson|csv)$"),
+    campaign_id: int | None = None,
+    user_id: int | None = None,
+    date_from: str | None = None,
+    date_to: str | None = None,
+):
+    media_type, chunks = service.export_dataset(dataset, format, campaign_id, user_id, date_from, date_to)
+    extension = "ndjson" if format == "ndjson" else "csv"
+    return StreamingResponse(
+        chunks,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{dataset}.{extension}"'},
+    )
+
+
+@router.get("/archive")
+def archived_partitions(dataset: str | None = None):
+    return {"archives": service.list_archived_partitions(dataset)}
+
+
+@router.get("/archive/{dataset}")
+def export_archived_dataset(
+    dataset: str,
+    month: str = Query(pattern=r"^\d{4}-\d{2}$"),
+    format: str = Query(default="ndjson", pattern="^(ndjson|csv)$"),
+    campaign_id: int | None = None,
+    user_id: int | None = None,
+):
+    media_type, chunks = service.export_archived_dataset(dataset, month, format, campaign_id, user_id)
+    extension = "ndjson" if format == "ndjson" else "csv"
+    return StreamingResponse(
+        chunks,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{dataset}-{month}.{extension}"'},
+    )
+
+
+@router.get("/stats/analytics/trends")
+def analytics_trends(
+    campaign_id: int | None = None,
+    months: int | None = Query(default=12, ge=1, le=36),
+):
+    return {"trends": analytics.get_monthly_trends(campaign_id, months)}
+
+
+@router.get("/stats/analytics/words")
+def analytics_word_difficulty(
+    limit: int | None = Query(default=50, ge=1, le=500),
+    min_attempts: int = Query(default=5, ge=1),
+    months: int | None = Query(default=12, ge=1, le=36),
+):
+    return {"words": analytics.get_word_difficulty(limit, min_attempts, months)}
+
+
+@router.get("/stats/analytics/items")
+def analytics_item_usage(
+    campaign_id: int | None = None,
+    months: int | None = Query(default=12, ge=1, le=36),
+):
+    return {"items": analytics.get_item_usage_trends(campaign_id, months)}
+
+
 @router.get("/stats/global/summary")
 def global_summary(
     daily_limit: int | None = Query(default=30, ge=1, le=365),
@@ -294,7 +401,8 @@ def global_summary(
     item_limit: int | None = Query(default=30, ge=1, le=365),
     accolade_limit: int | None = Query(default=30, ge=1, le=365),
 ):
-    return service.get_global_summary(daily_limit, word_limit, item_limit, accolade_limit)
+    summary, age, cache_status = service.get_global_summary_cached(daily_limit, word_limit, item_limit, accolade_limit)
+    return _with_cache_headers(summary, age, cache_status)
 
 
 @router.get("/stats/campaign/summary")
@@ -306,7 +414,7 @@ def campaign_summary(
     accolade_limit: int | None = Query(default=30, ge=1, le=365),
     recap_limit: int | None = Query(default=7, ge=1, le=365),
 ):
-    return service.get_campaign_summary(
+    summary, age, cache_status = service.get_campaign_summary_cached(
         campaign_id,
         daily_limit,
         word_limit,
@@ -314,6 +422,14 @@ def campaign_summary(
         accolade_limit,
         recap_limit,
     )
+    return _with_cache_headers(summary, age, cache_status)
+
+
+def _with_cache_headers(summary: dict, age: float, cache_status: str):
+    return JSONResponse(
+        content=jsonable_encoder(summary),
+        headers={"Age": str(int(age)), "X-Cache": cache_status},
+    )
 
 
 class AdjustBalancesRequest(BaseModel):
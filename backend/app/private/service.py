@@ -1,8 +1,18 @@
+import base64
+import csv
+import io
 import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 
 from fastapi import HTTPException
-from app.crud import get_db
+from app.crud import get_db, invalidate_leaderboard
+from app import partitions
+from app.dates import as_date, iso_date
 
 
 MAX_LIMIT = 365
@@ -33,22 +43,124 @@ def _clamp_offset(offset: Optional[int]) -> int:
     return min(offset, MAX_OFFSET)
 
 
+# Keyset orders per list endpoint: (column, direction, field in the shaped item).
+# Each order ends in a unique key so the cursor identifies exactly one row.
+KEYSET_ORDERS = {
+    "users": [("id", "ASC", "user_id")],
+    "user_campaign_stats": [("campaign_id", "DESC", "campaign_id"), ("user_id", "ASC", "user_id")],
+    "daily_results": [("date", "DESC", "date"), ("user_id", "ASC", "user_id"), ("campaign_id", "ASC", "campaign_id")],
+    "user_accolade_events": [
+        ("date", "DESC", "date"),
+        ("user_id", "ASC", "user_id"),
+        ("campaign_id", "ASC", "campaign_id"),
+        ("accolade_key", "ASC", "accolade_key"),
+    ],
+    "global_daily_stats": [("date", "DESC", "date")],
+    "campaign_daily_stats": [("date", "DESC", "date")],
+    "daily_troops": [("date", "DESC", "date"), ("user_id", "ASC", "user_id")],
+    "guess_states": [("date", "DESC", "date"), ("user_id", "ASC", "user_id")],
+    "first_guesses": [("date", "DESC", "date"), ("user_id", "ASC", "user_id")],
+    "shop_rotation": [("date", "DESC", "date"), ("user_id", "ASC", "user_id")],
+    "shop_log": [("id", "DESC", "id")],
+    "item_events": [("id", "DESC", "id")],
+    "recaps": [("date", "DESC", "date")],
+}
+
+
+def _encode_cursor(values: list) -> str:
+    raw = json.dumps(values, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _decode_cursor(cursor: str, size: int) -> list:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, UnicodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if not isinstance(values, list) or len(values) != size:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
+
+
+def _order_sql(order: list) -> str:
+    return ", ".join(f"{column} {direction}" for column, direction, _ in order)
+
+
+def _keyset_clause(order: list, cursor: Optional[str]) -> tuple[str, list]:
+    if not cursor:
+        return "", []
+    values = _decode_cursor(cursor, len(order))
+    directions = {direction for _, direction, _ in order}
+    if len(directions) == 1:
+        # Uniform direction: a row comparison lets Postgres seek straight into the index.
+        op = "<" if "DESC" in directions else ">"
+        columns = ", ".join(column for column, _, _ in order)
+        placeholders = ", ".join(["%s"] * len(order))
+        return f"({columns}) {op} ({placeholders})", list(values)
+    branches = []
+    params: list = []
+    for i, (column, direction, _) in enumerate(order):
+        parts = [f"{prev_column} = %s" for prev_column, _, _ in order[:i]]
+        parts.append(f"{column} {'<' if direction == 'DESC' else '>'} %s")
+        branches.append("(" + " AND ".join(parts) + ")")
+        params.extend(values[:i + 1])
+    return "(" + " OR ".join(branches) + ")", params
+
+
+def _apply_keyset(clauses: list, params: list, dataset: str, cursor: Optional[str]) -> None:
+    keyset_sql, keyset_params = _keyset_clause(KEYSET_ORDERS[dataset], cursor)
+    if keyset_sql:
+        clauses.append(keyset_sql)
+        params.extend(keyset_params)
+
+
+def next_cursor(dataset: str, items: list, limit: Optional[int]) -> Optional[str]:
+    if not items or len(items) < _clamp_limit(limit):
+        return None
+    return _encode_cursor([items[-1][field] for _, _, field in KEYSET_ORDERS[dataset]])
+
+
+def _check_date(value: str) -> str:
+    # Day columns are DATE now; a malformed bound would otherwise fail the cast as a 500.
+    try:
+        as_date(value)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Dates must be YYYY-MM-DD")
+    return value
+
+
 def _date_filters(date_from: Optional[str], date_to: Optional[str]) -> tuple[str, list]:
+    # Strings go through untyped, so the same bounds work on the DATE columns and on the
+    # TEXT partition keys of campaign_guesses / user_accolade_events.
     clauses = []
     params: list = []
     if date_from:
         clauses.append("date >= %s")
-        params.append(date_from)
+        params.append(_check_date(date_from))
     if date_to:
         clauses.append("date <= %s")
-        params.append(date_to)
+        params.append(_check_date(date_to))
     if not clauses:
         return "", params
     return " WHERE " + " AND ".join(clauses), params
 
 
+def _created_at_filters(date_from: Optional[str], date_to: Optional[str]) -> tuple[list, list]:
+    # Event tables only carry created_at; keep the range sargable instead of casting the column.
+    clauses = []
+    params: list = []
+    if date_from:
+        clauses.append("created_at >= %s::date")
+        params.append(_check_date(date_from))
+    if date_to:
+        clauses.append("created_at < %s::date + 1")
+        params.append(_check_date(date_to))
+    return clauses, params
+
+
 def list_campaigns():
-    with get_db() as conn:
+    with get_db(readonly=True) as conn:
         rows = conn.execute("""
             SELECT
                 c.id,
@@ -68,7 +180,7 @@ def list_campaigns():
         {
             "campaign_id": row[0],
             "name": row[1],
-            "start_date": row[2],
+            "start_date": iso_date(row[2]),
             "cycle_length": row[3],
             "is_admin_campaign": bool(row[4]),
             "member_count": row[5],
@@ -78,7 +190,7 @@ def list_campaigns():
 
 
 def get_campaign_details(campaign_id: int):
-    with get_db() as conn:
+    with get_db(readonly=True) as conn:
         row = conn.execute("""
             SELECT
                 id,
@@ -103,7 +215,7 @@ def get_campaign_details(campaign_id: int):
         "name": row[1],
         "owner_id": row[2],
         "invite_code": row[3],
-        "start_date": row[4],
+        "start_date": iso_date(row[4]),
         "cycle_length": row[5],
         "is_admin_campaign": bool(row[6]),
         "king": row[7],
@@ -114,11 +226,17 @@ def get_campaign_details(campaign_id: int):
     }
 
 
-def list_users(limit: Optional[int], offset: Optional[int]):
+def list_users(limit: Optional[int], offset: Optional[int], cursor: Optional[str] = None):
     limit = _clamp_limit(limit)
     offset = _clamp_offset(offset)
-    with get_db() as conn:
-        rows = conn.execute("""
+    clauses: list = []
+    params: list = []
+    _apply_keyset(clauses, params, "users", cursor)
+    where_sql = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    if cursor:
+        offset = 0
+    with get_db(readonly=True) as conn:
+        rows = conn.execute(f"""
             SELECT
                 id,
                 first_name,
@@ -135,9 +253,10 @@ def list_users(limit: Optional[int], offset: Optional[int]):
                 profile_image_thumb_url,
                 profile_image_thumb_key
             FROM users
-            ORDER BY id ASC
+            {where_sql}
+            ORDER BY {_order_sql(KEYSET_ORDERS["users"])}
             LIMIT %s OFFSET %s
-        """, (limit, offset)).fetchall()
+        """, (*params, limit, offset)).fetchall()
     return [
         {
             "user_id": row[0],
@@ -159,7 +278,12 @@ def list_users(limit: Optional[int], offset: Optional[int]):
     ]
 
 
-def get_user_campaign_stats(user_id: Optional[int], campaign_id: Optional[int], limit: Optional[int]):
+def get_user_campaign_stats(
+    user_id: Optional[int],
+    campaign_id: Optional[int],
+    limit: Optional[int],
+    cursor: Optional[str] = None,
+):
     limit = _clamp_limit(limit)
     clauses = []
     params: list = []
@@ -169,9 +293,10 @@ def get_user_campaign_stats(user_id: Optional[int], campaign_id: Optional[int],
     if campaign_id is not None:
         clauses.append("campaign_id = %s")
         params.append(campaign_id)
+    _apply_keyset(clauses, params, "user_campaign_stats", cursor)
     where_sql = f"WHERE {' AND '.join(clauses)}" if clauses else ""
     params.append(limit)
-    with get_db() as conn:
+    with get_db(readonly=True) as conn:
         rows = conn.execute(f"""
             SELECT
                 user_id,
@@ -189,7 +314,7 @@ def get_user_campaign_stats(user_id: Optional[int], campaign_id: Optional[int],
                 coins_earned_total
             FROM user_campaign_stats
             {where_sql}
-            ORDER BY campaign_id DESC, user_id ASC
+            ORDER BY {_order_sql(KEYSET_ORDERS["user_campaign_stats"])}
             LIMIT %s
         """, params).fetchall()
     return [
@@ -218,6 +343,7 @@ def get_user_daily_results(
     date_from: Optional[str],
     date_to: Optional[str],
     limit: Optional[int],
+    cursor: Optional[str] = None,
 ):
     limit = _clamp_limit(limit)
     clauses = []
@@ -232,9 +358,10 @@ def get_user_daily_results(
     if date_sql:
         clauses.append(date_sql.replace(" WHERE ", ""))
         params.extend(date_params)
+    _apply_keyset(clauses, params, "daily_results", cursor)
     where_sql = f"WHERE {' AND '.join(clauses)}" if clauses else ""
     params.append(limit)
-    with get_db() as conn:
+    with get_db(readonly=True) as conn:
         rows = conn.execute(f"""
             SELECT
                 user_id,
@@ -252,14 +379,14 @@ def get_user_daily_results(
                 completed_at
             FROM campaign_user_daily_results
             {where_sql}
-            ORDER BY date DESC, user_id ASC
+            ORDER BY {_order_sql(KEYSET_ORDERS["daily_results"])}
             LIMIT %s
         """, params).fetchall()
     return [
         {
             "user_id": row[0],
             "campaign_id": row[1],
-            "date": row[2],
+            "date": iso_date(row[2]),
             "word": row[3],
             "guesses_used": row[4],
             "solved": row[5],
@@ -287,7 +414,7 @@ def get_user_accolade_stats(user_id: Optional[int], campaign_id: Optional[int],
         params.append(campaign_id)
     where_sql = f"WHERE {' AND '.join(clauses)}" if clauses else ""
     params.append(limit)
-    with get_db() as conn:
+    with get_db(readonly=True) as conn:
         rows = conn.execute(f"""
             SELECT user_id, campaign_id, accolade_key, count, last_awarded_at
             FROM user_accolade_stats
@@ -313,6 +440,7 @@ def get_user_accolade_events(
     date_from: Optional[str],
     date_to: Optional[str],
     limit: Optional[int],
+    cursor: Optional[str] = None,
 ):
     limit = _clamp_limit(limit)
     clauses = []
@@ -327,14 +455,15 @@ def get_user_accolade_events(
     if date_sql:
         clauses.append(date_sql.replace(" WHERE ", ""))
         params.extend(date_params)
+    _apply_keyset(clauses, params, "user_accolade_events", cursor)
     where_sql = f"WHERE {' AND '.join(clauses)}" if clauses else ""
     params.append(limit)
-    with get_db() as conn:
+    with get_db(readonly=True) as conn:
         rows = conn.execute(f"""
             SELECT user_id, campaign_id, accolade_key, date, created_at
             FROM user_accolade_events
             {where_sql}
-            ORDER BY date DESC, user_id ASC
+            ORDER BY {_order_sql(KEYSET_ORDERS["user_accolade_events"])}
             LIMIT %s
         """, params).fetchall()
     return [
@@ -342,7 +471,7 @@ def get_user_accolade_events(
             "user_id": row[0],
             "campaign_id": row[1],
             "accolade_key": row[2],
-            "date": row[3],
+            "date": iso_date(row[3]),
             "created_at": row[4],
         }
         for row in rows
@@ -350,7 +479,7 @@ def get_user_accolade_events(
 
 
 def list_campaign_members(campaign_id: int):
-    with get_db() as conn:
+    with get_db(readonly=True) as conn:
         campaign_row = conn.execute(
             "SELECT owner_id FROM campaigns WHERE id = %s",
             (campaign_id,)
@@ -395,11 +524,14 @@ def list_campaign_members(campaign_id: int):
     ]
 
 
-def get_global_daily_stats(date_from: Optional[str], date_to: Optional[str], limit: Optional[int]):
-    where_sql, params = _date_filters(date_from, date_to)
+def get_global_daily_stats(date_from: Optional[str], date_to: Optional[str], limit: Optional[int], cursor: Optional[str] = None):
+    date_sql, params = _date_filters(date_from, date_to)
+    clauses = [date_sql.replace(" WHERE ", "")] if date_sql else []
+    _apply_keyset(clauses, params, "global_daily_stats", cursor)
+    where_sql = f"WHERE {' AND '.join(clauses)}" if clauses else ""
     limit = _clamp_limit(limit)
     params.append(limit)
-    with get_db() as conn:
+    with get_db(readonly=True) as conn:
         rows = conn.execute(f"""
             SELECT
                 date,
@@ -414,12 +546,12 @@ def get_global_daily_stats(date_from: Optional[str], date_to: Optional[str], lim
                 guess_6
             FROM global_daily_stats
             {where_sql}
-            ORDER BY date DESC
+            ORDER BY {_order_sql(KEYSET_ORDERS["global_daily_stats"])}
             LIMIT %s
         """, params).fetchall()
     return [
         {
-            "date": row[0],
+            "date": iso_date(row[0]),
             "total_campaigns_completed": row[1],
             "total_players": row[2],
             "total_guesses": row[3],
@@ -438,7 +570,7 @@ def get_global_word_stats(limit: Optional[int], order_by: str = "attempts"):
     allowed = {"attempts", "solves", "fails", "last_seen"}
     order_by = order_by if order_by in allowed else "attempts"
     limit = _clamp_limit(limit)
-    with get_db() as conn:
+    with get_db(readonly=True) as conn:
         rows = conn.execute(f"""
             SELECT word, attempts, solves, fails, first_seen, last_seen
             FROM global_word_stats
@@ -462,7 +594,7 @@ def get_global_item_stats(limit: Optional[int], order_by: str = "uses"):
     allowed = {"uses", "targets", "last_used_at"}
     order_by = order_by if order_by in allowed else "uses"
     limit = _clamp_limit(limit)
-    with get_db() as conn:
+    with get_db(readonly=True) as conn:
         rows = conn.execute(f"""
             SELECT item_key, uses, targets, last_used_at
             FROM global_item_stats
@@ -482,7 +614,7 @@ def get_global_item_stats(limit: Optional[int], order_by: str = "uses"):
 
 def get_global_accolade_stats(limit: Optional[int]):
     limit = _clamp_limit(limit)
-    with get_db() as conn:
+    with get_db(readonly=True) as conn:
         rows = conn.execute("""
             SELECT accolade_key, count, last_awarded_at
             FROM global_accolade_stats
@@ -501,13 +633,13 @@ def get_global_accolade_stats(limit: Optional[int]):
 
 def get_global_high_scores(limit: Optional[int]):
     limit = _clamp_limit(limit)
-    with get_db() as conn:
+    with get_db(readonly=True) as conn:
         rows = conn.execute("""
             SELECT
                 ended_on,
                 user_id,
                 troops,
-                display_name,
+                player_name,
                 campaign_id,
                 campaign_name,
                 campaign_length
@@ -530,7 +662,7 @@ def get_global_high_scores(limit: Optional[int]):
 
 
 def get_global_streak_stats():
-    with get_db() as conn:
+    with get_db(readonly=True) as conn:
         row = conn.execute("""
             SELECT id, highest_streak, user_id, campaign_id, updated_at
             FROM global_streak_stats
@@ -549,7 +681,7 @@ def get_global_streak_stats():
 
 def get_global_user_streaks(limit: Optional[int]):
     limit = _clamp_limit(limit)
-    with get_db() as conn:
+    with get_db(readonly=True) as conn:
         rows = conn.execute("""
             SELECT user_id, highest_streak, updated_at
             FROM global_user_streaks
@@ -566,11 +698,24 @@ def get_global_user_streaks(limit: Optional[int]):
     ]
 
 
-def get_campaign_daily_stats(campaign_id: int, date_from: Optional[str], date_to: Optional[str], limit: Optional[int]):
-    where_sql, params = _date_filters(date_from, date_to)
+def get_campaign_daily_stats(
+    campaign_id: int,
+    date_from: Optional[str],
+    date_to: Optional[str],
+    limit: Optional[int],
+    cursor: Optional[str] = None,
+):
     limit = _clamp_limit(limit)
-    params = [campaign_id] + params + [limit]
-    with get_db() as conn:
+    clauses = ["campaign_id = %s"]
+    params: list = [campaign_id]
+    date_sql, date_params = _date_filters(date_from, date_to)
+    if date_sql:
+        clauses.append(date_sql.replace(" WHERE ", ""))
+        params.extend(date_params)
+    _apply_keyset(clauses, params, "campaign_daily_stats", cursor)
+    where_sql = f"WHERE {' AND '.join(clauses)}"
+    params.append(limit)
+    with get_db(readonly=True) as conn:
         rows = conn.execute(f"""
             SELECT
                 date,
@@ -588,14 +733,13 @@ def get_campaign_daily_stats(campaign_id: int, date_from: Optional[str], date_to
                 hardest_word,
                 easiest_word
             FROM campaign_daily_stats
-            WHERE campaign_id = %s
-            {where_sql.replace(" WHERE ", " AND ")}
-            ORDER BY date DESC
+            {where_sql}
+            ORDER BY {_order_sql(KEYSET_ORDERS["campaign_daily_stats"])}
             LIMIT %s
         """, params).fetchall()
     return [
         {
-            "date": row[0],
+            "date": iso_date(row[0]),
             "total_troops": row[1],
             "avg_troops_per_player": row[2],
             "highest_troops": row[3],
@@ -620,6 +764,7 @@ def get_campaign_daily_troops(
     date_from: Optional[str],
     date_to: Optional[str],
     limit: Optional[int],
+    cursor: Optional[str] = None,
 ):
     limit = _clamp_limit(limit)
     clauses = ["campaign_id = %s"]
@@ -631,21 +776,22 @@ def get_campaign_daily_troops(
     if date_sql:
         clauses.append(date_sql.replace(" WHERE ", ""))
         params.extend(date_params)
+    _apply_keyset(clauses, params, "daily_troops", cursor)
     where_sql = f"WHERE {' AND '.join(clauses)}"
     params.append(limit)
-    with get_db() as conn:
+    with get_db(readonly=True) as conn:
         rows = conn.execute(f"""
             SELECT user_id, campaign_id, date, troops
             FROM campaign_daily_troops
             {where_sql}
-            ORDER BY date DESC, user_id ASC
+            ORDER BY {_order_sql(KEYSET_ORDERS["daily_troops"])}
             LIMIT %s
         """, params).fetchall()
     return [
         {
             "user_id": row[0],
             "campaign_id": row[1],
-            "date": row[2],
+            "date": iso_date(row[2]),
             "troops": row[3],
         }
         for row in rows
@@ -658,7 +804,7 @@ def get_campaign_word_stats(campaign_id: int, date_from: Optional[str], date_to:
     where_sql, params = _date_filters(date_from, date_to)
     limit = _clamp_limit(limit)
     params = [campaign_id] + params + [limit]
-    with get_db() as conn:
+    with get_db(readonly=True) as conn:
         rows = conn.execute(f"""
             SELECT date, word, solved_count, failed_count
             FROM campaign_daily_word_stats
@@ -669,7 +815,7 @@ def get_campaign_word_stats(campaign_id: int, date_from: Optional[str], date_to:
         """, params).fetchall()
     return [
         {
-            "date": row[0],
+            "date": iso_date(row[0]),
             "word": row[1],
             "solved_count": row[2],
             "failed_count": row[3],
@@ -680,7 +826,7 @@ def get_campaign_word_stats(campaign_id: int, date_from: Optional[str], date_to:
 
 def get_campaign_accolade_stats(campaign_id: int, limit: Optional[int]):
     limit = _clamp_limit(limit)
-    with get_db() as conn:
+    with get_db(readonly=True) as conn:
         rows = conn.execute("""
             SELECT accolade_key, count, last_awarded_at
             FROM campaign_accolade_stats
@@ -704,6 +850,7 @@ def get_campaign_guess_states(
     date_from: Optional[str],
     date_to: Optional[str],
     limit: Optional[int],
+    cursor: Optional[str] = None,
 ):
     limit = _clamp_limit(limit)
     clauses = ["campaign_id = %s"]
@@ -715,21 +862,22 @@ def get_campaign_guess_states(
     if date_sql:
         clauses.append(date_sql.replace(" WHERE ", ""))
         params.extend(date_params)
+    _apply_keyset(clauses, params, "guess_states", cursor)
     where_sql = f"WHERE {' AND '.join(clauses)}"
     params.append(limit)
-    with get_db() as conn:
+    with get_db(readonly=True) as conn:
         rows = conn.execute(f"""
             SELECT user_id, campaign_id, date, guesses, results, letter_status, current_row, game_over
             FROM campaign_guess_states
             {where_sql}
-            ORDER BY date DESC, user_id ASC
+            ORDER BY {_order_sql(KEYSET_ORDERS["guess_states"])}
             LIMIT %s
         """, params).fetchall()
     return [
         {
             "user_id": row[0],
             "campaign_id": row[1],
-            "date": row[2],
+            "date": iso_date(row[2]),
             "guesses": row[3],
             "results": row[4],
             "letter_status": row[5],
@@ -746,6 +894,7 @@ def get_campaign_first_guesses(
     date_from: Optional[str],
     date_to: Optional[str],
     limit: Optional[int],
+    cursor: Optional[str] = None,
 ):
     limit = _clamp_limit(limit)
     clauses = ["campaign_id = %s"]
@@ -757,21 +906,22 @@ def get_campaign_first_guesses(
     if date_sql:
         clauses.append(date_sql.replace(" WHERE ", ""))
         params.extend(date_params)
+    _apply_keyset(clauses, params, "first_guesses", cursor)
     where_sql = f"WHERE {' AND '.join(clauses)}"
     params.append(limit)
-    with get_db() as conn:
+    with get_db(readonly=True) as conn:
         rows = conn.execute(f"""
             SELECT user_id, campaign_id, date, word
             FROM campaign_first_guesses
             {where_sql}
-            ORDER BY date DESC, user_id ASC
+            ORDER BY {_order_sql(KEYSET_ORDERS["first_guesses"])}
             LIMIT %s
         """, params).fetchall()
     return [
         {
             "user_id": row[0],
             "campaign_id": row[1],
-            "date": row[2],
+            "date": iso_date(row[2]),
             "word": row[3],
         }
         for row in rows
@@ -780,14 +930,14 @@ def get_campaign_first_guesses(
 
 def get_campaign_item_usage(campaign_id: int, limit: Optional[int]):
     limit = _clamp_limit(limit)
-    with get_db() as conn:
+    with get_db(readonly=True) as conn:
         rows = conn.execute("""
             SELECT
                 item_key,
-                COUNT(*) AS uses,
-                SUM(CASE WHEN target_user_id IS NOT NULL THEN 1 ELSE 0 END) AS targets,
-                MAX(created_at) AS last_used_at
-            FROM campaign_item_events
+                SUM(uses) AS uses,
+                SUM(targeted) AS targets,
+                MAX(last_used_at) AS last_used_at
+            FROM campaign_item_use_totals
             WHERE campaign_id = %s
             GROUP BY item_key
             ORDER BY uses DESC, item_key ASC
@@ -810,6 +960,7 @@ def get_campaign_shop_rotation(
     date_from: Optional[str],
     date_to: Optional[str],
     limit: Optional[int],
+    cursor: Optional[str] = None,
 ):
     limit = _clamp_limit(limit)
     clauses = ["campaign_id = %s"]
@@ -821,21 +972,22 @@ def get_campaign_shop_rotation(
     if date_sql:
         clauses.append(date_sql.replace(" WHERE ", ""))
         params.extend(date_params)
+    _apply_keyset(clauses, params, "shop_rotation", cursor)
     where_sql = f"WHERE {' AND '.join(clauses)}"
     params.append(limit)
-    with get_db() as conn:
+    with get_db(readonly=True) as conn:
         rows = conn.execute(f"""
             SELECT user_id, campaign_id, date, items, reshuffles, updated_at
             FROM campaign_shop_rotation
             {where_sql}
-            ORDER BY date DESC, user_id ASC
+            ORDER BY {_order_sql(KEYSET_ORDERS["shop_rotation"])}
             LIMIT %s
         """, params).fetchall()
     return [
         {
             "user_id": row[0],
             "campaign_id": row[1],
-            "date": row[2],
+            "date": iso_date(row[2]),
             "items": row[3],
             "reshuffles": row[4],
             "updated_at": row[5],
@@ -851,6 +1003,7 @@ def get_campaign_shop_log(
     date_from: Optional[str],
     date_to: Optional[str],
     limit: Optional[int],
+    cursor: Optional[str] = None,
 ):
     limit = _clamp_limit(limit)
     clauses = ["campaign_id = %s"]
@@ -861,18 +1014,18 @@ def get_campaign_shop_log(
     if event_type:
         clauses.append("event_type = %s")
         params.append(event_type)
-    date_sql, date_params = _date_filters(date_from, date_to)
-    if date_sql:
-        clauses.append(date_sql.replace(" WHERE ", ""))
-        params.extend(date_params)
+    date_clauses, date_params = _created_at_filters(date_from, date_to)
+    clauses.extend(date_clauses)
+    params.extend(date_params)
+    _apply_keyset(clauses, params, "shop_log", cursor)
     where_sql = f"WHERE {' AND '.join(clauses)}"
     params.append(limit)
-    with get_db() as conn:
+    with get_db(readonly=True) as conn:
         rows = conn.execute(f"""
             SELECT id, user_id, campaign_id, event_type, item_key, details, created_at
             FROM campaign_shop_log
             {where_sql}
-            ORDER BY created_at DESC, id DESC
+            ORDER BY {_order_sql(KEYSET_ORDERS["shop_log"])}
             LIMIT %s
         """, params).fetchall()
     return [
@@ -898,6 +1051,7 @@ def get_campaign_item_events(
     date_from: Optional[str],
     date_to: Optional[str],
     limit: Optional[int],
+    cursor: Optional[str] = None,
 ):
     limit = _clamp_limit(limit)
     clauses = ["campaign_id = %s"]
@@ -914,18 +1068,18 @@ def get_campaign_item_events(
     if item_key:
         clauses.append("item_key = %s")
         params.append(item_key)
-    date_sql, date_params = _date_filters(date_from, date_to)
-    if date_sql:
-        clauses.append(date_sql.replace(" WHERE ", ""))
-        params.extend(date_params)
+    date_clauses, date_params = _created_at_filters(date_from, date_to)
+    clauses.extend(date_clauses)
+    params.extend(date_params)
+    _apply_keyset(clauses, params, "item_events", cursor)
     where_sql = f"WHERE {' AND '.join(clauses)}"
     params.append(limit)
-    with get_db() as conn:
+    with get_db(readonly=True) as conn:
         rows = conn.execute(f"""
             SELECT id, user_id, campaign_id, item_key, target_user_id, event_type, details, created_at
             FROM campaign_item_events
             {where_sql}
-            ORDER BY created_at DESC, id DESC
+            ORDER BY {_order_sql(KEYSET_ORDERS["item_events"])}
             LIMIT %s
         """, params).fetchall()
     return [
@@ -943,22 +1097,34 @@ def get_campaign_item_events(
     ]
 
 
-def get_campaign_recaps(campaign_id: int, date_from: Optional[str], date_to: Optional[str], limit: Optional[int]):
-    where_sql, params = _date_filters(date_from, date_to)
+def get_campaign_recaps(
+    campaign_id: int,
+    date_from: Optional[str],
+    date_to: Optional[str],
+    limit: Optional[int],
+    cursor: Optional[str] = None,
+):
     limit = _clamp_limit(limit)
-    params = [campaign_id] + params + [limit]
-    with get_db() as conn:
+    clauses = ["campaign_id = %s"]
+    params: list = [campaign_id]
+    date_sql, date_params = _date_filters(date_from, date_to)
+    if date_sql:
+        clauses.append(date_sql.replace(" WHERE ", ""))
+        params.extend(date_params)
+    _apply_keyset(clauses, params, "recaps", cursor)
+    where_sql = f"WHERE {' AND '.join(clauses)}"
+    params.append(limit)
+    with get_db(readonly=True) as conn:
         rows = conn.execute(f"""
             SELECT date, summary, highlights, created_at
             FROM campaign_daily_recaps
-            WHERE campaign_id = %s
-            {where_sql.replace(" WHERE ", " AND ")}
-            ORDER BY date DESC
+            {where_sql}
+            ORDER BY {_order_sql(KEYSET_ORDERS["recaps"])}
             LIMIT %s
         """, params).fetchall()
     return [
         {
-            "date": row[0],
+            "date": iso_date(row[0]),
             "summary": row[1],
             "highlights": row[2],
             "created_at": row[3],
@@ -967,18 +1133,323 @@ def get_campaign_recaps(campaign_id: int, date_from: Optional[str], date_to: Opt
     ]
 
 
+EXPORT_BATCH_SIZE = 5000
+EXPORT_FLUSH_ROWS = 1000
+
+# Streamable datasets: table, exported columns, filterable columns and the date filter style.
+# Exports stream in primary-key-ish order where an index serves it; campaign_guesses has no
+# unique ordering column, so it streams in storage order rather than sorting millions of rows.
+EXPORT_DATASETS = {
+    "guesses": {
+        "table": "campaign_guesses",
+        "columns": ["user_id", "campaign_id", "date", "word"],
+        "order": None,
+        "date_filter": "date",
+    },
+    "guess_states": {
+        "table": "campaign_guess_states",
+        "columns": ["user_id", "campaign_id", "date", "guesses", "results", "letter_status", "current_row", "game_over"],
+        "order": KEYSET_ORDERS["guess_states"],
+        "date_filter": "date",
+    },
+    "daily_results": {
+        "table": "campaign_user_daily_results",
+        "columns": [
+            "user_id", "campaign_id", "date", "word", "guesses_used", "solved", "first_guess_word",
+            "used_double_down", "double_down_success", "double_down_bonus_troops", "troops_earned",
+            "coins_earned", "completed_at",
+        ],
+        "order": KEYSET_ORDERS["daily_results"],
+        "date_filter": "date",
+    },
+    "first_guesses": {
+        "table": "campaign_first_guesses",
+        "columns": ["user_id", "campaign_id", "date", "word"],
+        "order": KEYSET_ORDERS["first_guesses"],
+        "date_filter": "date",
+    },
+    "daily_troops": {
+        "table": "campaign_daily_troops",
+        "columns": ["user_id", "campaign_id", "date", "troops"],
+        "order": KEYSET_ORDERS["daily_troops"],
+        "date_filter": "date",
+    },
+    "shop_rotation": {
+        "table": "campaign_shop_rotation",
+        "columns": ["user_id", "campaign_id", "date", "items", "reshuffles", "updated_at"],
+        "order": KEYSET_ORDERS["shop_rotation"],
+        "date_filter": "date",
+    },
+    "shop_log": {
+        "table": "campaign_shop_log",
+        "columns": ["id", "user_id", "campaign_id", "event_type", "item_key", "details", "created_at"],
+        "order": KEYSET_ORDERS["shop_log"],
+        "date_filter": "created_at",
+    },
+    "item_events": {
+        "table": "campaign_item_events",
+        "columns": ["id", "user_id", "campaign_id", "item_key", "target_user_id", "event_type", "details", "created_at"],
+        "order": KEYSET_ORDERS["item_events"],
+        "date_filter": "created_at",
+    },
+    "accolade_events": {
+        "table": "user_accolade_events",
+        "columns": ["user_id", "campaign_id", "accolade_key", "date", "created_at"],
+        "order": KEYSET_ORDERS["user_accolade_events"],
+        "date_filter": "date",
+    },
+}
+
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+def _export_query(dataset: str, campaign_id: Optional[int], user_id: Optional[int], date_from: Optional[str], date_to: Optional[str]):
+    spec = EXPORT_DATASETS[dataset]
+    clauses = []
+    params: list = []
+    if campaign_id is not None:
+        clauses.append("campaign_id = %s")
+        params.append(campaign_id)
+    if user_id is not None:
+        clauses.append("user_id = %s")
+        params.append(user_id)
+    if spec["date_filter"] == "created_at":
+        date_clauses, date_params = _created_at_filters(date_from, date_to)
+        clauses.extend(date_clauses)
+        params.extend(date_params)
+    else:
+        date_sql, date_params = _date_filters(date_from, date_to)
+        if date_sql:
+            clauses.append(date_sql.replace(" WHERE ", ""))
+            params.extend(date_params)
+    where_sql = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    order_sql = f"ORDER BY {_order_sql(spec['order'])}" if spec["order"] else ""
+    sql = f"""
+        SELECT {", ".join(spec["columns"])}
+        FROM {spec["table"]}
+        {where_sql}
+        {order_sql}
+    """
+    return sql, params
+
+
+def _iter_export_rows(sql: str, params: list, cursor_name: str):
+    with get_db(readonly=True) as conn:
+        # Named cursor = server-side cursor: rows arrive EXPORT_BATCH_SIZE at a time.
+        with conn.cursor(name=cursor_name) as cur:
+            cur.itersize = EXPORT_BATCH_SIZE
+            cur.execute(sql, params)
+            yield from cur
+
+
+def _json_default(value):
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return str(value)
+
+
+def _csv_value(value):
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return value
+
+
+def _ndjson_chunks(columns: list, rows):
+    lines = []
+    for row in rows:
+        lines.append(json.dumps(dict(zip(columns, row)), default=_json_default))
+        if len(lines) >= EXPORT_FLUSH_ROWS:
+            yield "\n".join(lines) + "\n"
+            lines = []
+    if lines:
+        yield "\n".join(lines) + "\n"
+
+
+def _csv_chunks(columns: list, rows):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    pending = 0
+    for row in rows:
+        writer.writerow([_csv_value(value) for value in row])
+        pending += 1
+        if pending >= EXPORT_FLUSH_ROWS:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate(0)
+            pending = 0
+    yield buffer.getvalue()
+
+
+def export_dataset(
+    dataset: str,
+    export_format: str,
+    campaign_id: Optional[int],
+    user_id: Optional[int],
+    date_from: Optional[str],
+    date_to: Optional[str],
+):
+    if dataset not in EXPORT_DATASETS:
+        raise HTTPException(status_code=404, detail="Unknown export dataset")
+    if export_format not in EXPORT_MEDIA_TYPES:
+        raise HTTPException(status_code=400, detail="Unsupported export format")
+    sql, params = _export_query(dataset, campaign_id, user_id, date_from, date_to)
+    columns = EXPORT_DATASETS[dataset]["columns"]
+    rows = _iter_export_rows(sql, params, f"private_export_{dataset}")
+    chunks = _ndjson_chunks(columns, rows) if export_format == "ndjson" else _csv_chunks(columns, rows)
+    return EXPORT_MEDIA_TYPES[export_format], chunks
+
+
+def list_archived_partitions(dataset: Optional[str]):
+    clauses = []
+    params: list = []
+    if dataset is not None:
+        table = partitions.table_for_dataset(dataset)
+        if table is None:
+            raise HTTPException(status_code=404, detail="Unknown archive dataset")
+        clauses.append("table_name = %s")
+        params.append(table)
+    where_sql = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    with get_db(readonly=True) as conn:
+        rows = conn.execute(f"""
+            SELECT table_name, month, row_count, bytes, archived_at
+            FROM archived_partitions
+            {where_sql}
+            ORDER BY table_name ASC, month DESC
+        """, params).fetchall()
+    return [
+        {
+            "dataset": partitions.PARTITIONED_TABLES.get(table_name, {}).get("dataset", table_name),
+            "table_name": table_name,
+            "month": month,
+            "row_count": row_count,
+            "bytes": size,
+            "archived_at": archived_at,
+        }
+        for table_name, month, row_count, size, archived_at in rows
+    ]
+
+
+def _filter_archived_rows(columns: list, rows, campaign_id: Optional[int], user_id: Optional[int]):
+    filters = []
+    if campaign_id is not None:
+        filters.append((columns.index("campaign_id"), str(campaign_id)))
+    if user_id is not None:
+        filters.append((columns.index("user_id"), str(user_id)))
+    for row in rows:
+        if all(row[index] == value for index, value in filters):
+            yield row
+
+
+def export_archived_dataset(
+    dataset: str,
+    month: str,
+    export_format: str,
+    campaign_id: Optional[int],
+    user_id: Optional[int],
+):
+    """Stream one archived month back out in the same formats as export_dataset."""
+    table = partitions.table_for_dataset(dataset)
+    if table is None:
+        raise HTTPException(status_code=404, detail="Unknown archive dataset")
+    if export_format not in EXPORT_MEDIA_TYPES:
+        raise HTTPException(status_code=400, detail="Unsupported export format")
+    with get_db(readonly=True) as conn:
+        row = conn.execute(
+            "SELECT path FROM archived_partitions WHERE table_name = %s AND month = %s",
+            (table, month),
+        ).fetchone()
+    if not row:
+        raise HTTPException(status_code=404, detail="Month is not archived")
+    if not os.path.exists(row[0]):
+        raise HTTPException(status_code=410, detail="Archive file is missing")
+    columns, rows = partitions.read_archive(row[0])
+    rows = _filter_archived_rows(columns, rows, campaign_id, user_id)
+    chunks = _ndjson_chunks(columns, rows) if export_format == "ndjson" else _csv_chunks(columns, rows)
+    return EXPORT_MEDIA_TYPES[export_format], chunks
+
+
+SUMMARY_WORKERS = int(os.getenv("PRIVATE_SUMMARY_WORKERS", "5"))
+SUMMARY_CACHE_TTL_SECONDS = float(os.getenv("PRIVATE_SUMMARY_CACHE_TTL_SECONDS", "30"))
+# How long past the TTL a cached summary may still be served while a refresh runs in the background.
+SUMMARY_STALE_SECONDS = float(os.getenv("PRIVATE_SUMMARY_STALE_SECONDS", "120"))
+# Keys include caller-chosen limits and campaign ids, so the cache is an LRU capped at this many.
+SUMMARY_CACHE_SIZE = int(os.getenv("PRIVATE_SUMMARY_CACHE_SIZE", "256"))
+
+_summary_executor = ThreadPoolExecutor(max_workers=SUMMARY_WORKERS, thread_name_prefix="private-summary")
+# Background refreshes get their own worker so they never queue behind the sub-queries they submit.
+_summary_refresh_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="private-summary-refresh")
+_summary_cache: "OrderedDict[tuple, tuple[float, dict]]" = OrderedDict()
+_summary_refreshing: set = set()
+_summary_cache_lock = threading.Lock()
+
+
+def _run_concurrently(tasks: dict) -> dict:
+    futures = {name: _summary_executor.submit(fn, *args) for name, (fn, args) in tasks.items()}
+    return {name: future.result() for name, future in futures.items()}
+
+
+def _store_summary(key: tuple, value: dict) -> None:
+    with _summary_cache_lock:
+        _summary_cache[key] = (time.monotonic(), value)
+        _summary_cache.move_to_end(key)
+        while len(_summary_cache) > SUMMARY_CACHE_SIZE:
+            _summary_cache.popitem(last=False)
+
+
+def _refresh_summary(key: tuple, builder) -> None:
+    try:
+        _store_summary(key, builder())
+    finally:
+        with _summary_cache_lock:
+            _summary_refreshing.discard(key)
+
+
+def _cached_summary(key: tuple, builder) -> tuple[dict, float, str]:
+    """Return (summary, age in seconds, cache status) with stale-while-revalidate semantics."""
+    now = time.monotonic()
+    with _summary_cache_lock:
+        entry = _summary_cache.get(key)
+        if entry:
+            built_at, value = entry
+            age = now - built_at
+            if age < SUMMARY_CACHE_TTL_SECONDS:
+                _summary_cache.move_to_end(key)
+                return value, age, "HIT"
+            if age < SUMMARY_CACHE_TTL_SECONDS + SUMMARY_STALE_SECONDS:
+                _summary_cache.move_to_end(key)
+                if key not in _summary_refreshing:
+                    _summary_refreshing.add(key)
+                    _summary_refresh_executor.submit(_refresh_summary, key, builder)
+                return value, age, "STALE"
+            del _summary_cache[key]
+    value = builder()
+    _store_summary(key, value)
+    return value, 0.0, "MISS"
+
+
+def clear_summary_cache() -> None:
+    with _summary_cache_lock:
+        _summary_cache.clear()
+
+
 def get_global_summary(
     daily_limit: Optional[int],
     word_limit: Optional[int],
     item_limit: Optional[int],
     accolade_limit: Optional[int],
 ):
-    return {
-        "daily_stats": get_global_daily_stats(None, None, daily_limit),
-        "word_stats": get_global_word_stats(word_limit, "attempts"),
-        "item_stats": get_global_item_stats(item_limit, "uses"),
-        "accolade_stats": get_global_accolade_stats(accolade_limit),
-    }
+    return _run_concurrently({
+        "daily_stats": (get_global_daily_stats, (None, None, daily_limit)),
+        "word_stats": (get_global_word_stats, (word_limit, "attempts")),
+        "item_stats": (get_global_item_stats, (item_limit, "uses")),
+        "accolade_stats": (get_global_accolade_stats, (accolade_limit,)),
+    })
 
 
 def get_campaign_summary(
@@ -989,14 +1460,42 @@ def get_campaign_summary(
     accolade_limit: Optional[int],
     recap_limit: Optional[int],
 ):
-    return {
-        "campaign_id": campaign_id,
-        "daily_stats": get_campaign_daily_stats(campaign_id, None, None, daily_limit),
-        "word_stats": get_campaign_word_stats(campaign_id, None, None, word_limit, "solved_count"),
-        "item_stats": get_campaign_item_usage(campaign_id, item_limit),
-        "accolade_stats": get_campaign_accolade_stats(campaign_id, accolade_limit),
-        "recaps": get_campaign_recaps(campaign_id, None, None, recap_limit),
-    }
+    sections = _run_concurrently({
+        "daily_stats": (get_campaign_daily_stats, (campaign_id, None, None, daily_limit)),
+        "word_stats": (get_campaign_word_stats, (campaign_id, None, None, word_limit, "solved_count")),
+        "item_stats": (get_campaign_item_usage, (campaign_id, item_limit)),
+        "accolade_stats": (get_campaign_accolade_stats, (campaign_id, accolade_limit)),
+        "recaps": (get_campaign_recaps, (campaign_id, None, None, recap_limit)),
+    })
+    return {"campaign_id": campaign_id, **sections}
+
+
+def get_global_summary_cached(
+    daily_limit: Optional[int],
+    word_limit: Optional[int],
+    item_limit: Optional[int],
+    accolade_limit: Optional[int],
+):
+    key = ("global", daily_limit, word_limit, item_limit, accolade_limit)
+    return _cached_summary(
+        key,
+        lambda: get_global_summary(daily_limit, word_limit, item_limit, accolade_limit),
+    )
+
+
+def get_campaign_summary_cached(
+    campaign_id: int,
+    daily_limit: Optional[int],
+    word_limit: Optional[int],
+    item_limit: Optional[int],
+    accolade_limit: Optional[int],
+    recap_limit: Optional[int],
+):
+    key = ("campaign", campaign_id, daily_limit, word_limit, item_limit, accolade_limit, recap_limit)
+    return _cached_summary(
+        key,
+        lambda: get_campaign_summary(campaign_id, daily_limit, word_limit, item_limit, accolade_limit, recap_limit),
+    )
 
 
 def adjust_campaign_balances(
@@ -1061,6 +1560,7 @@ def adjust_campaign_balances(
                     SET score = %s
                     WHERE user_id = %s AND campaign_id = %s
                 """, (next_score, user_id, campaign_id))
+                invalidate_leaderboard(conn, campaign_id)
             response["score"] = next_score
 
         if not dry_run:
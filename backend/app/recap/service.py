@@ -4,8 +4,11 @@ from datetime import date, datetime, timedelta
 from zoneinfo import ZoneInfo
 
 from app.crud import get_db
+from app.dates import as_date
+from app.singleflight import SingleFlight
 from app.items import get_item
 from app.media.storage import create_presigned_download
+from app.principal import is_campaign_member
 from app.accolades.service import award_accolade
 from fastapi import HTTPException
 
@@ -22,17 +25,6 @@ def _yesterday_ct() -> date:
     return (now_ct - timedelta(days=1)).date()
 
 
-def _parse_date(value) -> date:
-    if isinstance(value, datetime):
-        return value.date()
-    if isinstance(value, date):
-        return value
-    try:
-        return datetime.fromisoformat(value).date()
-    except Exception:
-        return datetime.strptime(value, "%Y-%m-%d").date()
-
-
 def _get_day_for_date(start_date: date, target_date: date) -> int:
     delta = (target_date - start_date).days
     return max(1, delta + 1)
@@ -42,6 +34,9 @@ def _get_date_for_day(start_date: date, day: int) -> date:
     return start_date + timedelta(days=max(day, 1) - 1)
 
 
+RECAP_READS = SingleFlight("campaign_recap")
+
+
 def _get_campaign_start(conn, campaign_id: int):
     row = conn.execute(
         "SELECT start_date, cycle_length, COALESCE(is_admin_campaign, FALSE) FROM campaigns WHERE id = %s",
@@ -50,7 +45,7 @@ def _get_campaign_start(conn, campaign_id: int):
     if not row:
         raise HTTPException(status_code=404, detail="Campaign not found")
     start_date_value, cycle_length, is_admin_campaign = row
-    return _parse_date(start_date_value), int(cycle_length or 0), bool(is_admin_campaign)
+    return as_date(start_date_value), int(cycle_length or 0), bool(is_admin_campaign)
 
 
 def _build_recap_for_date(conn, campaign_id: int, target_date: date):
@@ -381,40 +376,51 @@ def _load_stored_recap(conn, campaign_id: int, date_str: str):
 
 
 def get_campaign_recap(campaign_id: int, requester_id: int, day: int | None = None):
+    # Membership is checked on the primary: a lagging replica would still admit a kicked player.
     with get_db() as conn:
-        member_row = conn.execute(
-            "SELECT 1 FROM campaign_members WHERE campaign_id = %s AND user_id = %s",
-            (campaign_id, requester_id),
-        ).fetchone()
-        if not member_row:
+        if not is_campaign_member(conn, requester_id, campaign_id):
             raise HTTPException(status_code=403, detail="Not a member of this campaign")
 
-        start_date, cycle_length, _is_admin = _get_campaign_start(conn, campaign_id)
-        today_ct = datetime.now(ZoneInfo("America/Chicago")).date()
-        current_day = _get_day_for_date(start_date, today_ct)
+    # The recap is the same for every member, so concurrent requests share one build; only
+    # the leader opens a replica connection.
+    today = datetime.now(ZoneInfo("America/Chicago")).strftime("%Y-%m-%d")
+    return RECAP_READS.do((campaign_id, day, today), lambda: _campaign_recap(campaign_id, day))
+
+
+def _campaign_recap(campaign_id: int, day: int | None):
+    with get_db(readonly=True) as conn:
+        return _build_campaign_recap(conn, campaign_id, day)
 
-        if day is None:
-            day = current_day
-        day = max(1, min(int(day), cycle_length or int(day)))
-        target_date = _get_date_for_day(start_date, day)
-        date_str = target_date.strftime("%Y-%m-%d")
 
-        summary = None
-        events: list[dict] = []
+def _build_campaign_recap(conn, campaign_id: int, day: int | None):
+    start_date, cycle_length, _is_admin = _get_campaign_start(conn, campaign_id)
+    today_ct = datetime.now(ZoneInfo("America/Chicago")).date()
+    current_day = _get_day_for_date(start_date, today_ct)
 
-        if day == current_day:
+    if day is None:
+        day = current_day
+    day = max(1, min(int(day), cycle_length or int(day)))
+    target_date = _get_date_for_day(start_date, day)
+    date_str = target_date.strftime("%Y-%m-%d")
+
+    summary = None
+    events: list[dict] = []
+
+    if day == current_day:
+        summary, events = _build_recap_for_date(conn, campaign_id, target_date)
+        events = _resolve_avatars(conn, campaign_id, date_str, events)
+
+    else:
+        summary, events = _load_stored_recap(conn, campaign_id, date_str)
+        if not events:
             summary, events = _build_recap_for_date(conn, campaign_id, target_date)
+            # Built from the read-only connection, stored through the primary.
+            with get_db() as write_conn:
+                _store_recap(write_conn, campaign_id, date_str, summary, events)
             events = _resolve_avatars(conn, campaign_id, date_str, events)
 
-        else:
-            summary, events = _load_stored_recap(conn, campaign_id, date_str)
-            if not events:
-                summary, events = _build_recap_for_date(conn, campaign_id, target_date)
-                _store_recap(conn, campaign_id, date_str, summary, events)
-                events = _resolve_avatars(conn, campaign_id, date_str, events)
-
-        day_number = _get_day_for_date(start_date, target_date)
-        date_label = target_date.strftime("%b %d, %Y")
+    day_number = _get_day_for_date(start_date, target_date)
+    date_label = target_date.strftime("%b %d, %Y")
 
     highlights = []
     if isinstance(events, list):
@@ -0,0 +1,103 @@
+import os
+import threading
+import time
+
+import psycopg
+from psycopg.rows import tuple_row
+from prometheus_client import Counter, Gauge
+
+
+REPLICA_DB_URL = os.getenv("DATABASE_REPLICA_URL")
+# Read-only work only goes to the replica while it is at most this far behind the primary.
+REPLICA_MAX_LAG_SECONDS = float(os.getenv("REPLICA_MAX_LAG_SECONDS", "10"))
+# Lag is sampled on a fresh replica connection at most this often.
+REPLICA_LAG_CHECK_SECONDS = float(os.getenv("REPLICA_LAG_CHECK_SECONDS", "5"))
+# After a failed connect, skip the replica for this long instead of paying the timeout per request.
+REPLICA_RETRY_SECONDS = float(os.getenv("REPLICA_RETRY_SECONDS", "30"))
+REPLICA_CONNECT_TIMEOUT_SECONDS = int(os.getenv("REPLICA_CONNECT_TIMEOUT_SECONDS", "2"))
+
+# An idle primary stops advancing the replay timestamp, so a replica that has replayed
+# everything it received counts as caught up rather than as lagging.
+_LAG_QUERY = """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+    END
+"""
+
+_state_lock = threading.Lock()
+_lag_seconds = None
+_lag_checked_at = 0.0
+_down_until = 0.0
+
+REPLICA_LAG = Gauge(
+    "db_replica_lag_seconds",
+    "Last measured replay lag of the read replica",
+)
+READONLY_CONNECTIONS = Counter(
+    "db_readonly_connections_total",
+    "Read-only connections by where they were routed",
+    ["target"],
+)
+
+
+def replica_lag():
+    return _lag_seconds
+
+
+def reset_replica_state() -> None:
+    global _lag_seconds, _lag_checked_at, _down_until
+    with _state_lock:
+        _lag_seconds = None
+        _lag_checked_at = 0.0
+        _down_until = 0.0
+
+
+def _measure_lag(conn) -> float:
+    global _lag_seconds, _lag_checked_at
+    value = conn.execute(_LAG_QUERY).fetchone()[0]
+    # Behind but nothing replayed yet since startup: the lag is unknown, so treat it as too much.
+    lag = float("inf") if value is None else float(value)
+    conn.rollback()
+    with _state_lock:
+        _lag_seconds = lag
+        _lag_checked_at = time.monotonic()
+    REPLICA_LAG.set(lag)
+    return lag
+
+
+def connect_replica():
+    """Open a read-only replica connection, or return None to send the caller to the primary."""
+    global _down_until
+    if not REPLICA_DB_URL:
+        return None
+    now = time.monotonic()
+    if now < _down_until:
+        READONLY_CONNECTIONS.labels("primary_replica_down").inc()
+        return None
+    lag_is_fresh = _lag_seconds is not None and now - _lag_checked_at < REPLICA_LAG_CHECK_SECONDS
+    if lag_is_fresh and _lag_seconds > REPLICA_MAX_LAG_SECONDS:
+        READONLY_CONNECTIONS.labels("primary_replica_lagging").inc()
+        return None
+    try:
+        conn = psycopg.connect(
+            REPLICA_DB_URL,
+            row_factory=tuple_row,
+            connect_timeout=REPLICA_CONNECT_TIMEOUT_SECONDS,
+        )
+    except psycopg.OperationalError as exc:
+        with _state_lock:
+            _down_until = now + REPLICA_RETRY_SECONDS
+        print(f"⚠️ Read replica unavailable, using primary for {REPLICA_RETRY_SECONDS:.0f}s: {exc}")
+        READONLY_CONNECTIONS.labels("primary_replica_down").inc()
+        return None
+
+    if not lag_is_fresh and _measure_lag(conn) > REPLICA_MAX_LAG_SECONDS:
+        conn.close()
+        READONLY_CONNECTIONS.labels("primary_replica_lagging").inc()
+        return None
+    # Any write that slips onto a read-only call site fails loudly instead of hitting a standby.
+    conn.read_only = True
+    READONLY_CONNECTIONS.labels("replica").inc()
+    return conn
@@ -2,6 +2,8 @@ from __future__ import annotations
 
 from fastapi import HTTPException
 
+from app.dates import iso_date
+
 
 ORACLE_WHISPER_KEY = "oracle_whisper"
 
@@ -55,7 +57,7 @@ def get_weekly_reward_pending(conn, user_id: int, campaign_id: int):
 
     return {
         "pending": True,
-        "cycle_start_date": cycle_start_date,
+        "cycle_start_date": iso_date(cycle_start_date),
         "recipient_count": int(recipient_count),
         "whispers_per_recipient": int(whispers_per_recipient),
         "candidates": candidates,
@@ -146,7 +148,7 @@ def choose_weekly_reward_recipients(conn, user_id: int, campaign_id: int, recipi
 
     return {
         "status": "ok",
-        "cycle_start_date": cycle_start_date,
+        "cycle_start_date": iso_date(cycle_start_date),
         "granted": {
             "recipient_count": int(recipient_count),
             "whispers_per_recipient": int(whispers_per_recipient),
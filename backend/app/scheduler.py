@@ -1,8 +1,22 @@
-from apscheduler.schedulers.background import BackgroundScheduler
-from apscheduler.triggers.cron import CronTrigger
-from app.crud import handle_campaign_end, get_db
+import os
+import random
+import signal
+import socket
+import threading
+
+import psycopg
+from app import candidates, wordfeatures
+from app.cache import get_backend
+from app.crud import handle_campaign_end, get_db, load_valid_words, pregenerate_shop_rotations, prime_campaign_caches
 from app.recap.service import build_and_store_recap
-from datetime import datetime, timedelta, date
+from app.analytics.service import export_daily_facts
+from app.accolades.evaluator import ACCOLADE_EVAL_SECONDS, evaluate_pending_accolades
+from app.dates import as_date
+from app.counters import COUNTER_FLUSH_SECONDS, flush_global_counters
+from app.idempotency import purge_expired as purge_expired_idempotency_keys
+from app.partitions import archive_partition, ensure_future_partitions, expired_partitions
+from database import init_db
+from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
 import json
 
@@ -17,17 +31,8 @@ def reset_expired_campaigns():
             FROM campaigns
         """).fetchall()
 
-        for camp_id, start_date_value, cycle_length in campaigns:
-            if isinstance(start_date_value, datetime):
-                start_date = start_date_value.date()
-            elif isinstance(start_date_value, date):
-                start_date = start_date_value
-            else:
-                try:
-                    start_date = datetime.fromisoformat(start_date_value).date()
-                except ValueError:
-                    start_date = datetime.strptime(start_date_value, "%Y-%m-%d").date()
-            final_day = start_date + timedelta(days=cycle_length - 1)
+        for camp_id, start_date, cycle_length in campaigns:
+            final_day = as_date(start_date) + timedelta(days=cycle_length - 1)
 
             if today > final_day:
                 print(f"  🔁 Resetting campaign {camp_id} — ended on {final_day}")
@@ -39,22 +44,23 @@ def compute_campaign_daily_stats():
     today = datetime.now(ZoneInfo("America/Chicago")).date()
     stats_date = (today - timedelta(days=1)).strftime("%Y-%m-%d")
 
-    with get_db() as conn:
-        campaign_ids = conn.execute("""
+    # Aggregates are read from the replica when one is configured; results go to the primary.
+    with get_db(readonly=True) as read_conn, get_db() as conn:
+        campaign_ids = read_conn.execute("""
             SELECT id FROM campaigns WHERE COALESCE(is_admin_campaign, FALSE) = FALSE
         """).fetchall()
 
         for (campaign_id,) in campaign_ids:
-            member_count = conn.execute("""
+            member_count = read_conn.execute("""
                 SELECT COUNT(*) FROM campaign_members WHERE campaign_id = %s
             """, (campaign_id,)).fetchone()[0]
 
-            completed_count = conn.execute("""
+            completed_count = read_conn.execute("""
                 SELECT COUNT(*) FROM campaign_daily_progress
                 WHERE campaign_id = %s AND date = %s AND completed = 1
             """, (campaign_id, stats_date)).fetchone()[0]
 
-            troops_rows = conn.execute("""
+            troops_rows = read_conn.execute("""
                 SELECT COALESCE(SUM(troops), 0), COALESCE(MAX(troops), 0)
                 FROM campaign_daily_troops
                 WHERE campaign_id = %s AND date = %s
@@ -63,13 +69,13 @@ def compute_campaign_daily_stats():
             highest_troops = troops_rows[1] or 0
             avg_troops_per_player = (total_troops / member_count) if member_count else 0
 
-            guess_rows = conn.execute("""
+            guess_rows = read_conn.execute("""
                 SELECT user_id, current_row, results
                 FROM campaign_guess_states
                 WHERE campaign_id = %s AND date = %s
             """, (campaign_id, stats_date)).fetchall()
 
-            dd_used_ids = conn.execute("""
+            dd_used_ids = read_conn.execute("""
                 SELECT user_id
                 FROM campaign_members
                 WHERE campaign_id = %s AND double_down_date = %s
@@ -101,7 +107,7 @@ def compute_campaign_daily_stats():
                     if current_row == 6:
                         clutch_wins += 1
 
-            word_rows = conn.execute("""
+            word_rows = read_conn.execute("""
                 SELECT word,
                        SUM(CASE WHEN solved = 1 THEN 1 ELSE 0 END) AS solved_count,
                        SUM(CASE WHEN solved = 0 THEN 1 ELSE 0 END) AS failed_count
@@ -187,8 +193,8 @@ def compute_campaign_daily_word_stats():
     today = datetime.now(ZoneInfo("America/Chicago")).date()
     stats_date = (today - timedelta(days=1)).strftime("%Y-%m-%d")
 
-    with get_db() as conn:
-        rows = conn.execute("""
+    with get_db(readonly=True) as read_conn, get_db() as conn:
+        rows = read_conn.execute("""
             SELECT cudr.campaign_id, cudr.word,
                    SUM(CASE WHEN cudr.solved = 1 THEN 1 ELSE 0 END) AS solved_count,
                    SUM(CASE WHEN cudr.solved = 0 THEN 1 ELSE 0 END) AS failed_count
@@ -225,7 +231,7 @@ def compute_campaign_daily_recaps():
 
     recap_date = (datetime.now(ZoneInfo("America/Chicago")).date() - timedelta(days=1))
 
-    with get_db() as conn:
+    with get_db(readonly=True) as conn:
         campaign_ids = conn.execute("""
             SELECT id FROM campaigns WHERE COALESCE(is_admin_campaign, FALSE) = FALSE
         """).fetchall()
@@ -239,22 +245,22 @@ def compute_global_daily_stats():
     today = datetime.now(ZoneInfo("America/Chicago")).date()
     stats_date = (today - timedelta(days=1)).strftime("%Y-%m-%d")
 
-    with get_db() as conn:
-        total_guesses = conn.execute("""
+    with get_db(readonly=True) as read_conn, get_db() as conn:
+        total_guesses = read_conn.execute("""
             SELECT COUNT(*)
             FROM campaign_guesses cg
             JOIN campaigns c ON c.id = cg.campaign_id
             WHERE cg.date = %s AND COALESCE(c.is_admin_campaign, FALSE) = FALSE
         """, (stats_date,)).fetchone()[0]
 
-        total_players = conn.execute("""
+        total_players = read_conn.execute("""
             SELECT COUNT(DISTINCT cudr.user_id)
             FROM campaign_user_daily_results cudr
             JOIN campaigns c ON c.id = cudr.campaign_id
             WHERE cudr.date = %s AND COALESCE(c.is_admin_campaign, FALSE) = FALSE
         """, (stats_date,)).fetchone()[0]
 
-        total_campaigns_completed = conn.execute("""
+        total_campaigns_completed = read_conn.execute("""
             SELECT COUNT(*)
             FROM campaign_daily_stats cds
             JOIN campaigns c ON c.id = cds.campaign_id
@@ -264,7 +270,7 @@ def compute_global_daily_stats():
               AND COALESCE(c.is_admin_campaign, FALSE) = FALSE
         """, (stats_date,)).fetchone()[0]
 
-        guess_counts = conn.execute("""
+        guess_counts = read_conn.execute("""
             SELECT cudr.guesses_used, COUNT(*)
             FROM campaign_user_daily_results cudr
             JOIN campaigns c ON c.id = cudr.campaign_id
@@ -309,14 +315,312 @@ def compute_global_daily_stats():
             guess_map.get(6, 0)
         ))
 
+def export_daily_analytics():
+    print(f"[{datetime.now(ZoneInfo('America/Chicago'))}] Exporting daily analytics facts...")
+
+    facts_date = datetime.now(ZoneInfo("America/Chicago")).date() - timedelta(days=1)
+    counts = export_daily_facts(facts_date)
+    print(f"  📊 Exported {facts_date}: {counts}")
+
+def maintain_partitions():
+    print(f"[{datetime.now(ZoneInfo('America/Chicago'))}] Maintaining monthly partitions...")
+
+    today = datetime.now(ZoneInfo("America/Chicago")).date()
+
+    with get_db() as conn:
+        ensure_future_partitions(conn, today)
+        expired = expired_partitions(conn, today)
+
+    # One transaction per month so each detach only holds the parent's lock briefly.
+    for table, partition, month in expired:
+        with get_db() as conn:
+            archived = archive_partition(conn, table, partition, month)
+        print(f"  📦 Archived {partition}: {archived['row_count']} rows -> {archived['path']}")
+
+def purge_idempotency_keys():
+    print(f"[{datetime.now(ZoneInfo('America/Chicago'))}] Purging expired idempotency keys...")
+
+    with get_db() as conn:
+        purged = purge_expired_idempotency_keys(conn)
+    print(f"  🧹 Purged {purged} stored responses")
+
+def prewarm_next_day():
+    tomorrow = datetime.now(ZoneInfo("America/Chicago")).date() + timedelta(days=1)
+    print(f"[{datetime.now(ZoneInfo('America/Chicago'))}] Pre-generating shop rotations for {tomorrow}...")
+
+    with get_db() as conn:
+        members = pregenerate_shop_rotations(conn, tomorrow.strftime("%Y-%m-%d"))
+    print(f"  🛒 Rotations ready for {members} members")
+
+def prime_new_day():
+    """Warm this process for the new day; API workers run it through RolloverWarmer."""
+    print(f"[{datetime.now(ZoneInfo('America/Chicago'))}] Priming caches for the new day...")
+
+    today = datetime.now(ZoneInfo("America/Chicago")).strftime("%Y-%m-%d")
+    load_valid_words()
+    candidates.preload()
+    wordfeatures.preload()
+    with get_db() as conn:
+        primed = prime_campaign_caches(conn, today)
+    print(f"  🔥 Primed schedules and standings for {primed} campaigns")
+
+def prime_shared_cache():
+    # This process serves no requests, so its own L1 is worthless; only a shared L2 helps.
+    if get_backend() is None:
+        return
+    print(f"[{datetime.now(ZoneInfo('America/Chicago'))}] Priming the shared cache for the new day...")
+
+    today = datetime.now(ZoneInfo("America/Chicago")).strftime("%Y-%m-%d")
+    with get_db() as conn:
+        primed = prime_campaign_caches(conn, today)
+    print(f"  🔥 Shared cache primed for {primed} campaigns")
+
+def flush_counters():
+    with get_db() as conn:
+        flush_global_counters(conn)
+
+_DAILY = {"timezone": "America/Chicago"}
+_BACKGROUND = {"coalesce": True, "max_instances": 1}
+
+# (job, trigger, add_job options). Triggers are apscheduler aliases so the API process, which
+# imports this module only for the health check, never loads apscheduler. Every job also takes
+# its own advisory lock when it runs, so a manual `python -m app.scheduler run <job>` never
+# overlaps the leader's run.
+JOBS = [
+    (prewarm_next_day, "cron", {"hour": 23, "minute": 55, **_DAILY}),
+    (reset_expired_campaigns, "cron", {"hour": 0, "minute": 0, **_DAILY}),
+    (prime_shared_cache, "cron", {"hour": 0, "minute": 0, "second": 30, **_DAILY}),
+    (compute_campaign_daily_stats, "cron", {"hour": 0, "minute": 5, **_DAILY}),
+    (compute_campaign_daily_word_stats, "cron", {"hour": 0, "minute": 7, **_DAILY}),
+    (compute_campaign_daily_recaps, "cron", {"hour": 0, "minute": 8, **_DAILY}),
+    (compute_global_daily_stats, "cron", {"hour": 0, "minute": 10, **_DAILY}),
+    (export_daily_analytics, "cron", {"hour": 0, "minute": 12, **_DAILY}),
+    (maintain_partitions, "cron", {"hour": 3, "minute": 30, **_DAILY}),
+    (purge_idempotency_keys, "cron", {"hour": 3, "minute": 45, **_DAILY}),
+    (flush_counters, "interval", {"seconds": COUNTER_FLUSH_SECONDS, **_BACKGROUND}),
+    (evaluate_pending_accolades, "interval", {"seconds": ACCOLADE_EVAL_SECONDS, **_BACKGROUND}),
+]
+
+SCHEDULER_LEADER_LOCK = "scheduler:leader"
+SCHEDULER_HEARTBEAT_SECONDS = int(os.getenv("SCHEDULER_HEARTBEAT_SECONDS", "15"))
+# Scheduled jobs belong in their own process, `python -m app.scheduler`, so nightly work never
+# shares a worker with requests. RUN_SCHEDULER_IN_API=1 lets API processes stand for leader
+# too (a single-process dev setup); either way only the elected leader runs the jobs.
+RUN_SCHEDULER_IN_API = os.getenv("RUN_SCHEDULER_IN_API", "0").lower() in ("1", "true", "yes")
+
+
+# API workers prime their own in-process caches this long after midnight, plus up to the
+# jitter so they do not all query at the same instant.
+ROLLOVER_PRIME_DELAY_SECONDS = float(os.getenv("ROLLOVER_PRIME_DELAY_SECONDS", "30"))
+ROLLOVER_PRIME_JITTER_SECONDS = float(os.getenv("ROLLOVER_PRIME_JITTER_SECONDS", "15"))
+
+
+def run_job_exclusively(job):
+    """Run job unless another process is already running it; returns False when skipped."""
+    lock_conn = get_db()
+    try:
+        lock_conn.autocommit = True
+        key = f"scheduler:job:{job.__name__}"
+        if not lock_conn.execute("SELECT pg_try_advisory_lock(hashtext(%s))", (key,)).fetchone()[0]:
+            print(f"  ⏭️ {job.__name__} is already running elsewhere, skipping")
+            return False
+        job()
+        return True
+    finally:
+        # Closing the session releases the advisory lock.
+        lock_conn.close()
+
+
+class SchedulerLeader:
+    """Runs JOBS only while holding the leader advisory lock on its control connection.
+
+    Every instance heartbeats into scheduler_heartbeats. Standbys retry the lock each
+    heartbeat; if the leader's session dies, Postgres releases the lock and the next
+    standby to try takes over.
+    """
+
+    def __init__(self):
+        self.instance_id = f"{socket.gethostname()}:{os.getpid()}"
+        self.conn = None
+        self.scheduler = None
+        self.last_job = None
+        self.last_job_at = None
+        self.last_success_at = None
+        self.last_error = None
+        self._stop = threading.Event()
+
+    @property
+    def is_leader(self) -> bool:
+        return self.scheduler is not None
+
+    def _on_job_event(self, event):
+        self.last_job = event.job_id
+        self.last_job_at = datetime.now(ZoneInfo("America/Chicago"))
+        if event.exception is not None:
+            self.last_error = f"{event.job_id}: {event.exception!r}"
+        else:
+            self.last_success_at = self.last_job_at
+
+    def _start_jobs(self):
+        from apscheduler.events import EVENT_JOB_ERROR, EVENT_JOB_EXECUTED
+        from apscheduler.schedulers.background import BackgroundScheduler
+
+        scheduler = BackgroundScheduler()
+        for job, trigger, options in JOBS:
+            scheduler.add_job(run_job_exclusively, trigger, args=[job], id=job.__name__, **options)
+        scheduler.add_listener(self._on_job_event, EVENT_JOB_EXECUTED | EVENT_JOB_ERROR)
+        scheduler.start()
+        self.scheduler = scheduler
+        print(f"👑 Scheduler leader: {self.instance_id}")
+
+    def _stop_jobs(self):
+        if self.scheduler is not None:
+            self.scheduler.shutdown(wait=False)
+            self.scheduler = None
+
+    def _disconnect(self):
+        self._stop_jobs()
+        if self.conn is not None:
+            try:
+                self.conn.close()
+            except psycopg.Error:
+                pass
+            self.conn = None
+
+    def tick(self):
+        """One election + heartbeat round."""
+        try:
+            if self.conn is None:
+                self.conn = get_db()
+                self.conn.autocommit = True
+            if not self.is_leader:
+                acquired = self.conn.execute(
+                    "SELECT pg_try_advisory_lock(hashtext(%s))", (SCHEDULER_LEADER_LOCK,)
+                ).fetchone()[0]
+                if acquired:
+                    self._start_jobs()
+            self.conn.execute("""
+                INSERT INTO scheduler_heartbeats (
+                    instance_id, is_leader, started_at, last_beat_at, last_job, last_job_at,
+                    last_success_at, last_error
+                ) VALUES (%s, %s, now(), now(), %s, %s, %s, %s)
+                ON CONFLICT (instance_id) DO UPDATE
+                SET is_leader = EXCLUDED.is_leader,
+                    last_beat_at = EXCLUDED.last_beat_at,
+                    last_job = EXCLUDED.last_job,
+                    last_job_at = EXCLUDED.last_job_at,
+                    last_success_at = EXCLUDED.last_success_at,
+                    last_error = EXCLUDED.last_error
+            """, (
+                self.instance_id, self.is_leader, self.last_job, self.last_job_at,
+                self.last_success_at, self.last_error,
+            ))
+        except psycopg.Error as exc:
+            # Losing the control session also lost the lock; stop before another leader starts.
+            print(f"⚠️ Scheduler control connection failed, stepping down: {exc}")
+            self._disconnect()
+
+    def run_forever(self):
+        while not self._stop.is_set():
+            self.tick()
+            self._stop.wait(SCHEDULER_HEARTBEAT_SECONDS)
+        self._stop_jobs()
+        if self.conn is not None:
+            try:
+                self.conn.execute(
+                    "UPDATE scheduler_heartbeats SET is_leader = FALSE WHERE instance_id = %s", (self.instance_id,)
+                )
+            except psycopg.Error:
+                pass
+        self._disconnect()
+
+    def stop(self):
+        self._stop.set()
+
+
 def start_scheduler():
-    scheduler = BackgroundScheduler()
-    
-    # Change to run every 1 minute for testing
-    scheduler.add_job(reset_expired_campaigns, CronTrigger(hour=0, minute=0, timezone="America/Chicago"))
-    scheduler.add_job(compute_campaign_daily_stats, CronTrigger(hour=0, minute=5, timezone="America/Chicago"))
-    scheduler.add_job(compute_campaign_daily_word_stats, CronTrigger(hour=0, minute=7, timezone="America/Chicago"))
-    scheduler.add_job(compute_campaign_daily_recaps, CronTrigger(hour=0, minute=8, timezone="America/Chicago"))
-    scheduler.add_job(compute_global_daily_stats, CronTrigger(hour=0, minute=10, timezone="America/Chicago"))
-
-    scheduler.start()
+    """Start leader election in a background thread of this process."""
+    leader = SchedulerLeader()
+    threading.Thread(target=leader.run_forever, name="scheduler-leader", daemon=True).start()
+    return leader
+
+
+class RolloverWarmer:
+    """Runs prime_new_day in this API worker shortly after every midnight America/Chicago.
+
+    Each worker fills its own in-process caches here instead of leaving that to the first
+    players; the scheduler only primes the shared backend (prime_shared_cache). Priming is
+    generation-checked, so a reset that invalidates mid-prime simply leaves the key cold.
+    """
+
+    def __init__(self):
+        self._stop = threading.Event()
+
+    @staticmethod
+    def seconds_until_prime(now=None) -> float:
+        now = now or datetime.now(ZoneInfo("America/Chicago"))
+        tomorrow = now.date() + timedelta(days=1)
+        midnight = datetime(tomorrow.year, tomorrow.month, tomorrow.day, tzinfo=now.tzinfo)
+        # Via timestamps: same-zone aware subtraction ignores a DST change in between.
+        return (
+            midnight.timestamp() - now.timestamp()
+            + ROLLOVER_PRIME_DELAY_SECONDS + random.uniform(0, ROLLOVER_PRIME_JITTER_SECONDS)
+        )
+
+    def run_forever(self):
+        while not self._stop.wait(self.seconds_until_prime()):
+            try:
+                prime_new_day()
+            except psycopg.Error as exc:
+                print(f"⚠️ Could not prime caches for the new day; first requests will load them: {exc}")
+
+    def start(self) -> "RolloverWarmer":
+        threading.Thread(target=self.run_forever, name="rollover-warmer", daemon=True).start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+
+def get_scheduler_health() -> dict:
+    """Whether exactly one live leader exists, and how long ago any job last succeeded.
+
+    Served unauthenticated, so it carries no instance ids or error text; those stay in
+    scheduler_heartbeats.
+    """
+    with get_db() as conn:
+        leaders, last_success_age = conn.execute("""
+            SELECT COUNT(*) FILTER (WHERE is_leader AND last_beat_at > now() - %s * INTERVAL '1 second'),
+                   EXTRACT(EPOCH FROM now() - MAX(last_success_at))
+            FROM scheduler_heartbeats
+            WHERE last_beat_at > now() - INTERVAL '1 day'
+        """, (SCHEDULER_HEARTBEAT_SECONDS * 3,)).fetchone()
+    return {
+        "status": "ok" if leaders == 1 else "no_leader" if leaders == 0 else "split_leadership",
+        "seconds_since_last_success": round(float(last_success_age), 1) if last_success_age is not None else None,
+    }
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run the background job scheduler.")
+    subparsers = parser.add_subparsers(dest="command")
+    run_parser = subparsers.add_parser("run", help="run one job now, under its job lock")
+    run_parser.add_argument("job", choices=[job.__name__ for job, _, _ in JOBS])
+    args = parser.parse_args()
+
+    init_db()
+    if args.command == "run":
+        job = next(job for job, _, _ in JOBS if job.__name__ == args.job)
+        run_job_exclusively(job)
+        return
+
+    leader = SchedulerLeader()
+    signal.signal(signal.SIGTERM, lambda *_: leader.stop())
+    signal.signal(signal.SIGINT, lambda *_: leader.stop())
+    leader.run_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""Coalesce identical concurrent reads into one computation.
+
+The first caller for a key runs the work; callers arriving while it is in flight wait for
+the same result (or exception) instead of repeating the queries. Nothing is kept once the
+call finishes, so this only collapses bursts, such as every player of a campaign opening
+the app right after midnight. A follower that waits longer than the timeout stops waiting
+and runs the work itself, so a stuck leader slows callers down but never fails them.
+"""
+import asyncio
+import inspect
+import os
+import threading
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+
+from prometheus_client import Counter
+from starlette.concurrency import run_in_threadpool
+
+
+SINGLEFLIGHT_TIMEOUT_SECONDS = float(os.getenv("SINGLEFLIGHT_TIMEOUT_SECONDS", "10"))
+
+SINGLEFLIGHT_CALLS = Counter(
+    "singleflight_calls_total",
+    "Coalesced reads by group and role: leader ran the work, follower shared its result, fallback ran it again after a timeout",
+    ["group", "role"],
+)
+
+# Handed to followers when the leader was interrupted (e.g. a cancelled async request) rather
+# than failing; they then run the work themselves.
+_ABANDONED = object()
+
+
+class SingleFlight:
+    def __init__(self, group: str, timeout_seconds: float = SINGLEFLIGHT_TIMEOUT_SECONDS):
+        self.group = group
+        self.timeout_seconds = timeout_seconds
+        self._calls: dict = {}
+        self._lock = threading.Lock()
+
+    def _join(self, key) -> tuple[Future, bool]:
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                return future, False
+            future = Future()
+            self._calls[key] = future
+            return future, True
+
+    def _finish(self, key, future: Future, result=None, error: Exception | None = None) -> None:
+        with self._lock:
+            if self._calls.get(key) is future:
+                del self._calls[key]
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def do(self, key, fn, timeout_seconds: float | None = None):
+        """Run fn() once for all concurrent callers with the same key (sync handlers)."""
+        future, leader = self._join(key)
+        if not leader:
+            try:
+                result = future.result(timeout=timeout_seconds or self.timeout_seconds)
+            except FutureTimeoutError:
+                result = _ABANDONED
+            if result is _ABANDONED:
+                SINGLEFLIGHT_CALLS.labels(self.group, "fallback").inc()
+                return fn()
+            SINGLEFLIGHT_CALLS.labels(self.group, "follower").inc()
+            return result
+
+        SINGLEFLIGHT_CALLS.labels(self.group, "leader").inc()
+        try:
+            result = fn()
+        except Exception as exc:
+            self._finish(key, future, error=exc)
+            raise
+        except BaseException:
+            self._finish(key, future, _ABANDONED)
+            raise
+        self._finish(key, future, result)
+        return result
+
+    async def do_async(self, key, fn, timeout_seconds: float | None = None):
+        """Async-handler variant; fn may be a coroutine function or a blocking callable."""
+
+        async def _run():
+            if inspect.iscoroutinefunction(fn):
+                return await fn()
+            return await run_in_threadpool(fn)
+
+        future, leader = self._join(key)
+        if not leader:
+            try:
+                result = await asyncio.wait_for(
+                    asyncio.shield(asyncio.wrap_future(future)), timeout_seconds or self.timeout_seconds
+                )
+            except asyncio.TimeoutError:
+                result = _ABANDONED
+            if result is _ABANDONED:
+                SINGLEFLIGHT_CALLS.labels(self.group, "fallback").inc()
+                return await _run()
+            SINGLEFLIGHT_CALLS.labels(self.group, "follower").inc()
+            return result
+
+        SINGLEFLIGHT_CALLS.labels(self.group, "leader").inc()
+        try:
+            result = await _run()
+        except Exception as exc:
+            self._finish(key, future, error=exc)
+            raise
+        except BaseException:
+            self._finish(key, future, _ABANDONED)
+            raise
+        self._finish(key, future, result)
+        return result
@@ -1,17 +1,26 @@
+import os
 from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
 from fastapi import HTTPException
+from app.cache import Cache
+from app.dates import as_date
+
+# (start_date, cycle_length) per campaign; invalidated when a cycle restarts or the campaign is deleted.
+CAMPAIGN_SCHEDULE_CACHE = Cache(
+    "campaign_schedule",
+    ttl_seconds=float(os.getenv("CAMPAIGN_SCHEDULE_CACHE_TTL_SECONDS", "300")),
+)
 
 def resolve_campaign_day(conn, campaign_id: int, day_override: int | None):
-    row = conn.execute("""
+    row = CAMPAIGN_SCHEDULE_CACHE.get(campaign_id, lambda: conn.execute("""
         SELECT start_date, cycle_length
         FROM campaigns
         WHERE id = %s
-    """, (campaign_id,)).fetchone()
+    """, (campaign_id,)).fetchone())
     if not row:
         raise HTTPException(status_code=404, detail="Campaign not found")
 
-    start_date = datetime.strptime(row[0], "%Y-%m-%d").date()
+    start_date = as_date(row[0])
     cycle_length = row[1]
     today = datetime.now(ZoneInfo("America/Chicago")).date()
     current_day = min((today - start_date).days + 1, cycle_length)
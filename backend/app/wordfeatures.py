@@ -0,0 +1,55 @@
+"""Per-word facts revealed by the blessing items, precomputed for the playable word list.
+
+Campaign secrets are drawn from playablewordlist.txt, so a lookup is a dict hit once the
+index is built (on first use). A secret set by hand from the wider guess list is computed
+on the spot.
+"""
+from dataclasses import dataclass
+from functools import lru_cache
+
+from app.candidates import PLAYABLE_WORD_ORDER
+
+
+ALPHABET = tuple(chr(c) for c in range(ord("A"), ord("Z") + 1))
+VOWELS = frozenset("AEIOU")
+
+
+@dataclass(frozen=True)
+class WordFeatures:
+    word: str
+    letters: frozenset
+    vowel_count: int
+    # (letter, 1-based positions) for every letter that appears more than once, in word order.
+    twins: tuple
+    # Letters not in the word, in alphabet order.
+    absent_letters: tuple
+
+
+def _compute(word: str) -> WordFeatures:
+    word = word.upper()
+    positions = {}
+    for index, letter in enumerate(word):
+        positions.setdefault(letter, []).append(index + 1)
+    return WordFeatures(
+        word=word,
+        letters=frozenset(word),
+        vowel_count=sum(1 for letter in word if letter in VOWELS),
+        twins=tuple((letter, tuple(found)) for letter, found in positions.items() if len(found) >= 2),
+        absent_letters=tuple(letter for letter in ALPHABET if letter not in positions),
+    )
+
+
+@lru_cache(maxsize=1)
+def _index() -> dict:
+    return {word.upper(): _compute(word) for word in PLAYABLE_WORD_ORDER}
+
+
+def preload() -> None:
+    """Build the feature index now instead of on the first blessing."""
+    _index()
+
+
+def features(word: str) -> WordFeatures:
+    key = word.upper()
+    found = _index().get(key)
+    return found if found is not None else _compute(key)
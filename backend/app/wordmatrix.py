@@ -0,0 +1,224 @@
+"""Precomputed Wordle feedback patterns for every (valid guess, playable answer) pair.
+
+The matrix is built offline (`python -m app.wordmatrix build`, also run in the Docker
+build) and memory-mapped at runtime, so every worker shares one copy through the page
+cache. Cell [g, a] is the base-3 pattern guess g gets against answer a: position i
+contributes 3**i times 0 (absent), 1 (present) or 2 (correct), so 242 is a solve.
+"""
+import json
+import math
+import os
+import threading
+from collections import Counter
+from typing import Optional
+
+import numpy as np
+
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+PATTERN_MATRIX_PATH = os.getenv("PATTERN_MATRIX_PATH", os.path.join(DATA_DIR, "pattern_matrix.npy"))
+SOLVED_PATTERN = 242
+PATTERN_COUNT = 243
+# Rows of the matrix processed per step; bounds the scratch memory of the vectorized passes.
+CHUNK_ROWS = 512
+
+_STATUS_VALUE = {"absent": 0, "present": 1, "correct": 2}
+_POWERS = np.array([1, 3, 9, 27, 81], dtype=np.int16)
+
+
+def _read_words(filename: str) -> list:
+    with open(os.path.join(DATA_DIR, filename), "r") as f:
+        return [line.strip().lower() for line in f if len(line.strip()) == 5]
+
+
+def pattern(guess: str, answer: str) -> int:
+    """Pure-Python pattern for one pair; same duplicate-letter rules as the guess endpoint."""
+    result = [0] * 5
+    remaining = Counter()
+    for i in range(5):
+        if guess[i] == answer[i]:
+            result[i] = 2
+        else:
+            remaining[answer[i]] += 1
+    for i in range(5):
+        if result[i] == 0 and remaining[guess[i]] > 0:
+            result[i] = 1
+            remaining[guess[i]] -= 1
+    return sum(value * 3 ** i for i, value in enumerate(result))
+
+
+def pattern_from_result(result: list) -> int:
+    return sum(_STATUS_VALUE[status] * 3 ** i for i, status in enumerate(result))
+
+
+def _encode(words: list) -> np.ndarray:
+    return np.frombuffer("".join(words).encode("ascii"), dtype=np.uint8).reshape(-1, 5) - ord("a")
+
+
+def _pattern_block(guess_codes: np.ndarray, answer_codes: np.ndarray) -> np.ndarray:
+    n, m = len(guess_codes), len(answer_codes)
+    green = guess_codes[:, None, :] == answer_codes[None, :, :]
+    # Letters of each answer still available for "present" marks once greens are taken out.
+    available = np.zeros((n, m, 26), dtype=np.int8)
+    rows = np.arange(n)[:, None]
+    cols = np.arange(m)[None, :]
+    for k in range(5):
+        available[rows, cols, answer_codes[None, :, k]] += ~green[:, :, k]
+    values = green.astype(np.int16) * 2
+    for i in range(5):
+        letter = guess_codes[:, i][:, None]
+        present = ~green[:, :, i] & (available[rows, cols, letter] > 0)
+        available[rows, cols, letter] -= present
+        values[:, :, i] += present
+    return (values * _POWERS).sum(axis=2).astype(np.uint8)
+
+
+def _answer_difficulty(matrix: np.ndarray) -> np.ndarray:
+    # How hard an answer is to isolate: the average log2 size of the group of answers that
+    # share its pattern, over every guess, scaled to 0..1 by log2(answer count).
+    n, m = matrix.shape
+    total = np.zeros(m, dtype=np.float64)
+    for start in range(0, n, CHUNK_ROWS):
+        block = matrix[start:start + CHUNK_ROWS].astype(np.int64)
+        counts = _pattern_counts(block)
+        bucket_sizes = np.take_along_axis(counts, block, axis=1)
+        total += np.log2(bucket_sizes).sum(axis=0)
+    return total / n / math.log2(m)
+
+
+def _pattern_counts(block: np.ndarray) -> np.ndarray:
+    rows = block.shape[0]
+    offsets = block.astype(np.int64) + (np.arange(rows, dtype=np.int64) * PATTERN_COUNT)[:, None]
+    return np.bincount(offsets.ravel(), minlength=rows * PATTERN_COUNT).reshape(rows, PATTERN_COUNT)
+
+
+def build(path: str = PATTERN_MATRIX_PATH, guesses: Optional[list] = None, answers: Optional[list] = None) -> str:
+    answers = answers or _read_words("playablewordlist.txt")
+    guesses = sorted(set(guesses or _read_words("wordlist.txt")) | set(answers))
+    guess_codes, answer_codes = _encode(guesses), _encode(answers)
+    matrix = np.lib.format.open_memmap(f"{path}.partial", mode="w+", dtype=np.uint8, shape=(len(guesses), len(answers)))
+    for start in range(0, len(guesses), CHUNK_ROWS):
+        matrix[start:start + CHUNK_ROWS] = _pattern_block(guess_codes[start:start + CHUNK_ROWS], answer_codes)
+    matrix.flush()
+    difficulty = _answer_difficulty(matrix)
+    del matrix
+    with open(f"{path}.json", "w") as f:
+        json.dump({"guesses": guesses, "answers": answers, "difficulty": [round(float(d), 4) for d in difficulty]}, f)
+    os.replace(f"{path}.partial", path)
+    return path
+
+
+class PatternMatrix:
+    def __init__(self, path: str = PATTERN_MATRIX_PATH):
+        with open(f"{path}.json", "r") as f:
+            meta = json.load(f)
+        self.matrix = np.load(path, mmap_mode="r")
+        self.guesses = meta["guesses"]
+        self.answers = meta["answers"]
+        self.difficulty = dict(zip(self.answers, meta["difficulty"]))
+        self.guess_index = {word: i for i, word in enumerate(self.guesses)}
+        self.answer_index = {word: i for i, word in enumerate(self.answers)}
+        self._answer_rows = np.array([self.guess_index[word] for word in self.answers])
+
+    def all_candidates(self) -> np.ndarray:
+        return np.ones(len(self.answers), dtype=bool)
+
+    def candidates_after(self, history: list, candidates: Optional[np.ndarray] = None) -> np.ndarray:
+        """Answers still consistent with [(guess, pattern), ...]."""
+        mask = self.all_candidates() if candidates is None else candidates.copy()
+        for guess, observed in history:
+            mask &= self.matrix[self.guess_index[guess]] == observed
+        return mask
+
+    def _scores(self, candidates: np.ndarray) -> tuple:
+        """Expected remaining candidates and expected information (bits) for every guess."""
+        count = int(candidates.sum())
+        expected = np.empty(len(self.guesses))
+        bits = np.empty(len(self.guesses))
+        columns = np.flatnonzero(candidates)
+        for start in range(0, len(self.guesses), CHUNK_ROWS):
+            counts = _pattern_counts(self.matrix[start:start + CHUNK_ROWS, columns])
+            expected[start:start + CHUNK_ROWS] = (counts.astype(np.float64) ** 2).sum(axis=1) / count
+            p = counts / count
+            with np.errstate(divide="ignore", invalid="ignore"):
+                bits[start:start + CHUNK_ROWS] = -np.nansum(p * np.log2(p), axis=1)
+        return expected, bits
+
+    def expected_remaining(self, candidates: np.ndarray) -> np.ndarray:
+        return self._scores(candidates)[0]
+
+    def information_gain(self, candidates: np.ndarray) -> np.ndarray:
+        return self._scores(candidates)[1]
+
+    def best_guess(self, candidates: np.ndarray) -> str:
+        """Guess minimising expected remaining candidates; ties go to a possible answer."""
+        expected = self.expected_remaining(candidates)
+        is_candidate = np.zeros(len(self.guesses), dtype=bool)
+        is_candidate[self._answer_rows[candidates]] = True
+        # A candidate guess can end the game outright, which is worth one leftover word.
+        expected = expected - is_candidate * (1.0 / max(int(candidates.sum()), 1))
+        return self.guesses[int(np.argmin(expected))]
+
+    def score_guesses(self, guesses: list, answer: str) -> list:
+        """Per-guess skill vs luck for one finished board.
+
+        skill is best possible expected remaining / this guess's expected remaining
+        (1.0 = optimal). luck_bits is the information actually gained minus what the
+        guess was expected to gain; positive means the answer fell in a small group.
+        """
+        answer_column = self.answer_index[answer]
+        candidates = self.all_candidates()
+        scored = []
+        for guess in guesses:
+            before = int(candidates.sum())
+            expected, bits = self._scores(candidates)
+            row = self.guess_index[guess]
+            observed = int(self.matrix[row, answer_column])
+            after_mask = candidates & (self.matrix[row] == observed)
+            after = int(after_mask.sum())
+            scored.append({
+                "guess": guess,
+                "candidates_before": before,
+                "candidates_after": after,
+                "expected_after": round(float(expected[row]), 3),
+                "best_expected_after": round(float(expected.min()), 3),
+                "skill": round(float(expected.min() / expected[row]), 4) if expected[row] else 1.0,
+                "luck_bits": round(math.log2(before / after) - float(bits[row]), 3) if after else 0.0,
+            })
+            candidates = after_mask
+            if observed == SOLVED_PATTERN:
+                break
+        return scored
+
+
+_matrix = None
+_matrix_lock = threading.Lock()
+
+
+def get_pattern_matrix() -> Optional[PatternMatrix]:
+    """The shared matrix, or None when it has not been built on this host."""
+    global _matrix
+    if _matrix is None:
+        with _matrix_lock:
+            if _matrix is None and os.path.exists(PATTERN_MATRIX_PATH):
+                _matrix = PatternMatrix(PATTERN_MATRIX_PATH)
+    return _matrix
+
+
+def word_difficulty(word: str) -> Optional[float]:
+    matrix = get_pattern_matrix()
+    if matrix is None:
+        return None
+    return matrix.difficulty.get(word)
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Build the memory-mapped guess pattern matrix.")
+    parser.add_argument("command", choices=["build"])
+    parser.add_argument("--path", default=PATTERN_MATRIX_PATH)
+    args = parser.parse_args()
+    started = time.perf_counter()
+    print(f"built {build(args.path)} in {time.perf_counter() - started:.1f}s")
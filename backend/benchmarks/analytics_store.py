@@ -0,0 +1,75 @@
+"""Private analytics queries on Postgres vs. the DuckDB/Parquet analytics store.
+
+Needs DATABASE_URL and a populated ANALYTICS_DIR (python -m app.analytics --start YYYY-MM-DD).
+Both sides answer the same monthly trend and word difficulty questions over --months.
+
+    python benchmarks/analytics_store.py --months 24 --repeat 3
+"""
+import argparse
+import os
+import sys
+import time
+
+BACKEND_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if BACKEND_ROOT not in sys.path:
+    sys.path.insert(0, BACKEND_ROOT)
+
+from app.analytics import service as analytics  # noqa: E402
+from app.crud import get_db  # noqa: E402
+
+
+def _postgres_trends(since: str, campaign_id):
+    campaign_sql = "AND campaign_id = %s" if campaign_id is not None else ""
+    params = (since, campaign_id) if campaign_id is not None else (since,)
+    with get_db(readonly=True) as conn:
+        return conn.execute(f"""
+            SELECT LEFT(date, 7), COUNT(*), COUNT(DISTINCT user_id), COUNT(DISTINCT campaign_id),
+                   AVG(solved), AVG(guesses_used) FILTER (WHERE solved = 1),
+                   SUM(troops_earned), SUM(coins_earned), SUM(used_double_down)
+            FROM campaign_user_daily_results
+            WHERE date >= %s {campaign_sql}
+            GROUP BY 1
+            ORDER BY 1
+        """, params).fetchall()
+
+
+def _postgres_words(since: str):
+    with get_db(readonly=True) as conn:
+        return conn.execute("""
+            SELECT word, COUNT(*), AVG(solved), AVG(guesses_used) FILTER (WHERE solved = 1)
+            FROM campaign_user_daily_results
+            WHERE word IS NOT NULL AND date >= %s
+            GROUP BY word
+            HAVING COUNT(*) >= 5
+        """, (since,)).fetchall()
+
+
+def _best_of(repeat: int, fn, *args):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(*args)
+        timings.append(time.perf_counter() - started)
+    return min(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--months", type=int, default=24)
+    parser.add_argument("--campaign-id", type=int, default=None)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    since = analytics._since(args.months).isoformat()
+    cases = (
+        ("monthly trends", _postgres_trends, (since, args.campaign_id), analytics.get_monthly_trends, (args.campaign_id, args.months)),
+        ("word difficulty", _postgres_words, (since,), analytics.get_word_difficulty, (50, 5, args.months)),
+    )
+    for label, pg_fn, pg_args, store_fn, store_args in cases:
+        pg_ms = _best_of(args.repeat, pg_fn, *pg_args)
+        store_ms = _best_of(args.repeat, store_fn, *store_args)
+        print(f"{label:>16}: postgres {pg_ms:8.1f} ms  store {store_ms:8.1f} ms  ({pg_ms / store_ms:5.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Measure per-request auth overhead with and without the verified-token / principal caches.
+
+Runs without a database: principal lookups go through a stub connection that counts queries.
+
+    python benchmarks/auth_overhead.py --requests 20000
+"""
+import argparse
+import os
+import sys
+import time
+
+BACKEND_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if BACKEND_ROOT not in sys.path:
+    sys.path.insert(0, BACKEND_ROOT)
+
+os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+os.environ.setdefault("ALGORITHM", "HS256")
+os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "60")
+
+from app import auth, principal  # noqa: E402
+
+
+class _CountingConn:
+    def __init__(self):
+        self.queries = 0
+
+    def execute(self, query, params=None):
+        self.queries += 1
+        return self
+
+    def fetchone(self):
+        return (False, [1, 2, 3])
+
+
+def _run(requests: int, tokens: list, cached: bool):
+    conn = _CountingConn()
+    auth.clear_token_cache()
+    principal.invalidate_principal()
+    started = time.perf_counter()
+    for i in range(requests):
+        token = tokens[i % len(tokens)]
+        if not cached:
+            auth.clear_token_cache()
+            principal.invalidate_principal()
+        user_id = auth.get_current_user(token)["user_id"]
+        # A typical endpoint checks admin status and membership once each.
+        principal.get_principal(conn, user_id).is_admin
+        principal.is_campaign_member(conn, user_id, 1)
+    elapsed = time.perf_counter() - started
+    return elapsed, conn.queries
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--users", type=int, default=200)
+    args = parser.parse_args()
+
+    tokens = [auth.create_access_token({"user_id": user_id}) for user_id in range(1, args.users + 1)]
+    for label, cached in (("uncached", False), ("cached", True)):
+        elapsed, queries = _run(args.requests, tokens, cached)
+        per_request_us = elapsed / args.requests * 1_000_000
+        print(f"{label:>9}: {per_request_us:8.1f} us/request, {queries / args.requests:.2f} principal queries/request")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Concurrent finished games bumping the same global_word_stats row: direct upsert vs app.counters deltas.
+
+Needs DATABASE_URL. Every simulated game is one transaction that increments the shared
+counter first and then spends --work-ms on the rest of the guess path (pg_sleep), the way
+validate_guess holds the row lock until commit. Benchmark rows use a word that is not in
+the word lists and are deleted afterwards.
+
+    python benchmarks/counter_contention.py --threads 32 --games 2000
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+BACKEND_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if BACKEND_ROOT not in sys.path:
+    sys.path.insert(0, BACKEND_ROOT)
+
+from app.counters import flush_global_counters, record_word_result  # noqa: E402
+from app.crud import get_db  # noqa: E402
+
+BENCH_WORD = "zbnch"
+DAY = "2026-01-01"
+
+
+def _upsert(conn):
+    # What validate_guess did before app.counters.
+    conn.execute("""
+        INSERT INTO global_word_stats (word, attempts, solves, fails, first_seen, last_seen)
+        VALUES (%s, 1, 1, 0, %s, %s)
+        ON CONFLICT (word) DO UPDATE
+        SET attempts = global_word_stats.attempts + 1,
+            solves = global_word_stats.solves + EXCLUDED.solves,
+            fails = global_word_stats.fails + EXCLUDED.fails,
+            last_seen = EXCLUDED.last_seen
+    """, (BENCH_WORD, DAY, DAY))
+
+
+def _delta(conn):
+    record_word_result(conn, BENCH_WORD, True, DAY)
+
+
+def _run(increment, threads: int, games: int, work_ms: float):
+    latencies = []
+    lock = threading.Lock()
+    per_thread = games // threads
+
+    def _worker():
+        mine = []
+        for _ in range(per_thread):
+            started = time.perf_counter()
+            with get_db() as conn:
+                increment(conn)
+                conn.execute("SELECT pg_sleep(%s)", (work_ms / 1000,))
+            mine.append(time.perf_counter() - started)
+        with lock:
+            latencies.extend(mine)
+
+    started = time.perf_counter()
+    workers = [threading.Thread(target=_worker) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return len(latencies) / elapsed, latencies[len(latencies) // 2], latencies[int(len(latencies) * 0.95)]
+
+
+def _cleanup():
+    with get_db() as conn:
+        conn.execute("DELETE FROM global_word_stat_deltas WHERE word = %s", (BENCH_WORD,))
+        conn.execute("DELETE FROM global_word_stats WHERE word = %s", (BENCH_WORD,))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--games", type=int, default=2000)
+    parser.add_argument("--work-ms", type=float, default=5.0)
+    args = parser.parse_args()
+
+    _cleanup()
+    try:
+        for name, increment in (("upsert", _upsert), ("deltas", _delta)):
+            games_per_s, p50, p95 = _run(increment, args.threads, args.games, args.work_ms)
+            print(f"{name:>7}: {games_per_s:8.0f} games/s  p50 {p50 * 1000:7.1f} ms  p95 {p95 * 1000:7.1f} ms")
+
+        started = time.perf_counter()
+        with get_db() as conn:
+            folded = flush_global_counters(conn)
+            attempts = conn.execute(
+                "SELECT attempts FROM global_word_stats WHERE word = %s", (BENCH_WORD,)
+            ).fetchone()[0]
+        print(f"  flush: {(time.perf_counter() - started) * 1000:.1f} ms {folded}; {attempts} attempts recorded")
+    finally:
+        _cleanup()
+
+
+if __name__ == "__main__":
+    main()
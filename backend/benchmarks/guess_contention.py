@@ -0,0 +1,190 @@
+"""Concurrent guesses with and without the per-(user, campaign) advisory lock in crud.validate_guess.
+
+Needs DATABASE_URL. Seeds one scratch admin campaign (so global stats are left alone) with
+--players players, then runs two scenarios:
+
+- double submit: every player sends the winning guess --copies times at once, as a flaky mobile
+  connection retrying would. Reports how many rows each board advanced and how many troops were
+  awarded; anything above one row and one award is a lost update.
+- unrelated players: one player's lock is held for --hold seconds while everyone else guesses.
+  Their latencies should not move; only the held player's own guess waits.
+
+Scratch rows are deleted afterwards.
+
+    python benchmarks/guess_contention.py --players 64 --copies 3 --hold 1.0
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from unittest.mock import patch
+from zoneinfo import ZoneInfo
+
+BACKEND_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if BACKEND_ROOT not in sys.path:
+    sys.path.insert(0, BACKEND_ROOT)
+
+from fastapi import HTTPException  # noqa: E402
+
+from app import crud  # noqa: E402
+from app.cache import clear_all  # noqa: E402
+from app.crud import get_db  # noqa: E402
+
+BENCH_TAG = "bench-guess-lock"
+SECRET = "crane"
+WRONG_GUESS = "slate"
+
+
+def _seed(players: int) -> tuple:
+    today = datetime.now(ZoneInfo("America/Chicago")).strftime("%Y-%m-%d")
+    with get_db() as conn:
+        user_ids = [
+            conn.execute("""
+                INSERT INTO users (first_name, last_name, email, phone, password)
+                VALUES ('Bench', %s, %s, %s, 'x')
+                RETURNING id
+            """, (str(p), f"{BENCH_TAG}-{p}@example.invalid", f"9{p:09d}")).fetchone()[0]
+            for p in range(players)
+        ]
+        campaign_id = conn.execute("""
+            INSERT INTO campaigns (name, owner_id, invite_code, start_date, cycle_length, is_admin_campaign)
+            VALUES (%s, %s, 'BLOCK1', %s, 30, TRUE)
+            RETURNING id
+        """, (BENCH_TAG, user_ids[0], today)).fetchone()[0]
+        for user_id in user_ids:
+            conn.execute("""
+                INSERT INTO campaign_members (user_id, campaign_id, display_name, color, score)
+                VALUES (%s, %s, 'Bench', '#ffd700', 0)
+            """, (user_id, campaign_id))
+        conn.execute("""
+            INSERT INTO campaign_words (campaign_id, day, word)
+            SELECT %s, day, %s FROM generate_series(1, 30) AS day
+        """, (campaign_id, SECRET))
+    return campaign_id, user_ids
+
+
+def _campaign_tables(conn) -> list:
+    return [row[0] for row in conn.execute("""
+        SELECT c.table_name
+        FROM information_schema.columns c
+        JOIN pg_class t ON t.relname = c.table_name AND NOT t.relispartition
+        WHERE c.table_schema = current_schema() AND c.column_name = 'campaign_id' AND c.table_name <> 'campaigns'
+    """)]
+
+
+def _reset(campaign_id: int):
+    clear_all()
+    with get_db() as conn:
+        for table in _campaign_tables(conn):
+            if table not in ("campaign_members", "campaign_words"):
+                conn.execute(f"DELETE FROM {table} WHERE campaign_id = %s", (campaign_id,))
+        conn.execute("UPDATE campaign_members SET score = 0 WHERE campaign_id = %s", (campaign_id,))
+
+
+def _cleanup():
+    with get_db() as conn:
+        campaign_ids = [row[0] for row in conn.execute("SELECT id FROM campaigns WHERE name = %s", (BENCH_TAG,))]
+        for table in _campaign_tables(conn):
+            conn.execute(f"DELETE FROM {table} WHERE campaign_id = ANY(%s)", (campaign_ids,))
+        conn.execute("DELETE FROM campaigns WHERE id = ANY(%s)", (campaign_ids,))
+        conn.execute("DELETE FROM users WHERE email LIKE %s", (f"{BENCH_TAG}-%",))
+
+
+def _guess(word: str, user_id: int, campaign_id: int) -> float:
+    started = time.perf_counter()
+    try:
+        crud.validate_guess(word, user_id, campaign_id)
+    except HTTPException:
+        pass
+    return time.perf_counter() - started
+
+
+def double_submit(campaign_id: int, user_ids: list, copies: int) -> dict:
+    _reset(campaign_id)
+    calls = [user_id for user_id in user_ids for _ in range(copies)]
+    barrier = threading.Barrier(len(calls))
+
+    def _submit(user_id):
+        barrier.wait()
+        return _guess(SECRET, user_id, campaign_id)
+
+    with ThreadPoolExecutor(max_workers=len(calls)) as pool:
+        list(pool.map(_submit, calls))
+    with get_db() as conn:
+        rows = dict(conn.execute("""
+            SELECT user_id, COUNT(*) FROM campaign_guesses WHERE campaign_id = %s GROUP BY user_id
+        """, (campaign_id,)).fetchall())
+        scores = dict(conn.execute(
+            "SELECT user_id, score FROM campaign_members WHERE campaign_id = %s", (campaign_id,)
+        ).fetchall())
+    return {
+        "extra_rows": sum(count - 1 for count in rows.values()),
+        "scores": dict(sorted(Counter(scores.values()).items())),
+    }
+
+
+def _pct(latencies: list, q: float) -> float:
+    return latencies[min(int(len(latencies) * q), len(latencies) - 1)] * 1000
+
+
+def unrelated_players(campaign_id: int, user_ids: list, hold: float) -> dict:
+    _reset(campaign_id)
+    held, others = user_ids[0], user_ids[1:]
+    locked = threading.Event()
+
+    def _hold():
+        with get_db() as conn:
+            conn.execute("SELECT pg_advisory_xact_lock(%s, %s)", (held, campaign_id))
+            locked.set()
+            time.sleep(hold)
+
+    holder = threading.Thread(target=_hold)
+    holder.start()
+    locked.wait()
+    with ThreadPoolExecutor(max_workers=len(user_ids)) as pool:
+        held_future = pool.submit(_guess, WRONG_GUESS, held, campaign_id)
+        latencies = sorted(pool.map(lambda user_id: _guess(WRONG_GUESS, user_id, campaign_id), others))
+        held_latency = held_future.result()
+    holder.join()
+    return {
+        "p50": _pct(latencies, 0.5),
+        "p95": _pct(latencies, 0.95),
+        "max": latencies[-1] * 1000,
+        "held": held_latency * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--players", type=int, default=64)
+    parser.add_argument("--copies", type=int, default=3)
+    parser.add_argument("--hold", type=float, default=1.0)
+    args = parser.parse_args()
+
+    _cleanup()
+    campaign_id, user_ids = _seed(args.players)
+    try:
+        with patch.object(crud, "_lock_players", lambda *args: None):
+            unlocked = double_submit(campaign_id, user_ids, args.copies)
+        locked = double_submit(campaign_id, user_ids, args.copies)
+        for label, submit in (("no lock", unlocked), ("advisory lock", locked)):
+            print(
+                f"{label:>14}: {args.players} players x {args.copies} identical submits -> "
+                f"{submit['extra_rows']} extra board rows, players per score {submit['scores']}"
+            )
+        for hold in (0.0, args.hold):
+            result = unrelated_players(campaign_id, user_ids, hold)
+            print(
+                f"{'held ' + format(hold * 1000, '.0f') + ' ms':>14}: other players p50 {result['p50']:.1f} ms"
+                f"  p95 {result['p95']:.1f} ms  max {result['max']:.1f} ms; held player {result['held']:.0f} ms"
+            )
+    finally:
+        _cleanup()
+
+
+if __name__ == "__main__":
+    main()
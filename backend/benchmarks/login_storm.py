@@ -0,0 +1,99 @@
+"""Gameplay latency during a login storm, with bcrypt inline vs. on the dedicated password executor.
+
+A shared pool stands in for FastAPI's request threadpool. "Logins" verify a real bcrypt
+hash, either inline on that pool or awaited from an event loop the way the async login
+route does; "guesses" do a short burst of pure-Python work. We report guess latency percentiles.
+
+    python benchmarks/login_storm.py --logins 200 --guesses 400 --rounds 12
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+BACKEND_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if BACKEND_ROOT not in sys.path:
+    sys.path.insert(0, BACKEND_ROOT)
+
+import bcrypt  # noqa: E402
+from fastapi import HTTPException  # noqa: E402
+
+from app import passwords  # noqa: E402
+
+REQUEST_POOL_SIZE = 40  # anyio's default thread limiter
+
+
+def _guess_work():
+    total = 0
+    for i in range(20000):
+        total += i * i
+    return time.perf_counter()
+
+
+def _storm_inline(pool, stored, logins: int):
+    return [pool.submit(bcrypt.checkpw, b"hunter2", stored) for _ in range(logins)]
+
+
+def _storm_dedicated(pool, stored, logins: int):
+    async def _login():
+        try:
+            await passwords.verify_password_async("hunter2", stored)
+        except HTTPException:
+            pass
+
+    async def _storm():
+        await asyncio.gather(*(_login() for _ in range(logins)))
+
+    # The event loop gets its own thread; no request-pool thread waits on bcrypt.
+    loop_thread = ThreadPoolExecutor(max_workers=1)
+    future = loop_thread.submit(asyncio.run, _storm())
+    loop_thread.shutdown(wait=False)
+    return [future]
+
+
+def _run(storm, stored, logins: int, guesses: int):
+    with ThreadPoolExecutor(max_workers=REQUEST_POOL_SIZE) as pool:
+        login_futures = storm(pool, stored, logins)
+        # Let the storm occupy the pool before gameplay requests arrive.
+        time.sleep(0.05)
+        submitted = []
+        for _ in range(guesses):
+            submitted.append((time.perf_counter(), pool.submit(_guess_work)))
+            time.sleep(0.002)
+        latencies = []
+        for submitted_at, future in submitted:
+            latencies.append(future.result() - submitted_at)
+        for future in login_futures:
+            future.result()
+    latencies.sort()
+    return latencies
+
+
+def _pct(values, pct):
+    return values[min(len(values) - 1, int(len(values) * pct))] * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--guesses", type=int, default=400)
+    parser.add_argument("--rounds", type=int, default=passwords.BCRYPT_ROUNDS)
+    args = parser.parse_args()
+
+    stored = bcrypt.hashpw(b"hunter2", bcrypt.gensalt(rounds=args.rounds))
+    baseline = _run(_storm_inline, stored, 0, args.guesses)
+    print(f"{'idle':>10}: p50 {_pct(baseline, 0.5):7.1f} ms  p99 {_pct(baseline, 0.99):7.1f} ms")
+    for label, storm in (("inline", _storm_inline), ("dedicated", _storm_dedicated)):
+        latencies = _run(storm, stored, args.logins, args.guesses)
+        print(
+            f"{label:>10}: p50 {_pct(latencies, 0.5):7.1f} ms  p99 {_pct(latencies, 0.99):7.1f} ms  "
+            f"mean {statistics.mean(latencies) * 1000:7.1f} ms"
+        )
+    print(f"rejected logins (dedicated): {passwords.PASSWORD_HASH_REJECTED.labels('verify')._value.get():.0f}")
+
+
+if __name__ == "__main__":
+    main()
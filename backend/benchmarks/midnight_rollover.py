@@ -0,0 +1,150 @@
+"""Replay the first requests after midnight with cold caches vs after the scheduler's pre-warm stage.
+
+Needs DATABASE_URL. Seeds --campaigns scratch campaigns with --members players each, then has
+every player make their first-of-day calls (progress, leaderboard, saved board, shop) from
+--threads workers at once: first against empty caches and no shop rotations, then after
+prewarm_next_day's rotations and prime_new_day's caches. Scratch rows are deleted afterwards.
+
+    python benchmarks/midnight_rollover.py --campaigns 50 --members 20 --threads 32
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+BACKEND_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if BACKEND_ROOT not in sys.path:
+    sys.path.insert(0, BACKEND_ROOT)
+
+from app import crud  # noqa: E402
+from app.cache import clear_all  # noqa: E402
+from app.crud import get_db  # noqa: E402
+
+BENCH_TAG = "bench-rollover"
+
+
+def _seed(campaigns: int, members: int) -> list:
+    start = (datetime.now(ZoneInfo("America/Chicago")).date() - timedelta(days=1)).strftime("%Y-%m-%d")
+    players = []
+    with get_db() as conn:
+        for c in range(campaigns):
+            user_ids = [
+                conn.execute("""
+                    INSERT INTO users (first_name, last_name, email, phone, password)
+                    VALUES ('Bench', %s, %s, %s, 'x')
+                    RETURNING id
+                """, (str(m), f"{BENCH_TAG}-{c}-{m}@example.invalid", f"0{c:05d}{m:04d}")).fetchone()[0]
+                for m in range(members)
+            ]
+            campaign_id = conn.execute("""
+                INSERT INTO campaigns (name, owner_id, invite_code, start_date, cycle_length)
+                VALUES (%s, %s, %s, %s, 30)
+                RETURNING id
+            """, (BENCH_TAG, user_ids[0], f"B{c:05d}", start)).fetchone()[0]
+            for user_id in user_ids:
+                conn.execute("""
+                    INSERT INTO campaign_members (user_id, campaign_id, display_name, color, score)
+                    VALUES (%s, %s, 'Bench', '#ffd700', %s)
+                """, (user_id, campaign_id, random.randint(0, 500)))
+                players.append((user_id, campaign_id))
+            conn.execute("""
+                INSERT INTO campaign_words (campaign_id, day, word)
+                SELECT %s, day, 'crane' FROM generate_series(1, 30) AS day
+            """, (campaign_id,))
+    return players
+
+
+def _cleanup():
+    with get_db() as conn:
+        campaign_ids = [row[0] for row in conn.execute("SELECT id FROM campaigns WHERE name = %s", (BENCH_TAG,))]
+        for table in ("campaign_shop_rotation", "campaign_shop_log", "campaign_members", "campaign_words"):
+            conn.execute(f"DELETE FROM {table} WHERE campaign_id = ANY(%s)", (campaign_ids,))
+        conn.execute("DELETE FROM campaigns WHERE id = ANY(%s)", (campaign_ids,))
+        conn.execute("DELETE FROM users WHERE email LIKE %s", (f"{BENCH_TAG}-%",))
+
+
+def _reset_day(players: list):
+    clear_all()
+    with get_db() as conn:
+        conn.execute(
+            "DELETE FROM campaign_shop_rotation WHERE campaign_id = ANY(%s)",
+            (sorted({campaign_id for _, campaign_id in players}),),
+        )
+
+
+ENDPOINTS = {
+    "progress": lambda user_id, campaign_id: crud.get_campaign_progress(campaign_id),
+    "leaderboard": lambda user_id, campaign_id: crud.get_leaderboard(campaign_id),
+    "board": lambda user_id, campaign_id: crud.get_saved_progress(user_id, campaign_id),
+    "shop": lambda user_id, campaign_id: crud.get_shop_state(user_id, campaign_id),
+}
+
+
+def _first_requests(user_id: int, campaign_id: int) -> list:
+    timings = []
+    for name, call in ENDPOINTS.items():
+        started = time.perf_counter()
+        call(user_id, campaign_id)
+        timings.append((name, time.perf_counter() - started))
+    return timings
+
+
+def _pct(latencies: list, q: float) -> float:
+    return latencies[min(int(len(latencies) * q), len(latencies) - 1)] * 1000
+
+
+def _replay(players: list, threads: int):
+    order = list(players)
+    random.shuffle(order)
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        timings = [t for per_player in pool.map(lambda p: _first_requests(*p), order) for t in per_player]
+    elapsed = time.perf_counter() - started
+    by_endpoint = {
+        name: sorted(t for endpoint, t in timings if endpoint == name) for name in ENDPOINTS
+    }
+    return elapsed, sorted(t for _, t in timings), by_endpoint
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--campaigns", type=int, default=50)
+    parser.add_argument("--members", type=int, default=20)
+    parser.add_argument("--threads", type=int, default=32)
+    args = parser.parse_args()
+
+    _cleanup()
+    players = _seed(args.campaigns, args.members)
+    today = datetime.now(ZoneInfo("America/Chicago")).strftime("%Y-%m-%d")
+    try:
+        _reset_day(players)
+        results = [("cold", 0.0, _replay(players, args.threads))]
+
+        _reset_day(players)
+        started = time.perf_counter()
+        with get_db() as conn:
+            crud.pregenerate_shop_rotations(conn, today)
+            crud.prime_campaign_caches(conn, today)
+        prewarm = time.perf_counter() - started
+        results.append(("prewarmed", prewarm, _replay(players, args.threads)))
+
+        print(f"{len(players)} players x 4 first requests, {args.threads} threads")
+        for name, prewarm, (elapsed, latencies, by_endpoint) in results:
+            print(
+                f"{name:>10}: burst {elapsed:6.2f} s  p50 {_pct(latencies, 0.5):7.1f} ms"
+                f"  p95 {_pct(latencies, 0.95):7.1f} ms  p99 {_pct(latencies, 0.99):7.1f} ms"
+                f"  (pre-warm {prewarm * 1000:.0f} ms)"
+            )
+            print("            " + "  ".join(
+                f"{endpoint} p50 {_pct(t, 0.5):.1f}/p95 {_pct(t, 0.95):.1f}" for endpoint, t in by_endpoint.items()
+            ))
+    finally:
+        _cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Solver queries on the memory-mapped pattern matrix vs. pure Python over the word lists.
+
+Builds the matrix first if PATTERN_MATRIX_PATH does not exist. The pure-Python best opening
+guess is timed on --sample guesses and extrapolated to the full guess list.
+
+    python benchmarks/pattern_matrix.py --sample 100
+"""
+import argparse
+import os
+import sys
+import time
+from collections import Counter
+
+BACKEND_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if BACKEND_ROOT not in sys.path:
+    sys.path.insert(0, BACKEND_ROOT)
+
+from app import wordmatrix  # noqa: E402
+
+
+def _python_expected_remaining(guess, answers):
+    counts = Counter(wordmatrix.pattern(guess, answer) for answer in answers)
+    return sum(count * count for count in counts.values()) / len(answers)
+
+
+def _timed(fn, *args):
+    started = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sample", type=int, default=100)
+    args = parser.parse_args()
+
+    if not os.path.exists(wordmatrix.PATTERN_MATRIX_PATH):
+        _, elapsed = _timed(wordmatrix.build)
+        print(f"build: {elapsed:.1f}s")
+    matrix, elapsed = _timed(wordmatrix.PatternMatrix)
+    print(f"load (mmap): {elapsed * 1000:.1f} ms for {matrix.matrix.shape[0]}x{matrix.matrix.shape[1]}")
+
+    sample = matrix.guesses[:: max(1, len(matrix.guesses) // args.sample)][: args.sample]
+    _, elapsed = _timed(lambda: [_python_expected_remaining(guess, matrix.answers) for guess in sample])
+    python_full = elapsed / len(sample) * len(matrix.guesses)
+    best, numpy_full = _timed(matrix.best_guess, matrix.all_candidates())
+    print(f"best opening guess: python ~{python_full:.1f}s (extrapolated)  numpy {numpy_full:.2f}s -> {best}")
+
+    answer = matrix.answers[len(matrix.answers) // 2]
+    history = [(guess, wordmatrix.pattern(guess, answer)) for guess in ("crane", "moist")]
+    candidates, elapsed = _timed(matrix.candidates_after, history)
+    print(f"candidates after 2 guesses: {elapsed * 1000:.2f} ms ({int(candidates.sum())} left)")
+    best, elapsed = _timed(matrix.best_guess, candidates)
+    print(f"best third guess: {elapsed * 1000:.1f} ms -> {best}")
+    _, elapsed = _timed(matrix.score_guesses, ["crane", "moist", answer], answer)
+    print(f"score a 3-guess board: {elapsed * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Pull campaign_guesses through the private API: OFFSET paging vs keyset paging vs streaming export.
+
+Needs DATABASE_URL. --seed inserts synthetic rows into a scratch campaign (--campaign-id) first
+and --cleanup removes them afterwards.
+
+    python benchmarks/private_export.py --rows 5000000 --seed --cleanup
+"""
+import argparse
+import os
+import resource
+import sys
+import time
+
+BACKEND_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if BACKEND_ROOT not in sys.path:
+    sys.path.insert(0, BACKEND_ROOT)
+
+from app.crud import get_db  # noqa: E402
+from app.private import service  # noqa: E402
+
+WORDS = ["crane", "slate", "adieu", "roast", "pious", "trace", "lemon", "brick"]
+
+
+def _seed(campaign_id: int, rows: int):
+    with get_db() as conn:
+        conn.execute("""
+            INSERT INTO campaign_guesses (user_id, campaign_id, word, date)
+            SELECT
+                (g %% 500) + 1,
+                %s,
+                (%s::text[])[(g %% 8) + 1],
+                TO_CHAR(DATE '2020-01-01' + (g / 2000), 'YYYY-MM-DD')
+            FROM generate_series(1, %s) AS g
+        """, (campaign_id, WORDS, rows))
+        conn.execute("ANALYZE campaign_guesses")
+
+
+def _cleanup(campaign_id: int):
+    with get_db() as conn:
+        conn.execute("DELETE FROM campaign_guesses WHERE campaign_id = %s", (campaign_id,))
+
+
+def _peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _time_export(campaign_id: int, export_format: str):
+    started = time.perf_counter()
+    total_bytes = 0
+    _, chunks = service.export_dataset("guesses", export_format, campaign_id, None, None, None)
+    for chunk in chunks:
+        total_bytes += len(chunk)
+    return time.perf_counter() - started, total_bytes
+
+
+def _time_offset_pages(campaign_id: int, pages: int, page_size: int):
+    # What deep OFFSET paging used to cost: each page rescans everything before it.
+    timings = []
+    with get_db() as conn:
+        for page in range(pages):
+            offset = page * page_size * 100
+            started = time.perf_counter()
+            conn.execute("""
+                SELECT user_id, campaign_id, date, word
+                FROM campaign_guesses
+                WHERE campaign_id = %s
+                ORDER BY date DESC, user_id ASC
+                LIMIT %s OFFSET %s
+            """, (campaign_id, page_size, offset)).fetchall()
+            timings.append((offset, time.perf_counter() - started))
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=5_000_000)
+    parser.add_argument("--campaign-id", type=int, default=-4242)
+    parser.add_argument("--seed", action="store_true")
+    parser.add_argument("--cleanup", action="store_true")
+    args = parser.parse_args()
+
+    if args.seed:
+        started = time.perf_counter()
+        _seed(args.campaign_id, args.rows)
+        print(f"seeded {args.rows} rows in {time.perf_counter() - started:.1f}s")
+
+    try:
+        for export_format in ("ndjson", "csv"):
+            elapsed, total_bytes = _time_export(args.campaign_id, export_format)
+            print(
+                f"export {export_format:>6}: {elapsed:6.1f}s, {total_bytes / 1_048_576:7.1f} MiB, "
+                f"{args.rows / elapsed:,.0f} rows/s, peak RSS {_peak_rss_mb():.0f} MiB"
+            )
+        for offset, elapsed in _time_offset_pages(args.campaign_id, pages=4, page_size=365):
+            print(f"OFFSET {offset:>9,}: {elapsed * 1000:8.1f} ms/page")
+    finally:
+        if args.cleanup:
+            _cleanup(args.campaign_id)
+
+
+if __name__ == "__main__":
+    main()
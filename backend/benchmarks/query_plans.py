@@ -0,0 +1,526 @@
+"""EXPLAIN every statement issued by crud, private.service, recap.service and scheduler on seeded data.
+
+Needs a database with the app schema (QUERY_PLAN_DATABASE_URL, else DATABASE_URL); point it at a
+scratch copy, not production. Inside one transaction that is rolled back, --campaigns campaigns
+of --members players get --days of history in every per-day table and are ANALYZEd; then each
+statement is planned with EXPLAIN (FORMAT JSON):
+
+- statements written as literals (or f-strings over module constants) are read from the source
+  and planned with GENERIC_PLAN, so they need no parameter values (Postgres 16+);
+- private.service builds its WHERE clauses at runtime, so its get_/list_ readers and the export
+  queries are called once unfiltered and once with every filter set, and what they send is
+  planned with the real parameters.
+
+A statement fails the check when it sequential-scans a table of --min-rows or more that its
+baseline entry did not, or when its estimated cost grows past --tolerance over the baseline.
+Baseline entries are keyed by a fingerprint of the whitespace-normalized SQL, so adding or
+moving a query leaves every other entry alone; a changed statement is a new entry.
+tests/integration/test_query_plans.py runs the same check.
+
+    python benchmarks/query_plans.py --top 25
+    python benchmarks/query_plans.py --update-baseline
+"""
+import argparse
+import ast
+import hashlib
+import importlib
+import inspect
+import json
+import os
+import re
+import sys
+from dataclasses import dataclass, field
+from datetime import datetime
+from unittest.mock import patch
+from zoneinfo import ZoneInfo
+
+BACKEND_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if BACKEND_ROOT not in sys.path:
+    sys.path.insert(0, BACKEND_ROOT)
+
+MODULES = ("app.crud", "app.private.service", "app.recap.service", "app.scheduler")
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "query_plan_baseline.json")
+MIN_SEQ_SCAN_ROWS = int(os.getenv("QUERY_PLAN_MIN_ROWS", "10000"))
+COST_TOLERANCE = float(os.getenv("QUERY_PLAN_COST_TOLERANCE", "0.25"))
+
+_PLANNABLE = ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH")
+_PLACEHOLDER = re.compile(r"%%|%s")
+# Summaries only fan out to readers that are called on their own.
+_SKIPPED_CALLS = {
+    "get_global_summary", "get_campaign_summary",
+    "get_global_summary_cached", "get_campaign_summary_cached",
+}
+
+
+@dataclass
+class Statement:
+    key: str
+    source: str
+    sql: str
+    params: tuple = None
+
+    @property
+    def fingerprint(self) -> str:
+        return hashlib.sha1(" ".join(self.sql.split()).encode()).hexdigest()[:12]
+
+    @property
+    def caller(self) -> str:
+        # The key without its ordinal, which shifts whenever a query is added above it.
+        return self.key.rsplit("#", 1)[0]
+
+
+@dataclass
+class Result:
+    statement: Statement
+    cost: float = 0.0
+    # {table: rows} for every table above the size threshold read with a Seq Scan.
+    seq_scans: dict = field(default_factory=dict)
+    error: str = None
+
+
+class _Unresolved(Exception):
+    pass
+
+
+def _resolve(node, namespace: dict) -> str:
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return node.value
+    if isinstance(node, ast.Name) and isinstance(namespace.get(node.id), str):
+        return namespace[node.id]
+    if isinstance(node, ast.BinOp) and isinstance(node.op, ast.Add):
+        return _resolve(node.left, namespace) + _resolve(node.right, namespace)
+    if isinstance(node, ast.JoinedStr):
+        return "".join(_resolve(part, namespace) for part in node.values)
+    if isinstance(node, ast.FormattedValue) and node.format_spec is None:
+        return _resolve(node.value, namespace)
+    raise _Unresolved(ast.unparse(node))
+
+
+def to_generic(sql: str) -> str:
+    """psycopg %s placeholders as $n, so EXPLAIN (GENERIC_PLAN) can plan without values."""
+    count = 0
+
+    def _number(match):
+        nonlocal count
+        if match.group(0) == "%%":
+            return "%"
+        count += 1
+        return f"${count}"
+
+    return _PLACEHOLDER.sub(_number, sql)
+
+
+def collect_static(module) -> tuple[list, list]:
+    """(statements, unresolved) for every execute/executemany with a SQL string in module."""
+    path = inspect.getsourcefile(module)
+    tree = ast.parse(open(path).read())
+    namespace = vars(module)
+    prefix = module.__name__.removeprefix("app.")
+    statements, unresolved = [], []
+    counts: dict = {}
+
+    def _visit(node, scope):
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                _visit(child, f"{scope}.{child.name}" if scope else child.name)
+                continue
+            if (
+                isinstance(child, ast.Call)
+                and isinstance(child.func, ast.Attribute)
+                and child.func.attr in ("execute", "executemany")
+                and child.args
+            ):
+                counts[scope] = counts.get(scope, 0) + 1
+                key = f"{prefix}.{scope or '<module>'}#{counts[scope]}"
+                source = f"{os.path.relpath(path, BACKEND_ROOT)}:{child.lineno}"
+                try:
+                    sql = _resolve(child.args[0], namespace)
+                except _Unresolved as exc:
+                    unresolved.append((key, source, str(exc)))
+                else:
+                    if sql.lstrip().split(None, 1)[0].upper() in _PLANNABLE:
+                        statements.append(Statement(key, source, to_generic(sql)))
+            _visit(child, scope)
+
+    _visit(tree, "")
+    return statements, unresolved
+
+
+class _Recorder:
+    """Stands in for get_db(): runs on the seeded connection and keeps what was sent."""
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.sent = []
+
+    def __call__(self, readonly: bool = False):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, query, params=None):
+        self.sent.append((query, tuple(params or ())))
+        return self.conn.execute(query, params)
+
+
+def collect_private(conn, values: dict) -> list:
+    """Statements the private.service readers build at runtime, unfiltered and filtered."""
+    from app.private import service
+
+    recorder = _Recorder(conn)
+    statements = []
+
+    def _capture(name, call):
+        recorder.sent.clear()
+        try:
+            with conn.transaction():
+                call()
+        except Exception:
+            pass
+        for n, (query, params) in enumerate(recorder.sent, start=1):
+            statements.append(Statement(
+                f"private.service.{name}#{n}", "app/private/service.py", query, params,
+            ))
+
+    with patch.object(service, "get_db", recorder):
+        for name, fn in inspect.getmembers(service, inspect.isfunction):
+            if fn.__module__ != service.__name__ or name in _SKIPPED_CALLS:
+                continue
+            if not name.startswith(("get_", "list_")):
+                continue
+            signature = inspect.signature(fn)
+            required = [p.name for p in signature.parameters.values() if p.default is p.empty]
+            if any(name_ not in values for name_ in required):
+                continue
+            unfiltered = {p: values[p] if p in required else None for p in signature.parameters}
+            unfiltered.update({p: values["limit"] for p in signature.parameters if p.endswith("limit")})
+            filtered = {p: values.get(p) for p in signature.parameters if p in values}
+            filtered.update({p: values["limit"] for p in signature.parameters if p.endswith("limit")})
+            for variant, kwargs in (("", unfiltered), ("[filtered]", filtered)):
+                kwargs = {k: v for k, v in kwargs.items() if v is not None or signature.parameters[k].default is None}
+                _capture(f"{name}{variant}", lambda: fn(**kwargs))
+        for dataset in service.EXPORT_DATASETS:
+            for variant, filters in (("", (None, None, None, None)), ("[filtered]", (
+                values["campaign_id"], values["user_id"], values["date_from"], values["date_to"],
+            ))):
+                sql, params = service._export_query(dataset, *filters)
+                statements.append(Statement(
+                    f"private.service.export.{dataset}{variant}#1", "app/private/service.py", sql, tuple(params),
+                ))
+    return statements
+
+
+def collect(conn, values: dict) -> tuple[list, list]:
+    """Every plannable statement, static ones first; runtime duplicates of them are dropped."""
+    statements, unresolved = [], []
+    for name in MODULES:
+        found, missing = collect_static(importlib.import_module(name))
+        statements += found
+        unresolved += missing
+    seen = {" ".join(s.sql.split()) for s in statements}
+    for statement in collect_private(conn, values):
+        text = " ".join(to_generic(statement.sql).split())
+        if text not in seen:
+            seen.add(text)
+            statements.append(statement)
+    unresolved = [entry for entry in unresolved if not entry[0].startswith("private.service.")]
+    return statements, unresolved
+
+
+_MEMBERS = """
+    FROM generate_series(0, %(campaigns)s * %(members)s - 1) AS n
+"""
+_MEMBER_DAYS = """
+    FROM campaign_members cm CROSS JOIN generate_series(0, %(days)s - 1) AS day
+    WHERE cm.campaign_id >= %(c0)s
+"""
+_CAMPAIGN_DAYS = """
+    FROM generate_series(%(c0)s, %(c0)s + %(campaigns)s - 1) AS c CROSS JOIN generate_series(0, %(days)s - 1) AS day
+"""
+_WORD = "(ARRAY['crane', 'slate', 'trace', 'adieu', 'roate'])[1 + (day %% 5)]"
+
+SEED = [
+    f"""INSERT INTO users (id, first_name, last_name, email, phone, password, campaigns, total_guesses, correct_guesses)
+        SELECT %(u0)s + n, 'Plan', n::text, 'plan-' || (%(u0)s + n) || '@example.invalid', 'plan-' || (%(u0)s + n),
+               '\\x00'::bytea, 1, 120, 80
+        {_MEMBERS}""",
+    """INSERT INTO campaigns (id, name, owner_id, invite_code, start_date, cycle_length, is_admin_campaign)
+        SELECT c, 'Plan ' || c, %(u0)s + (c - %(c0)s) * %(members)s, 'PLAN' || c,
+               %(today)s::date - (%(days)s - 1), %(days)s, FALSE
+        FROM generate_series(%(c0)s, %(c0)s + %(campaigns)s - 1) AS c""",
+    f"""INSERT INTO campaign_members (user_id, campaign_id, display_name, color, score)
+        SELECT %(u0)s + n, %(c0)s + n / %(members)s, 'Plan ' || n, '#ffd700', (n * 37) %% 900
+        {_MEMBERS}""",
+    f"""INSERT INTO campaign_words (campaign_id, day, word, difficulty)
+        SELECT c, day + 1, {_WORD}, 3.0 {_CAMPAIGN_DAYS}""",
+    f"""INSERT INTO campaign_guess_states (user_id, campaign_id, date, guesses, results, letter_status, current_row, game_over)
+        SELECT cm.user_id, cm.campaign_id, %(today)s::date - day, '[]', '[]', '{{}}', 4, 1 {_MEMBER_DAYS}""",
+    f"""INSERT INTO campaign_daily_progress (user_id, campaign_id, date, completed)
+        SELECT cm.user_id, cm.campaign_id, %(today)s::date - day, 1 {_MEMBER_DAYS}""",
+    f"""INSERT INTO campaign_user_daily_results (
+            user_id, campaign_id, date, word, guesses_used, solved, first_guess_word,
+            used_double_down, double_down_success, double_down_bonus_troops, troops_earned, coins_earned, completed_at
+        )
+        SELECT cm.user_id, cm.campaign_id, %(today)s::date - day, {_WORD}, 1 + (cm.user_id + day) %% 6,
+               ((cm.user_id + day) %% 7 <> 0)::int, 'crane', 0, 0, 0, 40, 5, %(today)s::timestamp - day * INTERVAL '1 day'
+        {_MEMBER_DAYS}""",
+    f"""INSERT INTO campaign_first_guesses (user_id, campaign_id, date, word)
+        SELECT cm.user_id, cm.campaign_id, %(today)s::date - day, 'crane' {_MEMBER_DAYS}""",
+    f"""INSERT INTO campaign_daily_troops (user_id, campaign_id, date, troops)
+        SELECT cm.user_id, cm.campaign_id, %(today)s::date - day, 40 {_MEMBER_DAYS}""",
+    f"""INSERT INTO campaign_guesses (user_id, campaign_id, word, date)
+        SELECT cm.user_id, cm.campaign_id, {_WORD}, to_char(%(today)s::date - day, 'YYYY-MM-DD')
+        {_MEMBER_DAYS.replace("AS day", "AS day CROSS JOIN generate_series(1, 3) AS attempt")}""",
+    f"""INSERT INTO campaign_shop_rotation (user_id, campaign_id, date, items)
+        SELECT cm.user_id, cm.campaign_id, %(today)s::date - day, '{{}}'::jsonb {_MEMBER_DAYS}""",
+    f"""INSERT INTO campaign_shop_daily_spend (user_id, campaign_id, shop_date, coins_spent, purchase_count)
+        SELECT cm.user_id, cm.campaign_id, %(today)s::date - day, 10, 1 {_MEMBER_DAYS} AND day %% 3 = 0""",
+    f"""INSERT INTO campaign_shop_daily_purchases (user_id, campaign_id, shop_date, item_key, category, cost, purchased_at)
+        SELECT cm.user_id, cm.campaign_id, %(today)s::date - day, 'shield', 'illusion', 10,
+               %(today)s::timestamp - day * INTERVAL '1 day'
+        {_MEMBER_DAYS} AND day %% 3 = 0""",
+    f"""INSERT INTO campaign_shop_log (user_id, campaign_id, event_type, item_key, details, created_at)
+        SELECT cm.user_id, cm.campaign_id, 'purchase', 'shield',
+               json_build_object('date', to_char(%(today)s::date - day, 'YYYY-MM-DD'), 'cost', 10)::text,
+               %(today)s::timestamp - day * INTERVAL '1 day'
+        {_MEMBER_DAYS} AND day %% 3 = 0""",
+    f"""INSERT INTO store_purchases (user_id, campaign_id, item_key, category, cost, purchased_at)
+        SELECT cm.user_id, cm.campaign_id, 'shield', 'illusion', 10, %(today)s::timestamp - day * INTERVAL '1 day'
+        {_MEMBER_DAYS} AND day %% 3 = 0""",
+    f"""INSERT INTO campaign_item_events (user_id, campaign_id, item_key, target_user_id, event_type, details, created_at)
+        SELECT cm.user_id, cm.campaign_id, 'shield', cm.user_id, 'use', '{{}}',
+               %(today)s::timestamp - day * INTERVAL '1 day'
+        {_MEMBER_DAYS} AND day %% 2 = 0""",
+    """INSERT INTO campaign_item_use_totals (user_id, campaign_id, item_key, uses, targeted, last_used_at)
+        SELECT user_id, campaign_id, item_key, COUNT(*), COUNT(target_user_id), MAX(created_at)
+        FROM campaign_item_events
+        WHERE campaign_id >= %(c0)s
+        GROUP BY user_id, campaign_id, item_key""",
+    f"""INSERT INTO user_accolade_events (user_id, campaign_id, accolade_key, date, created_at)
+        SELECT cm.user_id, cm.campaign_id, 'first_solver', to_char(%(today)s::date - day, 'YYYY-MM-DD'),
+               %(today)s::timestamp - day * INTERVAL '1 day'
+        {_MEMBER_DAYS} AND day %% 5 = 0""",
+    f"""INSERT INTO user_accolade_stats (user_id, campaign_id, accolade_key, count, last_awarded_at)
+        SELECT %(u0)s + n, %(c0)s + n / %(members)s, 'first_solver', 6, %(today)s::timestamp {_MEMBERS}""",
+    f"""INSERT INTO user_campaign_stats (user_id, campaign_id, total_solves, total_fails, total_days_played, current_streak, longest_streak)
+        SELECT %(u0)s + n, %(c0)s + n / %(members)s, 25, 5, 30, 3, 9 {_MEMBERS}""",
+    f"""INSERT INTO campaign_streaks (user_id, campaign_id, streak, last_completed_date)
+        SELECT %(u0)s + n, %(c0)s + n / %(members)s, 3, %(today)s {_MEMBERS}""",
+    f"""INSERT INTO campaign_streak_cycle (user_id, campaign_id, streak, last_completed_date)
+        SELECT %(u0)s + n, %(c0)s + n / %(members)s, 3, %(today)s {_MEMBERS}""",
+    f"""INSERT INTO campaign_coins (user_id, campaign_id, coins, last_awarded_date)
+        SELECT %(u0)s + n, %(c0)s + n / %(members)s, 40, %(today)s {_MEMBERS}""",
+    f"""INSERT INTO campaign_user_items (user_id, campaign_id, item_key, quantity)
+        SELECT %(u0)s + n, %(c0)s + n / %(members)s, item_key, 1
+        {_MEMBERS} CROSS JOIN unnest(ARRAY['shield', 'oracle', 'cone']) AS item_key""",
+    f"""INSERT INTO campaign_user_status_effects (user_id, campaign_id, effect_key, effect_value, active)
+        SELECT %(u0)s + n, %(c0)s + n / %(members)s, 'shield', '{{}}', TRUE {_MEMBERS}""",
+    f"""INSERT INTO global_user_streaks (user_id, highest_streak) SELECT %(u0)s + n, 9 {_MEMBERS}""",
+    f"""INSERT INTO global_high_scores (user_id, campaign_id, player_name, campaign_name, troops, ended_on, campaign_length)
+        SELECT %(u0)s + n, %(c0)s + n / %(members)s, 'Plan', 'Plan', (n * 37) %% 900, %(today)s, %(days)s {_MEMBERS}""",
+    """INSERT INTO global_high_score_buckets (campaign_length, troops, entries)
+        SELECT campaign_length, troops, COUNT(*) FROM global_high_scores WHERE campaign_id >= %(c0)s GROUP BY 1, 2
+        ON CONFLICT (campaign_length, troops) DO UPDATE SET entries = global_high_score_buckets.entries + EXCLUDED.entries""",
+    f"""INSERT INTO accolade_triggers (kind, campaign_id, user_id, date, payload)
+        SELECT 'game_completed', %(c0)s + n / %(members)s, %(u0)s + n, %(today)s, '{{}}' {_MEMBERS}""",
+    f"""INSERT INTO global_word_stat_deltas (word, solved, day) SELECT 'crane', 1, %(today)s {_MEMBERS}""",
+    f"""INSERT INTO campaign_daily_stats (campaign_id, date, total_troops, completed_count, member_count)
+        SELECT c, %(today)s::date - day, 800, 20, %(members)s {_CAMPAIGN_DAYS}""",
+    f"""INSERT INTO campaign_daily_word_stats (campaign_id, date, word, solved_count, failed_count)
+        SELECT c, %(today)s::date - day, {_WORD}, 20, 5 {_CAMPAIGN_DAYS}""",
+    f"""INSERT INTO campaign_daily_recaps (campaign_id, date, summary, highlights)
+        SELECT c, %(today)s::date - day, 'Plan', '[]'::jsonb {_CAMPAIGN_DAYS}""",
+    """INSERT INTO global_daily_stats (date, total_players, total_guesses)
+        SELECT %(today)s::date - day, 1000, 4000 FROM generate_series(0, %(days)s - 1) AS day
+        ON CONFLICT (date) DO NOTHING""",
+]
+
+
+def seed(conn, campaigns: int, members: int, days: int) -> dict:
+    """Insert the scratch history and ANALYZE; returns the values the private readers are called with."""
+    today = datetime.now(ZoneInfo("America/Chicago")).date()
+    u0 = conn.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM users").fetchone()[0]
+    c0 = conn.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM campaigns").fetchone()[0]
+    params = {"campaigns": campaigns, "members": members, "days": days, "today": today, "u0": u0, "c0": c0}
+    for statement in SEED:
+        conn.execute(statement, params)
+    conn.execute("ANALYZE")
+    return {
+        "user_id": u0,
+        "campaign_id": c0,
+        "date_from": (today.replace(day=1)).isoformat(),
+        "date_to": today.isoformat(),
+        "limit": 50,
+        "offset": 0,
+    }
+
+
+def table_rows(conn) -> dict:
+    """Estimated rows per table; partitions are counted under their parent."""
+    rows = conn.execute("""
+        SELECT c.relname, COALESCE(parent.relname, c.relname), GREATEST(c.reltuples, 0)
+        FROM pg_class c
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        LEFT JOIN pg_inherits i ON i.inhrelid = c.oid
+        LEFT JOIN pg_class parent ON parent.oid = i.inhparent
+        WHERE n.nspname = current_schema() AND c.relkind IN ('r', 'p')
+    """).fetchall()
+    parents = {name: parent for name, parent, _ in rows}
+    totals: dict = {}
+    for name, parent, tuples in rows:
+        totals[parent] = totals.get(parent, 0) + int(tuples)
+    return {name: (parent, totals[parent]) for name, parent in parents.items()}
+
+
+def seq_scans(plan: dict):
+    """Relation names read by Seq Scan nodes anywhere in an EXPLAIN (FORMAT JSON) plan."""
+    if plan.get("Node Type") == "Seq Scan":
+        yield plan["Relation Name"]
+    for child in plan.get("Plans", []):
+        yield from seq_scans(child)
+
+
+def explain(conn, statements: list, sizes: dict, min_rows: int = MIN_SEQ_SCAN_ROWS) -> list:
+    results = []
+    for statement in statements:
+        result = Result(statement)
+        try:
+            with conn.transaction():
+                if statement.params is None:
+                    row = conn.execute("EXPLAIN (GENERIC_PLAN, FORMAT JSON) " + statement.sql).fetchone()
+                else:
+                    row = conn.execute("EXPLAIN (FORMAT JSON) " + statement.sql, statement.params).fetchone()
+        except Exception as exc:
+            result.error = str(exc).splitlines()[0]
+            results.append(result)
+            continue
+        plan = row[0][0]["Plan"]
+        result.cost = plan["Total Cost"]
+        for relation in seq_scans(plan):
+            table, rows = sizes.get(relation, (relation, 0))
+            if rows >= min_rows:
+                result.seq_scans[table] = rows
+        results.append(result)
+    return results
+
+
+def analyse(dsn: str, campaigns: int = 250, members: int = 40, days: int = 30, min_rows: int = MIN_SEQ_SCAN_ROWS):
+    """(results, unresolved) for the seeded database at dsn; nothing it writes is kept."""
+    import psycopg
+
+    # No auto-prepare: an EXPLAIN text sent five times would become a prepared statement,
+    # and GENERIC_PLAN cannot be bound without parameters.
+    with psycopg.connect(dsn, prepare_threshold=None) as conn:
+        try:
+            values = seed(conn, campaigns, members, days)
+            statements, unresolved = collect(conn, values)
+            return explain(conn, statements, table_rows(conn), min_rows), unresolved
+        finally:
+            conn.rollback()
+            # Dead pages left by the rollback would inflate the next run's estimates.
+            conn.autocommit = True
+            conn.execute("VACUUM")
+
+
+def load_baseline(path: str = BASELINE_PATH) -> dict:
+    if not os.path.exists(path):
+        return {}
+    with open(path) as handle:
+        return json.load(handle)
+
+
+def write_baseline(results: list, path: str = BASELINE_PATH) -> None:
+    previous = load_baseline(path)
+    baseline = {}
+    for r in results:
+        if r.error is not None:
+            continue
+        # Identical SQL plans the same wherever it is issued; keep the worst case.
+        entry = baseline.setdefault(r.statement.fingerprint, {"callers": [], "cost": 0.0, "seq_scans": []})
+        entry["callers"] = sorted(set(entry["callers"]) | {r.statement.caller})
+        entry["cost"] = max(entry["cost"], round(r.cost, 2))
+        entry["seq_scans"] = sorted(set(entry["seq_scans"]) | set(r.seq_scans))
+    for fingerprint, entry in baseline.items():
+        # Planner jitter of a fraction of a percent is not a change worth a diff line.
+        known = previous.get(fingerprint)
+        if known and known["seq_scans"] == entry["seq_scans"] and abs(entry["cost"] - known["cost"]) <= known["cost"] * 0.01:
+            entry["cost"] = known["cost"]
+    with open(path, "w") as handle:
+        json.dump(dict(sorted(baseline.items())), handle, indent=1)
+        handle.write("\n")
+
+
+def regressions(results: list, baseline: dict, tolerance: float = COST_TOLERANCE) -> list:
+    """Human-readable problems: new large sequential scans and cost growth past tolerance.
+
+    Statements whose SQL is not in the baseline are only checked for sequential scans.
+    """
+    problems = []
+    for result in results:
+        if result.error is not None:
+            continue
+        key = result.statement.key
+        known = baseline.get(result.statement.fingerprint)
+        allowed = set(known["seq_scans"]) if known else set()
+        for table in sorted(set(result.seq_scans) - allowed):
+            problems.append(
+                f"{key} ({result.statement.source}) seq scans {table} ({result.seq_scans[table]:,} rows)"
+            )
+        if known and result.cost > known["cost"] * (1 + tolerance) + 1:
+            problems.append(
+                f"{key} ({result.statement.source}) cost {result.cost:,.0f} vs baseline {known['cost']:,.0f}"
+            )
+    return problems
+
+
+def report(results: list, unresolved: list, top: int) -> str:
+    lines = [f"{len(results)} statements planned, {len(unresolved)} built at runtime and not planned"]
+    lines.append(f"\nMost expensive {top}:")
+    for result in sorted((r for r in results if r.error is None), key=lambda r: -r.cost)[:top]:
+        scans = ", ".join(f"{table} ({rows:,})" for table, rows in sorted(result.seq_scans.items()))
+        lines.append(f"  {result.cost:>14,.0f}  {result.statement.key}  {result.statement.source}")
+        if scans:
+            lines.append(f"  {'':>14}  seq scan: {scans}")
+    errors = [r for r in results if r.error is not None]
+    if errors:
+        lines.append("\nCould not be planned:")
+        lines += [f"  {r.statement.key} {r.statement.source}: {r.error}" for r in errors]
+    if unresolved:
+        lines.append("\nBuilt at runtime (not planned):")
+        lines += [f"  {key} {source}: {expr}" for key, source, expr in unresolved]
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dsn", default=os.getenv("QUERY_PLAN_DATABASE_URL") or os.getenv("DATABASE_URL"))
+    parser.add_argument("--campaigns", type=int, default=250)
+    parser.add_argument("--members", type=int, default=40)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--min-rows", type=int, default=MIN_SEQ_SCAN_ROWS)
+    parser.add_argument("--tolerance", type=float, default=COST_TOLERANCE)
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args()
+    if not args.dsn:
+        parser.error("set QUERY_PLAN_DATABASE_URL or pass --dsn")
+
+    results, unresolved = analyse(args.dsn, args.campaigns, args.members, args.days, args.min_rows)
+    print(report(results, unresolved, args.top))
+    if args.update_baseline:
+        write_baseline(results)
+        print(f"\nBaseline written to {os.path.relpath(BASELINE_PATH)}")
+        return
+    problems = regressions(results, load_baseline(), args.tolerance)
+    if problems:
+        print("\nRegressions:")
+        print("\n".join(f"  {problem}" for problem in problems))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
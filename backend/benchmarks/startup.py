@@ -0,0 +1,90 @@
+"""Cold start of the API process: import time per module and time to the first request.
+
+Each measurement runs in a fresh interpreter. Import times come from `python -X importtime`;
+time to first request covers importing app.main, building the app and answering one
+unauthenticated POST /api/guess through TestClient (startup handlers are skipped, so no
+database is needed). tests/integration/test_startup_budget.py runs the same measurement
+and fails past STARTUP_BUDGET_MS.
+
+    python benchmarks/startup.py --top 25 --budget-ms 2000
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+BACKEND_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# Only the code paths that use these should pay for importing them.
+HEAVY_MODULES = ("apscheduler", "bcrypt", "boto3", "duckdb", "numpy", "PIL")
+
+_FIRST_REQUEST = """
+import json, sys, time
+started = time.perf_counter()
+from fastapi.testclient import TestClient
+from app import main
+imported = time.perf_counter()
+main.app.router.on_startup = []
+main.app.router.on_shutdown = []
+with TestClient(main.app) as client:
+    status = client.post("/api/guess", json={"word": "crane", "campaign_id": 1}).status_code
+finished = time.perf_counter()
+print(json.dumps({
+    "import_ms": (imported - started) * 1000,
+    "first_request_ms": (finished - started) * 1000,
+    "status": status,
+    "heavy_modules": [name for name in %r if name in sys.modules],
+}))
+"""
+
+
+def _python(*args) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *args], cwd=BACKEND_ROOT, capture_output=True, text=True, check=True
+    )
+
+
+def import_times(module: str = "app.main") -> list:
+    """(module, self_ms, cumulative_ms) for every module imported by `import module`."""
+    stderr = _python("-X", "importtime", "-c", f"import {module}").stderr
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((name.strip(), int(self_us) / 1000, int(cumulative_us) / 1000))
+    return rows
+
+
+def time_to_first_request() -> dict:
+    return json.loads(_python("-c", _FIRST_REQUEST % (HEAVY_MODULES,)).stdout.splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--top", type=int, default=20, help="slowest modules to list, by self time")
+    parser.add_argument("--budget-ms", type=float, default=None, help="exit 1 when the first request is slower")
+    args = parser.parse_args()
+
+    rows = import_times()
+    print(f"{'self ms':>9} {'cumul ms':>9}  module")
+    for name, self_ms, cumulative_ms in sorted(rows, key=lambda row: row[1], reverse=True)[:args.top]:
+        print(f"{self_ms:9.1f} {cumulative_ms:9.1f}  {name}")
+    app_total = next(cumulative for name, _, cumulative in rows if name == "app.main")
+    print(f"import app.main: {app_total:.1f} ms across {len(rows)} modules")
+
+    result = time_to_first_request()
+    print(
+        f"first request: {result['first_request_ms']:.1f} ms "
+        f"(import {result['import_ms']:.1f} ms, status {result['status']})"
+    )
+    if result["heavy_modules"]:
+        print(f"loaded at startup: {', '.join(result['heavy_modules'])}")
+    if args.budget_ms is not None and result["first_request_ms"] > args.budget_ms:
+        print(f"over budget: {result['first_request_ms']:.1f} ms > {args.budget_ms:.1f} ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
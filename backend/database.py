@@ -1,5 +1,11 @@
 import psycopg
+from datetime import datetime
 from os import getenv
+from zoneinfo import ZoneInfo
+
+from app.dates import migrate_date_columns
+from app.partitions import migrate_to_partitions
+from app.principal import set_admin
 
 def init_db():
     db_url = getenv("DATABASE_URL")
@@ -14,13 +20,71 @@ def init_db():
         conn.execute("ALTER TABLE campaigns ADD COLUMN IF NOT EXISTS is_admin_campaign BOOLEAN DEFAULT FALSE")
         conn.execute("ALTER TABLE campaigns ADD COLUMN IF NOT EXISTS ruler_background_image_url TEXT")
         conn.execute("ALTER TABLE campaigns ADD COLUMN IF NOT EXISTS ruler_background_image_key TEXT")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS global_high_scores (
+                id SERIAL PRIMARY KEY,
+                user_id INTEGER,
+                campaign_id INTEGER,
+                player_name TEXT NOT NULL,
+                campaign_name TEXT NOT NULL,
+                troops INTEGER NOT NULL,
+                ended_on TEXT NOT NULL,
+                campaign_length INTEGER,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
         conn.execute("ALTER TABLE global_high_scores ADD COLUMN IF NOT EXISTS campaign_length INTEGER")
+        # Hall of fame ordering (troops DESC, ended_on DESC, id DESC) overall, per cycle length and per user.
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_global_high_scores_rank
+            ON global_high_scores (troops DESC, ended_on DESC, id DESC)
+        """)
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_global_high_scores_length_rank
+            ON global_high_scores (campaign_length, troops DESC, ended_on DESC, id DESC)
+        """)
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_global_high_scores_user_best
+            ON global_high_scores (user_id, campaign_length, troops DESC, ended_on DESC, id DESC)
+        """)
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_global_high_scores_user_best_all
+            ON global_high_scores (user_id, troops DESC, ended_on DESC, id DESC)
+        """)
+        # Entry counts per (campaign_length, troops); campaign_length 0 is the all-lengths board.
+        # Rank of a score is 1 + the entries above it, summed over distinct troop values only.
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS global_high_score_buckets (
+                campaign_length INTEGER NOT NULL,
+                troops INTEGER NOT NULL,
+                entries INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (campaign_length, troops)
+            )
+        """)
+        buckets_seeded = conn.execute("SELECT 1 FROM global_high_score_buckets LIMIT 1").fetchone()
+        if not buckets_seeded:
+            conn.execute("""
+                INSERT INTO global_high_score_buckets (campaign_length, troops, entries)
+                SELECT 0, troops, COUNT(*)
+                FROM global_high_scores
+                GROUP BY troops
+                UNION ALL
+                SELECT campaign_length, troops, COUNT(*)
+                FROM global_high_scores
+                WHERE campaign_length IS NOT NULL AND campaign_length > 0
+                GROUP BY campaign_length, troops
+                ON CONFLICT (campaign_length, troops) DO NOTHING
+            """)
+        # 0..1 from app.wordmatrix; NULL when the pattern matrix was not built on the seeding host.
+        conn.execute("ALTER TABLE campaign_words ADD COLUMN IF NOT EXISTS difficulty REAL")
+        # Surviving playable answers as an app.candidates bitset; NULL rows are rebuilt from the board.
+        conn.execute("ALTER TABLE campaign_guess_states ADD COLUMN IF NOT EXISTS candidates BYTEA")
         conn.execute("ALTER TABLE users ADD COLUMN IF NOT EXISTS is_admin BOOLEAN DEFAULT FALSE")
         conn.execute("ALTER TABLE users ADD COLUMN IF NOT EXISTS profile_image_url TEXT")
         conn.execute("ALTER TABLE users ADD COLUMN IF NOT EXISTS profile_image_key TEXT")
         conn.execute("ALTER TABLE users ADD COLUMN IF NOT EXISTS profile_image_thumb_url TEXT")
         conn.execute("ALTER TABLE users ADD COLUMN IF NOT EXISTS profile_image_thumb_key TEXT")
-        conn.execute("UPDATE users SET is_admin = TRUE WHERE id = 2")
+        set_admin(conn, 2, True)
         conn.execute("ALTER TABLE campaign_members ADD COLUMN IF NOT EXISTS army_image_url TEXT")
         conn.execute("ALTER TABLE campaign_members ADD COLUMN IF NOT EXISTS army_image_key TEXT")
         conn.execute("ALTER TABLE campaign_members ADD COLUMN IF NOT EXISTS army_image_thumb_url TEXT")
@@ -71,7 +135,7 @@ def init_db():
             CREATE TABLE IF NOT EXISTS campaign_daily_troops (
                 user_id INTEGER NOT NULL,
                 campaign_id INTEGER NOT NULL,
-                date TEXT NOT NULL,
+                date DATE NOT NULL,
                 troops INTEGER NOT NULL DEFAULT 0,
                 PRIMARY KEY (user_id, campaign_id, date)
             )
@@ -79,7 +143,7 @@ def init_db():
         conn.execute("""
             CREATE TABLE IF NOT EXISTS campaign_daily_stats (
                 campaign_id INTEGER NOT NULL,
-                date TEXT NOT NULL,
+                date DATE NOT NULL,
                 total_troops INTEGER NOT NULL DEFAULT 0,
                 avg_troops_per_player REAL NOT NULL DEFAULT 0,
                 highest_troops INTEGER NOT NULL DEFAULT 0,
@@ -102,7 +166,7 @@ def init_db():
             CREATE TABLE IF NOT EXISTS campaign_first_guesses (
                 user_id INTEGER NOT NULL,
                 campaign_id INTEGER NOT NULL,
-                date TEXT NOT NULL,
+                date DATE NOT NULL,
                 word TEXT NOT NULL,
                 PRIMARY KEY (user_id, campaign_id, date)
             )
@@ -146,7 +210,7 @@ def init_db():
         conn.execute("""
             CREATE TABLE IF NOT EXISTS campaign_cycle_rewards (
                 campaign_id INTEGER NOT NULL,
-                cycle_start_date TEXT NOT NULL,
+                cycle_start_date DATE NOT NULL,
                 winner_user_id INTEGER NOT NULL,
                 recipient_count INTEGER NOT NULL,
                 whispers_per_recipient INTEGER NOT NULL DEFAULT 3,
@@ -158,7 +222,7 @@ def init_db():
         conn.execute("""
             CREATE TABLE IF NOT EXISTS campaign_cycle_reward_recipients (
                 campaign_id INTEGER NOT NULL,
-                cycle_start_date TEXT NOT NULL,
+                cycle_start_date DATE NOT NULL,
                 recipient_user_id INTEGER NOT NULL,
                 PRIMARY KEY (campaign_id, cycle_start_date, recipient_user_id)
             )
@@ -192,6 +256,64 @@ def init_db():
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
         """)
+        # One row per (user, campaign, shop day, item); the primary key enforces the
+        # "one purchase per item per day" rule so purchase_item is a single conditional insert.
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS campaign_shop_daily_purchases (
+                user_id INTEGER NOT NULL,
+                campaign_id INTEGER NOT NULL,
+                shop_date DATE NOT NULL,
+                item_key TEXT NOT NULL,
+                category TEXT,
+                cost INTEGER NOT NULL DEFAULT 0,
+                purchased_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (user_id, campaign_id, shop_date, item_key)
+            )
+        """)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS campaign_shop_daily_spend (
+                user_id INTEGER NOT NULL,
+                campaign_id INTEGER NOT NULL,
+                shop_date DATE NOT NULL,
+                coins_spent INTEGER NOT NULL DEFAULT 0,
+                purchase_count INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (user_id, campaign_id, shop_date)
+            )
+        """)
+        ledger_seeded = conn.execute(
+            "SELECT 1 FROM campaign_shop_daily_purchases LIMIT 1"
+        ).fetchone()
+        if not ledger_seeded:
+            # Backfill from the purchase log using the same shop-day rules the old jsonb scans used.
+            conn.execute("""
+                INSERT INTO campaign_shop_daily_purchases (
+                    user_id, campaign_id, shop_date, item_key, category, cost, purchased_at
+                )
+                SELECT
+                    user_id,
+                    campaign_id,
+                    CASE
+                        WHEN COALESCE(details, '{}')::jsonb ? 'date'
+                            THEN (COALESCE(details, '{}')::jsonb->>'date')::date
+                        ELSE DATE(created_at AT TIME ZONE 'America/Chicago')
+                    END,
+                    item_key,
+                    COALESCE(details, '{}')::jsonb->>'category',
+                    COALESCE((COALESCE(details, '{}')::jsonb->>'cost')::INTEGER, 0),
+                    created_at
+                FROM campaign_shop_log
+                WHERE event_type = 'purchase' AND item_key IS NOT NULL
+                ON CONFLICT (user_id, campaign_id, shop_date, item_key) DO NOTHING
+            """)
+            conn.execute("""
+                INSERT INTO campaign_shop_daily_spend (
+                    user_id, campaign_id, shop_date, coins_spent, purchase_count
+                )
+                SELECT user_id, campaign_id, shop_date, SUM(cost), COUNT(*)
+                FROM campaign_shop_daily_purchases
+                GROUP BY user_id, campaign_id, shop_date
+                ON CONFLICT (user_id, campaign_id, shop_date) DO NOTHING
+            """)
         conn.execute("""
             CREATE TABLE IF NOT EXISTS campaign_item_events (
                 id SERIAL PRIMARY KEY,
@@ -208,7 +330,7 @@ def init_db():
             CREATE TABLE IF NOT EXISTS campaign_shop_rotation (
                 user_id INTEGER NOT NULL,
                 campaign_id INTEGER NOT NULL,
-                date TEXT NOT NULL,
+                date DATE NOT NULL,
                 items JSONB NOT NULL,
                 reshuffles INTEGER NOT NULL DEFAULT 0,
                 updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
@@ -223,11 +345,19 @@ def init_db():
                 last_used_at TIMESTAMP
             )
         """)
+        # Append-only increments folded into global_item_stats by app.counters.
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS global_item_stat_deltas (
+                item_key TEXT NOT NULL,
+                targeted INTEGER NOT NULL DEFAULT 0,
+                used_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
         conn.execute("""
             CREATE TABLE IF NOT EXISTS campaign_user_daily_results (
                 user_id INTEGER NOT NULL,
                 campaign_id INTEGER NOT NULL,
-                date TEXT NOT NULL,
+                date DATE NOT NULL,
                 word TEXT,
                 guesses_used INTEGER NOT NULL,
                 solved INTEGER NOT NULL,
@@ -242,10 +372,15 @@ def init_db():
             )
         """)
         conn.execute("ALTER TABLE campaign_user_daily_results ADD COLUMN IF NOT EXISTS word TEXT")
+        # Nightly jobs (daily stats, analytics export) read one whole day across all campaigns.
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_campaign_user_daily_results_date
+            ON campaign_user_daily_results (date)
+        """)
         conn.execute("""
             CREATE TABLE IF NOT EXISTS campaign_daily_recaps (
                 campaign_id INTEGER NOT NULL,
-                date TEXT NOT NULL,
+                date DATE NOT NULL,
                 summary TEXT,
                 highlights JSONB,
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
@@ -273,7 +408,7 @@ def init_db():
         conn.execute("""
             CREATE TABLE IF NOT EXISTS campaign_daily_word_stats (
                 campaign_id INTEGER NOT NULL,
-                date TEXT NOT NULL,
+                date DATE NOT NULL,
                 word TEXT NOT NULL,
                 solved_count INTEGER NOT NULL DEFAULT 0,
                 failed_count INTEGER NOT NULL DEFAULT 0,
@@ -287,6 +422,12 @@ def init_db():
                 last_awarded_at TIMESTAMP
             )
         """)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS global_accolade_stat_deltas (
+                accolade_key TEXT NOT NULL,
+                awarded_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
         conn.execute("""
             CREATE TABLE IF NOT EXISTS campaign_accolade_stats (
                 campaign_id INTEGER NOT NULL,
@@ -316,9 +457,35 @@ def init_db():
                 PRIMARY KEY (user_id, campaign_id, accolade_key, date)
             )
         """)
+        # One row per app.scheduler instance; the leader runs the jobs, the rest stand by.
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS scheduler_heartbeats (
+                instance_id TEXT PRIMARY KEY,
+                is_leader BOOLEAN NOT NULL DEFAULT FALSE,
+                started_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+                last_beat_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+                last_job TEXT,
+                last_job_at TIMESTAMPTZ,
+                last_error TEXT
+            )
+        """)
+        conn.execute("ALTER TABLE scheduler_heartbeats ADD COLUMN IF NOT EXISTS last_success_at TIMESTAMPTZ")
+        # Work queue for app.accolades.evaluator: one row per finished game, purchase or
+        # campaign end, deleted once its accolade rules have run.
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS accolade_triggers (
+                id BIGSERIAL PRIMARY KEY,
+                kind TEXT NOT NULL,
+                campaign_id INTEGER NOT NULL,
+                user_id INTEGER,
+                date TEXT NOT NULL,
+                payload TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
         conn.execute("""
             CREATE TABLE IF NOT EXISTS global_daily_stats (
-                date TEXT PRIMARY KEY,
+                date DATE PRIMARY KEY,
                 total_campaigns_completed INTEGER NOT NULL DEFAULT 0,
                 total_players INTEGER NOT NULL DEFAULT 0,
                 total_guesses INTEGER NOT NULL DEFAULT 0,
@@ -340,6 +507,13 @@ def init_db():
                 last_seen TEXT
             )
         """)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS global_word_stat_deltas (
+                word TEXT NOT NULL,
+                solved INTEGER NOT NULL,
+                day TEXT NOT NULL
+            )
+        """)
         conn.execute("""
             CREATE TABLE IF NOT EXISTS global_streak_stats (
                 id INTEGER PRIMARY KEY DEFAULT 1,
@@ -377,4 +551,98 @@ def init_db():
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
         """)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS archived_partitions (
+                table_name TEXT NOT NULL,
+                month TEXT NOT NULL,
+                path TEXT NOT NULL,
+                row_count INTEGER NOT NULL DEFAULT 0,
+                bytes BIGINT NOT NULL DEFAULT 0,
+                archived_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (table_name, month)
+            )
+        """)
+        # Lifetime item uses per player and item. campaign_item_events loses its archived
+        # months, so counts that must never shrink (item_master, private item usage) live here.
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS campaign_item_use_totals (
+                user_id INTEGER NOT NULL,
+                campaign_id INTEGER NOT NULL,
+                item_key TEXT NOT NULL,
+                uses INTEGER NOT NULL DEFAULT 0,
+                targeted INTEGER NOT NULL DEFAULT 0,
+                last_used_at TIMESTAMP,
+                PRIMARY KEY (user_id, campaign_id, item_key)
+            )
+        """)
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_campaign_item_use_totals_campaign
+            ON campaign_item_use_totals (campaign_id)
+        """)
+        item_totals_seeded = conn.execute("SELECT 1 FROM campaign_item_use_totals LIMIT 1").fetchone()
+        if not item_totals_seeded:
+            conn.execute("""
+                INSERT INTO campaign_item_use_totals (user_id, campaign_id, item_key, uses, targeted, last_used_at)
+                SELECT user_id, campaign_id, item_key, COUNT(*),
+                       COUNT(target_user_id), MAX(created_at)
+                FROM campaign_item_events
+                WHERE event_type = 'use'
+                  AND user_id IS NOT NULL AND campaign_id IS NOT NULL AND item_key IS NOT NULL
+                GROUP BY user_id, campaign_id, item_key
+            """)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS idempotency_keys (
+                user_id INTEGER NOT NULL,
+                idempotency_key TEXT NOT NULL,
+                endpoint TEXT NOT NULL,
+                request_hash TEXT NOT NULL,
+                status_code INTEGER,
+                response JSONB,
+                created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+                PRIMARY KEY (user_id, idempotency_key)
+            )
+        """)
+        # A NULL status_code marks a key claimed by a request that is still running.
+        conn.execute("""
+            ALTER TABLE idempotency_keys
+            ALTER COLUMN status_code DROP NOT NULL,
+            ALTER COLUMN response DROP NOT NULL
+        """)
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_idempotency_keys_created_at
+            ON idempotency_keys (created_at)
+        """)
+        # Campaign standings in rank order (leaderboard window) and members by name (paged
+        # member/target lists with prefix search); the primary key leads with user_id.
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_campaign_members_rank
+            ON campaign_members (campaign_id, score DESC, user_id)
+        """)
+        # COALESCE keeps members without a display name in the paged lists; it replaces
+        # idx_campaign_members_name, which indexed the bare column.
+        conn.execute("DROP INDEX IF EXISTS idx_campaign_members_name")
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_campaign_members_sort_name
+            ON campaign_members (campaign_id, (lower(COALESCE(display_name, '')) COLLATE "C"), user_id)
+        """)
+        migrate_date_columns(conn)
+        # Per-campaign day ranges (nightly stats, recaps, private API date filters); the
+        # primary keys put user_id before date and cannot serve them.
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_campaign_guess_states_campaign_date
+            ON campaign_guess_states (campaign_id, date)
+        """)
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_campaign_daily_progress_campaign_date
+            ON campaign_daily_progress (campaign_id, date)
+        """)
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_campaign_user_daily_results_campaign_date
+            ON campaign_user_daily_results (campaign_id, date)
+        """)
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_campaign_daily_troops_campaign_date
+            ON campaign_daily_troops (campaign_id, date)
+        """)
+        migrate_to_partitions(conn, datetime.now(ZoneInfo("America/Chicago")).date())
     print("✅ Database connection verified!")
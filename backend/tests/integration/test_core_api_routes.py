@@ -154,13 +154,48 @@ class CoreApiRoutesIntegrationTests(unittest.TestCase):
     with patch.object(app_main.crud, "get_global_leaderboard", return_value=[{"user_id": 1}]) as mock_glb:
       res_glb = self.client.get("/api/leaderboard/global?limit=5")
     self.assertEqual(res_glb.status_code, 200)
-    mock_glb.assert_called_once_with(5)
+    mock_glb.assert_called_once_with(5, None)
 
     with patch.object(app_main.crud, "acknowledge_update", return_value={"ok": True}) as mock_ack:
       res_ack = self.client.post("/api/user/acknowledge_update")
     self.assertEqual(res_ack.status_code, 200)
     mock_ack.assert_called_once_with(77)
 
+  def test_global_leaderboard_page_me_and_rank_routes(self):
+    with patch.object(app_main.crud, "get_global_leaderboard_page", return_value={"entries": [], "next_cursor": None}) as mock_page:
+      res_page = self.client.get("/api/leaderboard/global/page?limit=20&campaign_length=7&cursor=120:2026-01-05:9")
+    self.assertEqual(res_page.status_code, 200)
+    mock_page.assert_called_once_with(20, 7, "120:2026-01-05:9")
+
+    with patch.object(app_main.crud, "get_global_personal_best", return_value={"best": None, "rank": None}) as mock_me:
+      res_me = self.client.get("/api/leaderboard/global/me?campaign_length=5")
+    self.assertEqual(res_me.status_code, 200)
+    mock_me.assert_called_once_with(77, 5)
+
+    with patch.object(app_main.crud, "get_global_score_rank", return_value={"rank": 3}) as mock_rank:
+      res_rank = self.client.get("/api/leaderboard/global/rank?troops=140")
+    self.assertEqual(res_rank.status_code, 200)
+    mock_rank.assert_called_once_with(140, None)
+
+  def test_leaderboard_window_and_member_page_routes(self):
+    with patch.object(app_main.crud, "get_leaderboard_window", return_value={"my_rank": 4, "entries": []}) as mock_window:
+      res_window = self.client.post("/api/leaderboard/window", json={"campaign_id": 9, "radius": 5})
+    self.assertEqual(res_window.status_code, 200)
+    mock_window.assert_called_once_with(9, 77, 3, 5)
+
+    with patch.object(app_main.crud, "get_campaign_members_page", return_value={"members": [], "next_cursor": None}) as mock_members:
+      res_members = self.client.post("/api/campaign/members/page", json={"campaign_id": 9, "prefix": "ad"})
+    self.assertEqual(res_members.status_code, 200)
+    mock_members.assert_called_once_with(9, 77, 25, None, "ad")
+
+    with patch.object(app_main.crud, "get_targetable_members_page", return_value={"targets": [], "next_cursor": None}) as mock_targets:
+      res_targets = self.client.post(
+        "/api/campaign/targets/page",
+        json={"campaign_id": 9, "limit": 10, "cursor": "4:ada", "item_key": "hex_of_compulsion"},
+      )
+    self.assertEqual(res_targets.status_code, 200)
+    mock_targets.assert_called_once_with(9, 77, 10, "4:ada", None, "hex_of_compulsion")
+
   def test_route_surfaces_http_exception_from_crud(self):
     with patch.object(app_main.crud, "delete_campaign", side_effect=HTTPException(status_code=403, detail="Forbidden")):
       res = self.client.post("/api/campaign/delete", json={"campaign_id": 3})
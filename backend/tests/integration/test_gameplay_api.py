@@ -82,6 +82,21 @@ class GameplayApiIntegrationTests(unittest.TestCase):
     self.assertEqual(response.json(), payload)
     mock_targets.assert_called_once_with(22, 314, "hex_of_compulsion")
 
+  def test_targets_for_items_endpoint_defaults_to_the_inventory(self):
+    payload = {"effective_on": "2026-01-06", "items": {"hex_of_compulsion": [3]}}
+    with patch.object(app_main.crud, "get_item_target_matrix", return_value=payload) as mock_matrix:
+      response = self.client.post("/api/campaign/targets/items", json={"campaign_id": 22})
+      explicit = self.client.post(
+        "/api/campaign/targets/items",
+        json={"campaign_id": 22, "item_keys": ["spider_swarm"]},
+      )
+
+    self.assertEqual(response.status_code, 200)
+    self.assertEqual(response.json(), payload)
+    self.assertEqual(explicit.status_code, 200)
+    self.assertEqual(mock_matrix.call_args_list[0].args, (22, 314, None))
+    self.assertEqual(mock_matrix.call_args_list[1].args, (22, 314, ["spider_swarm"]))
+
   def test_mercy_redeem_endpoint_passes_through_crud_payload(self):
     with patch.object(app_main.crud, "redeem_candle_of_mercy", return_value={"bonus": 10}) as mock_redeem:
       response = self.client.post("/api/campaign/items/mercy/redeem", json={"campaign_id": 8})
@@ -133,6 +148,27 @@ class GameplayApiIntegrationTests(unittest.TestCase):
     self.assertEqual(response.status_code, 400)
     self.assertEqual(response.json(), {"detail": "Target required"})
 
+  def test_purchase_endpoint_scopes_idempotency_key_to_the_user(self):
+    def _run(user_id, key, endpoint, request, handler, response):
+      self.assertEqual((user_id, key, endpoint, request.item_key), (314, "tap-81", "shop_purchase", "shield"))
+      response.headers["Idempotent-Replayed"] = "true"
+      return handler()
+
+    with (
+      patch.object(app_main, "run_idempotent", side_effect=_run),
+      patch.object(app_main.crud, "purchase_item", return_value={"coins": 3}) as mock_purchase,
+    ):
+      response = self.client.post(
+        "/api/campaign/shop/purchase",
+        json={"campaign_id": 5, "item_key": "shield"},
+        headers={"Idempotency-Key": "tap-81"},
+      )
+
+    self.assertEqual(response.status_code, 200)
+    self.assertEqual(response.json(), {"coins": 3})
+    self.assertEqual(response.headers["Idempotent-Replayed"], "true")
+    mock_purchase.assert_called_once_with(314, 5, "shield")
+
 
 if __name__ == "__main__":
   unittest.main()
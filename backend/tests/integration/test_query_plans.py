@@ -0,0 +1,124 @@
+import os
+import sys
+import tempfile
+import unittest
+
+
+BACKEND_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if BACKEND_ROOT not in sys.path:
+  sys.path.insert(0, BACKEND_ROOT)
+
+try:
+  from app import scheduler  # noqa: E402
+  from benchmarks import query_plans  # noqa: E402
+except Exception as exc:  # pragma: no cover
+  query_plans = None
+  IMPORT_ERROR = exc
+else:
+  IMPORT_ERROR = None
+
+# Seeds and rolls back; point it at a scratch database with the app schema, never production.
+QUERY_PLAN_DATABASE_URL = os.getenv("QUERY_PLAN_DATABASE_URL")
+
+
+def _result(key, sql, cost, seq_scans=None):
+  statement = query_plans.Statement(key, "app/crud.py:1", sql)
+  return query_plans.Result(statement, cost=cost, seq_scans=seq_scans or {})
+
+
+class QueryPlanCheckTests(unittest.TestCase):
+  def setUp(self):
+    if query_plans is None:
+      self.skipTest(f"query plan suite unavailable: {IMPORT_ERROR}")
+
+  def test_placeholders_become_numbered_parameters(self):
+    self.assertEqual(
+      query_plans.to_generic("SELECT * FROM t WHERE a = %s AND b LIKE 'x%%' AND c = ANY(%s)"),
+      "SELECT * FROM t WHERE a = $1 AND b LIKE 'x%' AND c = ANY($2)",
+    )
+
+  def test_statements_are_keyed_by_function_and_order(self):
+    statements, unresolved = query_plans.collect_static(scheduler)
+    keys = {s.key: s for s in statements}
+
+    self.assertIn("scheduler.compute_global_daily_stats#1", keys)
+    self.assertIn("$1", keys["scheduler.compute_global_daily_stats#1"].sql)
+    self.assertTrue(keys["scheduler.compute_global_daily_stats#1"].source.startswith("app/scheduler.py:"))
+    self.assertEqual(unresolved, [])
+
+  def test_seq_scans_are_found_in_nested_plans(self):
+    plan = {
+      "Node Type": "Hash Join",
+      "Plans": [
+        {"Node Type": "Seq Scan", "Relation Name": "campaign_members"},
+        {"Node Type": "Hash", "Plans": [{"Node Type": "Index Scan", "Relation Name": "users"}]},
+      ],
+    }
+
+    self.assertEqual(list(query_plans.seq_scans(plan)), ["campaign_members"])
+
+  def test_only_new_seq_scans_and_cost_growth_are_regressions(self):
+    scanned = "SELECT 1 FROM campaign_members WHERE campaign_id = $1"
+    indexed = "SELECT 1 FROM campaign_members WHERE user_id = $1"
+    baseline = {
+      query_plans.Statement("k", "", scanned).fingerprint: {"cost": 100.0, "seq_scans": ["campaign_members"]},
+      query_plans.Statement("k", "", indexed).fingerprint: {"cost": 100.0, "seq_scans": []},
+    }
+    results = [
+      _result("crud.a#1", scanned, 120.0, {"campaign_members": 50000}),
+      _result("crud.b#1", indexed, 200.0),
+      _result("crud.c#1", "SELECT 2", 900.0),
+      _result("crud.d#1", "SELECT 3", 10.0, {"campaign_guesses": 900000}),
+    ]
+
+    problems = query_plans.regressions(results, baseline, tolerance=0.25)
+
+    self.assertEqual(len(problems), 2)
+    self.assertIn("crud.b#1", problems[0])
+    self.assertIn("cost 200 vs baseline 100", problems[0])
+    self.assertIn("crud.d#1", problems[1])
+    self.assertIn("seq scans campaign_guesses", problems[1])
+
+  def test_baseline_entries_survive_queries_being_added_above_them(self):
+    sql = "SELECT 1 FROM campaign_members WHERE user_id = $1"
+    with tempfile.TemporaryDirectory() as tmp:
+      path = os.path.join(tmp, "baseline.json")
+      query_plans.write_baseline([_result("crud.a#1", sql, 10.0), _result("crud.b#2", sql, 12.0)], path)
+      baseline = query_plans.load_baseline(path)
+
+    entry = baseline[query_plans.Statement("k", "", sql).fingerprint]
+    self.assertEqual(entry, {"callers": ["crud.a", "crud.b"], "cost": 12.0, "seq_scans": []})
+    # The same statement now third in its function: same entry, no regression.
+    self.assertEqual(query_plans.regressions([_result("crud.a#3", sql, 11.0)], baseline), [])
+
+  def test_rewriting_the_baseline_ignores_planner_jitter(self):
+    sql = "SELECT 1 FROM campaign_members WHERE user_id = $1"
+    fingerprint = query_plans.Statement("k", "", sql).fingerprint
+    with tempfile.TemporaryDirectory() as tmp:
+      path = os.path.join(tmp, "baseline.json")
+      query_plans.write_baseline([_result("crud.a#1", sql, 500.0)], path)
+      query_plans.write_baseline([_result("crud.a#1", sql, 500.04)], path)
+      self.assertEqual(query_plans.load_baseline(path)[fingerprint]["cost"], 500.0)
+      query_plans.write_baseline([_result("crud.a#1", sql, 560.0)], path)
+      self.assertEqual(query_plans.load_baseline(path)[fingerprint]["cost"], 560.0)
+
+
+class QueryPlanRegressionTests(unittest.TestCase):
+  @classmethod
+  def setUpClass(cls):
+    if query_plans is None:
+      raise unittest.SkipTest(f"query plan suite unavailable: {IMPORT_ERROR}")
+    if not QUERY_PLAN_DATABASE_URL:
+      raise unittest.SkipTest("QUERY_PLAN_DATABASE_URL is not set")
+    cls.results, cls.unresolved = query_plans.analyse(QUERY_PLAN_DATABASE_URL)
+
+  def test_every_statement_plans(self):
+    self.assertEqual([(r.statement.key, r.error) for r in self.results if r.error], [])
+
+  def test_no_new_sequential_scans_or_cost_regressions(self):
+    problems = query_plans.regressions(self.results, query_plans.load_baseline())
+    self.assertEqual(problems, [], "\n" + query_plans.report(self.results, self.unresolved, top=20))
+
+
+if __name__ == "__main__":
+  unittest.main()
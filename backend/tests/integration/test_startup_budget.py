@@ -0,0 +1,57 @@
+import importlib
+import os
+import subprocess
+import sys
+import unittest
+
+
+BACKEND_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if BACKEND_ROOT not in sys.path:
+  sys.path.insert(0, BACKEND_ROOT)
+
+try:
+  import fastapi  # noqa: E402,F401
+  import httpx  # noqa: E402,F401  (fastapi.testclient needs it)
+  from benchmarks import startup  # noqa: E402
+except ImportError as exc:  # pragma: no cover
+  startup = None
+  IMPORT_ERROR = exc
+else:
+  IMPORT_ERROR = None
+
+# Generous enough for a loaded CI runner; lower it locally to catch smaller regressions.
+STARTUP_BUDGET_MS = float(os.getenv("STARTUP_BUDGET_MS", "3000"))
+
+
+class StartupBudgetTests(unittest.TestCase):
+  @classmethod
+  def setUpClass(cls):
+    if startup is None:
+      raise unittest.SkipTest(f"startup benchmark unavailable: {IMPORT_ERROR}")
+    # Only a missing optional dependency skips; a child process that fails is a real failure.
+    try:
+      importlib.import_module("app.main")
+    except ImportError as exc:
+      raise unittest.SkipTest(f"app.main dependencies are not installed: {exc}")
+    try:
+      cls.result = startup.time_to_first_request()
+    except subprocess.CalledProcessError as exc:
+      raise AssertionError(f"startup measurement failed:\n{exc.stderr}") from exc
+
+  def test_first_request_is_served_within_budget(self):
+    self.assertEqual(self.result["status"], 401)
+    self.assertLessEqual(self.result["first_request_ms"], STARTUP_BUDGET_MS)
+
+  def test_heavy_dependencies_are_not_imported_at_startup(self):
+    self.assertEqual(self.result["heavy_modules"], [])
+
+  def test_import_times_are_parsed_per_module(self):
+    rows = {name: (self_ms, cumulative_ms) for name, self_ms, cumulative_ms in startup.import_times()}
+
+    self.assertIn("app.main", rows)
+    self.assertIn("app.crud", rows)
+    self.assertGreaterEqual(rows["app.main"][1], rows["app.crud"][1])
+
+
+if __name__ == "__main__":
+  unittest.main()
@@ -0,0 +1,150 @@
+import os
+import sys
+import unittest
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+
+BACKEND_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if BACKEND_ROOT not in sys.path:
+  sys.path.insert(0, BACKEND_ROOT)
+
+try:
+  from app.accolades import evaluator  # noqa: E402
+except Exception as exc:  # pragma: no cover
+  evaluator = None
+  IMPORT_ERROR = exc
+else:
+  IMPORT_ERROR = None
+
+
+class _FakeCursor:
+  def __init__(self, rows):
+    self._rows = rows
+
+  def fetchall(self):
+    return self._rows
+
+
+class _FakeConn:
+  def __init__(self, first_solvers=(), prior=(), item_uses=()):
+    self.first_solvers = list(first_solvers)
+    self.prior = list(prior)
+    self.item_uses = list(item_uses)
+    self.queries = []
+
+  def execute(self, query, params=None):
+    normalized = " ".join(query.split())
+    self.queries.append(normalized)
+    if "DISTINCT ON (campaign_id, date)" in normalized:
+      return _FakeCursor(self.first_solvers)
+    if "FROM campaign_user_daily_results" in normalized:
+      return _FakeCursor(self.prior)
+    if "FROM campaign_item_events" in normalized:
+      return _FakeCursor(self.item_uses)
+    return _FakeCursor([])
+
+
+def _game(user_id, day, **payload):
+  return {"id": user_id, "kind": "game_completed", "campaign_id": 7, "user_id": user_id, "date": day, "payload": payload}
+
+
+class AccoladeEvaluatorTests(unittest.TestCase):
+  def setUp(self):
+    if evaluator is None:
+      self.skipTest(f"backend app.accolades.evaluator import unavailable: {IMPORT_ERROR}")
+
+  def _evaluate(self, conn, triggers):
+    awarded = []
+
+    def _award(conn, campaign_id, user_id, key, date_str):
+      awarded.append((user_id, key, date_str))
+      return True
+
+    with patch.object(evaluator, "award_accolade", side_effect=_award):
+      count = evaluator.evaluate_triggers(conn, triggers)
+    self.assertEqual(count, len(awarded))
+    return awarded
+
+  def test_batch_loads_context_once_for_all_games(self):
+    conn = _FakeConn(
+      first_solvers=[(7, "2026-03-02", 1)],
+      prior=[(2, 7, "2026-03-01", 0), (2, 7, "2026-02-28", 0)],
+      item_uses=[(3, 7, "2026-03-02", datetime(2026, 3, 3, 2, 0, tzinfo=timezone.utc))],
+    )
+    triggers = [
+      _game(1, "2026-03-02", solved=True, guesses_used=1, completed_at="2026-03-02T12:00:00-06:00"),
+      _game(2, "2026-03-02", solved=True, guesses_used=4, completed_at="2026-03-02T12:00:00-06:00"),
+      _game(3, "2026-03-02", solved=True, guesses_used=3, completed_at="2026-03-02T23:55:00-06:00"),
+      _game(4, "2026-03-02", solved=False, guesses_used=6, days_played=7, streak=7),
+    ]
+
+    awarded = self._evaluate(conn, triggers)
+
+    self.assertEqual(sorted((user_id, key) for user_id, key, _ in awarded), [
+      (1, "ace"),
+      (1, "first_solver"),
+      (2, "comeback"),
+      (2, "iron_will"),
+      (3, "clutch"),
+      (3, "late_save"),
+      (3, "night_owl"),
+      (3, "saves_the_day"),
+      (4, "perfect_week"),
+      (4, "veteran_7"),
+    ])
+    self.assertEqual(len(conn.queries), 3)
+
+  def test_item_used_after_the_solve_does_not_save_the_day(self):
+    conn = _FakeConn(item_uses=[
+      (3, 7, "2026-03-02", datetime(2026, 3, 2, 18, 30, tzinfo=timezone.utc)),
+      (5, 7, "2026-03-02", datetime(2026, 3, 2, 17, 30, tzinfo=timezone.utc)),
+    ])
+    triggers = [
+      _game(3, "2026-03-02", solved=True, guesses_used=2, completed_at="2026-03-02T12:00:00-06:00"),
+      _game(5, "2026-03-02", solved=True, guesses_used=2, completed_at="2026-03-02T12:00:00-06:00"),
+    ]
+
+    awarded = self._evaluate(conn, triggers)
+
+    self.assertNotIn((3, "saves_the_day", "2026-03-02"), awarded)
+    self.assertIn((5, "saves_the_day", "2026-03-02"), awarded)
+
+  def test_backfilled_utc_completion_near_midnight_counts_on_the_central_day(self):
+    # 05:55 UTC on the 3rd is 23:55 CST on the 2nd; read as Central it would be early_bird on the 3rd.
+    awarded = self._evaluate(_FakeConn(), [
+      _game(3, "2026-03-02", solved=True, guesses_used=4, completed_at="2026-03-03T05:55:00+00:00"),
+    ])
+
+    self.assertEqual(sorted(key for _, key, _ in awarded), ["late_save", "night_owl"])
+
+  def test_backfill_emits_completed_at_as_utc(self):
+    class _BackfillConn:
+      def __init__(self):
+        self.queries = []
+
+      def execute(self, query, params=None):
+        self.queries.append(" ".join(query.split()))
+        return type("_Result", (), {"rowcount": 0})()
+
+    conn = _BackfillConn()
+    evaluator.backfill_triggers(conn, "2026-03-01", "2026-03-31")
+
+    self.assertIn("'completed_at', r.completed_at AT TIME ZONE 'UTC',", conn.queries[0])
+
+  def test_purchase_and_campaign_end_rules(self):
+    conn = _FakeConn()
+    triggers = [
+      {"id": 1, "kind": "purchase", "campaign_id": 7, "user_id": 5, "date": "2026-03-02", "payload": {"spend_total": 60}},
+      {"id": 2, "kind": "purchase", "campaign_id": 7, "user_id": 6, "date": "2026-03-02", "payload": {"spend_total": 10}},
+      {"id": 3, "kind": "campaign_ended", "campaign_id": 7, "user_id": None, "date": "2026-03-07", "payload": {"top_user_ids": [9, 8]}},
+    ]
+
+    awarded = self._evaluate(conn, triggers)
+
+    self.assertEqual(awarded, [(5, "big_spender", "2026-03-02"), (9, "top_3", "2026-03-07"), (8, "top_3", "2026-03-07")])
+    self.assertEqual(conn.queries, [])
+
+
+if __name__ == "__main__":
+  unittest.main()
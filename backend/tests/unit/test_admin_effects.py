@@ -12,6 +12,7 @@ if BACKEND_ROOT not in sys.path:
 
 try:
   from fastapi import HTTPException
+  from app import principal  # noqa: E402
   from app.admin import service  # noqa: E402
 except Exception as exc:  # pragma: no cover
   service = None
@@ -40,6 +41,8 @@ class _FakeConn:
 
   def execute(self, query, params=None):
     normalized = " ".join(query.split())
+    if "FROM users u" in normalized:
+      return _FakeCursor((True, [99]))
     if "SELECT score FROM campaign_members" in normalized:
       return _FakeCursor((self.current_score,))
     if "FROM campaign_members" in normalized:
@@ -83,6 +86,10 @@ class AdminEffectsTests(unittest.TestCase):
   def setUp(self):
     if service is None:
       self.skipTest(f"backend app.admin.service import unavailable: {IMPORT_ERROR}")
+    principal.PRINCIPAL_CACHE.clear()
+
+  def tearDown(self):
+    principal.PRINCIPAL_CACHE.clear()
 
   def test_list_admin_effects_exposes_custom_payload_types(self):
     conn = _FakeConn()
@@ -0,0 +1,189 @@
+import os
+import sys
+import tempfile
+import unittest
+from datetime import date, datetime, timedelta
+from unittest.mock import patch
+from zoneinfo import ZoneInfo
+
+
+BACKEND_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if BACKEND_ROOT not in sys.path:
+  sys.path.insert(0, BACKEND_ROOT)
+
+try:
+  from app.analytics import service  # noqa: E402
+except Exception as exc:  # pragma: no cover
+  service = None
+  IMPORT_ERROR = exc
+else:
+  IMPORT_ERROR = None
+
+
+class _FakeCursor:
+  def __init__(self, rows, columns=()):
+    self._rows = rows
+    self.description = [type("Column", (), {"name": name}) for name in columns]
+
+  def fetchall(self):
+    return self._rows
+
+
+class _FakeConn:
+  def __init__(self, rows_by_table):
+    self.rows_by_table = rows_by_table
+
+  def execute(self, query, params=None):
+    for table, rows in self.rows_by_table.items():
+      if f"FROM {table}" in query:
+        return _FakeCursor(rows)
+    return _FakeCursor([])
+
+
+class _FallbackConn:
+  """Answers the Postgres fallback queries with one aggregated row."""
+
+  def __init__(self, columns, row):
+    self.columns = columns
+    self.row = row
+    self.queries = []
+
+  def execute(self, query, params=None):
+    self.queries.append((" ".join(query.split()), params))
+    return _FakeCursor([self.row], self.columns)
+
+
+class _FakeDbCtx:
+  def __init__(self, conn):
+    self.conn = conn
+
+  def __enter__(self):
+    return self.conn
+
+  def __exit__(self, exc_type, exc, tb):
+    return False
+
+
+def _result(user_id, campaign_id, day, word, guesses_used, solved):
+  return (user_id, campaign_id, day, word, guesses_used, solved, 0, 0, 10, 1)
+
+
+class AnalyticsStoreTests(unittest.TestCase):
+  def setUp(self):
+    if service is None:
+      self.skipTest(f"backend app.analytics import unavailable: {IMPORT_ERROR}")
+    self._dir = tempfile.TemporaryDirectory()
+    self.addCleanup(self._dir.cleanup)
+    patcher = patch.object(service, "ANALYTICS_DIR", self._dir.name)
+    patcher.start()
+    self.addCleanup(patcher.stop)
+
+  def _export(self, day, results, item_events=()):
+    conn = _FakeConn({
+      "campaign_user_daily_results": results,
+      "campaign_item_events": list(item_events),
+    })
+    get_db_calls = []
+
+    def _get_db(**kwargs):
+      get_db_calls.append(kwargs)
+      return _FakeDbCtx(conn)
+
+    with patch.object(service, "get_db", side_effect=_get_db):
+      counts = service.export_daily_facts(day)
+    self.assertEqual(get_db_calls, [{"readonly": True}])
+    return counts
+
+  def _fallback(self, fn, *args):
+    conn = _FallbackConn(["month", "games"], ("2026-02", 4))
+    with patch.object(service, "get_db", return_value=_FakeDbCtx(conn)) as get_db:
+      rows = fn(*args)
+    get_db.assert_called_once_with(readonly=True)
+    return rows, conn.queries
+
+  def test_missing_store_answers_from_postgres(self):
+    rows, queries = self._fallback(service.get_monthly_trends, 7, 12)
+
+    self.assertEqual(rows, [{"month": "2026-02", "games": 4}])
+    self.assertIn("FROM campaign_user_daily_results cudr", queries[0][0])
+    self.assertEqual(queries[0][1], [service._since(12), 7])
+    _, queries = self._fallback(service.get_item_usage_trends, None, 3)
+    self.assertIn("FROM campaign_item_events cie", queries[0][0])
+
+  def test_stale_store_answers_from_postgres(self):
+    stale = datetime.now(ZoneInfo("America/Chicago")).date() - timedelta(days=service.ANALYTICS_MAX_LAG_DAYS + 1)
+    self._export(stale, [_result(1, 7, stale.isoformat(), "crane", 3, 1)])
+
+    self.assertIsNone(service._fact_glob("daily_results", stale))
+    _, queries = self._fallback(service.get_word_difficulty, 10, 1, 12)
+    self.assertIn("FROM campaign_user_daily_results cudr", queries[0][0])
+    with patch.object(service, "ANALYTICS_MAX_LAG_DAYS", service.ANALYTICS_MAX_LAG_DAYS + 1):
+      self.assertIsNotNone(service._fact_glob("daily_results", stale))
+
+  def test_store_that_starts_after_the_requested_range_answers_from_postgres(self):
+    day = datetime.now(ZoneInfo("America/Chicago")).date()
+    self._export(day, [_result(1, 7, day.isoformat(), "crane", 3, 1)])
+
+    self.assertIsNotNone(service._fact_glob("daily_results", day))
+    self.assertIsNone(service._fact_glob("daily_results", day - timedelta(days=1)))
+    rows, _ = self._fallback(service.get_monthly_trends, None, 12)
+    self.assertEqual(rows, [{"month": "2026-02", "games": 4}])
+
+  def test_trends_and_word_difficulty_read_exported_days(self):
+    day = datetime.now(ZoneInfo("America/Chicago")).date()
+    if day.day > 1:
+      self._export(day.replace(day=1), [])
+    counts = self._export(day, [
+      _result(1, 7, day.isoformat(), "crane", 3, 1),
+      _result(2, 7, day.isoformat(), "crane", 6, 0),
+      _result(3, 8, day.isoformat(), "slate", 2, 1),
+    ], item_events=[(7, 1, day.isoformat(), "oracle_whisper", "use", None)])
+
+    self.assertEqual(counts, {"daily_results": 3, "campaign_daily": 0, "item_events": 1})
+    trends = service.get_monthly_trends(7, 1)
+    self.assertEqual(len(trends), 1)
+    self.assertEqual((trends[0]["games"], trends[0]["players"], trends[0]["solve_rate"]), (2, 2, 0.5))
+
+    words = service.get_word_difficulty(10, min_attempts=1, months=1)
+    self.assertEqual([row["word"] for row in words], ["crane", "slate"])
+    self.assertGreater(words[0]["difficulty"], words[1]["difficulty"])
+
+    items = service.get_item_usage_trends(None, 1)
+    self.assertEqual([(row["item_key"], row["events"]) for row in items], [("oracle_whisper", 1)])
+
+  def test_last_day_of_month_compacts_daily_files(self):
+    self._export(date(2026, 2, 27), [_result(1, 7, "2026-02-27", "crane", 3, 1)])
+    self._export(date(2026, 2, 28), [_result(1, 7, "2026-02-28", "slate", 4, 1)])
+
+    self.assertEqual(self._parquet_files(), ["2026-02.parquet"])
+    self.assertEqual(self._games_by_month(), [("2026-02", 2)])
+
+  def test_rerunning_days_of_a_compacted_month_replaces_their_rows(self):
+    results = {
+      date(2026, 9, 29): [_result(1, 7, "2026-09-29", "crane", 3, 1)],
+      date(2026, 9, 30): [_result(1, 7, "2026-09-30", "slate", 4, 1)],
+    }
+    for _ in range(2):
+      for day, rows in results.items():
+        self._export(day, rows)
+    self.assertEqual(self._parquet_files(), ["2026-09.parquet"])
+    self.assertEqual(self._games_by_month(), [("2026-09", 2)])
+
+    self._export(date(2026, 9, 29), results[date(2026, 9, 29)] * 2)
+    self.assertEqual(self._parquet_files(), ["2026-09.parquet"])
+    self.assertEqual(self._games_by_month(), [("2026-09", 3)])
+
+  def _parquet_files(self):
+    return sorted(name for name in os.listdir(service._fact_dir("daily_results")) if name.endswith(".parquet"))
+
+  def _games_by_month(self):
+    with (
+      patch.object(service, "_since", return_value=service._first_day("daily_results")),
+      patch.object(service, "ANALYTICS_MAX_LAG_DAYS", 10_000),
+    ):
+      trends = service.get_monthly_trends(None, 3)
+    return [(row["month"], row["games"]) for row in trends]
+
+
+if __name__ == "__main__":
+  unittest.main()
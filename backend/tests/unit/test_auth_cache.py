@@ -0,0 +1,205 @@
+import json
+import os
+import sys
+import time
+import unittest
+from datetime import timedelta
+from unittest.mock import patch
+
+
+BACKEND_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if BACKEND_ROOT not in sys.path:
+  sys.path.insert(0, BACKEND_ROOT)
+
+try:
+  from app import cache, principal  # noqa: E402
+except Exception as exc:  # pragma: no cover
+  principal = None
+  PRINCIPAL_IMPORT_ERROR = exc
+else:
+  PRINCIPAL_IMPORT_ERROR = None
+
+try:
+  from app import auth  # noqa: E402
+except Exception as exc:  # pragma: no cover
+  auth = None
+  AUTH_IMPORT_ERROR = exc
+else:
+  AUTH_IMPORT_ERROR = None
+
+
+class _FakeCursor:
+  def __init__(self, row):
+    self._row = row
+
+  def fetchone(self):
+    return self._row
+
+
+class _FakeConn:
+  def __init__(self, is_admin=False, memberships=None):
+    self.calls = []
+    self.is_admin = is_admin
+    self.memberships = list(memberships or [])
+
+  def execute(self, query, params=None):
+    self.calls.append((query, params))
+    normalized_query = " ".join(query.split())
+    if "FROM users u" in normalized_query:
+      return _FakeCursor((self.is_admin, self.memberships))
+    return _FakeCursor(None)
+
+
+class TokenCacheTests(unittest.TestCase):
+  def setUp(self):
+    if auth is None:
+      self.skipTest(f"backend app.auth import unavailable: {AUTH_IMPORT_ERROR}")
+    auth.clear_token_cache()
+
+  def tearDown(self):
+    auth.clear_token_cache()
+
+  def test_verified_token_is_decoded_once(self):
+    token = auth.create_access_token({"user_id": 42})
+    with patch.object(auth.jwt, "decode", wraps=auth.jwt.decode) as decode:
+      first = auth.get_current_user(token)
+      second = auth.get_current_user(token)
+
+    self.assertEqual(first, {"user_id": 42})
+    self.assertEqual(second, {"user_id": 42})
+    self.assertEqual(decode.call_count, 1)
+
+  def test_cached_entry_is_not_served_past_token_exp(self):
+    token = auth.create_access_token({"user_id": 42}, expires_delta=timedelta(minutes=5))
+    auth.get_current_user(token)
+    with (
+      patch.object(auth.time, "time", return_value=time.time() + 600),
+      patch.object(auth.jwt, "decode", side_effect=auth.JWTError("expired")) as decode,
+    ):
+      with self.assertRaises(Exception) as ctx:
+        auth.get_current_user(token)
+
+    self.assertEqual(getattr(ctx.exception, "status_code", None), 401)
+    self.assertEqual(decode.call_count, 1)
+
+  def test_cache_is_bounded(self):
+    with patch.object(auth, "TOKEN_CACHE_SIZE", 2):
+      tokens = [auth.create_access_token({"user_id": user_id}) for user_id in (1, 2, 3)]
+      for token in tokens:
+        auth.get_current_user(token)
+
+    self.assertEqual(len(auth._token_cache), 2)
+
+  def test_invalid_token_is_rejected_and_not_cached(self):
+    with self.assertRaises(Exception) as ctx:
+      auth.get_current_user("not-a-token")
+
+    self.assertEqual(getattr(ctx.exception, "status_code", None), 401)
+    self.assertEqual(len(auth._token_cache), 0)
+
+
+class PrincipalCacheTests(unittest.TestCase):
+  def setUp(self):
+    if principal is None:
+      self.skipTest(f"backend app.principal import unavailable: {PRINCIPAL_IMPORT_ERROR}")
+    principal.PRINCIPAL_CACHE.clear()
+
+  def tearDown(self):
+    principal.PRINCIPAL_CACHE.clear()
+
+  def test_principal_is_loaded_once_and_shared(self):
+    conn = _FakeConn(is_admin=True, memberships=[3, 5])
+
+    first = principal.get_principal(conn, 7)
+    second = principal.get_principal(conn, 7)
+
+    self.assertTrue(first.is_admin)
+    self.assertTrue(second.is_member(5))
+    self.assertEqual(len(conn.calls), 1)
+
+  def test_membership_miss_is_rechecked_against_database(self):
+    conn = _FakeConn(memberships=[3])
+    principal.get_principal(conn, 7)
+    conn.memberships = [3, 9]
+
+    self.assertTrue(principal.is_campaign_member(conn, 7, 9))
+    self.assertEqual(len(conn.calls), 2)
+
+  def test_invalidation_drops_cached_admin_flag(self):
+    conn = _FakeConn(is_admin=True)
+    self.assertTrue(principal.get_principal(conn, 7).is_admin)
+    conn.is_admin = False
+
+    self.assertTrue(principal.get_principal(conn, 7).is_admin)
+    principal.invalidate_principal(conn, 7)
+    self.assertFalse(principal.get_principal(conn, 7).is_admin)
+    notify = [params for query, params in conn.calls if "pg_notify" in query]
+    self.assertEqual(json.loads(notify[0][1]), {"namespace": "principal", "key": "7"})
+
+  def test_invalidation_from_another_worker_drops_the_principal(self):
+    conn = _FakeConn(memberships=[3])
+    principal.get_principal(conn, 7)
+    conn.memberships = []
+
+    cache._apply_notification(json.dumps({"namespace": "principal", "key": repr(7)}))
+
+    self.assertFalse(principal.get_principal(conn, 7).is_member(3))
+    self.assertEqual(len([query for query, _ in conn.calls if "FROM users u" in query]), 2)
+
+  def test_stale_principal_is_reloaded_after_ttl(self):
+    conn = _FakeConn(is_admin=True)
+    principal.get_principal(conn, 7)
+    conn.is_admin = False
+
+    with patch.object(cache.time, "monotonic", return_value=time.monotonic() + principal.PRINCIPAL_TTL_SECONDS + 1):
+      self.assertFalse(principal.get_principal(conn, 7).is_admin)
+
+  def test_set_admin_invalidates_the_cached_flag(self):
+    conn = _FakeConn(is_admin=False)
+    self.assertFalse(principal.get_principal(conn, 7).is_admin)
+
+    principal.set_admin(conn, 7, True)
+    conn.is_admin = True
+
+    self.assertTrue(principal.get_principal(conn, 7).is_admin)
+    self.assertIn(("UPDATE users SET is_admin = %s WHERE id = %s", (True, 7)), conn.calls)
+
+
+class _ConnectCounter:
+  def __init__(self, conn):
+    self.conn = conn
+    self.opened = 0
+
+  def __call__(self):
+    self.opened += 1
+    return self
+
+  def __enter__(self):
+    return self.conn
+
+  def __exit__(self, exc_type, exc, tb):
+    return False
+
+
+class PrincipalDependencyTests(unittest.TestCase):
+  def setUp(self):
+    if auth is None or principal is None:
+      self.skipTest(f"backend app.auth import unavailable: {AUTH_IMPORT_ERROR or PRINCIPAL_IMPORT_ERROR}")
+    principal.PRINCIPAL_CACHE.clear()
+
+  def tearDown(self):
+    principal.PRINCIPAL_CACHE.clear()
+
+  def test_dependency_returns_the_principal_and_only_connects_on_a_miss(self):
+    connect = _ConnectCounter(_FakeConn(is_admin=True, memberships=[3]))
+    with patch.object(auth, "get_db", side_effect=connect):
+      first = auth.get_principal({"user_id": 7})
+      second = auth.get_principal({"user_id": 7})
+
+    self.assertEqual(first, principal.Principal(user_id=7, is_admin=True, memberships=frozenset({3})))
+    self.assertIs(second, first)
+    self.assertEqual(connect.opened, 1)
+
+
+if __name__ == "__main__":
+  unittest.main()
@@ -0,0 +1,108 @@
+import json
+import os
+import sys
+import unittest
+from unittest.mock import patch
+
+
+BACKEND_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if BACKEND_ROOT not in sys.path:
+  sys.path.insert(0, BACKEND_ROOT)
+
+try:
+  from prometheus_client import REGISTRY  # noqa: E402
+  from app import cache  # noqa: E402
+except Exception as exc:  # pragma: no cover
+  cache = None
+  IMPORT_ERROR = exc
+else:
+  IMPORT_ERROR = None
+
+
+class _FakeConn:
+  def __init__(self):
+    self.notifications = []
+
+  def execute(self, query, params=None):
+    if "pg_notify" in query:
+      self.notifications.append(params)
+
+
+def _count(name, **labels):
+  return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+class CacheLayerTests(unittest.TestCase):
+  def setUp(self):
+    if cache is None:
+      self.skipTest(f"backend app.cache import unavailable: {IMPORT_ERROR}")
+    self.loads = []
+
+  def _loader(self, value):
+    def _load():
+      self.loads.append(value)
+      return value
+    return _load
+
+  def test_l1_serves_repeat_reads_and_evicts_least_recent(self):
+    lru = cache.Cache("test_lru", ttl_seconds=60, maxsize=2)
+    hits_before = _count("cache_requests_total", namespace="test_lru", tier="l1", result="hit")
+
+    self.assertEqual(lru.get(1, self._loader("a")), "a")
+    self.assertEqual(lru.get(1, self._loader("stale")), "a")
+    lru.get(2, self._loader("b"))
+    lru.get(3, self._loader("c"))
+    self.assertEqual(lru.get(1, self._loader("a2")), "a2")
+
+    self.assertEqual(self.loads, ["a", "b", "c", "a2"])
+    self.assertEqual(_count("cache_requests_total", namespace="test_lru", tier="l1", result="hit") - hits_before, 1)
+    self.assertEqual(_count("cache_evictions_total", namespace="test_lru", reason="size"), 2)
+
+  def test_expired_entries_and_none_are_reloaded(self):
+    short = cache.Cache("test_ttl", ttl_seconds=0)
+
+    short.get("k", self._loader("v1"))
+    short.get("k", self._loader("v2"))
+    short.get("missing", self._loader(None))
+    short.get("missing", self._loader(None))
+
+    self.assertEqual(self.loads, ["v1", "v2", None, None])
+
+  def test_invalidate_notifies_after_dropping_local_copy(self):
+    schedule = cache.Cache("test_notify", ttl_seconds=60)
+    schedule.get((7, "2026-03-01"), self._loader("old"))
+    conn = _FakeConn()
+
+    schedule.invalidate(conn, (7, "2026-03-01"))
+
+    channel, payload = conn.notifications[0]
+    self.assertEqual(channel, cache.CACHE_CHANNEL)
+    self.assertEqual(json.loads(payload), {"namespace": "test_notify", "key": "(7, '2026-03-01')"})
+    self.assertEqual(schedule.get((7, "2026-03-01"), self._loader("new")), "new")
+
+  def test_notification_from_another_worker_drops_l1_and_l2(self):
+    with patch.object(cache, "CACHE_BACKEND", "memory"), patch.object(cache, "_backend", None):
+      shared = cache.Cache("test_shared", ttl_seconds=60)
+      shared.get(5, self._loader("v1"))
+      shared.clear()
+      self.assertEqual(shared.get(5, self._loader("unused")), "v1")
+
+      cache._apply_notification(json.dumps({"namespace": "test_shared", "key": repr(5)}))
+
+      self.assertEqual(shared.get(5, self._loader("v2")), "v2")
+      self.assertEqual(self.loads, ["v1", "v2"])
+
+  def test_load_racing_an_invalidation_is_not_cached(self):
+    racy = cache.Cache("test_race", ttl_seconds=60)
+
+    def _load():
+      racy.discard(repr(1))
+      return "read before the write committed"
+
+    racy.get(1, _load)
+
+    self.assertEqual(racy.get(1, self._loader("fresh")), "fresh")
+
+
+if __name__ == "__main__":
+  unittest.main()
@@ -0,0 +1,161 @@
+import os
+import sys
+import unittest
+from unittest.mock import patch
+
+
+BACKEND_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if BACKEND_ROOT not in sys.path:
+  sys.path.insert(0, BACKEND_ROOT)
+
+try:
+  from app import crud, principal  # noqa: E402
+except Exception as exc:  # pragma: no cover
+  crud = None
+  IMPORT_ERROR = exc
+else:
+  IMPORT_ERROR = None
+
+
+class _FakeCursor:
+  def __init__(self, rows):
+    self._rows = rows
+
+  def fetchone(self):
+    return self._rows[0] if self._rows else None
+
+  def fetchall(self):
+    return self._rows
+
+
+class _FakeConn:
+  """Answers each query from the first (marker, rows) pair whose marker it contains."""
+
+  def __init__(self, answers):
+    self.answers = answers
+    self.calls = []
+
+  def execute(self, query, params=None):
+    normalized = " ".join(query.split())
+    self.calls.append((normalized, params))
+    for marker, rows in self.answers:
+      if marker in normalized:
+        return _FakeCursor(rows)
+    return _FakeCursor([])
+
+
+class _FakeDbCtx:
+  def __init__(self, conn):
+    self.conn = conn
+
+  def __enter__(self):
+    return self.conn
+
+  def __exit__(self, exc_type, exc, tb):
+    return False
+
+
+def _standing(user_id, score):
+  return (user_id, f"P{user_id}", "#fff", score, 1, None, None, None, None, None, None, None, None, None, 9)
+
+
+def _member(user_id, name):
+  return (user_id, name, "#fff", f"First {user_id}")
+
+
+class LeaderboardWindowTests(unittest.TestCase):
+  def setUp(self):
+    if crud is None:
+      self.skipTest(f"backend app.crud import unavailable: {IMPORT_ERROR}")
+
+  def _window(self, answers, top=2, radius=2):
+    conn = _FakeConn(answers)
+    with patch.object(crud, "get_db", return_value=_FakeDbCtx(conn)):
+      return crud.get_leaderboard_window(9, 50, top, radius), conn
+
+  def test_window_ranks_top_and_neighbours_without_duplicates(self):
+    window, conn = self._window([
+      ("SELECT score FROM campaign_members", [(40,)]),
+      ("SELECT COUNT(*)", [(3,)]),
+      ("cm.user_id >= %s", [_standing(50, 40), _standing(51, 40)]),
+      ("ORDER BY cm.score DESC, cm.user_id LIMIT", [_standing(1, 90), _standing(2, 80)]),
+      ("ORDER BY cm.score, cm.user_id DESC", [_standing(3, 60), _standing(2, 80)]),
+    ])
+
+    self.assertEqual(window["my_rank"], 4)
+    self.assertEqual(
+      [(entry["rank"], entry["user_id"]) for entry in window["entries"]],
+      [(1, 1), (2, 2), (3, 3), (4, 50), (5, 51)],
+    )
+    self.assertEqual(conn.calls[1][1], (9, 40, 40, 50))
+
+  def test_sizes_are_clamped_so_the_response_stays_bounded(self):
+    _, conn = self._window([("SELECT score FROM campaign_members", [(40,)]), ("SELECT COUNT(*)", [(0,)])], top=500, radius=-3)
+
+    limits = [params[-1] for query, params in conn.calls if query.endswith("LIMIT %s")]
+    self.assertEqual(limits, [crud.LEADERBOARD_WINDOW_MAX, 0, 1])
+
+  def test_non_members_get_no_window(self):
+    with self.assertRaises(Exception) as ctx:
+      self._window([])
+
+    self.assertEqual(getattr(ctx.exception, "status_code", None), 403)
+
+
+class MemberPageTests(unittest.TestCase):
+  def setUp(self):
+    if crud is None:
+      self.skipTest(f"backend app.crud import unavailable: {IMPORT_ERROR}")
+    principal.PRINCIPAL_CACHE.clear()
+
+  def tearDown(self):
+    principal.PRINCIPAL_CACHE.clear()
+
+  def test_page_returns_name_cursor_and_blocked_status_for_the_page_only(self):
+    conn = _FakeConn([
+      ("FROM users u", [(False, [9])]),
+      ("FROM campaign_members cm JOIN users u", [_member(4, "Ada: Queen"), _member(2, "bob"), _member(8, "Cy")]),
+      ("FROM campaign_item_events", [(2, "vowel_voodoo")]),
+    ])
+    with (
+      patch.object(crud, "get_db", return_value=_FakeDbCtx(conn)),
+      patch.object(crud, "resolve_campaign_day", return_value=(None, None, 1, 1, crud.datetime(2026, 1, 5))),
+    ):
+      page = crud.get_targetable_members_page(9, 1, limit=2, item_key="hex_of_compulsion")
+
+    self.assertEqual([(t["user_id"], t["blocked"]) for t in page["targets"]], [(4, False), (2, True)])
+    self.assertEqual(page["next_cursor"], "2:bob")
+    self.assertEqual(conn.calls[1][1], (9, 1, "%", "", 0, 3))
+    self.assertEqual(conn.calls[-1][1][-1], [4, 2])
+
+  def test_prefix_is_escaped_and_cursor_resumes_after_the_last_name(self):
+    conn = _FakeConn([("FROM campaigns", [(1,)])])
+    with patch.object(crud, "get_db", return_value=_FakeDbCtx(conn)):
+      page = crud.get_campaign_members_page(9, 1, limit=500, cursor="4:ada: queen", prefix="A_%")
+
+    self.assertEqual(page, {"members": [], "next_cursor": None})
+    self.assertEqual(conn.calls[1][1], (9, 1, "a\\_\\%%", "ada: queen", 4, crud.MEMBER_PAGE_MAX_LIMIT + 1))
+
+  def test_members_without_a_display_name_sort_first_and_page_on(self):
+    conn = _FakeConn([
+      ("FROM campaigns", [(1,)]),
+      ("FROM campaign_members cm JOIN users u", [_member(6, None), _member(3, "ada")]),
+    ])
+    with patch.object(crud, "get_db", return_value=_FakeDbCtx(conn)):
+      page = crud.get_campaign_members_page(9, 1, limit=1)
+
+    self.assertEqual(page["members"][0]["user_id"], 6)
+    self.assertEqual(page["next_cursor"], "6:")
+    self.assertIn("lower(COALESCE(cm.display_name, '')) COLLATE \"C\" LIKE %s", conn.calls[1][0])
+
+  def test_invalid_cursor_is_rejected(self):
+    conn = _FakeConn([("FROM users u", [(False, [9])])])
+    with patch.object(crud, "get_db", return_value=_FakeDbCtx(conn)):
+      with self.assertRaises(Exception) as ctx:
+        crud.get_targetable_members_page(9, 1, cursor="garbage")
+
+    self.assertEqual(getattr(ctx.exception, "status_code", None), 400)
+
+
+if __name__ == "__main__":
+  unittest.main()
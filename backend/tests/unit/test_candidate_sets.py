@@ -0,0 +1,84 @@
+import os
+import sys
+import unittest
+
+
+BACKEND_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if BACKEND_ROOT not in sys.path:
+  sys.path.insert(0, BACKEND_ROOT)
+
+try:
+  from app import candidates  # noqa: E402
+except Exception as exc:  # pragma: no cover
+  candidates = None
+  IMPORT_ERROR = exc
+else:
+  IMPORT_ERROR = None
+
+
+def _result(guess, answer):
+  result = ["absent"] * 5
+  remaining = list(answer)
+  for i in range(5):
+    if guess[i] == answer[i]:
+      result[i] = "correct"
+      remaining.remove(guess[i])
+  for i in range(5):
+    if result[i] != "correct" and guess[i] in remaining:
+      result[i] = "present"
+      remaining.remove(guess[i])
+  return result
+
+
+class CandidateSetTests(unittest.TestCase):
+  def setUp(self):
+    if candidates is None:
+      self.skipTest(f"backend app.candidates import unavailable: {IMPORT_ERROR}")
+
+  def _scan(self, board, answer):
+    return [
+      word for word in candidates.PLAYABLE_WORD_ORDER
+      if all(_result(guess, word) == _result(guess, answer) for guess in board)
+    ]
+
+  def test_narrow_matches_full_scan(self):
+    for board, answer in (
+      (["crane", "moist"], "hoist"),
+      (["geese", "eerie"], "there"),
+      (["llama", "spell"], "knoll"),
+      (["abbey"], "tabby"),
+    ):
+      bits = candidates.ALL_CANDIDATES
+      for guess in board:
+        bits = candidates.narrow(bits, guess, _result(guess, answer))
+      self.assertEqual(candidates.words(bits), self._scan(board, answer), board)
+      self.assertIn(answer, candidates.words(bits))
+
+  def test_grey_duplicate_caps_letter_count(self):
+    bits = candidates.narrow(candidates.ALL_CANDIDATES, "eerie", _result("eerie", "there"))
+    remaining = candidates.words(bits)
+
+    self.assertTrue(remaining)
+    self.assertTrue(all(word.count("e") == 2 for word in remaining))
+
+  def test_stored_set_round_trips_and_rebuilds_when_missing(self):
+    guesses = [list("crane"), list("moist"), [""] * 5, [""] * 5, [""] * 5, [""] * 5]
+    results = [_result("crane", "hoist"), _result("moist", "hoist"), None, None, None, None]
+    bits = candidates.from_board(guesses, results)
+
+    self.assertEqual(candidates.decode(candidates.encode(bits)), bits)
+    self.assertEqual(candidates.load(None, guesses, results), bits)
+    self.assertEqual(candidates.load(b"stale", guesses, results), bits)
+    self.assertEqual(candidates.count(bits), len(self._scan(["crane", "moist"], "hoist")))
+
+  def test_hint_counts_cover_remaining_words(self):
+    bits = candidates.narrow(candidates.ALL_CANDIDATES, "moist", _result("moist", "hoist"))
+    remaining = candidates.words(bits)
+
+    self.assertEqual(candidates.position_letter_counts(bits, 4), {"t": len(remaining)})
+    self.assertEqual(sum(candidates.position_letter_counts(bits, 0).values()), len(remaining))
+    self.assertEqual(candidates.letter_counts(bits)["s"], len(remaining))
+
+
+if __name__ == "__main__":
+  unittest.main()
@@ -12,7 +12,7 @@ if BACKEND_ROOT not in sys.path:
 
 try:
   from fastapi import HTTPException
-  from app import crud  # noqa: E402
+  from app import crud, principal  # noqa: E402
 except Exception as exc:  # pragma: no cover
   crud = None
   HTTPException = None
@@ -39,6 +39,8 @@ class _UseItemConn:
 
   def execute(self, query, params=None):
     normalized = " ".join(query.split())
+    if "FROM users u" in normalized:
+      return _FakeCursor((False, [99]))
     if "FROM campaign_members" in normalized and "WHERE campaign_id = %s AND user_id = %s" in normalized:
       return _FakeCursor((1,))
     if "SELECT quantity" in normalized and "FROM campaign_user_items" in normalized:
@@ -68,6 +70,7 @@ class _ValidateConn:
         json.dumps({}),
         0,
         0,
+        None,
       )
     self.guess_state = guess_state
     self.committed = False
@@ -80,7 +83,7 @@ class _ValidateConn:
       return _FakeCursor(("cigar",))
     if "FROM campaign_guesses" in normalized and "word = %s" in normalized:
       return _FakeCursor(None)
-    if "FROM campaign_guess_states" in normalized and "SELECT guesses, results, letter_status, current_row, game_over" in normalized:
+    if "FROM campaign_guess_states" in normalized and "SELECT guesses, results, letter_status, current_row, game_over, candidates" in normalized:
       return _FakeCursor(self.guess_state)
     if "SELECT item_key, details" in normalized and "FROM campaign_item_events" in normalized:
       return _FakeCursor(self.effect_rows)
@@ -104,6 +107,20 @@ class _ValidateConnNoStop(_ValidateConn):
     return super().execute(query, params)
 
 
+class _RecordingValidateConn(_ValidateConn):
+  def __init__(self, **kwargs):
+    super().__init__(**kwargs)
+    self.calls = []
+
+  def execute(self, query, params=None):
+    self.calls.append((" ".join(query.split()), params))
+    return super().execute(query, params)
+
+  def commit(self):
+    self.calls.append(("COMMIT", None))
+    super().commit()
+
+
 class _FakeDbCtx:
   def __init__(self, conn):
     self.conn = conn
@@ -119,6 +136,10 @@ class CurseMechanicsTests(unittest.TestCase):
   def setUp(self):
     if crud is None:
       self.skipTest(f"backend app.crud import unavailable: {IMPORT_ERROR}")
+    principal.PRINCIPAL_CACHE.clear()
+
+  def tearDown(self):
+    principal.PRINCIPAL_CACHE.clear()
 
   def test_use_item_vowel_voodoo_stores_two_vowels_payload(self):
     item = {
@@ -250,6 +271,7 @@ class CurseMechanicsTests(unittest.TestCase):
       json.dumps({}),
       2,
       0,
+      None,
     )
     conn = _ValidateConn(effect_rows=effect_rows, guess_state=guess_state)
     with (
@@ -272,6 +294,7 @@ class CurseMechanicsTests(unittest.TestCase):
       json.dumps({}),
       2,
       0,
+      None,
     )
     conn = _ValidateConn(effect_rows=effect_rows, guess_state=guess_state)
     with (
@@ -306,10 +329,30 @@ class CurseMechanicsTests(unittest.TestCase):
     mock_penalty.assert_called_once_with(conn, 1, 2, 2, 5)
     self.assertTrue(conn.committed)
 
+  def test_infernal_penalty_for_invalid_word_invalidates_the_leaderboard_before_committing(self):
+    effect_rows = [
+      ("infernal_mandate", json.dumps({"effective_on": "2026-03-01"})),
+    ]
+    conn = _RecordingValidateConn(effect_rows=effect_rows)
+    with (
+      patch.object(crud, "get_db", return_value=_FakeDbCtx(conn)),
+      patch.object(crud, "resolve_campaign_day", return_value=(None, 7, 2, 2, date(2026, 3, 1))),
+      patch.object(crud, "is_admin_campaign", return_value=False),
+    ):
+      with self.assertRaises(HTTPException):
+        crud.validate_guess("zzzzz", user_id=1, campaign_id=2)
+
+    queries = [query for query, _ in conn.calls]
+    score_update = next(i for i, query in enumerate(queries) if query.startswith("UPDATE campaign_members SET score"))
+    notify = next(i for i, query in enumerate(queries) if "pg_notify" in query)
+    self.assertLess(score_update, notify)
+    self.assertLess(notify, queries.index("COMMIT"))
+    self.assertIn('"namespace": "leaderboard"', conn.calls[notify][1][1])
+
   def test_validate_guess_infernal_hard_mode_violation_calls_penalty(self):
     guesses = [["c", "", "", "", ""], ["", "", "", "", ""], ["", "", "", "", ""], ["", "", "", "", ""], ["", "", "", "", ""], ["", "", "", "", ""]]
     results = [["present", None, None, None, None], None, None, None, None, None]
-    guess_state = (json.dumps(guesses), json.dumps(results), json.dumps({}), 1, 0)
+    guess_state = (json.dumps(guesses), json.dumps(results), json.dumps({}), 1, 0, None)
     effect_rows = [
       ("infernal_mandate", json.dumps({"effective_on": "2026-03-01"})),
     ]
@@ -329,7 +372,7 @@ class CurseMechanicsTests(unittest.TestCase):
   def test_validate_guess_returns_infernal_penalty_for_hard_mode_violation(self):
     guesses = [["c", "", "", "", ""], ["", "", "", "", ""], ["", "", "", "", ""], ["", "", "", "", ""], ["", "", "", "", ""], ["", "", "", "", ""]]
     results = [["present", None, None, None, None], None, None, None, None, None]
-    guess_state = (json.dumps(guesses), json.dumps(results), json.dumps({}), 1, 0)
+    guess_state = (json.dumps(guesses), json.dumps(results), json.dumps({}), 1, 0, None)
     effect_rows = [
       ("infernal_mandate", json.dumps({"effective_on": "2026-03-01"})),
     ]
@@ -338,7 +381,7 @@ class CurseMechanicsTests(unittest.TestCase):
       patch.object(crud, "get_db", return_value=_FakeDbCtx(conn)),
       patch.object(crud, "resolve_campaign_day", return_value=(None, 7, 2, 2, date(2026, 3, 1))),
       patch.object(crud, "is_admin_campaign", return_value=False),
-      patch.object(crud, "VALID_WORDS", set(crud.VALID_WORDS) | {"arise"}),
+      patch.object(crud, "load_valid_words", return_value=crud.load_valid_words() | {"arise"}),
     ):
       response = crud.validate_guess("arise", user_id=1, campaign_id=2)
 
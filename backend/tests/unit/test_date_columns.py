@@ -0,0 +1,98 @@
+import os
+import sys
+import unittest
+from datetime import date, datetime
+
+
+BACKEND_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if BACKEND_ROOT not in sys.path:
+  sys.path.insert(0, BACKEND_ROOT)
+
+try:
+  from app import dates  # noqa: E402
+except Exception as exc:  # pragma: no cover
+  dates = None
+  IMPORT_ERROR = exc
+else:
+  IMPORT_ERROR = None
+
+
+class _FakeCursor:
+  def __init__(self, rows):
+    self._rows = rows
+
+  def fetchone(self):
+    return self._rows[0]
+
+  def fetchall(self):
+    return self._rows
+
+
+class _FakeConn:
+  def __init__(self, text_columns, malformed=()):
+    self.text_columns = text_columns
+    self.malformed = set(malformed)
+    self.queries = []
+
+  def execute(self, query, params=None):
+    normalized = " ".join(query.split())
+    self.queries.append(normalized)
+    if "information_schema.columns" in normalized:
+      return _FakeCursor([(column,) for column in self.text_columns.get(params[0], [])])
+    if normalized.startswith("SELECT COUNT(*)"):
+      table, column = normalized.split("FROM ")[1].split(" WHERE ")[0], normalized.split("WHERE ")[1].split(" ")[0]
+      return _FakeCursor([(3 if (table, column) in self.malformed else 0,)])
+    return _FakeCursor([])
+
+
+class DateColumnTests(unittest.TestCase):
+  def setUp(self):
+    if dates is None:
+      self.skipTest(f"backend app.dates import unavailable: {IMPORT_ERROR}")
+
+  def test_values_from_either_column_type_normalize(self):
+    self.assertEqual(dates.as_date("2026-03-01"), date(2026, 3, 1))
+    self.assertEqual(dates.as_date(date(2026, 3, 1)), date(2026, 3, 1))
+    self.assertEqual(dates.as_date(datetime(2026, 3, 1, 23, 59)), date(2026, 3, 1))
+    self.assertIsNone(dates.as_date(None))
+    self.assertEqual(dates.iso_date(date(2026, 3, 1)), "2026-03-01")
+    self.assertEqual(dates.iso_date("2026-03-01"), "2026-03-01")
+    self.assertIsNone(dates.iso_date(None))
+
+  def test_migration_converts_text_columns(self):
+    conn = _FakeConn(text_columns={"campaigns": ["start_date"], "campaign_shop_daily_spend": ["shop_date"]})
+
+    with self.assertLogs("app.dates", level="INFO"):
+      dates.migrate_date_columns(conn)
+
+    self.assertIn("pg_advisory_xact_lock", conn.queries[0])
+    checks = [q for q in conn.queries if q.startswith("SELECT COUNT(*)")]
+    self.assertIn("pg_temp.try_date(start_date) IS NULL", checks[0])
+    alters = [q for q in conn.queries if q.startswith("ALTER TABLE")]
+    self.assertEqual(alters, [
+      "ALTER TABLE campaigns ALTER COLUMN start_date TYPE DATE USING start_date::date",
+      "ALTER TABLE campaign_shop_daily_spend ALTER COLUMN shop_date TYPE DATE USING shop_date::date",
+    ])
+
+  def test_malformed_values_fail_before_any_column_is_altered(self):
+    conn = _FakeConn(
+      text_columns={"campaigns": ["start_date"], "global_daily_stats": ["date"]},
+      malformed=[("global_daily_stats", "date")],
+    )
+
+    with self.assertRaises(RuntimeError) as ctx:
+      dates.migrate_date_columns(conn)
+
+    self.assertIn("global_daily_stats.date (3 rows)", str(ctx.exception))
+    self.assertFalse([q for q in conn.queries if q.startswith(("ALTER", "ANALYZE"))])
+
+  def test_migration_is_a_no_op_once_columns_are_dates(self):
+    conn = _FakeConn(text_columns={})
+
+    dates.migrate_date_columns(conn)
+
+    self.assertFalse([q for q in conn.queries if q.startswith(("ALTER", "ANALYZE"))])
+
+
+if __name__ == "__main__":
+  unittest.main()
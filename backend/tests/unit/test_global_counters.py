@@ -0,0 +1,76 @@
+import os
+import sys
+import unittest
+
+
+BACKEND_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if BACKEND_ROOT not in sys.path:
+  sys.path.insert(0, BACKEND_ROOT)
+
+try:
+  from app import counters  # noqa: E402
+  from app.accolades import service as accolades  # noqa: E402
+except Exception as exc:  # pragma: no cover
+  counters = None
+  accolades = None
+  IMPORT_ERROR = exc
+else:
+  IMPORT_ERROR = None
+
+
+class _FakeCursor:
+  def __init__(self, row=None, rowcount=1):
+    self._row = row
+    self.rowcount = rowcount
+
+  def fetchone(self):
+    return self._row
+
+
+class _FakeConn:
+  def __init__(self):
+    self.queries = []
+
+  def execute(self, query, params=None):
+    normalized = " ".join(query.split())
+    self.queries.append((normalized, params))
+    if normalized.startswith("WITH moved AS"):
+      return _FakeCursor((2,))
+    return _FakeCursor()
+
+
+class GlobalCounterTests(unittest.TestCase):
+  def setUp(self):
+    if counters is None:
+      self.skipTest(f"backend app.counters import unavailable: {IMPORT_ERROR}")
+
+  def test_award_appends_delta_instead_of_locking_global_row(self):
+    conn = _FakeConn()
+
+    self.assertTrue(accolades.award_accolade(conn, 7, 3, "ace", "2026-03-01"))
+
+    statements = [query for query, _ in conn.queries]
+    self.assertFalse(any("INTO global_accolade_stats " in query for query in statements))
+    self.assertIn(("ace",), [params for query, params in conn.queries if "global_accolade_stat_deltas" in query])
+
+  def test_record_helpers_store_one_row_per_event(self):
+    conn = _FakeConn()
+
+    counters.record_word_result(conn, "crane", False, "2026-03-01")
+    counters.record_item_use(conn, "oracle_whisper", True)
+
+    self.assertEqual([params for _, params in conn.queries], [("crane", 0, "2026-03-01"), ("oracle_whisper", 1)])
+
+  def test_flush_folds_every_delta_table(self):
+    conn = _FakeConn()
+
+    folded = counters.flush_global_counters(conn)
+
+    self.assertEqual(folded, {"word_stats": 2, "item_stats": 2, "accolade_stats": 2})
+    for query, _ in conn.queries:
+      self.assertIn("DELETE FROM global_", query)
+      self.assertIn("ON CONFLICT", query)
+
+
+if __name__ == "__main__":
+  unittest.main()
@@ -0,0 +1,120 @@
+import os
+import sys
+import unittest
+from unittest.mock import patch
+
+
+BACKEND_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if BACKEND_ROOT not in sys.path:
+  sys.path.insert(0, BACKEND_ROOT)
+
+try:
+  from app import crud  # noqa: E402
+except Exception as exc:  # pragma: no cover
+  crud = None
+  IMPORT_ERROR = exc
+else:
+  IMPORT_ERROR = None
+
+
+class _FakeCursor:
+  def __init__(self, rows):
+    self._rows = rows
+
+  def fetchone(self):
+    return self._rows[0] if self._rows else None
+
+  def fetchall(self):
+    return self._rows
+
+
+class _FakeConn:
+  def __init__(self, rows=None, bucket_sum=0):
+    self.calls = []
+    self.rows = rows or []
+    self.bucket_sum = bucket_sum
+
+  def execute(self, query, params=None):
+    self.calls.append((" ".join(query.split()), params))
+    normalized_query = self.calls[-1][0]
+    if "FROM global_high_score_buckets" in normalized_query:
+      return _FakeCursor([(self.bucket_sum,)])
+    if "FROM global_high_scores" in normalized_query:
+      return _FakeCursor(self.rows)
+    return _FakeCursor([])
+
+
+class _FakeDbCtx:
+  def __init__(self, conn):
+    self.conn = conn
+
+  def __enter__(self):
+    return self.conn
+
+  def __exit__(self, exc_type, exc, tb):
+    return False
+
+
+def _row(troops, ended_on, score_id, length=7):
+  return ("Ada Lovelace", "Realm", troops, ended_on, length, score_id)
+
+
+class GlobalLeaderboardTests(unittest.TestCase):
+  def setUp(self):
+    if crud is None:
+      self.skipTest(f"backend app.crud import unavailable: {IMPORT_ERROR}")
+
+  def test_page_returns_keyset_cursor_when_more_rows_exist(self):
+    conn = _FakeConn(rows=[_row(150, "2026-01-03", 11), _row(140, "2026-01-02", 10), _row(130, "2026-01-01", 9)])
+    with patch.object(crud, "get_db", return_value=_FakeDbCtx(conn)):
+      page = crud.get_global_leaderboard_page(limit=2, campaign_length=7)
+
+    self.assertEqual([entry["best_troops"] for entry in page["entries"]], [150, 140])
+    self.assertEqual(page["next_cursor"], "140:2026-01-02:10")
+    query, params = conn.calls[0]
+    self.assertIn("campaign_length = %s", query)
+    self.assertEqual(params, (7, 3))
+
+  def test_page_continues_after_cursor(self):
+    conn = _FakeConn(rows=[_row(130, "2026-01-01", 9)])
+    with patch.object(crud, "get_db", return_value=_FakeDbCtx(conn)):
+      page = crud.get_global_leaderboard_page(limit=2, cursor="140:2026-01-02:10")
+
+    self.assertIsNone(page["next_cursor"])
+    query, params = conn.calls[0]
+    self.assertIn("(troops, ended_on, id) < (%s, %s, %s)", query)
+    self.assertEqual(params, (140, "2026-01-02", 10, 3))
+
+  def test_invalid_cursor_is_rejected(self):
+    with self.assertRaises(Exception) as ctx:
+      crud.get_global_leaderboard_page(cursor="garbage")
+
+    self.assertEqual(getattr(ctx.exception, "status_code", None), 400)
+
+  def test_leaderboard_no_longer_runs_ddl_or_seeding(self):
+    conn = _FakeConn(rows=[])
+    with patch.object(crud, "get_db", return_value=_FakeDbCtx(conn)):
+      self.assertEqual(crud.get_global_leaderboard(10), [])
+
+    self.assertEqual(len(conn.calls), 1)
+    self.assertTrue(conn.calls[0][0].startswith("SELECT"))
+
+  def test_personal_best_includes_rank_from_buckets(self):
+    conn = _FakeConn(rows=[_row(140, "2026-01-02", 10, length=5)], bucket_sum=4)
+    with patch.object(crud, "get_db", return_value=_FakeDbCtx(conn)):
+      result = crud.get_global_personal_best(user_id=3, campaign_length=5)
+
+    self.assertEqual(result["best"]["best_troops"], 140)
+    self.assertEqual(result["rank"], 5)
+    self.assertEqual(conn.calls[-1][1], (5, 140))
+
+  def test_record_high_score_bumps_all_and_length_buckets(self):
+    conn = _FakeConn()
+    crud._record_global_high_score(conn, 3, 9, "Ada", "Realm", 120, "2026-01-02", 7)
+
+    bucket_params = [params for query, params in conn.calls if "INSERT INTO global_high_score_buckets" in query]
+    self.assertEqual(bucket_params, [(0, 120), (7, 120)])
+
+
+if __name__ == "__main__":
+  unittest.main()
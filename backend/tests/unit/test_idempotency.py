@@ -0,0 +1,190 @@
+import json
+import os
+import sys
+import unittest
+from unittest.mock import patch
+
+
+BACKEND_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if BACKEND_ROOT not in sys.path:
+  sys.path.insert(0, BACKEND_ROOT)
+
+try:
+  from fastapi import HTTPException, Response
+  from app import idempotency  # noqa: E402
+except Exception as exc:  # pragma: no cover
+  idempotency = None
+  IMPORT_ERROR = exc
+else:
+  IMPORT_ERROR = None
+
+
+class _FakeCursor:
+  def __init__(self, row=None):
+    self._row = row
+
+  def fetchone(self):
+    return self._row
+
+
+class _FakeConn:
+  """idempotency_keys as a dict; the context manager drops writes when the block raises."""
+
+  def __init__(self, store, open_conns):
+    self.store = store
+    self.pending = dict(store)
+    self.open_conns = open_conns
+    self.queries = []
+
+  def execute(self, query, params=None):
+    normalized = " ".join(query.split())
+    self.queries.append(normalized)
+    if normalized.startswith("INSERT INTO idempotency_keys"):
+      user_id, key, endpoint, request_hash = params[:4]
+      if (user_id, key) in self.pending:
+        return _FakeCursor()
+      self.pending[(user_id, key)] = (endpoint, request_hash, None, None)
+      return _FakeCursor((1,))
+    if normalized.startswith("SELECT endpoint, request_hash"):
+      return _FakeCursor(self.pending.get((params[0], params[1])))
+    if normalized.startswith("UPDATE idempotency_keys"):
+      response, user_id, key = params
+      endpoint, request_hash, _, _ = self.pending[(user_id, key)]
+      self.pending[(user_id, key)] = (endpoint, request_hash, 200, json.loads(response))
+    if normalized.startswith("DELETE FROM idempotency_keys"):
+      self.pending.pop((params[0], params[1]), None)
+    return _FakeCursor()
+
+  def __enter__(self):
+    self.open_conns.append(self)
+    return self
+
+  def __exit__(self, exc_type, exc, tb):
+    self.open_conns.remove(self)
+    if exc_type is None:
+      self.store.clear()
+      self.store.update(self.pending)
+    return False
+
+
+class IdempotencyTests(unittest.TestCase):
+  def setUp(self):
+    if idempotency is None:
+      self.skipTest(f"backend app.idempotency import unavailable: {IMPORT_ERROR}")
+    self.store = {}
+    self.conns = []
+    self.open_conns = []
+
+    def _get_db():
+      conn = _FakeConn(self.store, self.open_conns)
+      self.conns.append(conn)
+      return conn
+
+    patcher = patch.object(idempotency, "get_db", side_effect=_get_db)
+    patcher.start()
+    self.addCleanup(patcher.stop)
+
+  def _run(self, handler, key="retry-1", request=None, endpoint="shop_purchase", response=None):
+    return idempotency.run_idempotent(7, key, endpoint, request or {"campaign_id": 3, "item_key": "shield"}, handler, response)
+
+  def test_retry_replays_the_stored_response_without_running_the_handler(self):
+    calls = []
+
+    def _purchase():
+      calls.append(dict(self.store))
+      self.assertEqual(self.open_conns, [])
+      return {"coins": 12}
+
+    self.assertEqual(self._run(_purchase), {"coins": 12})
+    response = Response()
+    self.assertEqual(self._run(_purchase, response=response), {"coins": 12})
+
+    self.assertEqual(len(calls), 1)
+    self.assertEqual(calls[0][(7, "retry-1")][2], None)
+    self.assertEqual(self.store[(7, "retry-1")][2:], (200, {"body": {"coins": 12}}))
+    self.assertEqual(response.headers[idempotency.REPLAY_HEADER], "true")
+
+  def _in_flight(self, key="retry-1", request=None):
+    request_hash = idempotency._fingerprint(request or {"campaign_id": 3, "item_key": "shield"})
+    self.store[(7, key)] = ("shop_purchase", request_hash, None, None)
+
+  def test_a_duplicate_waits_for_the_first_result_and_replays_it(self):
+    self._in_flight()
+    sleeps = []
+
+    def _first_finishes(seconds):
+      sleeps.append(seconds)
+      if len(sleeps) == 2:
+        self.store[(7, "retry-1")] = self.store[(7, "retry-1")][:2] + (200, {"body": {"coins": 12}})
+
+    response = Response()
+    with patch.object(idempotency.time, "sleep", side_effect=_first_finishes):
+      result = self._run(lambda: self.fail("the duplicate must not run the handler"), response=response)
+
+    self.assertEqual(result, {"coins": 12})
+    self.assertEqual(sleeps, [idempotency.IDEMPOTENCY_POLL_SECONDS] * 2)
+    self.assertEqual(response.headers[idempotency.REPLAY_HEADER], "true")
+
+  def test_a_duplicate_runs_the_handler_when_the_first_releases_the_key(self):
+    self._in_flight()
+
+    with patch.object(idempotency.time, "sleep", side_effect=lambda _: self.store.clear()):
+      self.assertEqual(self._run(lambda: {"coins": 5}), {"coins": 5})
+
+    self.assertEqual(self.store[(7, "retry-1")][2], 200)
+
+  def test_a_duplicate_gets_a_409_once_the_wait_runs_out(self):
+    self._in_flight()
+
+    with (
+      patch.object(idempotency, "IDEMPOTENCY_WAIT_SECONDS", 0),
+      patch.object(idempotency.time, "sleep") as sleep,
+    ):
+      with self.assertRaises(HTTPException) as ctx:
+        self._run(lambda: self.fail("the duplicate must not run the handler"))
+
+    self.assertEqual(ctx.exception.status_code, 409)
+    self.assertIn("Retry-After", ctx.exception.headers)
+    sleep.assert_not_called()
+
+  def test_errors_release_the_key_so_a_retry_runs_again(self):
+    calls = []
+
+    def _broke():
+      calls.append(1)
+      raise HTTPException(status_code=400, detail={"message": "Not enough coins"})
+
+    def _down():
+      raise HTTPException(status_code=503, detail="try later")
+
+    for _ in range(2):
+      with self.assertRaises(HTTPException) as ctx:
+        self._run(_broke)
+      self.assertEqual(ctx.exception.detail, {"message": "Not enough coins"})
+    with self.assertRaises(HTTPException):
+      self._run(_down, key="retry-2")
+    with self.assertRaises(RuntimeError):
+      self._run(lambda: (_ for _ in ()).throw(RuntimeError("boom")), key="retry-3")
+
+    self.assertEqual(calls, [1, 1])
+    self.assertEqual(self.store, {})
+
+  def test_reusing_a_key_for_another_request_is_rejected(self):
+    self._run(lambda: {"ok": True})
+
+    with self.assertRaises(HTTPException) as ctx:
+      self._run(lambda: {"ok": True}, request={"campaign_id": 3, "item_key": "oracle"})
+    self.assertEqual(ctx.exception.status_code, 422)
+    with self.assertRaises(HTTPException):
+      self._run(lambda: {"ok": True}, endpoint="item_use")
+
+  def test_requests_without_a_key_skip_the_table(self):
+    self.assertEqual(self._run(lambda: {"ok": True}, key=None), {"ok": True})
+    self.assertEqual(self.conns, [])
+    with self.assertRaises(HTTPException) as ctx:
+      self._run(lambda: {"ok": True}, key="x" * 300)
+    self.assertEqual(ctx.exception.status_code, 400)
+
+
+if __name__ == "__main__":
+  unittest.main()
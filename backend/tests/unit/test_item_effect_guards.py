@@ -33,8 +33,9 @@ class _FakeCursor:
 
 
 class _FakeConn:
-  def __init__(self, cursed_row=None, curse_event=False, qty=0, score=10, guess_state_row=None, blessing_today=False):
+  def __init__(self, cursed_row=None, curse_event=False, qty=0, score=10, guess_state_row=None, blessing_today=False, uses_before=0):
     self.cursed_row = cursed_row
+    self.uses_before = uses_before
     self.curse_event = curse_event
     self.qty = qty
     self.score = score
@@ -59,8 +60,8 @@ class _FakeConn:
       return _FakeCursor((1,) if self.curse_event else None)
     if "FROM campaign_user_items" in normalized and "SELECT quantity" in normalized:
       return _FakeCursor((self.qty,))
-    if "SELECT COUNT(*)" in normalized and "FROM campaign_item_events" in normalized:
-      return _FakeCursor((0,))
+    if "FROM campaign_item_use_totals" in normalized:
+      return _FakeCursor((self.uses_before + 1,))
     return _FakeCursor(None)
 
 
@@ -334,6 +335,29 @@ class ItemEffectGuardTests(unittest.TestCase):
     self.assertEqual(result["blessing_troop_cost_applied"], 0)
     self.assertFalse(result["candle_consumed"])
 
+  def test_item_master_reads_the_lifetime_total_not_the_archivable_events(self):
+    dispel = {
+      "key": "dispel_curse",
+      "name": "Dispel Curse",
+      "category": "blessing",
+      "affects_others": False,
+      "requires_target": False,
+    }
+    conn = _FakeConn(qty=1, score=0, uses_before=crud.ITEM_MASTER_THRESHOLD - 1)
+    with (
+      patch.object(crud, "get_item", return_value=dispel),
+      patch.object(crud, "get_db", return_value=_FakeDbCtx(conn)),
+      patch.object(crud, "resolve_campaign_day", return_value=(None, 7, 2, 2, date(2026, 3, 1))),
+      patch.object(crud, "is_admin_campaign", return_value=False),
+      patch.object(crud, "_has_active_curse_effect_today", return_value=True),
+      patch.object(crud, "_is_curse_lock_dispersed_for_day", return_value=False),
+      patch.object(crud, "award_accolade") as mock_award,
+    ):
+      crud.use_item(user_id=10, campaign_id=20, item_key="dispel_curse", target_user_id=None, effect_payload=None)
+
+    self.assertIn("item_master", [call.args[3] for call in mock_award.call_args_list])
+    self.assertFalse(any("COUNT(*)" in q and "campaign_item_events" in q for q, _ in conn.queries))
+
   def test_get_active_target_effects_returns_curse_dispersed_flag(self):
     effect_rows = [
       ("vowel_voodoo", json.dumps({"payload": {"type": "vowels", "value": "ae"}})),
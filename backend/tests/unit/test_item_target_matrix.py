@@ -0,0 +1,108 @@
+import os
+import sys
+import unittest
+from datetime import datetime
+from unittest.mock import patch
+
+
+BACKEND_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if BACKEND_ROOT not in sys.path:
+  sys.path.insert(0, BACKEND_ROOT)
+
+try:
+  from app import crud, principal  # noqa: E402
+except Exception as exc:  # pragma: no cover
+  crud = None
+  IMPORT_ERROR = exc
+else:
+  IMPORT_ERROR = None
+
+
+class _FakeCursor:
+  def __init__(self, rows):
+    self._rows = rows
+
+  def fetchone(self):
+    return self._rows[0] if self._rows else None
+
+  def fetchall(self):
+    return self._rows
+
+
+class _FakeConn:
+  def __init__(self, inventory=(), events=()):
+    self.inventory = list(inventory)
+    self.events = list(events)
+    self.calls = []
+
+  def execute(self, query, params=None):
+    normalized = " ".join(query.split())
+    self.calls.append((normalized, params))
+    if "FROM users u" in normalized:
+      return _FakeCursor([(False, [9])])
+    if "FROM campaign_user_items" in normalized:
+      return _FakeCursor([(key,) for key in self.inventory])
+    if "FROM campaign_item_events" in normalized:
+      return _FakeCursor(self.events)
+    return _FakeCursor([])
+
+
+class _FakeDbCtx:
+  def __init__(self, conn):
+    self.conn = conn
+
+  def __enter__(self):
+    return self.conn
+
+  def __exit__(self, exc_type, exc, tb):
+    return False
+
+
+class ItemTargetMatrixTests(unittest.TestCase):
+  def setUp(self):
+    if crud is None:
+      self.skipTest(f"backend app.crud import unavailable: {IMPORT_ERROR}")
+    principal.PRINCIPAL_CACHE.clear()
+
+  def tearDown(self):
+    principal.PRINCIPAL_CACHE.clear()
+
+  def _matrix(self, conn, item_keys=None):
+    with (
+      patch.object(crud, "get_db", return_value=_FakeDbCtx(conn)),
+      patch.object(crud, "resolve_campaign_day", return_value=(None, None, 3, 3, datetime(2026, 1, 5))),
+    ):
+      return crud.get_item_target_matrix(9, 1, item_keys)
+
+  def test_one_event_scan_serves_every_item_in_the_inventory(self):
+    conn = _FakeConn(
+      inventory=["hex_of_compulsion", "oracle_whisper", "spider_swarm"],
+      events=[(2, "cone_of_cold"), (3, "vowel_voodoo"), (4, "time_stop"), (1, "spider_swarm")],
+    )
+
+    matrix = self._matrix(conn)
+
+    self.assertEqual(matrix, {
+      "effective_on": "2026-01-06",
+      "items": {"hex_of_compulsion": [2, 3, 4], "spider_swarm": [2, 3]},
+    })
+    self.assertEqual(sum("FROM campaign_item_events" in query for query, _ in conn.calls), 1)
+
+  def test_explicit_keys_are_canonicalised_and_unknown_keys_rejected(self):
+    legacy_key = next(iter(crud.LEGACY_ITEM_KEY_ALIASES))
+    matrix = self._matrix(_FakeConn(), [legacy_key, crud.LEGACY_ITEM_KEY_ALIASES[legacy_key]])
+    self.assertEqual(list(matrix["items"]), [crud.LEGACY_ITEM_KEY_ALIASES[legacy_key]])
+
+    with self.assertRaises(Exception) as ctx:
+      self._matrix(_FakeConn(), ["no_such_item"])
+    self.assertEqual(getattr(ctx.exception, "status_code", None), 404)
+
+  def test_blocked_by_sets_follow_the_catalog(self):
+    self.assertIsNone(crud.ITEM_BLOCKED_BY["hex_of_compulsion"])
+    self.assertIn("cone_of_cold", crud.ITEM_BLOCKED_BY["spider_swarm"])
+    self.assertTrue(crud.EXCLUSIVE_ALL_KEYS <= crud.ITEM_BLOCKED_BY["time_stop"])
+    self.assertNotIn("spider_swarm", crud.ITEM_BLOCKED_BY["time_stop"])
+
+
+if __name__ == "__main__":
+  unittest.main()
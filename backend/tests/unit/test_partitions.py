@@ -0,0 +1,331 @@
+import gzip
+import os
+import sys
+import tempfile
+import unittest
+from datetime import date
+from unittest.mock import patch
+
+
+BACKEND_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if BACKEND_ROOT not in sys.path:
+  sys.path.insert(0, BACKEND_ROOT)
+
+try:
+  from app import partitions  # noqa: E402
+  from app.private import service  # noqa: E402
+except Exception as exc:  # pragma: no cover
+  partitions = None
+  service = None
+  IMPORT_ERROR = exc
+else:
+  IMPORT_ERROR = None
+
+
+class _FakeCursor:
+  def __init__(self, rows):
+    self._rows = rows
+    self.rowcount = len(rows)
+
+  def fetchone(self):
+    return self._rows[0] if self._rows else None
+
+  def fetchall(self):
+    return self._rows
+
+  def copy(self, query):
+    return _FakeCopy(self._rows)
+
+  def __enter__(self):
+    return self
+
+  def __exit__(self, exc_type, exc, tb):
+    return False
+
+
+class _FakeCopy:
+  def __init__(self, rows):
+    self._rows = rows
+
+  def __enter__(self):
+    return iter([b"id,user_id,campaign_id\n"] + [f"{row[0]},{row[1]},{row[2]}\n".encode() for row in self._rows])
+
+  def __exit__(self, exc_type, exc, tb):
+    return False
+
+
+class _FakeConn:
+  def __init__(self, children=None, copy_rows=None, relkinds=None, stranded=False):
+    self.calls = []
+    self.children = children or []
+    self.copy_rows = copy_rows or []
+    self.relkinds = relkinds if relkinds is not None else {table: "p" for table in partitions.PARTITIONED_TABLES}
+    self.stranded = stranded
+
+  def execute(self, query, params=None):
+    self.calls.append((" ".join(query.split()), params))
+    normalized_query = self.calls[-1][0]
+    if "SELECT relkind" in normalized_query:
+      relkind = self.relkinds.get(params[0])
+      return _FakeCursor([(relkind,)] if relkind else [])
+    if normalized_query.startswith("SELECT 1 FROM") and "_default WHERE" in normalized_query:
+      return _FakeCursor([(1,)] if self.stranded else [])
+    if "FROM pg_inherits" in normalized_query:
+      return _FakeCursor([(name,) for name in self.children if name.startswith(params[0])])
+    return _FakeCursor([])
+
+  def cursor(self):
+    return _FakeCursor(self.copy_rows)
+
+
+class _MigrationConn:
+  """Catalog answers for one unpartitioned table plus scripted copy batches."""
+
+  def __init__(self, relkinds, nonempty=(), last_copied=None, batches=(), primary_key=("id",)):
+    self.calls = []
+    self.primary_key = list(primary_key)
+    self.commits = 0
+    self.relkinds = relkinds
+    self.nonempty = set(nonempty)
+    self.last_copied = last_copied
+    self.batches = list(batches)
+
+  def execute(self, query, params=None):
+    normalized = " ".join(query.split())
+    self.calls.append((normalized, params))
+    if "SELECT relkind" in normalized:
+      relkind = self.relkinds.get(params[0])
+      return _FakeCursor([(relkind,)] if relkind else [])
+    if "pg_try_advisory_lock" in normalized:
+      return _FakeCursor([(True,)])
+    if "i.indisprimary ORDER BY" in normalized:
+      return _FakeCursor([(column,) for column in self.primary_key])
+    if "pg_get_indexdef" in normalized:
+      return _FakeCursor([(f"CREATE INDEX idx_{params[0]}_user ON public.{params[0]} USING btree (user_id)",)])
+    if "pg_get_serial_sequence" in normalized:
+      return _FakeCursor([("id", f"public.{params[0]}_id_seq")])
+    if normalized.startswith("SELECT MIN("):
+      return _FakeCursor([(date(2026, 9, 3), date(2026, 10, 2))])
+    if normalized.endswith("LIMIT 1") and normalized.startswith("SELECT 1 FROM"):
+      return _FakeCursor([(1,)] if normalized.split()[3] in self.nonempty else [])
+    if normalized.startswith("SELECT id FROM") and "_partitioned ORDER BY id DESC" in normalized:
+      return _FakeCursor([self.last_copied] if self.last_copied else [])
+    if normalized.startswith("WITH batch AS"):
+      return _FakeCursor([self.batches.pop(0)] if self.batches else [])
+    return _FakeCursor([])
+
+  def commit(self):
+    self.commits += 1
+    self.calls.append(("COMMIT", None))
+
+  def rollback(self):
+    pass
+
+
+class _FakeDbCtx:
+  def __init__(self, conn):
+    self.conn = conn
+
+  def __enter__(self):
+    return self.conn
+
+  def __exit__(self, exc_type, exc, tb):
+    return False
+
+
+class PartitionMaintenanceTests(unittest.TestCase):
+  def setUp(self):
+    if partitions is None:
+      self.skipTest(f"backend app.partitions import unavailable: {IMPORT_ERROR}")
+
+  def test_month_arithmetic_crosses_years(self):
+    self.assertEqual(partitions.add_months(date(2026, 11, 1), 3), date(2027, 2, 1))
+    self.assertEqual(partitions.add_months(date(2026, 1, 1), -1), date(2025, 12, 1))
+    self.assertEqual(partitions.partition_name("store_purchases", date(2026, 3, 1)), "store_purchases_p202603")
+
+  def test_future_partitions_are_created_ahead(self):
+    conn = _FakeConn()
+    partitions.ensure_future_partitions(conn, date(2026, 12, 15), months_ahead=1)
+
+    created = [query for query, _ in conn.calls if query.startswith("CREATE TABLE IF NOT EXISTS campaign_guesses_")]
+    self.assertEqual(len(created), 2)
+    self.assertIn("FOR VALUES FROM ('2026-12-01') TO ('2027-01-01')", created[0])
+    self.assertIn("campaign_guesses_p202701", created[1])
+
+  def test_existing_month_partition_is_left_alone(self):
+    conn = _FakeConn(relkinds={"campaign_guesses": "p", "campaign_guesses_p202611": "r"})
+    partitions.create_month_partition(conn, "campaign_guesses", date(2026, 11, 1))
+
+    self.assertFalse([query for query, _ in conn.calls if not query.startswith("SELECT relkind")])
+
+  def test_rows_stranded_in_default_move_into_the_new_month(self):
+    conn = _FakeConn(relkinds={"store_purchases": "p", "store_purchases_default": "r"}, stranded=True)
+    partitions.create_month_partition(conn, "store_purchases", date(2026, 11, 1))
+
+    queries = [query for query, _ in conn.calls if not query.startswith("SELECT")]
+    self.assertFalse([query for query in queries if "PARTITION OF" in query])
+    self.assertEqual(queries[0], "LOCK TABLE store_purchases IN SHARE ROW EXCLUSIVE MODE")
+    self.assertIn("CREATE TABLE store_purchases_p202611 (LIKE store_purchases", queries[1])
+    self.assertIn("DELETE FROM store_purchases_default WHERE purchased_at >= %s AND purchased_at < %s", queries[2])
+    self.assertIn("INSERT INTO store_purchases_p202611 SELECT * FROM moved", queries[2])
+    self.assertEqual(
+      queries[3],
+      "ALTER TABLE store_purchases ATTACH PARTITION store_purchases_p202611 FOR VALUES FROM ('2026-11-01') TO ('2026-12-01')",
+    )
+    self.assertEqual(conn.calls[-2][1], ("2026-11-01", "2026-12-01"))
+
+  def test_only_months_past_retention_expire(self):
+    conn = _FakeConn(children=[
+      "campaign_item_events_default",
+      "campaign_item_events_p202604",
+      "campaign_item_events_p202605",
+      "campaign_item_events_p202610",
+    ])
+    expired = partitions.expired_partitions(conn, date(2026, 10, 19), retention_months=6)
+
+    self.assertEqual(expired, [("campaign_item_events", "campaign_item_events_p202604", date(2026, 4, 1))])
+
+  def test_archive_writes_file_before_dropping_partition(self):
+    conn = _FakeConn(copy_rows=[(1, 7, 12), (2, 8, 12)])
+    with tempfile.TemporaryDirectory() as archive_dir:
+      archived = partitions.archive_partition(
+        conn, "campaign_shop_log", "campaign_shop_log_p202603", date(2026, 3, 1), archive_dir,
+      )
+      with gzip.open(archived["path"], "rt") as fh:
+        self.assertEqual(fh.read().splitlines(), ["id,user_id,campaign_id", "1,7,12", "2,8,12"])
+
+    self.assertEqual(archived["row_count"], 2)
+    self.assertTrue(archived["path"].endswith(os.path.join("campaign_shop_log", "2026-03.csv.gz")))
+    queries = [query for query, _ in conn.calls]
+    self.assertEqual(queries[0], "ALTER TABLE campaign_shop_log DETACH PARTITION campaign_shop_log_p202603")
+    self.assertEqual(queries[1], "DROP TABLE campaign_shop_log_p202603")
+    self.assertIn("INSERT INTO archived_partitions", queries[2])
+
+
+class PartitionMigrationTests(unittest.TestCase):
+  def setUp(self):
+    if partitions is None:
+      self.skipTest(f"backend app.partitions import unavailable: {IMPORT_ERROR}")
+
+  def test_startup_only_partitions_empty_tables(self):
+    conn = _MigrationConn(
+      relkinds={"campaign_guesses": "r", "campaign_shop_log": "r"},
+      nonempty={"campaign_shop_log"},
+    )
+    with patch("builtins.print"):
+      partitions.migrate_to_partitions(conn, date(2026, 10, 19))
+
+    queries = [query for query, _ in conn.calls]
+    self.assertIn("CREATE TABLE campaign_guesses_partitioned (LIKE campaign_guesses INCLUDING DEFAULTS INCLUDING CONSTRAINTS) PARTITION BY RANGE (date)", queries)
+    self.assertIn("ALTER TABLE campaign_guesses RENAME CONSTRAINT campaign_guesses_partitioned_pkey TO campaign_guesses_pkey", queries)
+    self.assertFalse([query for query in queries if "campaign_shop_log_partitioned" in query or "LOCK TABLE campaign_shop_log" in query])
+    self.assertEqual(conn.commits, 0)
+
+  def test_staging_table_copies_partition_key_indexes_and_months(self):
+    conn = _MigrationConn(relkinds={"campaign_item_events": "r"})
+    partitions._prepare_staging(conn, "campaign_item_events", date(2026, 10, 19))
+
+    queries = [query for query, _ in conn.calls if not query.startswith("SELECT")]
+    self.assertEqual(queries[1], "ALTER TABLE campaign_item_events_partitioned ADD PRIMARY KEY (id, created_at)")
+    self.assertEqual(queries[2], "CREATE TABLE campaign_item_events_default PARTITION OF campaign_item_events_partitioned DEFAULT")
+    months = [query.split()[5] for query in queries if "PARTITION OF campaign_item_events_partitioned FOR VALUES" in query]
+    self.assertEqual(months, [f"campaign_item_events_p2026{month:02d}" for month in (9, 10, 11, 12)])
+    self.assertEqual(
+      queries[-1],
+      "CREATE INDEX IF NOT EXISTS idx_campaign_item_events_user_staged ON campaign_item_events_partitioned USING btree (user_id)",
+    )
+
+  def test_batched_copy_resumes_then_swaps_under_one_lock(self):
+    conn = _MigrationConn(
+      relkinds={
+        "store_purchases": "r",
+        "store_purchases_partitioned": "p",
+        "store_purchases_migration_capture": "r",
+      },
+      last_copied=(10000,),
+      batches=[(20000, 10000), (20500, 500)],
+    )
+    with patch("builtins.print"):
+      partitions.migrate_in_batches(conn, date(2026, 10, 19), batch_size=10000)
+
+    queries = [query for query, _ in conn.calls]
+    self.assertFalse([query for query in queries if query.startswith("CREATE TABLE store_purchases_partitioned")])
+    self.assertFalse([query for query in queries if query.startswith("CREATE TRIGGER")])
+    batches = [(query, params) for query, params in conn.calls if query.startswith("WITH batch AS")]
+    self.assertEqual([params for _, params in batches], [(10000, 10000), (20000, 10000)])
+    self.assertIn("WHERE (id) > (%s) ORDER BY id LIMIT %s", batches[0][0])
+    self.assertIn("INSERT INTO store_purchases_partitioned SELECT * FROM batch ON CONFLICT DO NOTHING", batches[0][0])
+    self.assertEqual(queries[queries.index(batches[0][0]) + 1], "COMMIT")
+
+    swap = [query for query in queries[queries.index("LOCK TABLE store_purchases IN ACCESS EXCLUSIVE MODE"):] if not query.startswith("SELECT")]
+    self.assertEqual(swap[1:10], [
+      "INSERT INTO store_purchases_partitioned SELECT * FROM store_purchases_migration_capture ON CONFLICT DO NOTHING",
+      "DROP TABLE store_purchases_migration_capture",
+      "ALTER SEQUENCE public.store_purchases_id_seq OWNED BY store_purchases_partitioned.id",
+      "DROP TABLE store_purchases",
+      "ALTER TABLE store_purchases_partitioned RENAME TO store_purchases",
+      "ALTER TABLE store_purchases RENAME CONSTRAINT store_purchases_partitioned_pkey TO store_purchases_pkey",
+      "ALTER INDEX idx_store_purchases_user_staged RENAME TO idx_store_purchases_user",
+      "ANALYZE store_purchases",
+      "COMMIT",
+    ])
+    self.assertIn("pg_advisory_unlock", queries[-2])
+
+  def test_capture_trigger_is_committed_before_the_copy_starts(self):
+    conn = _MigrationConn(relkinds={"campaign_shop_log": "r", "campaign_shop_log_partitioned": "p"})
+    with patch("builtins.print"):
+      partitions.migrate_in_batches(conn, date(2026, 10, 19))
+
+    queries = [query for query, _ in conn.calls]
+    trigger = next(query for query in queries if query.startswith("CREATE TRIGGER"))
+    self.assertEqual(
+      trigger,
+      "CREATE TRIGGER campaign_shop_log_migration_capture AFTER INSERT ON campaign_shop_log "
+      "FOR EACH ROW EXECUTE FUNCTION partition_migration_capture('campaign_shop_log_migration_capture')",
+    )
+    self.assertIn("CREATE TABLE campaign_shop_log_migration_capture (LIKE campaign_shop_log)", queries)
+    self.assertEqual(queries[queries.index(trigger) + 1], "COMMIT")
+
+  def test_tables_without_a_primary_key_are_refused(self):
+    conn = _MigrationConn(relkinds={"campaign_guesses": "r"}, primary_key=())
+    with self.assertRaises(RuntimeError) as ctx:
+      partitions.migrate_in_batches(conn, date(2026, 10, 19))
+
+    self.assertIn("campaign_guesses has no primary key", str(ctx.exception))
+    self.assertFalse([query for query, _ in conn.calls if "LOCK TABLE" in query or "CREATE TABLE" in query])
+
+
+class ArchivedExportTests(unittest.TestCase):
+  def setUp(self):
+    if service is None:
+      self.skipTest(f"backend app.private.service import unavailable: {IMPORT_ERROR}")
+
+  def test_archived_month_streams_filtered_rows(self):
+    with tempfile.TemporaryDirectory() as archive_dir:
+      path = os.path.join(archive_dir, "2026-03.csv.gz")
+      with gzip.open(path, "wt", newline="") as fh:
+        fh.write("user_id,campaign_id,word,date\n1,12,crane,2026-03-01\n2,12,,2026-03-01\n1,13,slate,2026-03-02\n")
+
+      class _ArchiveConn:
+        def execute(self, query, params=None):
+          return _FakeCursor([(path,)])
+
+      with patch.object(service, "get_db", return_value=_FakeDbCtx(_ArchiveConn())):
+        media_type, chunks = service.export_archived_dataset("guesses", "2026-03", "ndjson", 12, None)
+        body = "".join(chunks)
+
+    self.assertEqual(media_type, "application/x-ndjson")
+    self.assertEqual(body.splitlines(), [
+      '{"user_id": "1", "campaign_id": "12", "word": "crane", "date": "2026-03-01"}',
+      '{"user_id": "2", "campaign_id": "12", "word": null, "date": "2026-03-01"}',
+    ])
+
+  def test_unknown_archive_dataset_is_404(self):
+    with self.assertRaises(Exception) as ctx:
+      service.export_archived_dataset("guess_states", "2026-03", "csv", None, None)
+
+    self.assertEqual(getattr(ctx.exception, "status_code", None), 404)
+
+
+if __name__ == "__main__":
+  unittest.main()
@@ -0,0 +1,200 @@
+import asyncio
+import os
+import sys
+import threading
+import unittest
+from unittest.mock import patch
+
+
+BACKEND_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if BACKEND_ROOT not in sys.path:
+  sys.path.insert(0, BACKEND_ROOT)
+
+try:
+  import bcrypt  # noqa: E402
+  from app import crud, passwords  # noqa: E402
+except Exception as exc:  # pragma: no cover
+  crud = None
+  passwords = None
+  IMPORT_ERROR = exc
+else:
+  IMPORT_ERROR = None
+
+
+class _FakeCursor:
+  def __init__(self, row):
+    self._row = row
+
+  def fetchone(self):
+    return self._row
+
+
+class _FakeConn:
+  def __init__(self, stored_hash):
+    self.calls = []
+    self.stored_hash = stored_hash
+
+  def execute(self, query, params=None):
+    self.calls.append((query, params))
+    normalized_query = " ".join(query.split())
+    if normalized_query.startswith("SELECT id, first_name, password"):
+      return _FakeCursor((5, "Ada", self.stored_hash, False))
+    return _FakeCursor(None)
+
+
+class _FakeDbCtx:
+  def __init__(self, conn):
+    self.conn = conn
+
+  def __enter__(self):
+    return self.conn
+
+  def __exit__(self, exc_type, exc, tb):
+    return False
+
+
+class PasswordHashingTests(unittest.TestCase):
+  def setUp(self):
+    if passwords is None:
+      self.skipTest(f"backend password helpers unavailable: {IMPORT_ERROR}")
+
+  def test_hash_and_verify_round_trip(self):
+    with patch.object(passwords, "BCRYPT_ROUNDS", 4):
+      hashed = asyncio.run(passwords.hash_password_async("hunter2"))
+
+    self.assertEqual(passwords.hash_rounds(hashed), 4)
+    self.assertTrue(asyncio.run(passwords.verify_password_async("hunter2", hashed)))
+    self.assertFalse(asyncio.run(passwords.verify_password_async("hunter3", hashed)))
+    self.assertEqual(passwords.queue_depth(), 0)
+
+  def test_saturated_queue_rejects_and_releases_the_slot(self):
+    release = threading.Event()
+    started = threading.Event()
+
+    def _slow():
+      started.set()
+      release.wait(timeout=5)
+      return True
+
+    async def _scenario():
+      holder = asyncio.ensure_future(passwords._run_async("verify", _slow))
+      await asyncio.get_running_loop().run_in_executor(None, started.wait, 5)
+      try:
+        await passwords.verify_password_async("hunter2", b"$2b$04$" + b"a" * 53)
+      finally:
+        release.set()
+        await holder
+
+    semaphore = threading.BoundedSemaphore(1)
+    with patch.object(passwords, "_admission", semaphore):
+      with self.assertRaises(Exception) as ctx:
+        asyncio.run(_scenario())
+      self.assertTrue(semaphore.acquire(blocking=False))
+
+    self.assertEqual(getattr(ctx.exception, "status_code", None), 503)
+
+  def test_needs_rehash_tracks_configured_cost(self):
+    stored = bcrypt.hashpw(b"pw", bcrypt.gensalt(rounds=4))
+    with patch.object(passwords, "BCRYPT_ROUNDS", 4):
+      self.assertFalse(passwords.needs_rehash(stored))
+    with patch.object(passwords, "BCRYPT_ROUNDS", 5):
+      self.assertTrue(passwords.needs_rehash(stored))
+
+
+class LoginRehashTests(unittest.TestCase):
+  def setUp(self):
+    if crud is None:
+      self.skipTest(f"backend app.crud import unavailable: {IMPORT_ERROR}")
+
+  def test_login_rehashes_when_cost_factor_changes(self):
+    conn = _FakeConn(bcrypt.hashpw(b"hunter2", bcrypt.gensalt(rounds=4)))
+    with (
+      patch.object(crud, "get_db", return_value=_FakeDbCtx(conn)),
+      patch.object(passwords, "BCRYPT_ROUNDS", 5),
+    ):
+      result = asyncio.run(crud.login_user("ADA@example.com", "hunter2"))
+
+    self.assertEqual(result["user_id"], 5)
+    updates = [params for query, params in conn.calls if query.startswith("UPDATE users SET password")]
+    self.assertEqual(len(updates), 1)
+    self.assertEqual(passwords.hash_rounds(updates[0][0]), 5)
+    self.assertTrue(bcrypt.checkpw(b"hunter2", updates[0][0]))
+
+  def test_login_keeps_hash_when_cost_factor_matches(self):
+    conn = _FakeConn(bcrypt.hashpw(b"hunter2", bcrypt.gensalt(rounds=4)))
+    with (
+      patch.object(crud, "get_db", return_value=_FakeDbCtx(conn)),
+      patch.object(passwords, "BCRYPT_ROUNDS", 4),
+    ):
+      asyncio.run(crud.login_user("ada@example.com", "hunter2"))
+
+    self.assertFalse(any(query.startswith("UPDATE users SET password") for query, _ in conn.calls))
+
+
+class _CampaignConn:
+  def __init__(self, open_transactions):
+    self.open_transactions = open_transactions
+    self.inserted_passwords = []
+
+  def execute(self, query, params=None):
+    normalized = " ".join(query.split())
+    if normalized.startswith("INSERT INTO users"):
+      self.inserted_passwords.append(params[-1])
+      return _FakeCursor((100 + len(self.inserted_passwords),))
+    if normalized.startswith("INSERT INTO campaigns"):
+      return _FakeCursor((42,))
+    if normalized.startswith("SELECT first_name"):
+      return _FakeCursor(("Ada",))
+    return _FakeCursor(None)
+
+  def __enter__(self):
+    self.open_transactions.append(self)
+    return self
+
+  def __exit__(self, exc_type, exc, tb):
+    self.open_transactions.remove(self)
+    return False
+
+
+class AdminCampaignTests(unittest.TestCase):
+  def setUp(self):
+    if crud is None:
+      self.skipTest(f"backend app.crud import unavailable: {IMPORT_ERROR}")
+
+  def test_test_member_passwords_are_hashed_before_the_transaction(self):
+    open_transactions = []
+    conn = _CampaignConn(open_transactions)
+    hashed_while_open = []
+
+    async def _hash(password):
+      hashed_while_open.append(bool(open_transactions))
+      return f"hash-{len(hashed_while_open)}".encode()
+
+    with (
+      patch.object(crud, "get_db", return_value=conn),
+      patch.object(crud, "is_admin_user", return_value=True),
+      patch.object(crud, "hash_password_async", side_effect=_hash),
+      patch.object(crud, "initialize_campaign_words"),
+      patch.object(crud, "invalidate_principal"),
+    ):
+      result = asyncio.run(crud.create_campaign("Realm", 5, 7, is_admin_campaign=True))
+
+    self.assertEqual(result["campaign_id"], 42)
+    self.assertEqual(hashed_while_open, [False, False, False])
+    self.assertEqual(sorted(conn.inserted_passwords), [b"hash-1", b"hash-2", b"hash-3"])
+
+  def test_non_admins_are_refused_before_any_hashing(self):
+    with (
+      patch.object(crud, "get_db", return_value=_CampaignConn([])),
+      patch.object(crud, "is_admin_user", return_value=False),
+      patch.object(crud, "hash_password_async") as hash_password_async,
+    ):
+      with self.assertRaises(Exception) as ctx:
+        asyncio.run(crud.create_campaign("Realm", 5, 7, is_admin_campaign=True))
+
+    self.assertEqual(getattr(ctx.exception, "status_code", None), 403)
+    hash_password_async.assert_not_called()
+
+
+if __name__ == "__main__":
+  unittest.main()
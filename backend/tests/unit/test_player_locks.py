@@ -0,0 +1,81 @@
+import os
+import sys
+import unittest
+from unittest.mock import patch
+
+
+BACKEND_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if BACKEND_ROOT not in sys.path:
+  sys.path.insert(0, BACKEND_ROOT)
+
+try:
+  from fastapi import HTTPException
+  from app import crud  # noqa: E402
+except Exception as exc:  # pragma: no cover
+  crud = None
+  HTTPException = None
+  IMPORT_ERROR = exc
+else:
+  IMPORT_ERROR = None
+
+
+class _FakeConn:
+  def __init__(self):
+    self.queries = []
+
+  def execute(self, query, params=None):
+    self.queries.append((" ".join(query.split()), params))
+    return self
+
+
+class _FakeDbCtx:
+  def __init__(self, conn):
+    self.conn = conn
+
+  def __enter__(self):
+    return self.conn
+
+  def __exit__(self, exc_type, exc, tb):
+    return False
+
+
+class PlayerLockTests(unittest.TestCase):
+  def setUp(self):
+    if crud is None:
+      self.skipTest(f"backend app.crud import unavailable: {IMPORT_ERROR}")
+
+  def test_players_are_locked_once_each_in_id_order(self):
+    conn = _FakeConn()
+
+    crud._lock_players(conn, 20, 12, None, 7, 12)
+
+    self.assertEqual(conn.queries, [
+      ("SELECT pg_advisory_xact_lock(%s, %s)", (7, 20)),
+      ("SELECT pg_advisory_xact_lock(%s, %s)", (12, 20)),
+    ])
+
+  def _first_queries(self, call):
+    conn = _FakeConn()
+    with (
+      patch.object(crud, "get_db", return_value=_FakeDbCtx(conn)),
+      patch.object(crud, "resolve_campaign_day", side_effect=HTTPException(status_code=404, detail="stop")),
+    ):
+      with self.assertRaises(HTTPException):
+        call()
+    return conn.queries
+
+  def test_guess_takes_the_lock_before_reading_anything(self):
+    queries = self._first_queries(lambda: crud.validate_guess("crane", user_id=10, campaign_id=20))
+
+    self.assertEqual(queries, [("SELECT pg_advisory_xact_lock(%s, %s)", (10, 20))])
+
+  def test_item_use_locks_the_user_and_the_target(self):
+    queries = self._first_queries(
+      lambda: crud.use_item(user_id=10, campaign_id=20, item_key="vowel_voodoo", target_user_id=3, effect_payload=None)
+    )
+
+    self.assertEqual([params for _, params in queries], [(3, 20), (10, 20)])
+
+
+if __name__ == "__main__":
+  unittest.main()
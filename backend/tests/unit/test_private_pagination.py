@@ -0,0 +1,155 @@
+import csv
+import io
+import json
+import os
+import sys
+import unittest
+from unittest.mock import patch
+
+
+BACKEND_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if BACKEND_ROOT not in sys.path:
+  sys.path.insert(0, BACKEND_ROOT)
+
+try:
+  from app.private import service  # noqa: E402
+except Exception as exc:  # pragma: no cover
+  service = None
+  IMPORT_ERROR = exc
+else:
+  IMPORT_ERROR = None
+
+
+class _FakeCursor:
+  def __init__(self, rows):
+    self._rows = rows
+
+  def fetchall(self):
+    return self._rows
+
+
+class _FakeConn:
+  def __init__(self, rows):
+    self.calls = []
+    self.rows = rows
+
+  def execute(self, query, params=None):
+    self.calls.append((" ".join(query.split()), params))
+    return _FakeCursor(self.rows)
+
+
+class _FakeDbCtx:
+  def __init__(self, conn):
+    self.conn = conn
+
+  def __enter__(self):
+    return self.conn
+
+  def __exit__(self, exc_type, exc, tb):
+    return False
+
+
+class PrivateKeysetPaginationTests(unittest.TestCase):
+  def setUp(self):
+    if service is None:
+      self.skipTest(f"backend app.private.service import unavailable: {IMPORT_ERROR}")
+
+  def test_uniform_order_uses_row_comparison(self):
+    cursor = service._encode_cursor([9021])
+    sql, params = service._keyset_clause(service.KEYSET_ORDERS["item_events"], cursor)
+
+    self.assertEqual(sql, "(id) < (%s)")
+    self.assertEqual(params, [9021])
+
+  def test_mixed_order_expands_predicate(self):
+    cursor = service._encode_cursor(["2026-03-01", 4])
+    sql, params = service._keyset_clause(service.KEYSET_ORDERS["guess_states"], cursor)
+
+    self.assertEqual(sql, "((date < %s) OR (date = %s AND user_id > %s))")
+    self.assertEqual(params, ["2026-03-01", "2026-03-01", 4])
+
+  def test_bad_cursor_is_rejected(self):
+    for cursor in ("!!!", service._encode_cursor([1, 2, 3])):
+      with self.assertRaises(Exception) as ctx:
+        service._keyset_clause(service.KEYSET_ORDERS["guess_states"], cursor)
+      self.assertEqual(getattr(ctx.exception, "status_code", None), 400)
+
+  def test_next_cursor_only_for_full_pages(self):
+    items = [{"date": "2026-03-02", "user_id": 1}, {"date": "2026-03-01", "user_id": 7}]
+
+    self.assertIsNone(service.next_cursor("guess_states", items, 3))
+    cursor = service.next_cursor("guess_states", items, 2)
+    self.assertEqual(service._decode_cursor(cursor, 2), ["2026-03-01", 7])
+
+  def test_list_endpoint_applies_cursor_and_order(self):
+    conn = _FakeConn(rows=[])
+    cursor = service._encode_cursor([500])
+    with patch.object(service, "get_db", return_value=_FakeDbCtx(conn)):
+      service.get_campaign_shop_log(12, None, "purchase", None, None, 50, cursor)
+
+    query, params = conn.calls[0]
+    self.assertIn("WHERE campaign_id = %s AND event_type = %s AND (id) < (%s)", query)
+    self.assertIn("ORDER BY id DESC", query)
+    self.assertEqual(params, [12, "purchase", 500, 50])
+
+  def test_event_date_filters_use_created_at_range(self):
+    conn = _FakeConn(rows=[])
+    with patch.object(service, "get_db", return_value=_FakeDbCtx(conn)):
+      service.get_campaign_item_events(12, None, None, None, None, "2026-03-01", "2026-03-02", 50)
+
+    query, params = conn.calls[0]
+    self.assertIn("created_at >= %s::date AND created_at < %s::date + 1", query)
+    self.assertEqual(params, [12, "2026-03-01", "2026-03-02", 50])
+
+
+class PrivateExportTests(unittest.TestCase):
+  def setUp(self):
+    if service is None:
+      self.skipTest(f"backend app.private.service import unavailable: {IMPORT_ERROR}")
+
+  def _export(self, export_format, rows):
+    captured = {}
+
+    def _fake_rows(sql, params, cursor_name):
+      captured["sql"] = " ".join(sql.split())
+      captured["params"] = params
+      captured["cursor_name"] = cursor_name
+      yield from rows
+
+    with (
+      patch.object(service, "_iter_export_rows", side_effect=_fake_rows),
+      patch.object(service, "EXPORT_FLUSH_ROWS", 2),
+    ):
+      media_type, chunks = service.export_dataset("first_guesses", export_format, 12, None, "2026-03-01", None)
+      body = "".join(chunks)
+    return media_type, body, captured
+
+  def test_ndjson_export_streams_one_object_per_row(self):
+    rows = [(1, 12, "2026-03-02", "crane"), (2, 12, "2026-03-02", "slate"), (1, 12, "2026-03-01", "adieu")]
+    media_type, body, captured = self._export("ndjson", rows)
+
+    self.assertEqual(media_type, "application/x-ndjson")
+    lines = [json.loads(line) for line in body.splitlines()]
+    self.assertEqual([line["word"] for line in lines], ["crane", "slate", "adieu"])
+    self.assertEqual(captured["params"], [12, "2026-03-01"])
+    self.assertIn("ORDER BY date DESC, user_id ASC", captured["sql"])
+    self.assertEqual(captured["cursor_name"], "private_export_first_guesses")
+
+  def test_csv_export_has_header_and_rows(self):
+    rows = [(1, 12, "2026-03-02", "crane"), (2, 12, "2026-03-02", "slate"), (1, 12, "2026-03-01", "adieu")]
+    media_type, body, _ = self._export("csv", rows)
+
+    self.assertEqual(media_type, "text/csv")
+    parsed = list(csv.reader(io.StringIO(body)))
+    self.assertEqual(parsed[0], ["user_id", "campaign_id", "date", "word"])
+    self.assertEqual(len(parsed), 4)
+
+  def test_unknown_dataset_is_404(self):
+    with self.assertRaises(Exception) as ctx:
+      service.export_dataset("passwords", "csv", None, None, None, None)
+
+    self.assertEqual(getattr(ctx.exception, "status_code", None), 404)
+
+
+if __name__ == "__main__":
+  unittest.main()
@@ -0,0 +1,123 @@
+import os
+import sys
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+
+BACKEND_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if BACKEND_ROOT not in sys.path:
+  sys.path.insert(0, BACKEND_ROOT)
+
+try:
+  from app.private import service  # noqa: E402
+except Exception as exc:  # pragma: no cover
+  service = None
+  IMPORT_ERROR = exc
+else:
+  IMPORT_ERROR = None
+
+
+class PrivateSummaryTests(unittest.TestCase):
+  def setUp(self):
+    if service is None:
+      self.skipTest(f"backend app.private.service import unavailable: {IMPORT_ERROR}")
+    service.clear_summary_cache()
+
+  def tearDown(self):
+    service.clear_summary_cache()
+
+  def test_global_summary_runs_sections_concurrently(self):
+    # Every section waits for all four to start; a sequential build would time out on the barrier.
+    barrier = threading.Barrier(4)
+
+    def _section(name):
+      def _fn(*args):
+        barrier.wait(timeout=2)
+        return [name]
+      return _fn
+
+    with (
+      patch.object(service, "get_global_daily_stats", side_effect=_section("daily")),
+      patch.object(service, "get_global_word_stats", side_effect=_section("words")),
+      patch.object(service, "get_global_item_stats", side_effect=_section("items")),
+      patch.object(service, "get_global_accolade_stats", side_effect=_section("accolades")),
+    ):
+      summary = service.get_global_summary(30, 30, 30, 30)
+
+    self.assertEqual(summary, {
+      "daily_stats": ["daily"],
+      "word_stats": ["words"],
+      "item_stats": ["items"],
+      "accolade_stats": ["accolades"],
+    })
+
+  def test_cache_hit_is_keyed_by_limits(self):
+    calls = []
+
+    def _builder(tag):
+      def _build():
+        calls.append(tag)
+        return {"tag": tag}
+      return _build
+
+    first = service._cached_summary(("global", 30), _builder("a"))
+    second = service._cached_summary(("global", 30), _builder("b"))
+    other = service._cached_summary(("global", 7), _builder("c"))
+
+    self.assertEqual(first[2], "MISS")
+    self.assertEqual(second[0], {"tag": "a"})
+    self.assertEqual(second[2], "HIT")
+    self.assertEqual(other[2], "MISS")
+    self.assertEqual(calls, ["a", "c"])
+
+  def test_cache_evicts_the_least_recently_used_key(self):
+    with patch.object(service, "SUMMARY_CACHE_SIZE", 2):
+      service._cached_summary(("campaign", 1), lambda: {"campaign": 1})
+      service._cached_summary(("campaign", 2), lambda: {"campaign": 2})
+      service._cached_summary(("campaign", 1), lambda: {"campaign": "rebuilt"})
+      service._cached_summary(("campaign", 3), lambda: {"campaign": 3})
+
+    self.assertEqual(list(service._summary_cache), [("campaign", 1), ("campaign", 3)])
+
+  def test_stale_entry_is_served_while_refreshing(self):
+    refreshed = threading.Event()
+
+    def _refresh():
+      refreshed.set()
+      return {"version": 2}
+
+    service._cached_summary(("global", 30), lambda: {"version": 1})
+    with (
+      patch.object(service, "SUMMARY_CACHE_TTL_SECONDS", 0),
+      patch.object(service, "SUMMARY_STALE_SECONDS", 60),
+    ):
+      value, age, status = service._cached_summary(("global", 30), _refresh)
+      self.assertEqual(status, "STALE")
+      self.assertEqual(value, {"version": 1})
+      self.assertGreaterEqual(age, 0)
+      self.assertTrue(refreshed.wait(timeout=2))
+
+    deadline = time.monotonic() + 2
+    while time.monotonic() < deadline:
+      value, _, status = service._cached_summary(("global", 30), lambda: {"version": 3})
+      if value == {"version": 2}:
+        break
+      time.sleep(0.01)
+    self.assertEqual(value, {"version": 2})
+    self.assertEqual(status, "HIT")
+
+  def test_entry_past_stale_window_is_rebuilt_inline(self):
+    service._cached_summary(("global", 30), lambda: {"version": 1})
+    with (
+      patch.object(service, "SUMMARY_CACHE_TTL_SECONDS", 0),
+      patch.object(service, "SUMMARY_STALE_SECONDS", 0),
+    ):
+      value, age, status = service._cached_summary(("global", 30), lambda: {"version": 2})
+
+    self.assertEqual((value, age, status), ({"version": 2}, 0.0, "MISS"))
+
+
+if __name__ == "__main__":
+  unittest.main()
@@ -0,0 +1,259 @@
+import os
+import sys
+import unittest
+from unittest.mock import patch
+
+
+BACKEND_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if BACKEND_ROOT not in sys.path:
+  sys.path.insert(0, BACKEND_ROOT)
+
+try:
+  import psycopg  # noqa: E402
+  from app import crud, principal, replica  # noqa: E402
+  from app.recap import service as recap_service  # noqa: E402
+except Exception as exc:  # pragma: no cover
+  crud = None
+  replica = None
+  recap_service = None
+  IMPORT_ERROR = exc
+else:
+  IMPORT_ERROR = None
+
+
+class _FakeCursor:
+  def __init__(self, row):
+    self._row = row
+
+  def fetchone(self):
+    return self._row
+
+
+class _FakeConn:
+  def __init__(self, name, lag=0.0):
+    self.name = name
+    self.lag = lag
+    self.read_only = False
+    self.closed = False
+    self.queries = []
+
+  def execute(self, query, params=None):
+    self.queries.append(" ".join(query.split()))
+    return _FakeCursor((self.lag,))
+
+  def rollback(self):
+    pass
+
+  def close(self):
+    self.closed = True
+
+
+class ReplicaRoutingTests(unittest.TestCase):
+  def setUp(self):
+    if replica is None:
+      self.skipTest(f"backend app.replica import unavailable: {IMPORT_ERROR}")
+    replica.reset_replica_state()
+    self.addCleanup(replica.reset_replica_state)
+    for name, value in (
+      ("REPLICA_DB_URL", "postgresql://replica"),
+      ("REPLICA_MAX_LAG_SECONDS", 5.0),
+      ("REPLICA_LAG_CHECK_SECONDS", 60.0),
+    ):
+      patcher = patch.object(replica, name, value)
+      patcher.start()
+      self.addCleanup(patcher.stop)
+
+  def _get_db(self, replica_conn, readonly=True):
+    opened = []
+
+    def _connect(url, **kwargs):
+      if url == "postgresql://replica":
+        if isinstance(replica_conn, Exception):
+          raise replica_conn
+        opened.append(replica_conn)
+        return replica_conn
+      conn = _FakeConn("primary")
+      opened.append(conn)
+      return conn
+
+    with (
+      patch.object(crud, "DB_URL", "postgresql://primary"),
+      patch.object(crud.psycopg, "connect", side_effect=_connect),
+    ):
+      return crud.get_db(readonly=readonly), opened
+
+  def test_readonly_goes_to_caught_up_replica(self):
+    conn, _ = self._get_db(_FakeConn("replica", lag=0.4))
+
+    self.assertEqual(conn.name, "replica")
+    self.assertTrue(conn.read_only)
+    self.assertEqual(replica.replica_lag(), 0.4)
+
+  def test_lagging_replica_falls_back_to_read_only_primary(self):
+    lagging = _FakeConn("replica", lag=30.0)
+    conn, _ = self._get_db(lagging)
+
+    self.assertEqual(conn.name, "primary")
+    self.assertTrue(conn.read_only)
+    self.assertTrue(lagging.closed)
+
+    # The measurement is reused, so the next call does not reconnect to the replica.
+    conn, opened = self._get_db(_FakeConn("replica", lag=0.0))
+    self.assertEqual([c.name for c in opened], ["primary"])
+
+  def test_unknown_lag_counts_as_lagging(self):
+    conn, _ = self._get_db(_FakeConn("replica", lag=None))
+
+    self.assertEqual(conn.name, "primary")
+
+  def test_unreachable_replica_is_skipped_for_retry_window(self):
+    conn, _ = self._get_db(psycopg.OperationalError("connection refused"))
+    self.assertEqual(conn.name, "primary")
+
+    conn, opened = self._get_db(_FakeConn("replica"))
+    self.assertEqual([c.name for c in opened], ["primary"])
+
+  def test_default_connections_never_touch_replica(self):
+    conn, opened = self._get_db(_FakeConn("replica"), readonly=False)
+
+    self.assertEqual([c.name for c in opened], ["primary"])
+    self.assertFalse(conn.read_only)
+
+
+class _MembershipConn(_FakeConn):
+  def __init__(self, name, is_member):
+    super().__init__(name)
+    self.is_member = is_member
+
+  def execute(self, query, params=None):
+    self.queries.append(" ".join(query.split()))
+    return _FakeCursor((False, [9] if self.is_member else []))
+
+
+class _RecordingDbCtx:
+  def __init__(self, conn):
+    self.conn = conn
+
+  def __enter__(self):
+    return self.conn
+
+  def __exit__(self, exc_type, exc, tb):
+    return False
+
+
+class RecapRoutingTests(unittest.TestCase):
+  def setUp(self):
+    if recap_service is None:
+      self.skipTest(f"backend app.recap.service import unavailable: {IMPORT_ERROR}")
+    principal.PRINCIPAL_CACHE.clear()
+
+  def tearDown(self):
+    principal.PRINCIPAL_CACHE.clear()
+
+  def _recap(self, is_member, opened=None):
+    opened = [] if opened is None else opened
+
+    def _get_db(readonly=False):
+      conn = _MembershipConn("replica" if readonly else "primary", is_member)
+      opened.append((readonly, conn))
+      return _RecordingDbCtx(conn)
+
+    with (
+      patch.object(recap_service, "get_db", side_effect=_get_db),
+      patch.object(recap_service, "_build_campaign_recap", side_effect=lambda conn, *_: conn.name),
+    ):
+      return recap_service.get_campaign_recap(9, 4), opened
+
+  def test_membership_is_checked_on_the_primary_and_built_on_the_replica(self):
+    built_on, opened = self._recap(is_member=True)
+
+    self.assertEqual(built_on, "replica")
+    self.assertEqual([readonly for readonly, _ in opened], [False, True])
+    self.assertIn("FROM campaign_members", opened[0][1].queries[0])
+
+  def test_non_member_is_rejected_before_touching_the_replica(self):
+    opened = []
+    with self.assertRaises(Exception) as ctx:
+      self._recap(is_member=False, opened=opened)
+
+    self.assertEqual(getattr(ctx.exception, "status_code", None), 403)
+    self.assertEqual([readonly for readonly, _ in opened], [False])
+
+  def test_followers_share_the_leaders_build_without_opening_the_replica(self):
+    opened = []
+    with patch.object(recap_service.RECAP_READS, "do", side_effect=lambda key, fn: "shared"):
+      result, opened = self._recap(is_member=True, opened=opened)
+
+    self.assertEqual(result, "shared")
+    self.assertEqual([readonly for readonly, _ in opened], [False])
+
+
+class _ListingCursor(_FakeCursor):
+  def fetchall(self):
+    return []
+
+
+class _ListingConn(_MembershipConn):
+  def execute(self, query, params=None):
+    normalized = " ".join(query.split())
+    self.queries.append(normalized)
+    if "FROM users u WHERE" in normalized:
+      return _ListingCursor((False, [9] if self.is_member else []))
+    if "FROM campaigns" in normalized:
+      return _ListingCursor((4 if self.is_member else 5,))
+    return _ListingCursor(None)
+
+
+class MemberListRoutingTests(unittest.TestCase):
+  def setUp(self):
+    if crud is None:
+      self.skipTest(f"backend app.crud import unavailable: {IMPORT_ERROR}")
+    principal.PRINCIPAL_CACHE.clear()
+
+  def tearDown(self):
+    principal.PRINCIPAL_CACHE.clear()
+
+  def _call(self, fn, is_member, opened):
+    def _get_db(readonly=False):
+      conn = _ListingConn("replica" if readonly else "primary", is_member)
+      opened.append((readonly, conn))
+      return _RecordingDbCtx(conn)
+
+    with (
+      patch.object(crud, "get_db", side_effect=_get_db),
+      patch.object(crud, "_queued_effects", side_effect=lambda conn, *_: (conn.name, {})),
+    ):
+      return fn()
+
+  def _listings(self):
+    return {
+      "members page": lambda: crud.get_campaign_members_page(9, 4),
+      "targets page": lambda: crud.get_targetable_members_page(9, 4),
+      "target matrix": lambda: crud.get_item_target_matrix(9, 4),
+    }
+
+  def test_access_is_checked_on_the_primary_and_the_listing_read_on_the_replica(self):
+    for name, fn in self._listings().items():
+      with self.subTest(name):
+        principal.PRINCIPAL_CACHE.clear()
+        opened = []
+        self._call(fn, True, opened)
+
+        self.assertEqual([readonly for readonly, _ in opened], [False, True])
+        self.assertEqual(len(opened[0][1].queries), 1)
+        self.assertTrue(opened[1][1].queries)
+
+  def test_outsiders_are_rejected_before_touching_the_replica(self):
+    for name, fn in self._listings().items():
+      with self.subTest(name):
+        principal.PRINCIPAL_CACHE.clear()
+        opened = []
+        with self.assertRaises(Exception) as ctx:
+          self._call(fn, False, opened)
+
+        self.assertEqual(getattr(ctx.exception, "status_code", None), 403)
+        self.assertEqual({readonly for readonly, _ in opened}, {False})
+
+
+if __name__ == "__main__":
+  unittest.main()
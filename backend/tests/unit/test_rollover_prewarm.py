@@ -0,0 +1,147 @@
+import json
+import os
+import sys
+import unittest
+from datetime import datetime
+from zoneinfo import ZoneInfo
+from unittest.mock import patch
+
+
+BACKEND_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if BACKEND_ROOT not in sys.path:
+  sys.path.insert(0, BACKEND_ROOT)
+
+try:
+  from app import crud, scheduler  # noqa: E402
+  from app.utils import campaigns  # noqa: E402
+except Exception as exc:  # pragma: no cover
+  crud = None
+  IMPORT_ERROR = exc
+else:
+  IMPORT_ERROR = None
+
+
+class _FakeCursor:
+  def __init__(self, rows=None):
+    self._rows = rows or []
+    self.batches = []
+
+  def fetchall(self):
+    return self._rows
+
+  def executemany(self, query, params):
+    self.batches.append((" ".join(query.split()), list(params)))
+
+  def __enter__(self):
+    return self
+
+  def __exit__(self, *exc):
+    return False
+
+
+class _FakeConn:
+  def __init__(self, members=(), campaigns=(), standings=()):
+    self.members = list(members)
+    self.campaigns = list(campaigns)
+    self.standings = list(standings)
+    self.cur = _FakeCursor()
+    self.queries = []
+
+  def execute(self, query, params=None):
+    normalized = " ".join(query.split())
+    self.queries.append((normalized, params))
+    if normalized.startswith("SELECT user_id, campaign_id FROM campaign_members"):
+      return _FakeCursor(self.members)
+    if normalized.startswith("SELECT id, start_date, cycle_length FROM campaigns"):
+      return _FakeCursor(self.campaigns)
+    if "FROM campaign_members cm" in normalized:
+      return _FakeCursor(self.standings)
+    raise AssertionError(f"unexpected query: {normalized}")
+
+  def cursor(self):
+    return self.cur
+
+
+class _NoDb:
+  def execute(self, query, params=None):
+    raise AssertionError("should have been served from the cache")
+
+
+def _standing(user_id, score, campaign_id):
+  return (user_id, f"p{user_id}", "red", score, 0, None, None, None, None, None, None, None, None, None, campaign_id)
+
+
+class RolloverPrewarmTests(unittest.TestCase):
+  def setUp(self):
+    if crud is None:
+      self.skipTest(f"backend app.crud import unavailable: {IMPORT_ERROR}")
+    crud.LEADERBOARD_CACHE.clear()
+    campaigns.CAMPAIGN_SCHEDULE_CACHE.clear()
+    self.addCleanup(crud.LEADERBOARD_CACHE.clear)
+    self.addCleanup(campaigns.CAMPAIGN_SCHEDULE_CACHE.clear)
+
+  def test_shop_rotations_are_inserted_in_one_batch_without_overwriting(self):
+    conn = _FakeConn(members=[(1, 10), (2, 10), (1, 11)])
+
+    self.assertEqual(crud.pregenerate_shop_rotations(conn, "2026-03-02"), 3)
+
+    [(query, params)] = conn.cur.batches
+    self.assertIn("ON CONFLICT (user_id, campaign_id, date) DO NOTHING", query)
+    self.assertEqual([row[:3] for row in params], [(1, 10, "2026-03-02"), (2, 10, "2026-03-02"), (1, 11, "2026-03-02")])
+    for row in params:
+      self.assertEqual(set(json.loads(row[3])), {"illusion", "blessing", "curse"})
+
+  def test_primed_schedules_and_standings_skip_the_database(self):
+    conn = _FakeConn(
+      campaigns=[(10, "2026-03-01", 5), (11, "2026-02-20", 30)],
+      standings=[_standing(1, 9, 10), _standing(2, 4, 10)],
+    )
+
+    self.assertEqual(crud.prime_campaign_caches(conn, "2026-03-02"), 2)
+    self.assertEqual(len(conn.queries), 2)
+
+    with patch.object(campaigns, "datetime", wraps=datetime) as mock_datetime:
+      mock_datetime.now.return_value = datetime(2026, 3, 2, 0, 1, tzinfo=ZoneInfo("America/Chicago"))
+      self.assertEqual(campaigns.resolve_campaign_day(_NoDb(), 10, None)[2], 2)
+    with (
+      patch.object(crud, "get_db", side_effect=AssertionError("should have been served from the cache")),
+      patch.object(crud, "datetime", wraps=datetime) as mock_datetime,
+    ):
+      mock_datetime.now.return_value = datetime(2026, 3, 2, 0, 1, tzinfo=ZoneInfo("America/Chicago"))
+      self.assertEqual([row["user_id"] for row in crud.get_leaderboard(10)], [1, 2])
+      self.assertEqual(crud.get_leaderboard(11), [])
+
+  def test_invalidation_during_the_bulk_read_leaves_that_cache_cold(self):
+    conn = _FakeConn(campaigns=[(10, "2026-03-01", 5)], standings=[_standing(1, 9, 10)])
+    execute = conn.execute
+
+    def _execute_with_concurrent_write(query, params=None):
+      rows = execute(query, params)
+      if "FROM campaign_members cm" in query:
+        # A guess commits in another worker while the standings are being read.
+        crud.LEADERBOARD_CACHE.discard(repr((10, "2026-03-02")))
+      return rows
+
+    conn.execute = _execute_with_concurrent_write
+    crud.prime_campaign_caches(conn, "2026-03-02")
+
+    self.assertEqual(crud.LEADERBOARD_CACHE.get((10, "2026-03-02"), lambda: "reloaded"), "reloaded")
+    self.assertEqual(campaigns.CAMPAIGN_SCHEDULE_CACHE.get(10, lambda: "reloaded"), ("2026-03-01", 5))
+
+  def test_scheduler_skips_priming_without_a_shared_cache(self):
+    with (
+      patch.object(scheduler, "get_backend", return_value=None),
+      patch.object(scheduler, "get_db", side_effect=AssertionError("nothing to prime")),
+    ):
+      scheduler.prime_shared_cache()
+
+  def test_workers_prime_just_after_midnight_across_dst(self):
+    central = ZoneInfo("America/Chicago")
+    with patch.object(scheduler, "ROLLOVER_PRIME_DELAY_SECONDS", 30), patch.object(scheduler, "ROLLOVER_PRIME_JITTER_SECONDS", 0):
+      self.assertEqual(scheduler.RolloverWarmer.seconds_until_prime(datetime(2026, 3, 2, 23, 59, tzinfo=central)), 90)
+      # 2026-11-01 has 25 hours; 01:00 CDT is 24 real hours from midnight.
+      self.assertEqual(scheduler.RolloverWarmer.seconds_until_prime(datetime(2026, 11, 1, 1, 0, tzinfo=central)), 24 * 3600 + 30)
+
+
+if __name__ == "__main__":
+  unittest.main()
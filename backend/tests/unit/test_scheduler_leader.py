@@ -0,0 +1,152 @@
+import os
+import sys
+import unittest
+from unittest.mock import patch
+
+
+BACKEND_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if BACKEND_ROOT not in sys.path:
+  sys.path.insert(0, BACKEND_ROOT)
+
+try:
+  import psycopg  # noqa: E402
+  from app import scheduler  # noqa: E402
+except Exception as exc:  # pragma: no cover
+  scheduler = None
+  IMPORT_ERROR = exc
+else:
+  IMPORT_ERROR = None
+
+
+class _FakeCursor:
+  def __init__(self, row):
+    self._row = row
+
+  def fetchone(self):
+    return self._row
+
+
+class _FakeConn:
+  def __init__(self, lock_free=True, fail=False):
+    self.lock_free = lock_free
+    self.fail = fail
+    self.autocommit = False
+    self.closed = False
+    self.queries = []
+
+  def execute(self, query, params=None):
+    if self.fail:
+      raise psycopg.OperationalError("server closed the connection")
+    normalized = " ".join(query.split())
+    self.queries.append((normalized, params))
+    if "pg_try_advisory_lock" in normalized:
+      return _FakeCursor((self.lock_free,))
+    return _FakeCursor(None)
+
+  def close(self):
+    self.closed = True
+
+
+class SchedulerLeaderTests(unittest.TestCase):
+  def setUp(self):
+    if scheduler is None:
+      self.skipTest(f"backend app.scheduler import unavailable: {IMPORT_ERROR}")
+
+  def _tick(self, leader, conn):
+    with (
+      patch.object(scheduler, "get_db", return_value=conn),
+      patch.object(scheduler.SchedulerLeader, "_start_jobs", autospec=True) as start_jobs,
+    ):
+      start_jobs.side_effect = lambda self: setattr(self, "scheduler", object())
+      leader.tick()
+    return start_jobs
+
+  def test_instance_that_gets_the_lock_leads_and_heartbeats(self):
+    leader = scheduler.SchedulerLeader()
+    conn = _FakeConn(lock_free=True)
+
+    start_jobs = self._tick(leader, conn)
+
+    self.assertTrue(leader.is_leader)
+    self.assertTrue(conn.autocommit)
+    start_jobs.assert_called_once()
+    heartbeat = [params for query, params in conn.queries if "INTO scheduler_heartbeats" in query]
+    self.assertEqual(heartbeat[0][:2], (leader.instance_id, True))
+
+    # Already leading: later ticks only heartbeat.
+    start_jobs = self._tick(leader, conn)
+    start_jobs.assert_not_called()
+
+  def test_standby_keeps_polling_without_running_jobs(self):
+    leader = scheduler.SchedulerLeader()
+    conn = _FakeConn(lock_free=False)
+
+    start_jobs = self._tick(leader, conn)
+
+    self.assertFalse(leader.is_leader)
+    start_jobs.assert_not_called()
+    self.assertTrue(any("INTO scheduler_heartbeats" in query for query, _ in conn.queries))
+
+  def test_lost_control_connection_steps_down(self):
+    leader = scheduler.SchedulerLeader()
+    self._tick(leader, _FakeConn(lock_free=True))
+    leader.conn.fail = True
+
+    with patch.object(scheduler.SchedulerLeader, "_stop_jobs", autospec=True) as stop_jobs:
+      stop_jobs.side_effect = lambda self: setattr(self, "scheduler", None)
+      leader.tick()
+
+    self.assertFalse(leader.is_leader)
+    self.assertIsNone(leader.conn)
+
+  def test_successful_jobs_are_heartbeated_separately_from_errors(self):
+    leader = scheduler.SchedulerLeader()
+    leader._on_job_event(type("_Event", (), {"job_id": "flush_counters", "exception": None})())
+    succeeded_at = leader.last_success_at
+    leader._on_job_event(type("_Event", (), {"job_id": "maintain_partitions", "exception": ValueError("x")})())
+
+    self.assertIsNotNone(succeeded_at)
+    self.assertEqual(leader.last_success_at, succeeded_at)
+    self.assertIn("maintain_partitions", leader.last_error)
+
+  def test_health_reports_only_status_and_last_success_age(self):
+    class _HealthConn(_FakeConn):
+      def __init__(self, row):
+        super().__init__()
+        self.row = row
+
+      def execute(self, query, params=None):
+        super().execute(query, params)
+        return _FakeCursor(self.row)
+
+    class _Ctx:
+      def __init__(self, conn):
+        self.conn = conn
+
+      def __enter__(self):
+        return self.conn
+
+      def __exit__(self, *exc):
+        return False
+
+    with patch.object(scheduler, "get_db", return_value=_Ctx(_HealthConn((1, 12.34)))):
+      self.assertEqual(scheduler.get_scheduler_health(), {"status": "ok", "seconds_since_last_success": 12.3})
+    with patch.object(scheduler, "get_db", return_value=_Ctx(_HealthConn((0, None)))):
+      self.assertEqual(scheduler.get_scheduler_health(), {"status": "no_leader", "seconds_since_last_success": None})
+
+  def test_job_already_running_elsewhere_is_skipped(self):
+    ran = []
+
+    def _job():
+      ran.append(True)
+
+    conn = _FakeConn(lock_free=False)
+    with patch.object(scheduler, "get_db", return_value=conn):
+      self.assertFalse(scheduler.run_job_exclusively(_job))
+
+    self.assertEqual(ran, [])
+    self.assertTrue(conn.closed)
+
+
+if __name__ == "__main__":
+  unittest.main()
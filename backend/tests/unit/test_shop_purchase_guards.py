@@ -26,20 +26,23 @@ class _FakeCursor:
 
 
 class _FakeConn:
-  def __init__(self):
+  def __init__(self, coins=10, already_bought=False):
     self.calls = []
+    self.coins = coins
+    self.already_bought = already_bought
 
   def execute(self, query, params=None):
     self.calls.append((query, params))
     normalized_query = " ".join(query.split())
-    if "FROM campaign_shop_log" in normalized_query and "LIMIT 1" in normalized_query:
-      return _FakeCursor(None)
-    if "SELECT coins" in normalized_query and "FROM campaign_coins" in normalized_query:
-      return _FakeCursor((10,))
+    if "INSERT INTO campaign_shop_daily_purchases" in normalized_query:
+      return _FakeCursor(None if self.already_bought else (1,))
+    if "UPDATE campaign_coins" in normalized_query and "RETURNING coins" in normalized_query:
+      cost = params[0]
+      return _FakeCursor((self.coins - cost,) if self.coins >= cost else None)
+    if "RETURNING coins_spent" in normalized_query:
+      return _FakeCursor((params[3],))
     if "RETURNING quantity" in normalized_query:
       return _FakeCursor((1,))
-    if "SELECT COALESCE(SUM(cost), 0)" in normalized_query and "FROM store_purchases" in normalized_query:
-      return _FakeCursor((0,))
     return _FakeCursor(None)
 
 
@@ -102,6 +105,40 @@ class ShopPurchaseGuardsTests(unittest.TestCase):
     self.assertEqual(result["quantity"], 1)
     self.assertEqual(result["item"]["key"], "candle_of_mercy")
 
+  def _purchase_with(self, conn):
+    item = {
+      "key": "candle_of_mercy",
+      "name": "Candle of Mercy",
+      "cost": 5,
+      "category": "blessing",
+    }
+    with (
+      patch.object(crud, "get_item", return_value=item),
+      patch.object(crud, "get_db", return_value=_FakeDbCtx(conn)),
+      patch.object(crud, "is_admin_campaign", return_value=True),
+      patch.object(crud, "_get_shop_day", return_value="2026-03-01"),
+      patch.object(crud, "_get_or_create_shop_rotation", return_value={"illusion": [], "blessing": ["candle_of_mercy"], "curse": []}),
+    ):
+      return crud.purchase_item(user_id=1, campaign_id=9, item_key="candle_of_mercy")
+
+  def test_purchase_rejects_second_buy_from_ledger_conflict(self):
+    conn = _FakeConn(already_bought=True)
+    with self.assertRaises(Exception) as ctx:
+      self._purchase_with(conn)
+
+    self.assertEqual(getattr(ctx.exception, "status_code", None), 400)
+    self.assertIn("already bought", getattr(ctx.exception, "detail", str(ctx.exception)).lower())
+    self.assertFalse(any("UPDATE campaign_coins" in query for query, _ in conn.calls))
+
+  def test_purchase_rejects_when_conditional_debit_fails(self):
+    conn = _FakeConn(coins=3)
+    with self.assertRaises(Exception) as ctx:
+      self._purchase_with(conn)
+
+    self.assertEqual(getattr(ctx.exception, "status_code", None), 400)
+    self.assertIn("not enough coins", getattr(ctx.exception, "detail", str(ctx.exception)).lower())
+    self.assertFalse(any("INSERT INTO store_purchases" in query for query, _ in conn.calls))
+
 
 if __name__ == "__main__":
   unittest.main()
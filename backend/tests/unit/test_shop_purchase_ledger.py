@@ -0,0 +1,160 @@
+import os
+import sys
+import threading
+import unittest
+from unittest.mock import patch
+
+
+BACKEND_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if BACKEND_ROOT not in sys.path:
+  sys.path.insert(0, BACKEND_ROOT)
+
+try:
+  from app import crud  # noqa: E402
+except Exception as exc:  # pragma: no cover
+  crud = None
+  IMPORT_ERROR = exc
+else:
+  IMPORT_ERROR = None
+
+
+class _FakeCursor:
+  def __init__(self, row):
+    self._row = row
+
+  def fetchone(self):
+    return self._row
+
+
+class _FakeStore:
+  """Shared state standing in for the unique ledger key and the coin balance."""
+
+  def __init__(self, coins):
+    self.lock = threading.Lock()
+    self.ledger = set()
+    self.coins = coins
+    self.spend = 0
+    self.quantity = 0
+
+
+class _FakeConn:
+  def __init__(self, store, barrier):
+    self.store = store
+    self.barrier = barrier
+    self.claimed = None
+    self.debited = 0
+
+  def execute(self, query, params=None):
+    normalized_query = " ".join(query.split())
+    store = self.store
+    if "INSERT INTO campaign_shop_daily_purchases" in normalized_query:
+      # Line both requests up on the conditional insert, like a double-click would.
+      self.barrier.wait(timeout=5)
+      key = tuple(params[:4])
+      with store.lock:
+        if key in store.ledger:
+          return _FakeCursor(None)
+        store.ledger.add(key)
+        self.claimed = key
+      return _FakeCursor((1,))
+    if "UPDATE campaign_coins" in normalized_query and "RETURNING coins" in normalized_query:
+      cost = params[0]
+      with store.lock:
+        if store.coins < cost:
+          return _FakeCursor(None)
+        store.coins -= cost
+        self.debited = cost
+        return _FakeCursor((store.coins,))
+    if "RETURNING coins_spent" in normalized_query:
+      with store.lock:
+        store.spend += params[3]
+        return _FakeCursor((store.spend,))
+    if "RETURNING quantity" in normalized_query:
+      with store.lock:
+        store.quantity += 1
+        return _FakeCursor((store.quantity,))
+    return _FakeCursor(None)
+
+  def rollback(self):
+    with self.store.lock:
+      if self.claimed:
+        self.store.ledger.discard(self.claimed)
+      self.store.coins += self.debited
+
+
+class _FakeDbCtx:
+  def __init__(self, conn):
+    self.conn = conn
+
+  def __enter__(self):
+    return self.conn
+
+  def __exit__(self, exc_type, exc, tb):
+    if exc_type is not None:
+      self.conn.rollback()
+    return False
+
+
+class ShopPurchaseLedgerConcurrencyTests(unittest.TestCase):
+  def setUp(self):
+    if crud is None:
+      self.skipTest(f"backend app.crud import unavailable: {IMPORT_ERROR}")
+
+  def _run_double_click(self, coins):
+    store = _FakeStore(coins=coins)
+    barrier = threading.Barrier(2)
+    item = {
+      "key": "candle_of_mercy",
+      "name": "Candle of Mercy",
+      "cost": 5,
+      "category": "blessing",
+    }
+    results = []
+    errors = []
+
+    def _purchase():
+      try:
+        results.append(crud.purchase_item(user_id=1, campaign_id=9, item_key="candle_of_mercy"))
+      except Exception as exc:
+        errors.append(exc)
+
+    with (
+      patch.object(crud, "get_item", return_value=item),
+      patch.object(crud, "get_db", side_effect=lambda: _FakeDbCtx(_FakeConn(store, barrier))),
+      patch.object(crud, "is_admin_campaign", return_value=False),
+      patch.object(crud, "award_accolade"),
+      patch.object(crud, "_get_shop_day", return_value="2026-03-01"),
+      patch.object(crud, "_get_or_create_shop_rotation", return_value={"illusion": [], "blessing": ["candle_of_mercy"], "curse": []}),
+    ):
+      threads = [threading.Thread(target=_purchase) for _ in range(2)]
+      for thread in threads:
+        thread.start()
+      for thread in threads:
+        thread.join(timeout=10)
+
+    return store, results, errors
+
+  def test_double_click_buys_once_and_debits_once(self):
+    store, results, errors = self._run_double_click(coins=20)
+
+    self.assertEqual(len(results), 1)
+    self.assertEqual(len(errors), 1)
+    self.assertEqual(getattr(errors[0], "status_code", None), 400)
+    self.assertIn("already bought", getattr(errors[0], "detail", "").lower())
+    self.assertEqual(results[0]["coins"], 15)
+    self.assertEqual(store.coins, 15)
+    self.assertEqual(store.spend, 5)
+    self.assertEqual(store.quantity, 1)
+    self.assertEqual(store.ledger, {(1, 9, "2026-03-01", "candle_of_mercy")})
+
+  def test_failed_debit_releases_ledger_claim(self):
+    store, results, errors = self._run_double_click(coins=3)
+
+    self.assertEqual(results, [])
+    self.assertEqual(len(errors), 2)
+    self.assertEqual(store.coins, 3)
+    self.assertEqual(store.ledger, set())
+
+
+if __name__ == "__main__":
+  unittest.main()
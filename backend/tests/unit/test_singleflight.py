@@ -0,0 +1,117 @@
+import asyncio
+import os
+import sys
+import threading
+import time
+import unittest
+
+
+BACKEND_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if BACKEND_ROOT not in sys.path:
+  sys.path.insert(0, BACKEND_ROOT)
+
+try:
+  from prometheus_client import REGISTRY  # noqa: E402
+  from app.singleflight import SingleFlight  # noqa: E402
+except Exception as exc:  # pragma: no cover
+  SingleFlight = None
+  IMPORT_ERROR = exc
+else:
+  IMPORT_ERROR = None
+
+
+def _count(group, role):
+  return REGISTRY.get_sample_value("singleflight_calls_total", {"group": group, "role": role}) or 0.0
+
+
+class SingleFlightTests(unittest.TestCase):
+  def setUp(self):
+    if SingleFlight is None:
+      self.skipTest(f"backend app.singleflight import unavailable: {IMPORT_ERROR}")
+
+  def _slow(self, calls, value="rows", delay=0.2):
+    def _work():
+      calls.append(value)
+      time.sleep(delay)
+      return value
+    return _work
+
+  def test_concurrent_sync_callers_share_one_call(self):
+    flight = SingleFlight("test_sync")
+    calls, results = [], []
+    threads = [
+      threading.Thread(target=lambda: results.append(flight.do((7, "2026-03-01"), self._slow(calls))))
+      for _ in range(8)
+    ]
+    for thread in threads:
+      thread.start()
+    for thread in threads:
+      thread.join()
+
+    self.assertEqual(calls, ["rows"])
+    self.assertEqual(results, ["rows"] * 8)
+    self.assertEqual(_count("test_sync", "leader"), 1)
+    self.assertEqual(_count("test_sync", "follower"), 7)
+
+    # Nothing is kept once the call finishes.
+    flight.do((7, "2026-03-01"), self._slow(calls, delay=0))
+    self.assertEqual(len(calls), 2)
+
+  def test_followers_get_the_leaders_exception(self):
+    flight = SingleFlight("test_error")
+    errors = []
+
+    def _fail():
+      time.sleep(0.1)
+      raise LookupError("campaign not found")
+
+    def _call():
+      try:
+        flight.do(1, _fail)
+      except LookupError as exc:
+        errors.append(exc)
+
+    threads = [threading.Thread(target=_call) for _ in range(3)]
+    for thread in threads:
+      thread.start()
+    for thread in threads:
+      thread.join()
+
+    self.assertEqual(len(errors), 3)
+    self.assertEqual(len({id(exc) for exc in errors}), 1)
+
+  def test_follower_runs_the_work_itself_after_the_timeout(self):
+    flight = SingleFlight("test_timeout", timeout_seconds=0.05)
+    calls = []
+    leader = threading.Thread(target=lambda: flight.do(1, self._slow(calls, "leader", delay=0.3)))
+    leader.start()
+    time.sleep(0.05)
+
+    self.assertEqual(flight.do(1, self._slow(calls, "fallback", delay=0)), "fallback")
+    leader.join()
+    self.assertEqual(_count("test_timeout", "fallback"), 1)
+
+  def test_async_callers_share_with_each_other_and_sync_work(self):
+    flight = SingleFlight("test_async")
+    calls = []
+
+    async def _fetch():
+      calls.append("async")
+      await asyncio.sleep(0.1)
+      return "recap"
+
+    async def _main():
+      shared = await asyncio.gather(*(flight.do_async(3, _fetch) for _ in range(5)))
+      threaded = await asyncio.gather(*(flight.do_async(4, self._slow(calls, "sync", 0.1)) for _ in range(5)))
+      return shared, threaded
+
+    shared, threaded = asyncio.run(_main())
+
+    self.assertEqual(shared, ["recap"] * 5)
+    self.assertEqual(threaded, ["sync"] * 5)
+    self.assertEqual(calls, ["async", "sync"])
+    self.assertEqual(_count("test_async", "follower"), 8)
+
+
+if __name__ == "__main__":
+  unittest.main()
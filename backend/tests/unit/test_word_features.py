@@ -0,0 +1,85 @@
+import json
+import os
+import sys
+import unittest
+from datetime import date
+
+
+BACKEND_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if BACKEND_ROOT not in sys.path:
+  sys.path.insert(0, BACKEND_ROOT)
+
+try:
+  from app import wordfeatures  # noqa: E402
+  from app.items import get_item  # noqa: E402
+  from app.items.context import ItemContext  # noqa: E402
+except Exception as exc:  # pragma: no cover
+  wordfeatures = None
+  IMPORT_ERROR = exc
+else:
+  IMPORT_ERROR = None
+
+
+class _FakeConn:
+  def __init__(self):
+    self.queries = []
+
+  def execute(self, query, params=None):
+    self.queries.append((" ".join(query.split()), params))
+    return None
+
+
+def _context(conn, secret, guess_state=None):
+  return ItemContext(
+    conn=conn,
+    user_id=1,
+    campaign_id=2,
+    target_day=3,
+    target_date=date(2026, 3, 3),
+    secret=secret,
+    guess_state=guess_state,
+  )
+
+
+class WordFeatureTests(unittest.TestCase):
+  def setUp(self):
+    if wordfeatures is None:
+      self.skipTest(f"backend app.wordfeatures import unavailable: {IMPORT_ERROR}")
+
+  def test_features_are_precomputed_for_playable_words(self):
+    features = wordfeatures.features("level")
+
+    self.assertIs(features, wordfeatures.features("LEVEL"))
+    self.assertEqual(features.twins, (("L", (1, 5)), ("E", (2, 4))))
+    self.assertEqual(features.vowel_count, 2)
+    self.assertEqual(features.letters, frozenset("LEV"))
+    self.assertEqual(len(features.absent_letters), 23)
+    self.assertNotIn("V", features.absent_letters)
+
+  def test_words_outside_the_playable_list_are_computed(self):
+    features = wordfeatures.features("zzzax")
+
+    self.assertEqual(features.twins, (("Z", (1, 2, 3)),))
+    self.assertEqual(features.vowel_count, 1)
+
+  def test_blessing_handlers_only_write_their_status_effect(self):
+    conn = _FakeConn()
+    state = {"guesses": json.dumps([["c", "r", "a", "n", "e"]]), "results": json.dumps([["absent"] * 5])}
+
+    twins = get_item("twin_fates")["handler"](_context(conn, "llama"))
+    vowels = get_item("vowel_vision")["handler"](_context(conn, "llama"))
+    light = get_item("guiding_light")["handler"](_context(conn, "llama", state))
+
+    self.assertEqual(twins["twins"]["letters"], [
+      {"letter": "L", "positions": [1, 2]},
+      {"letter": "A", "positions": [3, 5]},
+    ])
+    self.assertEqual(vowels["easy_tongue"]["vowel_count"], 2)
+    self.assertEqual(len(light["cartography"]["unused_letters"]), 4)
+    self.assertFalse(set(light["cartography"]["unused_letters"]) & set("LAMCRNE"))
+    self.assertEqual(len(conn.queries), 3)
+    self.assertTrue(all(query.startswith("INSERT INTO campaign_user_status_effects") for query, _ in conn.queries))
+
+
+if __name__ == "__main__":
+  unittest.main()
@@ -0,0 +1,65 @@
+import os
+import sys
+import tempfile
+import unittest
+
+
+BACKEND_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if BACKEND_ROOT not in sys.path:
+  sys.path.insert(0, BACKEND_ROOT)
+
+try:
+  from app import wordmatrix  # noqa: E402
+except Exception as exc:  # pragma: no cover
+  wordmatrix = None
+  IMPORT_ERROR = exc
+else:
+  IMPORT_ERROR = None
+
+
+ANSWERS = ["crane", "slate", "there", "hello", "abide", "rarer", "joist", "moist", "hoist", "foist"]
+GUESSES = ["speed", "eerie", "lolly", "array", "roate", "fjord"]
+
+
+class PatternMatrixTests(unittest.TestCase):
+  def setUp(self):
+    if wordmatrix is None:
+      self.skipTest(f"backend app.wordmatrix import unavailable: {IMPORT_ERROR}")
+    self._dir = tempfile.TemporaryDirectory()
+    self.addCleanup(self._dir.cleanup)
+    path = wordmatrix.build(os.path.join(self._dir.name, "patterns.npy"), guesses=GUESSES, answers=ANSWERS)
+    self.matrix = wordmatrix.PatternMatrix(path)
+
+  def test_vectorized_patterns_match_reference_with_duplicate_letters(self):
+    for guess in self.matrix.guesses:
+      for answer in self.matrix.answers:
+        expected = wordmatrix.pattern(guess, answer)
+        self.assertEqual(self.matrix.matrix[self.matrix.guess_index[guess], self.matrix.answer_index[answer]], expected, (guess, answer))
+
+  def test_pattern_encoding_matches_guess_results(self):
+    # "eerie" vs "there": only one leftover e for the two non-green e's, so the second stays absent.
+    result = ["present", "absent", "present", "absent", "correct"]
+    self.assertEqual(wordmatrix.pattern("eerie", "there"), wordmatrix.pattern_from_result(result))
+    self.assertEqual(wordmatrix.pattern("crane", "crane"), wordmatrix.SOLVED_PATTERN)
+
+  def test_candidates_and_best_guess(self):
+    candidates = self.matrix.candidates_after([("moist", wordmatrix.pattern("moist", "hoist"))])
+    remaining = sorted(word for word, keep in zip(self.matrix.answers, candidates) if keep)
+    self.assertEqual(remaining, ["foist", "hoist", "joist"])
+
+    # hoist cannot tell foist from joist; fjord splits all three, which beats guessing a candidate.
+    self.assertEqual(self.matrix.best_guess(candidates), "fjord")
+    expected = self.matrix.expected_remaining(candidates)
+    self.assertEqual(expected[self.matrix.guess_index["fjord"]], 1.0)
+    self.assertAlmostEqual(expected[self.matrix.guess_index["hoist"]], 5 / 3)
+
+  def test_score_guesses_rates_skill_and_luck(self):
+    scored = self.matrix.score_guesses(["moist", "fjord", "hoist"], "hoist")
+
+    self.assertEqual([row["candidates_after"] for row in scored], [3, 1, 1])
+    self.assertEqual(scored[1]["skill"], 1.0)
+    self.assertEqual(scored[1]["luck_bits"], 0.0)
+    self.assertTrue(all(0 <= value <= 1 for value in self.matrix.difficulty.values()))
+
+if __name__ == "__main__":
+  unittest.main()